@@ -7,6 +7,7 @@ auxiliary functions related to sine-approximation
 @author: bruns01
 """
 
+import numpy as np
 import scipy as sp
 from scipy import linalg as la
 import matplotlib.pyplot as mp
@@ -178,28 +179,69 @@ def phase_delay(A1, A2, deg=False):
 
 
 # periodical sinefit at known frequency
-def seq_threeparsinefit(y, t, f0,periods=1):
+def seq_threeparsinefit(y, t, f0, periods=1, returnSectionStartTimes=False):
     """
     period-wise sine-fit at a known frequency\n
     y vector of sample values \n
     t vector of sample times\n
     f0 known frequency\n
+    periods number of periods per section (default 1)\n
+    returnSectionStartTimes return the start times of the sections too\n
     \n
     returns a (n,3)-matrix of coefficient-triplets [[a,b,c], ...]\n
-    for y = a*sin(2*pi*f0*t) + b*cos(2*pi*f0*t) + c
+    for y = a*sin(2*pi*f0*t) + b*cos(2*pi*f0*t) + c\n
+    and the n section start times if returnSectionStartTimes=True
     """
-    Tau = 1.0 / f0
-    dt = t[1] - t[0]
-    N = int(Tau / dt) *periods  ## samples per section
-    M = int(sp.floor(t.size / N))  ## number of sections or periods
+    abc, sectionStartTimes = batch_threeparsinefit(y, t, f0, periods=periods)
+    if returnSectionStartTimes:
+        return abc, sectionStartTimes
+    return abc  ## matrix of all fit vectors per period
 
-    abc = sp.zeros((M, 3))
 
-    for i in range(int(M)):
-        ti = t[i * N : (i + 1) * N]
-        yi = y[i * N : (i + 1) * N]
-        abc[i, :] = threeparsinefit(yi, ti, f0)
-    return abc  ## matrix of all fit vectors per period
+# periodical sinefit at known frequency for many rows of samples at once
+def batch_threeparsinefit(y, t, f0, periods=1, returnCovariance=False):
+    """
+    period-wise sine-fit at a known frequency of many signals sampled at the
+    same times, all sections of all rows are solved at once\n
+    y (rows, samples)-array or vector of sample values \n
+    t vector of sample times shared by all rows\n
+    f0 known frequency\n
+    periods number of periods per section (default 1)\n
+    returnCovariance return the covariance of the coefficients too\n
+    \n
+    returns a (rows,n,3)-array of coefficient-triplets [a,b,c] per section,\n
+    for y = a*sin(2*pi*f0*t) + b*cos(2*pi*f0*t) + c, (n,3) for a vector y,\n
+    the n section start times\n
+    and if returnCovariance=True the (rows,n,3,3)-array of the coefficient\n
+    covariances estimated from the residuals of every section
+    """
+    y = np.asarray(y, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    vector = y.ndim == 1
+    y = np.atleast_2d(y)
+    Tau = 1.0 / f0
+    dt = t[1] - t[0]
+    N = int(Tau / dt) * periods  ## samples per section
+    M = int(np.floor(t.size / N))  ## number of sections or periods
+
+    # one design matrix per section, shared by all rows
+    ti = t[: M * N].reshape(M, N)
+    yi = y[:, : M * N].reshape(y.shape[0], M, N)
+    w0 = 2 * np.pi * f0
+    a = np.stack((np.cos(w0 * ti), np.sin(w0 * ti), np.ones(ti.shape)), axis=-1)
+    # normal equations, (a^T a) is close to diag(N/2, N/2, N) for whole periods
+    ata_inv = np.linalg.inv(np.einsum("mnk,mnl->mkl", a, a))
+    aty = np.einsum("mnk,rmn->rmk", a, yi)
+    abc = np.einsum("mkl,rml->rmk", ata_inv, aty)
+    sectionStartTimes = ti[:, 0]
+
+    result = (abc[0] if vector else abc, sectionStartTimes)
+    if returnCovariance:
+        residuals = yi - np.einsum("mnk,rmk->rmn", a, abc)
+        variance = np.sum(residuals ** 2, axis=-1) / (N - 3)
+        cov = variance[:, :, np.newaxis, np.newaxis] * ata_inv
+        result += (cov[0] if vector else cov,)
+    return result
 
 
 # four parameter sine-fit (with frequency approximation)
@@ -21,6 +21,8 @@ __all__ = [
     "AmpPhase2DFT",
     "AmpPhase2Time",
     "Time2AmpPhase",
+    "DFTPlan",
+    "get_DFT_plan",
     "dwt",
     "wave_dec",
     "wave_dec_realtime",
@@ -29,6 +31,8 @@ __all__ = [
     "filter_design",
     "dwt_max_level",
     "FIRuncFilter",
+    "FIRuncFilter_realtime",
+    "FIR_get_initial_state",
     "IIRuncFilter",
     "IIR_get_initial_state",
     "ARMA",
@@ -71,6 +75,8 @@ __all__ = [
     "separate_real_imag_of_mc_samples",
     "separate_real_imag_of_vector",
     "complex_2_real_imag",
+    "ToeplitzCovariance",
+    "BandedCovariance",
 ]
 
 from .misc import *
@@ -20,6 +20,7 @@ import numpy as np
 
 from .filterstuff import ua
 from .noise import white_gaussian
+from .tools import _update_mean_and_scatter_matrix
 
 
 def sos_FreqResp(S, d, f0, freqs):
@@ -56,13 +57,10 @@ def sos_FreqResp(S, d, f0, freqs):
     w = 2 * np.pi * freqs
 
     if isinstance(S, np.ndarray):
-        H = np.tile(rho, (len(w), 1)) * (
-            om0**2
-            + 2j
-            * np.tile(d * om0, (len(w), 1))
-            * np.tile(w[:, np.newaxis], (1, len(S)))
-            - np.tile(w[:, np.newaxis] ** 2, (1, len(S)))
-        ) ** (-1)
+        # Broadcast the parameter sets along the columns and the frequencies along
+        # the rows instead of tiling all of them to the shape of the result.
+        w = w[:, np.newaxis]
+        H = rho * (om0**2 + 2j * (d * om0) * w - w**2) ** (-1)
     else:
         H = rho / (om0**2 + 2j * d * om0 * w - w**2)
 
@@ -101,7 +99,7 @@ def sos_phys2filter(S, d, f0):
     return bc, ac
 
 
-def sos_realimag(S, d, f0, uS, ud, uf0, f, runs=10000):
+def sos_realimag(S, d, f0, uS, ud, uf0, f, runs=10000, chunk_size=None):
     """Propagation of uncertainty from physical parameters to real and imaginary part
 
     Propagation of uncertainties from physical parameters to real and imaginary part of
@@ -125,6 +123,10 @@ def sos_realimag(S, d, f0, uS, ud, uf0, f, runs=10000):
         frequency values at which to calculate real and imaginary part
     runs : int, optional
         number of Monte Carlo runs
+    chunk_size : int, optional
+        number of Monte Carlo runs for which the frequency responses are evaluated
+        at once, such that only the values of one chunk are kept in memory. Defaults
+        to all runs at once.
 
     Returns
     -------
@@ -139,15 +141,10 @@ def sos_realimag(S, d, f0, uS, ud, uf0, f, runs=10000):
     dMC = white_gaussian(runs, d, ud)
     fMC = white_gaussian(runs, f0, uf0)
 
-    HMC = sos_FreqResp(SMC, dMC, fMC, f)
+    return _propagate_sos_monte_carlo(SMC, dMC, fMC, f, chunk_size, abs_phase=False)
 
-    return (
-        np.mean(HMC, dtype=complex, axis=1),
-        np.cov(np.vstack((np.real(HMC), np.imag(HMC))), rowvar=True),
-    )
 
-
-def sos_absphase(S, d, f0, uS, ud, uf0, f, runs=10000):
+def sos_absphase(S, d, f0, uS, ud, uf0, f, runs=10000, chunk_size=None):
     """Propagation of uncertainty from physical parameters to amplitude and phase
 
     Propagation of uncertainties from physical parameters to amplitude and phase of
@@ -171,6 +168,10 @@ def sos_absphase(S, d, f0, uS, ud, uf0, f, runs=10000):
         frequency values at which to calculate amplitude and phase
     runs : int, optional
         number of Monte Carlo runs
+    chunk_size : int, optional
+        number of Monte Carlo runs for which the frequency responses are evaluated
+        at once, such that only the values of one chunk are kept in memory. Defaults
+        to all runs at once.
 
     Returns
     -------
@@ -185,9 +186,33 @@ def sos_absphase(S, d, f0, uS, ud, uf0, f, runs=10000):
     dMC = white_gaussian(runs, d, ud)
     fMC = white_gaussian(runs, f0, uf0)
 
-    HMC = sos_FreqResp(SMC, dMC, fMC, f)
-
-    return (
-        np.mean(HMC, dtype=complex, axis=1),
-        np.cov(np.vstack((np.abs(HMC), ua(HMC))), rowvar=True),
-    )
+    return _propagate_sos_monte_carlo(SMC, dMC, fMC, f, chunk_size, abs_phase=True)
+
+
+def _propagate_sos_monte_carlo(SMC, dMC, fMC, f, chunk_size, abs_phase):
+    """Mean frequency response and covariance of its real and imaginary parts or of
+    its amplitude and phase for the drawn parameter sets evaluated chunk by chunk"""
+    runs = len(SMC)
+    chunk_size = runs if chunk_size is None else int(chunk_size)
+    H_sum = np.zeros(len(f), dtype=complex)
+    n_samples, mean, scatter_matrix = 0, np.zeros(2 * len(f)), 0.0
+    for chunk_start in range(0, runs, chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        HMC = sos_FreqResp(SMC[chunk], dMC[chunk], fMC[chunk], f)
+        H_sum += np.sum(HMC, axis=1)
+        if abs_phase:
+            # The phases are unwrapped along the runs, so the unwrapping continues
+            # from the last run of the previous chunk.
+            if chunk_start == 0:
+                phases = ua(HMC)
+            else:
+                phases = np.unwrap(np.c_[last_phases, np.angle(HMC)])[:, 1:]
+            last_phases = phases[:, -1:]
+            samples = np.vstack((np.abs(HMC), phases))
+        else:
+            samples = np.vstack((np.real(HMC), np.imag(HMC)))
+        n_samples, mean, scatter_matrix = _update_mean_and_scatter_matrix(
+            n_samples, mean, scatter_matrix, samples.T
+        )
+
+    return H_sum / runs, scatter_matrix / (runs - 1)
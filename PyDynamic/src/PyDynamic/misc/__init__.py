@@ -43,6 +43,8 @@ __all__ = [
     "separate_real_imag_of_mc_samples",
     "separate_real_imag_of_vector",
     "complex_2_real_imag",
+    "ToeplitzCovariance",
+    "BandedCovariance",
 ]
 
 from .filterstuff import (
@@ -56,6 +58,7 @@ from .filterstuff import (
 from .impinvar import impinvar
 from .noise import ARMA
 from .SecondOrderSystem import sos_absphase, sos_FreqResp, sos_phys2filter, sos_realimag
+from .structured_covariance import BandedCovariance, ToeplitzCovariance
 from .testsignals import (
     corr_noise,
     GaussianPulse,
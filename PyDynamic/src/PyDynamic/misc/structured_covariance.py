@@ -0,0 +1,202 @@
+"""Compact representations of structured covariance matrices
+
+Covariance matrices of long, stationary or short-correlated signals are mostly
+zero or repeat the same few values over and over again. Storing them densely
+requires memory quadratic in the signal length. The classes in this module
+store only the non-redundant part and thus scale linearly in the signal length.
+
+This module contains the following classes:
+
+* :class:`ToeplitzCovariance`: Symmetric Toeplitz covariance matrix given by its
+  generator, i.e. the one-sided autocovariance of a stationary signal
+* :class:`BandedCovariance`: Symmetric banded covariance matrix given by its
+  upper diagonals
+"""
+
+__all__ = ["ToeplitzCovariance", "BandedCovariance"]
+
+from typing import Union
+
+import numpy as np
+from scipy.linalg import toeplitz
+
+
+class ToeplitzCovariance:
+    """Symmetric Toeplitz covariance matrix represented by its generator
+
+    Parameters
+    ----------
+    generator : np.ndarray of shape (L,)
+        first row of the covariance matrix, i.e. ``generator[k]`` is the covariance
+        between any two values ``k`` samples apart; entries beyond the generator's
+        length are assumed to be zero
+    size : int, optional
+        number of rows and columns of the represented matrix, defaults to the
+        generator's length
+    """
+
+    def __init__(self, generator: np.ndarray, size: int = None):
+        generator = np.asarray(generator, dtype=float)
+        if generator.ndim != 1 or len(generator) == 0:
+            raise ValueError(
+                "ToeplitzCovariance: generator is expected to be a non-empty vector, "
+                f"but is of shape {generator.shape}."
+            )
+        self._size = len(generator) if size is None else int(size)
+        self._generator = np.trim_zeros(generator[: self._size], trim="b")
+        if len(self._generator) == 0:
+            self._generator = np.zeros(1)
+
+    @property
+    def generator(self) -> np.ndarray:
+        """First row of the covariance matrix without trailing zeros"""
+        return self._generator
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the represented covariance matrix"""
+        return self._size, self._size
+
+    @property
+    def bandwidth(self) -> int:
+        """Number of non-zero upper diagonals above the main diagonal"""
+        return len(self._generator) - 1
+
+    def diagonal(self) -> np.ndarray:
+        """Main diagonal of the represented covariance matrix"""
+        return np.full(self._size, self._generator[0])
+
+    def roll(self, shift: int) -> "ToeplitzCovariance":
+        """Roll the underlying values by shift samples like :func:`numpy.roll`
+
+        A stationary covariance is invariant under shifts, so the generator is kept.
+        Only the correlations at the point where the rolling wraps around differ from
+        the circularly rolled dense matrix.
+        """
+        return ToeplitzCovariance(self._generator, size=self._size)
+
+    def to_banded(self) -> "BandedCovariance":
+        """Convert into band storage"""
+        return BandedCovariance(
+            np.repeat(self._generator[:, np.newaxis], self._size, axis=1)
+        )
+
+    def to_dense(self) -> np.ndarray:
+        """Expand into a dense covariance matrix of shape :attr:`shape`"""
+        first_row = np.zeros(self._size)
+        first_row[: len(self._generator)] = self._generator
+        return toeplitz(first_row)
+
+
+class BandedCovariance:
+    """Symmetric banded covariance matrix represented by its upper diagonals
+
+    Parameters
+    ----------
+    bands : np.ndarray of shape (bandwidth + 1, N)
+        ``bands[k, i]`` holds the covariance between the values ``i`` and ``i + k``,
+        i.e. the ``k``-th upper diagonal of the represented matrix of shape (N, N)
+        starting at its first row. The last ``k`` entries of ``bands[k]`` lie outside
+        the matrix and are ignored.
+    """
+
+    def __init__(self, bands: np.ndarray):
+        bands = np.array(bands, dtype=float, ndmin=2)
+        if bands.ndim != 2:
+            raise ValueError(
+                "BandedCovariance: bands are expected to be two-dimensional, but are "
+                f"of shape {bands.shape}."
+            )
+        size = bands.shape[1]
+        bands = bands[:size]
+        for k in range(1, len(bands)):
+            bands[k, size - k :] = 0.0
+        self._bands = bands
+
+    @classmethod
+    def from_dense(cls, matrix: np.ndarray, bandwidth: int = None):
+        """Extract the band storage from a dense, symmetric covariance matrix
+
+        Parameters
+        ----------
+        matrix : np.ndarray of shape (N, N)
+            dense covariance matrix
+        bandwidth : int, optional
+            number of upper diagonals to keep, defaults to the number of upper
+            diagonals containing non-zero entries
+
+        Returns
+        -------
+        BandedCovariance
+            the band storage of the upper triangle of matrix
+        """
+        size = len(matrix)
+        if bandwidth is None:
+            rows, columns = np.nonzero(np.triu(matrix))
+            bandwidth = int(np.max(columns - rows, initial=0))
+        bands = np.zeros((min(bandwidth, size - 1) + 1, size))
+        for k in range(len(bands)):
+            bands[k, : size - k] = np.diagonal(matrix, offset=k)
+        return cls(bands)
+
+    @property
+    def bands(self) -> np.ndarray:
+        """Upper diagonals of the covariance matrix in band storage"""
+        return self._bands
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the represented covariance matrix"""
+        return self._bands.shape[1], self._bands.shape[1]
+
+    @property
+    def bandwidth(self) -> int:
+        """Number of upper diagonals stored above the main diagonal"""
+        return len(self._bands) - 1
+
+    def diagonal(self) -> np.ndarray:
+        """Main diagonal of the represented covariance matrix"""
+        return self._bands[0].copy()
+
+    def roll(self, shift: int) -> "BandedCovariance":
+        """Roll the underlying values by shift samples like :func:`numpy.roll`
+
+        Correlations between values at the very end and the very beginning of the
+        signal, which the rolling brings next to each other, cannot be represented in
+        band storage and are discarded.
+        """
+        return BandedCovariance(np.roll(self._bands, shift, axis=1))
+
+    def to_banded(self) -> "BandedCovariance":
+        """Return the band storage itself for a uniform interface"""
+        return self
+
+    def to_dense(self) -> np.ndarray:
+        """Expand into a dense covariance matrix of shape :attr:`shape`"""
+        size = self.shape[0]
+        dense = np.diag(self._bands[0])
+        rows = np.arange(size)
+        for k in range(1, len(self._bands)):
+            dense[rows[: size - k], rows[k:]] = self._bands[k, : size - k]
+            dense[rows[k:], rows[: size - k]] = self._bands[k, : size - k]
+        return dense
+
+
+StructuredCovariance = Union[ToeplitzCovariance, BandedCovariance]
+
+
+def is_structured_covariance(covariance) -> bool:
+    """Check if a covariance is given in one of the compact representations
+
+    Parameters
+    ----------
+    covariance : object
+        the covariance to check
+
+    Returns
+    -------
+    bool
+        True, if covariance is a :class:`ToeplitzCovariance` or a
+        :class:`BandedCovariance`, False otherwise
+    """
+    return isinstance(covariance, (ToeplitzCovariance, BandedCovariance))
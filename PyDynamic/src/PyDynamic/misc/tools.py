@@ -52,7 +52,7 @@ __all__ = [
     "separate_real_imag_of_vector",
 ]
 
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -706,3 +706,48 @@ def separate_real_imag_of_vector(vector: np.ndarray) -> List[np.ndarray]:
 
 def _vector_has_odd_length(vector: np.ndarray) -> bool:
     return len(vector) % 2 == 1
+
+
+def _update_mean_and_scatter_matrix(
+    n_samples: int, mean: np.ndarray, scatter_matrix: np.ndarray, samples: np.ndarray
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    # Update of the mean and the sum of the outer products of the deviations from the
+    # mean by a block of samples. A one-dimensional scatter_matrix holds only its
+    # diagonal.
+    block_mean = np.mean(samples, axis=0)
+    block_deviations = samples - block_mean
+    if np.ndim(scatter_matrix) == 1:
+        block_scatter_matrix = np.sum(np.square(block_deviations), axis=0)
+    else:
+        block_scatter_matrix = block_deviations.T @ block_deviations
+    return _merge_means_and_scatter_matrices(
+        n_samples, mean, scatter_matrix, len(samples), block_mean, block_scatter_matrix
+    )
+
+
+def _merge_means_and_scatter_matrices(
+    n_samples: int,
+    mean: np.ndarray,
+    scatter_matrix: np.ndarray,
+    n_other_samples: int,
+    other_mean: np.ndarray,
+    other_scatter_matrix: np.ndarray,
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    # Pairwise merge of the means and the sums of the outer products of the
+    # deviations from the mean of two disjoint sets of samples after Chan, Golub and
+    # LeVeque (1979). One-dimensional scatter matrices hold only their diagonals.
+    n_total = n_samples + n_other_samples
+    if n_total == 0:
+        return n_total, mean, scatter_matrix
+    delta = other_mean - mean
+    if np.ndim(scatter_matrix) == 1:
+        delta_scatter_matrix = np.square(delta)
+    else:
+        delta_scatter_matrix = np.outer(delta, delta)
+    mean = mean + delta * n_other_samples / n_total
+    scatter_matrix = (
+        scatter_matrix
+        + other_scatter_matrix
+        + delta_scatter_matrix * n_samples * n_other_samples / n_total
+    )
+    return n_total, mean, scatter_matrix
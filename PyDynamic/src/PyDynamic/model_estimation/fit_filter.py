@@ -18,8 +18,9 @@ This module contains the following functions:
 __all__ = ["LSFIR", "LSIIR"]
 
 import inspect
+import multiprocessing
 from enum import Enum
-from typing import cast, Optional, Tuple, Union
+from typing import cast, Iterable, Iterator, Optional, Tuple, Union
 
 import numpy as np
 import scipy.signal as dsp
@@ -27,6 +28,7 @@ from scipy.stats import multivariate_normal
 
 from ..misc.filterstuff import grpdelay, isstable, mapinside
 from ..misc.tools import (
+    _update_mean_and_scatter_matrix,
     complex_2_real_imag,
     is_2d_square_matrix,
     number_of_rows_equals_vector_dim,
@@ -48,8 +50,13 @@ def LSIIR(
     inv: Optional[bool] = False,
     UH: Optional[np.ndarray] = None,
     mc_runs: Optional[int] = 1000,
+    n_cpu: Optional[int] = 1,
+    seed: Optional[Union[int, np.random.SeedSequence]] = None,
+    return_stab_stats: Optional[bool] = False,
 ) -> Union[
+    Tuple[np.ndarray, np.ndarray, int, Union[np.ndarray, None], float, np.ndarray],
     Tuple[np.ndarray, np.ndarray, int, Union[np.ndarray, None], float],
+    Tuple[np.ndarray, np.ndarray, int, Union[np.ndarray, None], np.ndarray],
     Tuple[np.ndarray, np.ndarray, int, Union[np.ndarray, None]],
 ]:
     """Least-squares (time-discrete) IIR filter fit to frequency response or reciprocal
@@ -94,6 +101,21 @@ def LSIIR(
     mc_runs : int, optional
         Number of Monte Carlo runs (default = 1000). Only used if uncertainties
         UH are provided.
+    n_cpu : int, optional
+        Number of processes the Monte Carlo runs are distributed to (default = 1).
+        The runs are split into one fixed share per process. The normal equations
+        of the least-squares fits with the initial time delay are assembled for all
+        runs of a share at once, the stabilization iterations run by run.
+    seed : int or np.random.SeedSequence, optional
+        If provided, every share of the Monte Carlo runs draws its own samples with
+        a local :class:`numpy.random.RandomState` seeded from its own
+        :class:`numpy.random.SeedSequence` spawned from seed, such that the results
+        only depend on seed and n_cpu and the global numpy random state is left
+        untouched. By default all samples are drawn in the main process with the
+        global numpy random number generator.
+    return_stab_stats : bool, optional
+        If True (default is False), the per-run stabilization statistics are
+        returned as an additional output value.
 
     Returns
     -------
@@ -108,6 +130,11 @@ def LSIIR(
         provided or is None.
     rms : float
         The root-mean-square error of the fit. Only returned, if `return_rms == True`.
+    stab_stats : np.ndarray of shape (mc_runs,)
+        Structured array with the fields `tau` (final time delay), `stab_iters`
+        (conducted stabilization attempts) and `stable` of each Monte Carlo run or of
+        the only fit, if UH is not provided. Only returned, if
+        `return_stab_stats == True`.
 
     References
     ----------
@@ -116,12 +143,8 @@ def LSIIR(
 
     .. seealso:: :func:`PyDynamic.uncertainty.propagate_filter.IIRuncFilter`
     """
-    if _uncertainties_were_provided(UH):
-        freq_resp_to_fit = real_imag_2_complex(
-            _draw_multivariate_monte_carlo_samples(complex_2_real_imag(H), UH, mc_runs)
-        )
-    else:
-        freq_resp_to_fit, mc_runs = [H], 1
+    if not _uncertainties_were_provided(UH):
+        mc_runs = 1
 
     if verbose:
         _print_iir_welcome_msg(H, Na, Nb, UH, inv, mc_runs)
@@ -132,85 +155,67 @@ def LSIIR(
     omega = _compute_radial_freqs_equals_two_pi_times_freqs_over_sampling_freq(Fs, f)
     Ns = np.arange(0, max(Nb, Na) + 1)[:, np.newaxis]
     E = np.exp(-1j * np.dot(omega[:, np.newaxis], Ns.T))
-    as_and_bs = np.empty((mc_runs, Nb + Na + 1))
-    taus = np.empty((mc_runs,), dtype=int)
-    tau_max = tau
-    stab_iters = np.zeros((mc_runs,), dtype=int)
-    if tau == 0 and max_stab_iter == 0:
-        relevant_filters_mask = np.ones((mc_runs,), dtype=bool)
-    else:
-        relevant_filters_mask = np.zeros((mc_runs,), dtype=bool)
 
-    for mc_run in range(mc_runs):
-        b_i, a_i = _compute_actual_iir_least_squares_fit(
-            freq_resp_to_fit[mc_run], tau, omega, E, Na, Nb, inv
+    # Split the runs into one fixed share per process, which either get their
+    # frequency responses from the main process or draw them seeded on their own.
+    n_shares = max(1, min(n_cpu, mc_runs))
+    share_sizes = [len(share) for share in np.array_split(np.arange(mc_runs), n_shares)]
+    if not _uncertainties_were_provided(UH):
+        shares_freq_resps, shares_seeds = [np.atleast_2d(H)], [None]
+    elif seed is None:
+        freq_resps_to_fit = real_imag_2_complex(
+            _draw_multivariate_monte_carlo_samples(
+                complex_2_real_imag(H), UH, mc_runs
+            ).reshape(mc_runs, -1)
         )
-
-        current_stabilization_iteration_counter = 1
-        if isstable(b_i, a_i, "digital"):
-            relevant_filters_mask[mc_run] = True
-            taus[mc_run] = tau
-        else:
-            # If the filter by now is unstable we already tried once to stabilize with
-            # initial estimate of time delay and we should iterate at least once. So now
-            # we try with previously required maximum time delay to obtain stability.
-            if tau_max > tau:
-                b_i, a_i = _compute_actual_iir_least_squares_fit(
-                    freq_resp_to_fit[mc_run], tau_max, omega, E, Na, Nb, inv
-                )
-                current_stabilization_iteration_counter += 1
-
-            if isstable(b_i, a_i, "digital"):
-                relevant_filters_mask[mc_run] = True
-
-            # Set the either needed delay for reaching stability or the initial
-            # delay to start iterations.
-            taus[mc_run] = tau_max
-
-            while (
-                not relevant_filters_mask[mc_run]
-                and current_stabilization_iteration_counter < max_stab_iter
-            ):
-                (
-                    b_i,
-                    a_i,
-                    taus[mc_run],
-                    relevant_filters_mask[mc_run],
-                ) = _compute_stabilized_filter_through_time_delay_iteration(
-                    b_i,
-                    a_i,
-                    taus[mc_run],
-                    omega,
-                    E,
-                    freq_resp_to_fit[mc_run],
-                    Nb,
-                    Na,
-                    Fs,
-                    inv,
-                )
-                current_stabilization_iteration_counter += 1
-            else:
-                if taus[mc_run] > tau_max:
-                    tau_max = taus[mc_run]
-                if verbose:
-                    sos = np.sum(
-                        np.abs(
-                            (dsp.freqz(b_i, a_i, omega)[1] - freq_resp_to_fit[mc_run])
-                            ** 2
-                        )
-                    )
-                    print(
-                        f"LSIIR: Fitting{f' for MC run {mc_run}' if _uncertainties_were_provided(UH) else ''}"
-                        f" finished. Conducted "
-                        f"{current_stabilization_iteration_counter} attempts to "
-                        f"stabilize filter. "
-                        f"{'' if relevant_filters_mask[mc_run] else warn_unstable_msg} "
-                        f"Final sum of squares = {sos}"
-                    )
-
-        # Finally store stacked filter parameters.
-        as_and_bs[mc_run, :] = np.hstack((a_i[1:], b_i))
-        stab_iters[mc_run] = current_stabilization_iteration_counter
+        shares_freq_resps = np.split(freq_resps_to_fit, np.cumsum(share_sizes)[:-1])
+        shares_seeds = [None] * n_shares
+    else:
+        shares_freq_resps = [None] * n_shares
+        shares_seeds = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        ).spawn(n_shares)
+    shares_args = [
+        (
+            share_freq_resps,
+            share_seed,
+            share_size,
+            share_start,
+            H,
+            UH,
+            tau,
+            omega,
+            E,
+            Na,
+            Nb,
+            Fs,
+            inv,
+            max_stab_iter,
+            verbose,
+        )
+        for share_freq_resps, share_seed, share_size, share_start in zip(
+            shares_freq_resps,
+            shares_seeds,
+            share_sizes,
+            np.concatenate(([0], np.cumsum(share_sizes)[:-1])),
+        )
+    ]
+    if n_shares == 1:
+        shares_results = [_fit_iir_filters_to_share_of_mc_runs(*shares_args[0])]
+    else:
+        with multiprocessing.Pool(n_shares) as pool:
+            shares_results = pool.starmap(
+                _fit_iir_filters_to_share_of_mc_runs, shares_args
+            )
+    as_and_bs, taus, stab_iters, relevant_filters_mask = (
+        np.concatenate(share_results)
+        for share_results in tuple(zip(*shares_results))[:4]
+    )
+    tau_max = max(share_results[4] for share_results in shares_results)
+    b_i, a_i = as_and_bs[-1, Na:], np.hstack((1.0, as_and_bs[-1, :Na]))
+    current_stabilization_iteration_counter = int(stab_iters[-1])
 
     # If we actually ran Monte Carlo simulation we compute the resulting filter.
     if mc_runs > 1:
@@ -296,15 +301,134 @@ def LSIIR(
         if return_rms:
             appendable_return_values.append(rms)
 
+    if return_stab_stats:
+        stab_stats = np.empty(
+            (mc_runs,), dtype=[("tau", int), ("stab_iters", int), ("stable", bool)]
+        )
+        stab_stats["tau"] = taus
+        stab_stats["stab_iters"] = stab_iters
+        stab_stats["stable"] = relevant_filters_mask
+        appendable_return_values.append(stab_stats)
+
     return cast(
         Union[
+            Tuple[
+                np.ndarray, np.ndarray, int, Union[np.ndarray, None], float, np.ndarray
+            ],
             Tuple[np.ndarray, np.ndarray, int, Union[np.ndarray, None], float],
+            Tuple[np.ndarray, np.ndarray, int, Union[np.ndarray, None], np.ndarray],
             Tuple[np.ndarray, np.ndarray, int, Union[np.ndarray, None]],
         ],
         tuple(appendable_return_values),
     )
 
 
+def _fit_iir_filters_to_share_of_mc_runs(
+    freq_resps_to_fit: Union[np.ndarray, None],
+    seed_sequence: Union[np.random.SeedSequence, None],
+    mc_runs: int,
+    first_mc_run: int,
+    H: np.ndarray,
+    UH: Union[np.ndarray, None],
+    tau: int,
+    omega: np.ndarray,
+    E: np.ndarray,
+    Na: int,
+    Nb: int,
+    Fs: float,
+    inv: bool,
+    max_stab_iter: int,
+    verbose: bool,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    """Fit and stabilize the IIR filters of one share of the Monte Carlo runs
+
+    Returns the stacked filter parameters `[a[1:],b]`, the time delays, the
+    stabilization attempts and the stability of all runs of the share and the
+    maximum of the time delays required for stabilization.
+    """
+    if freq_resps_to_fit is None:
+        freq_resps_to_fit = real_imag_2_complex(
+            _draw_multivariate_monte_carlo_samples(
+                complex_2_real_imag(H),
+                UH,
+                mc_runs,
+                np.random.RandomState(seed_sequence.generate_state(4)),
+            ).reshape(mc_runs, -1)
+        )
+    warn_unstable_msg = "CAUTION - The algorithm did NOT result in a stable IIR filter!"
+    taus = np.full((mc_runs,), tau, dtype=int)
+    tau_max = tau
+    stab_iters = np.ones((mc_runs,), dtype=int)
+    bs, as_ = _compute_actual_iir_least_squares_fits(
+        freq_resps_to_fit, tau, omega, E, Na, Nb, inv
+    )
+    initially_stable_filters_mask = _are_digital_filters_stable(as_)
+    relevant_filters_mask = initially_stable_filters_mask.copy()
+    if tau == 0 and max_stab_iter == 0:
+        relevant_filters_mask[:] = True
+
+    # Only the initially unstable filters are iterated, each starting with the
+    # previously required maximum time delay to obtain stability.
+    for mc_run in np.flatnonzero(~initially_stable_filters_mask):
+        b_i, a_i = bs[mc_run], as_[mc_run]
+        current_stabilization_iteration_counter = 1
+        if tau_max > tau:
+            b_i, a_i = _compute_actual_iir_least_squares_fit(
+                freq_resps_to_fit[mc_run], tau_max, omega, E, Na, Nb, inv
+            )
+            current_stabilization_iteration_counter += 1
+
+        if isstable(b_i, a_i, "digital"):
+            relevant_filters_mask[mc_run] = True
+
+        # Set the either needed delay for reaching stability or the initial
+        # delay to start iterations.
+        taus[mc_run] = tau_max
+
+        while (
+            not relevant_filters_mask[mc_run]
+            and current_stabilization_iteration_counter < max_stab_iter
+        ):
+            (
+                b_i,
+                a_i,
+                taus[mc_run],
+                relevant_filters_mask[mc_run],
+            ) = _compute_stabilized_filter_through_time_delay_iteration(
+                b_i,
+                a_i,
+                taus[mc_run],
+                omega,
+                E,
+                freq_resps_to_fit[mc_run],
+                Nb,
+                Na,
+                Fs,
+                inv,
+            )
+            current_stabilization_iteration_counter += 1
+        if taus[mc_run] > tau_max:
+            tau_max = taus[mc_run]
+        if verbose:
+            sos = np.sum(
+                np.abs((dsp.freqz(b_i, a_i, omega)[1] - freq_resps_to_fit[mc_run]) ** 2)
+            )
+            print(
+                f"LSIIR: Fitting"
+                f"{f' for MC run {first_mc_run + mc_run}' if UH is not None else ''}"
+                f" finished. Conducted "
+                f"{current_stabilization_iteration_counter} attempts to "
+                f"stabilize filter. "
+                f"{'' if relevant_filters_mask[mc_run] else warn_unstable_msg} "
+                f"Final sum of squares = {sos}"
+            )
+        bs[mc_run], as_[mc_run] = b_i, a_i
+        stab_iters[mc_run] = current_stabilization_iteration_counter
+
+    as_and_bs = np.hstack((as_[:, 1:], bs))
+    return as_and_bs, taus, stab_iters, relevant_filters_mask, tau_max
+
+
 def _print_iir_welcome_msg(
     H: np.ndarray, Na: int, Nb: int, UH: np.ndarray, inv: bool, mc_runs: int
 ):
@@ -359,6 +483,71 @@ def _compute_actual_iir_least_squares_fit(
     return b, a
 
 
+def _compute_actual_iir_least_squares_fits(
+    Hs: np.ndarray,
+    tau: int,
+    omega: np.ndarray,
+    E: np.ndarray,
+    Na: int,
+    Nb: int,
+    inv: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Stacked version of _compute_actual_iir_least_squares_fit for the frequency
+    # responses in the rows of Hs, which assembles all normal equations at once. They
+    # are often numerically singular, such that already the rounding of the stacked
+    # assembly changes the solutions noticeably. A single fit is thus left to
+    # _compute_actual_iir_least_squares_fit to keep its result unchanged.
+    if len(Hs) == 1:
+        b, a = _compute_actual_iir_least_squares_fit(Hs[0], tau, omega, E, Na, Nb, inv)
+        return b[np.newaxis, :], a[np.newaxis, :]
+    if inv and np.any(np.all(Hs == 0, axis=-1)):
+        _compute_actual_iir_least_squares_fit(
+            Hs[np.all(Hs == 0, axis=-1)][0], tau, omega, E, Na, Nb, inv
+        )
+    Ea = E[:, 1 : Na + 1]
+    Eb = E[:, : Nb + 1]
+    e_to_the_minus_one_j_omega_tau = _compute_e_to_the_one_j_omega_tau(-omega, tau)
+    delayed_freq_resps_or_reciprs = e_to_the_minus_one_j_omega_tau * (
+        np.reciprocal(Hs) if inv else Hs
+    )
+    D = np.concatenate(
+        (
+            delayed_freq_resps_or_reciprs[..., np.newaxis] * Ea,
+            np.broadcast_to(-Eb, Hs.shape + Eb.shape[1:]),
+        ),
+        axis=-1,
+    )
+    Tmp1 = np.real(np.conj(D).transpose(0, 2, 1) @ D)
+    Tmp2 = np.real(
+        np.conj(D).transpose(0, 2, 1) @ -delayed_freq_resps_or_reciprs[..., np.newaxis]
+    )[..., 0]
+    # A stacked pseudo-inverse does not reproduce the minimum norm solutions of
+    # lstsq for numerically singular normal equations.
+    abs_ = np.array(
+        [
+            _fit_filter_coeffs_via_least_squares(Tmp1_i, Tmp2_i)
+            for Tmp1_i, Tmp2_i in zip(Tmp1, Tmp2)
+        ]
+    )
+    as_ = np.hstack((np.ones((len(Hs), 1)), abs_[:, :Na]))
+    bs = abs_[:, Na:]
+    return bs, as_
+
+
+def _are_digital_filters_stable(as_: np.ndarray) -> np.ndarray:
+    # Stacked version of isstable(b, a, "digital") for monic denominators in the rows
+    # of as_, the roots are the eigenvalues of the same companion matrices np.roots
+    # builds.
+    n_roots = as_.shape[1] - 1
+    if n_roots == 0:
+        return np.ones(len(as_), dtype=bool)
+    companion_matrices = np.zeros((len(as_), n_roots, n_roots))
+    companion_matrices[:, 0, :] = -as_[:, 1:]
+    companion_matrices[:, np.arange(1, n_roots), np.arange(n_roots - 1)] = 1.0
+    roots = np.linalg.eigvals(companion_matrices)
+    return ~np.any(np.abs(roots) > 1.0, axis=-1)
+
+
 def _compute_stabilized_filter_through_time_delay_iteration(
     b: np.ndarray,
     a: np.ndarray,
@@ -497,6 +686,7 @@ def LSFIR(
     UH: Optional[np.ndarray] = None,
     mc_runs: Optional[int] = None,
     trunc_svd_tol: Optional[float] = None,
+    mc_block_size: Optional[int] = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """Design of FIR filter as fit to freq. resp. or its reciprocal with uncertainties
 
@@ -545,6 +735,11 @@ def LSFIR(
         Lower bound for singular values to be considered for pseudo-inverse. Values
         smaller than this threshold are considered zero. Defaults to zero. Only one of
         mc_runs and trunc_svd_tol can be provided.
+    mc_block_size : int, optional
+        Number of Monte Carlo runs drawn and evaluated at once. The least-squares
+        problem is factorized once and the mean and covariance of the filter
+        coefficients are accumulated block by block, such that only the samples of
+        one block are kept in memory. Defaults to all mc_runs at once.
 
     Returns
     -------
@@ -577,7 +772,7 @@ def LSFIR(
         sampling_freq,
         weights,
     ) = _validate_and_prepare_fir_inputs(
-        Fs, H, UH, f, inv, mc_runs, trunc_svd_tol, weights
+        Fs, H, UH, f, inv, mc_runs, trunc_svd_tol, weights, mc_block_size
     )
     if verbose:
         _print_fir_welcome_msg(H, N, inv, mc_runs, propagation_method, trunc_svd_tol)
@@ -589,24 +784,29 @@ def LSFIR(
             x, delayed_freq_resp_real_imag_or_recipr
         )
         Ub_fir = None
+    elif propagation_method == _PropagationMethod.MC:
+        mc_freq_resps_real_imag_blocks = _draw_multivariate_monte_carlo_sample_blocks(
+            vector=freq_resps_real_imag,
+            covariance_matrix=UH,
+            mc_runs=mc_runs,
+            block_size=mc_block_size,
+        )
+        b_fir, Ub_fir = _fit_fir_filter_with_uncertainty_propagation_via_mc(
+            inv, mc_freq_resps_real_imag_blocks, omega, tau, x
+        )
     else:
         mc_freq_resps_real_imag = _draw_multivariate_monte_carlo_samples(
             vector=freq_resps_real_imag, covariance_matrix=UH, mc_runs=mc_runs
         )
-        if propagation_method == _PropagationMethod.MC:
-            b_fir, Ub_fir = _fit_fir_filter_with_uncertainty_propagation_via_mc(
-                inv, mc_freq_resps_real_imag, omega, tau, x
-            )
-        else:
-            b_fir, Ub_fir = _fit_fir_filter_with_uncertainty_propagation_via_svd(
-                mc_freq_resps_real_imag,
-                mc_runs,
-                omega,
-                delayed_freq_resp_real_imag_or_recipr,
-                tau,
-                trunc_svd_tol,
-                x,
-            )
+        b_fir, Ub_fir = _fit_fir_filter_with_uncertainty_propagation_via_svd(
+            mc_freq_resps_real_imag,
+            mc_runs,
+            omega,
+            delayed_freq_resp_real_imag_or_recipr,
+            tau,
+            trunc_svd_tol,
+            x,
+        )
     if verbose:
         _print_fir_result_msg(b_fir, freq_resps_real_imag, inv, omega, tau)
     return b_fir, Ub_fir
@@ -627,6 +827,7 @@ def _validate_and_prepare_fir_inputs(
     mc_runs: int,
     trunc_svd_tol: float,
     weights: np.ndarray,
+    mc_block_size: Optional[int] = None,
 ) -> Tuple[np.ndarray, np.ndarray, int, _PropagationMethod, float, np.ndarray]:
     n_freqs = len(freqs)
     two_n_freqs = 2 * n_freqs
@@ -641,6 +842,7 @@ def _validate_and_prepare_fir_inputs(
     _validate_fir_uncertainty_propagation_method_related_inputs(
         UH, inv, mc_runs, trunc_svd_tol
     )
+    _validate_mc_block_size(mc_block_size)
     propagation_method, mc_runs = _determine_fir_propagation_method(UH, mc_runs)
     return (
         freq_resps_real_imag,
@@ -807,6 +1009,14 @@ def _validate_fir_uncertainty_propagation_method_related_inputs(
         )
 
 
+def _validate_mc_block_size(mc_block_size: Union[int, None]):
+    if mc_block_size is not None and mc_block_size < 1:
+        raise ValueError(
+            f"\n{_get_first_public_caller()}: Number of Monte Carlo runs per block is "
+            f"expected to be a positive integer but mc_block_size={mc_block_size}."
+        )
+
+
 def _number_of_monte_carlo_runs_was_provided(mc_runs: Union[int, None]) -> bool:
     return bool(mc_runs)
 
@@ -898,25 +1108,48 @@ def _fit_filter_coeffs_via_least_squares(
 
 
 def _draw_multivariate_monte_carlo_samples(
-    vector: np.ndarray, covariance_matrix: np.ndarray, mc_runs: int
+    vector: np.ndarray,
+    covariance_matrix: np.ndarray,
+    mc_runs: int,
+    random_state: Optional[np.random.RandomState] = None,
 ) -> np.ndarray:
-    return multivariate_normal.rvs(mean=vector, cov=covariance_matrix, size=mc_runs)
+    return multivariate_normal.rvs(
+        mean=vector, cov=covariance_matrix, size=mc_runs, random_state=random_state
+    )
+
+
+def _draw_multivariate_monte_carlo_sample_blocks(
+    vector: np.ndarray,
+    covariance_matrix: np.ndarray,
+    mc_runs: int,
+    block_size: Optional[int] = None,
+) -> Iterator[np.ndarray]:
+    # The covariance is factorized once for all blocks in the same way as
+    # numpy.random.multivariate_normal does, such that for a given seed the
+    # concatenated blocks equal the samples drawn at once.
+    _, s, vh = np.linalg.svd(covariance_matrix)
+    colorizer = np.sqrt(s)[:, np.newaxis] * vh
+    block_size = mc_runs if block_size is None else block_size
+    for block_start in range(0, mc_runs, block_size):
+        n_samples = min(block_size, mc_runs - block_start)
+        yield np.random.standard_normal((n_samples, len(vector))) @ colorizer + vector
 
 
 def _fit_fir_filter_with_uncertainty_propagation_via_mc(
     inv: bool,
-    mc_freq_resps_real_imag: np.ndarray,
+    mc_freq_resps_real_imag_blocks: Iterable[np.ndarray],
     omega: np.ndarray,
     tau: int,
     x: np.ndarray,
 ) -> Tuple[np.ndarray, np.ndarray]:
-    mc_delayed_freq_resps_or_recipr_real_imag = (
+    mc_delayed_freq_resps_or_recipr_real_imag_blocks = (
         _compute_mc_delayed_freq_resps_or_reciprs_real_imag(
             inv, mc_freq_resps_real_imag, omega, tau
         )
+        for mc_freq_resps_real_imag in mc_freq_resps_real_imag_blocks
     )
     return _conduct_fir_uncertainty_propagation_via_mc(
-        mc_delayed_freq_resps_or_recipr_real_imag, x
+        mc_delayed_freq_resps_or_recipr_real_imag_blocks, x
     )
 
 
@@ -933,19 +1166,29 @@ def _compute_mc_delayed_freq_resps_or_reciprs_real_imag(
 
 
 def _conduct_fir_uncertainty_propagation_via_mc(
-    mc_freq_resps_real_imag: np.ndarray, x: np.ndarray
+    mc_freq_resps_real_imag_blocks: Iterable[np.ndarray], x: np.ndarray
 ) -> Tuple[np.ndarray, np.ndarray]:
-    mc_b_firs = np.array(
-        [
-            _fit_filter_coeffs_via_least_squares(x, mc_freq_resp)
-            for mc_freq_resp in mc_freq_resps_real_imag
-        ]
-    ).T
-    b_fir = np.mean(mc_b_firs, axis=1)
-    Ub_fir = np.cov(mc_b_firs, rowvar=True)
+    # The design matrix is the same for all runs, so it is factorized only once and
+    # all runs of a block are solved by one matrix product.
+    least_squares_solver = _compute_least_squares_solver(x)
+    mc_runs = 0
+    b_fir = np.zeros(x.shape[1])
+    scatter_matrix = np.zeros((x.shape[1], x.shape[1]))
+    for mc_freq_resps_real_imag in mc_freq_resps_real_imag_blocks:
+        mc_b_firs = mc_freq_resps_real_imag @ least_squares_solver.T
+        mc_runs, b_fir, scatter_matrix = _update_mean_and_scatter_matrix(
+            mc_runs, b_fir, scatter_matrix, mc_b_firs
+        )
+    Ub_fir = scatter_matrix / (mc_runs - 1)
     return b_fir, Ub_fir
 
 
+def _compute_least_squares_solver(x: np.ndarray) -> np.ndarray:
+    # Pseudo-inverse with the same cut-off for small singular values as the default
+    # of numpy.linalg.lstsq.
+    return np.linalg.pinv(x, rcond=np.finfo(x.dtype).eps * max(x.shape))
+
+
 def _fit_fir_filter_with_uncertainty_propagation_via_svd(
     mc_freq_resps_real_imag: np.ndarray,
     mc_runs: int,
@@ -1057,10 +1300,22 @@ def invLSFIR_uncMC(
     Fs: float,
     verbose: Optional[bool] = True,
     mc_runs: Optional[int] = 10000,
+    mc_block_size: Optional[int] = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """Design of FIR filter as fit to the reciprocal of a freq. resp. with uncertainties
 
     This essentially is a wrapper for a call of :func:`LSFIR` with the according
     parameter set.
     """
-    return LSFIR(H, N, f, Fs, tau, verbose=verbose, inv=True, UH=UH, mc_runs=mc_runs)
+    return LSFIR(
+        H,
+        N,
+        f,
+        Fs,
+        tau,
+        verbose=verbose,
+        inv=True,
+        UH=UH,
+        mc_runs=mc_runs,
+        mc_block_size=mc_block_size,
+    )
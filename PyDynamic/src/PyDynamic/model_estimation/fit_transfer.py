@@ -25,6 +25,7 @@ def fit_som(
     MCruns: Optional[Union[int, None]] = 10000,
     scaling: Optional[float] = 1e-3,
     verbose: Optional[bool] = False,
+    chunk_size: Optional[int] = None,
 ):
     """Fit second-order model to complex-valued frequency response
 
@@ -63,6 +64,11 @@ def fit_som(
     verbose : bool, optional
         if True a progressbar will be printed to console during the Monte Carlo
         simulations, if False nothing will be printed out, defaults to False
+    chunk_size : int, optional
+        number of Monte Carlo trials for which the least-squares fits are solved
+        at once, defaults to None, which means all trials at once. This bounds
+        only the memory of the intermediate results of the fits, the Monte Carlo
+        samples of the frequency response are still drawn for all trials at once
 
     Returns
     -------
@@ -98,6 +104,12 @@ def fit_som(
             f"type {type(MCruns)}."
         )
 
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(
+            "fit_som: chunk_size is expected to be None or a positive integer, but "
+            f"chunk_size is {chunk_size}."
+        )
+
     if isinstance(weighting, np.ndarray):
         if len(weighting) != two_n:
             raise ValueError(
@@ -156,22 +168,25 @@ def fit_som(
 
         # Apply GUM S2
         if MCruns is not None:
-            # Monte Carlo
-            MU = np.zeros((MCruns, 3))
-            for i_monte_carlo_run in range(MCruns):
-                iri = inverted_h_mc[i_monte_carlo_run, :]
-                om = 2 * np.pi * f * scaling
-                E = np.c_[np.ones(n), 2j * om, -(om**2)]
-                X = np.r_[np.real(E), np.imag(E)]
+            # Monte Carlo, where all runs share the design matrix, such that the
+            # least-squares fits of all runs are solved at once chunk by chunk
+            om = 2 * np.pi * f * scaling
+            E = np.c_[np.ones(n), 2j * om, -(om**2)]
+            X = np.r_[np.real(E), np.imag(E)]
 
-                XVX = X.T.dot(np.linalg.solve(W, X))
-                XVy = X.T.dot(np.linalg.solve(W, iri))
+            XVX = X.T.dot(np.linalg.solve(W, X))
+            # (XVX)^-1 X^T W^-1 maps the samples of all runs to their parameters
+            solver = np.linalg.solve(XVX, np.linalg.solve(W, X).T)
 
-                MU[i_monte_carlo_run, :] = np.linalg.solve(XVX, XVy)
+            chunk_size = MCruns if chunk_size is None else int(chunk_size)
+            MU = np.zeros((MCruns, 3))
+            for chunk_start in range(0, MCruns, chunk_size):
+                chunk = slice(chunk_start, chunk_start + chunk_size)
+                MU[chunk] = inverted_h_mc[chunk].dot(solver.T)
 
                 if verbose:
                     progress_bar(
-                        i_monte_carlo_run,
+                        min(chunk_start + chunk_size, MCruns) - 1,
                         MCruns,
                         prefix="Monte Carlo for fit_som() running:",
                     )
@@ -14,6 +14,7 @@ from typing import Optional, Union
 import numpy as np
 from matplotlib.pyplot import figure, fill_between, legend, plot, xlabel, ylabel
 
+from .misc.structured_covariance import is_structured_covariance, StructuredCovariance
 from .misc.tools import (
     is_2d_matrix,
     is_2d_square_matrix,
@@ -49,12 +50,17 @@ class Signal:
         - float: constant standard uncertainty for all values
         - 1D-array: element-wise standard uncertainties
         - 2D-array: covariance matrix
+        - :class:`ToeplitzCovariance
+          <PyDynamic.misc.structured_covariance.ToeplitzCovariance>` or
+          :class:`BandedCovariance
+          <PyDynamic.misc.structured_covariance.BandedCovariance>`: compact
+          representation of the covariance matrix
     """
 
     _unit_time: str
     _unit_values: str
     _name: str
-    _uncertainty: np.ndarray
+    _uncertainty: Union[np.ndarray, StructuredCovariance]
     _standard_uncertainties: np.ndarray
     _Ts: float
     _Fs: float
@@ -67,7 +73,7 @@ class Signal:
         values: np.ndarray,
         Ts: Optional[float] = None,
         Fs: Optional[float] = None,
-        uncertainty: Optional[Union[float, np.ndarray]] = None,
+        uncertainty: Optional[Union[float, np.ndarray, StructuredCovariance]] = None,
     ):
         if len(values.shape) > 1:
             raise NotImplementedError(
@@ -135,6 +141,7 @@ class Signal:
         a: Optional[np.ndarray] = np.ones(1),
         filter_uncertainty: Optional[np.ndarray] = None,
         MonteCarloRuns: Optional[int] = 10000,
+        structured_covariance: Optional[bool] = False,
     ):
         r"""Apply digital filter (b, a) to the signal values
 
@@ -165,16 +172,32 @@ class Signal:
             number of Monte Carlo runs, defaults to 10.000, only considered for
             IIR-type filters. Otherwise :func:`FIRuncFilter
             <PyDynamic.uncertainty.propagate_filter.FIRuncFilter>` is applied directly
+        structured_covariance : bool, optional
+            if True, keep the full covariance of the filtered values in a compact
+            representation, which requires memory only linear in the signal length,
+            defaults to False. Only supported for fully certain FIR-type filters.
         """
 
         if self._is_fir_type_filter(a):
             self._values, self.uncertainty = FIRuncFilter(
-                self.values, self.uncertainty, b, Utheta=filter_uncertainty, kind="diag"
+                self.values,
+                self.uncertainty,
+                b,
+                Utheta=filter_uncertainty,
+                kind="diag",
+                return_structured_covariance=structured_covariance,
             )
         else:
+            if structured_covariance:
+                raise NotImplementedError(
+                    "Signal: structured covariances are only supported for FIR-type "
+                    "filters."
+                )
             self._values, self.uncertainty = MC(
                 self.values,
-                self.uncertainty,
+                self.uncertainty.to_dense()
+                if is_structured_covariance(self.uncertainty)
+                else self.uncertainty,
                 b,
                 a,
                 filter_uncertainty,
@@ -216,7 +239,7 @@ class Signal:
         return self._standard_uncertainties
 
     @property
-    def uncertainty(self) -> np.ndarray:
+    def uncertainty(self) -> Union[np.ndarray, StructuredCovariance]:
         """Uncertainties associated with the signal :attr:`values`
 
         Depending on the uncertainties provided during initialization, one of following
@@ -224,12 +247,24 @@ class Signal:
 
         - 1D-array: element-wise standard uncertainties
         - 2D-array: covariance matrix
+        - ToeplitzCovariance or BandedCovariance: compact covariance matrix
         """
         return self._uncertainty
 
     @uncertainty.setter
-    def uncertainty(self, value: Union[float, np.ndarray]):
-        if isinstance(value, float):
+    def uncertainty(self, value: Union[float, np.ndarray, StructuredCovariance]):
+        if is_structured_covariance(value):
+            if value.shape[0] != len(self.time):
+                raise ValueError(
+                    "Signal: if uncertainties are provided in a structured "
+                    f"representation they are expected to match the number of "
+                    f"elements of the provided time vector, but uncertainties are of "
+                    f"shape {value.shape} and time is of length {len(self.time)}. "
+                    f"Please adjust either one of them."
+                )
+            self._uncertainty = value
+            self._standard_uncertainties = np.sqrt(np.abs(value.diagonal()))
+        elif isinstance(value, float):
             self._uncertainty = np.full_like(self.values, value)
             self._standard_uncertainties = self._uncertainty
         elif isinstance(value, np.ndarray):
@@ -23,7 +23,11 @@ __all__ = [
     "AmpPhase2DFT",
     "AmpPhase2Time",
     "Time2AmpPhase",
+    "DFTPlan",
+    "get_DFT_plan",
     "FIRuncFilter",
+    "FIRuncFilter_realtime",
+    "FIR_get_initial_state",
     "IIRuncFilter",
     "IIR_get_initial_state",
     "MC",
@@ -47,7 +51,9 @@ from .propagate_DFT import (
     DFT2AmpPhase,
     DFT_deconv,
     DFT_multiply,
+    DFTPlan,
     GUM_DFT,
+    get_DFT_plan,
     GUM_iDFT,
     Time2AmpPhase,
 )
@@ -60,6 +66,12 @@ from .propagate_DWT import (
     wave_dec_realtime,
     wave_rec,
 )
-from .propagate_filter import FIRuncFilter, IIR_get_initial_state, IIRuncFilter
+from .propagate_filter import (
+    FIR_get_initial_state,
+    FIRuncFilter,
+    FIRuncFilter_realtime,
+    IIR_get_initial_state,
+    IIRuncFilter,
+)
 from .propagate_MonteCarlo import MC, SMC, UMC, UMC_generic
 from ..misc.noise import ARMA
@@ -10,6 +10,10 @@ This module contains the following functions:
   uncertainties
 * :func:`make_equidistant`: Interpolate a 1-D function equidistantly considering
   associated uncertainties
+
+The sensitivities of the interpolated values w.r.t. the original values are
+assembled as sparse matrix. For cubic interpolation the rapidly decaying
+sensitivities are truncated to a band, where they are below the rounding error.
 """
 
 __all__ = ["interp1d_unc", "make_equidistant"]
@@ -17,14 +21,23 @@ __all__ = ["interp1d_unc", "make_equidistant"]
 from typing import Optional, Tuple, Union
 
 import numpy as np
-from scipy.interpolate import BSpline, interp1d, splrep
+from scipy import sparse
+from scipy.interpolate import interp1d
+from scipy.linalg import solve_banded
+
+# sensitivities of the cubic spline to original values more than this number of
+# samples apart are neglected
+_CUBIC_SENSITIVITY_HALF_WIDTH = 20
+# number of original samples processed at once when assembling the cubic
+# sensitivities
+_CUBIC_SENSITIVITY_BLOCK_SIZE = 2**14
 
 
 def interp1d_unc(
     x_new: np.ndarray,
     x: np.ndarray,
     y: np.ndarray,
-    uy: np.ndarray,
+    uy: Optional[np.ndarray],
     kind: Optional[str] = "linear",
     copy=True,
     bounds_error: Optional[bool] = None,
@@ -32,9 +45,19 @@ def interp1d_unc(
     fill_unc: Optional[Union[float, Tuple[float, float], str]] = np.nan,
     assume_sorted: Optional[bool] = True,
     returnC: Optional[bool] = False,
+    Uy: Optional[Union[np.ndarray, sparse.spmatrix]] = None,
+    returnU: Optional[bool] = False,
 ) -> Union[
     Tuple[np.ndarray, np.ndarray, np.ndarray],
     Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, Union[np.ndarray, sparse.spmatrix]],
+    Tuple[
+        np.ndarray,
+        np.ndarray,
+        np.ndarray,
+        np.ndarray,
+        Union[np.ndarray, sparse.spmatrix],
+    ],
 ]:
     r"""Interpolate a 1-D function considering the associated uncertainties
 
@@ -54,12 +77,13 @@ def interp1d_unc(
         sorted in any order.
     x : (N,) array_like
         A 1-D array of real values.
-    y : (N,) array_like
+    y : (N,) or (..., N) array_like
         A 1-D array of real values. The length of y must be equal to the length
-        of x.
-    uy : (N,) array_like
+        of x. A stack of such arrays is interpolated at once with the sensitivities
+        computed only once.
+    uy : (N,) or (..., N) array_like or None
         A 1-D array of real values representing the standard uncertainties
-        associated with y.
+        associated with y, of the same shape as y. Can be None, if Uy is given.
     kind : str, optional
         Specifies the kind of interpolation for y as a string ('previous',
         'next', 'nearest', 'linear' or 'cubic'). Default is ‘linear’.
@@ -98,24 +122,35 @@ def interp1d_unc(
         If False, values of x can be in any order and they are sorted first. If
         True, x has to be an array of monotonically increasing values.
     returnC : bool, optional
-        If True, return sensitivity coefficients for later use. This is only
-        available for interpolation kind 'linear' and for
-        fill_unc="extrapolate" at the moment. If False sensitivity
+        If True, return sensitivity coefficients for later use. In case of
+        extrapolation this is only available for fill_unc="extrapolate" at the
+        moment. If False sensitivity
         coefficients are not returned and internal computation is
         slightly more efficient.
+    Uy : (N,N) array_like or scipy.sparse matrix, optional
+        Covariance matrix associated with a 1-D y. If given, it is used instead of
+        uy, such that correlations between the original values are taken into
+        account. A sparse (e.g. banded) matrix keeps all computations sparse.
+    returnU : bool, optional
+        If True, return the covariance matrix associated with y_new. It is a
+        scipy.sparse matrix, unless Uy is given as dense array. Only available
+        for a 1-D y and for extrapolation with fill_unc="extrapolate".
 
     Returns
     -------
     x_new : (M,) array_like
         values at which the interpolant is evaluated
-    y_new : (M,) array_like
+    y_new : (M,) or (..., M) array_like
         interpolated values
-    uy_new : (M,) array_like
+    uy_new : (M,) or (..., M) array_like
         interpolated associated standard uncertainties
     C : (M,N) array_like
         sensitivity matrix :math:`C`, which is used to compute the uncertainties
         :math:`U_{y_{new}} = C \cdot \operatorname{diag}(u_y^2) \cdot C^T`,
-        only returned if returnC is False, which is the default behaviour.
+        only returned if returnC is True.
+    U_y_new : (M,M) scipy.sparse matrix or array_like
+        covariance matrix :math:`U_{y_{new}} = C \cdot U_y \cdot C^T`, only returned
+        if returnU is True.
 
     References
     ----------
@@ -126,21 +161,37 @@ def interp1d_unc(
     # ----------------------------------------------------------------------------------
     x = np.array(x, copy=copy)
     y = np.array(y, copy=copy)
+    if Uy is not None:
+        # Check the covariance before it is needed to replace uy.
+        if y.ndim != 1 or Uy.shape != (len(y), len(y)):
+            raise ValueError(
+                "interp1d_unc: The covariance matrix Uy is expected to be of shape "
+                f"(N, N) for a 1-D array y of N values, but we have y.shape = "
+                f"{y.shape} and Uy.shape = {Uy.shape}."
+            )
+        uy = np.sqrt(np.abs(Uy.diagonal()))
     uy = np.array(uy, copy=copy)
 
     if not assume_sorted:
         ind = np.argsort(x)
         x = x[ind]
-        y = np.take(y, ind)
-        uy = np.take(uy, ind)
+        y = np.take(y, ind, axis=-1)
+        uy = np.take(uy, ind, axis=-1)
+        if Uy is not None:
+            Uy = Uy[ind][:, ind]
     # ----------------------------------------------------------------------------------
     # Check for proper dimensions of inputs which are not checked as desired by SciPy.
-    if not len(y) == len(uy):
+    if returnU and y.ndim != 1:
+        raise ValueError(
+            "interp1d_unc: The covariance matrix associated with y_new can only be "
+            f"returned for a 1-D array y, but we have y.shape = {y.shape}."
+        )
+    if not y.shape == uy.shape:
         raise ValueError(
             "interp1d_unc: Array of associated measurement values' uncertainties are "
             "expected to be of the same length as the array of measurement values, "
-            f"but we have len(y) = {len(y)} and len(uy) = {len(uy)}. Please "
-            f"provide an array of {len(y)} standard uncertainties."
+            f"but we have len(y) = {y.shape[-1]} and len(uy) = {uy.shape[-1]}. Please "
+            f"provide an array of {y.shape[-1]} standard uncertainties."
         )
 
     # Set up parameter dicts for calls of interp1d. We use it for interpolating the
@@ -159,11 +210,11 @@ def interp1d_unc(
         # but the linear case we set those explicitly to boundary values of y and uy
         # respectively but handle those cases separately.
         if fill_value == "extrapolate":
-            fill_value = y[0], y[-1]
+            fill_value = y[..., 0], y[..., -1]
 
         if fill_unc == "extrapolate":
-            fill_unc = uy[0], uy[-1]
-        elif bounds_error is not None and returnC:
+            fill_unc = uy[..., 0], uy[..., -1]
+        elif bounds_error is not None and (returnC or returnU):
             # This means bounds_error is intentionally set to False and we want to
             # extrapolate uncertainties with custom values. Additionally the sensitivity
             # coefficients shall be returned. This is not yet possible, because in this
@@ -183,31 +234,33 @@ def interp1d_unc(
     interp_y = interp1d(x, y, fill_value=fill_value, **interp1d_params)
     y_new = interp_y(x_new)
 
-    if kind in ("previous", "next", "nearest"):
-        if returnC:
-            raise NotImplementedError(
-                "interp1d_unc: Returning the sensitivity matrix for now is only "
-                "supported for interpolation types other than 'previous', 'next' and "
-                "'nearest'. Get in touch with us, if you need this to discuss how to "
-                "proceed."
-            )
+    if kind not in ("previous", "next", "nearest", "linear", "cubic"):
+        raise NotImplementedError(
+            f"interp1d_unc: The kind of interpolation '{kind}' is unsupported yet. Let "
+            f"us know, that you need it."
+        )
+
+    # Calculate boolean arrays of indices from t_new which are outside t's bounds...
+    extrap_range_below = x_new < np.min(x)
+    extrap_range_above = x_new > np.max(x)
+    extrap_range = extrap_range_below | extrap_range_above
+    # .. and inside t's bounds.
+    interp_range = ~extrap_range
+
+    # The sensitivities are only required, if the uncertainties cannot be looked up.
+    if kind in ("linear", "cubic") or Uy is not None or returnC or returnU:
+        C = _sensitivity_matrix(
+            x_new, x, kind, interp_range, extrap_range_below, extrap_range_above
+        )
+
+    if kind in ("previous", "next", "nearest") and Uy is None:
         # Look up uncertainties.
         interp_uy = interp1d(x, uy, fill_value=fill_unc, **interp1d_params)
         uy_new = interp_uy(x_new)
-    elif kind in ("linear", "cubic"):
-        # Calculate boolean arrays of indices from t_new which are outside t's bounds...
-        extrap_range_below = x_new < np.min(x)
-        extrap_range_above = x_new > np.max(x)
-        extrap_range = extrap_range_below | extrap_range_above
-        # .. and inside t's bounds.
-        interp_range = ~extrap_range
-
+    else:
         # Initialize the result array for the standard uncertainties.
         uy_new = np.empty_like(y_new)
 
-        # Initialize the sensitivity matrix of shape (M, N).
-        C = np.zeros((len(x_new), len(uy)), "float64")
-
         # First extrapolate the according values if required and then
         # compute interpolated uncertainties following White, 2017.
 
@@ -217,124 +270,263 @@ def interp1d_unc(
             # a 2-tuple of floats. In case we have one float we set uy_new to this value
             # inside the extrapolation range.
             if isinstance(fill_unc, float):
-                uy_new[extrap_range] = fill_unc
+                uy_new[..., extrap_range] = fill_unc
             else:
                 # Now fill_unc should be a 2-tuple, which we can fill into uy_new.
-                uy_new[extrap_range_below], uy_new[extrap_range_above] = fill_unc
-
-            # In each row of C corresponding to an extrapolation value below the
-            # original range set the first column to 1 and in each row of C
-            # corresponding to an extrapolation value above the original range set
-            # the last column to 1. It is important to do this before
-            # interpolating, because in general those two columns can contain
-            # non-zero values in the interpolation range.
-            C[:, 0], C[:, -1] = extrap_range_below, extrap_range_above
+                uy_new[..., extrap_range_below] = np.expand_dims(fill_unc[0], -1)
+                uy_new[..., extrap_range_above] = np.expand_dims(fill_unc[1], -1)
 
         # If interpolation is needed, compute uncertainties following White, 2017.
         if np.any(interp_range):
-
-            if kind == "linear":
-                # This following section is taken mainly from
-                # scipy.interpolate.interp1d to determine the indices of the relevant
-                # original x values just for the interpolation range.
-                # ----------------------------------------------------------------------
-                # 2. Find where in the original data, the values to interpolate
-                #    would be inserted.
-                #    Note: If x_new[n] == x[m], then m is returned by searchsorted.
-                x_new_indices = np.searchsorted(x, x_new[interp_range])
-
-                # 3. Clip x_new_indices so that they are within the range of
-                #    self.x indices and at least 1.  Removes mis-interpolation
-                #    of x_new[n] = x[0]
-                x_new_indices = x_new_indices.clip(1, len(x) - 1).astype(int)
-
-                # 4. Calculate the slope of regions that each x_new value falls in.
-                lo = x_new_indices - 1
-                hi = x_new_indices
-
-                x_lo = x[lo]
-                x_hi = x[hi]
-                # --------------------------------------------------------------------------
-                # Prepare the sensitivity coefficients, which in the first place
-                # inside the interpolation range are the Lagrangian polynomials. We
-                # compute the Lagrangian polynomials for all interpolation nodes
-                # inside the original range.
-                L_1 = (x_new[interp_range] - x_hi) / (x_lo - x_hi)
-                L_2 = (x_new[interp_range] - x_lo) / (x_hi - x_lo)
-
-                # Create iterators needed to efficiently fill our sensitivity matrix
-                # in the rows corresponding to interpolation range.
-                lo_it = iter(lo)
-                hi_it = iter(hi)
-                L_1_it = iter(L_1)
-                L_2_it = iter(L_2)
-
-                # In each row of C set the column with the corresponding
-                # index in lo to L_1 and the column with the corresponding
-                # index in hi to L_2.
-                for index, C_row in enumerate(C):
-                    if interp_range[index]:
-                        C_row[next(lo_it)] = next(L_1_it)
-                        C_row[next(hi_it)] = next(L_2_it)
+            C_interp = C[np.flatnonzero(interp_range)]
+            if Uy is None:
                 # Compute the standard uncertainties avoiding to build the sparse
                 # covariance matrix diag(u_y^2). We reduce the equation
-                # C diag(u_y^2) C^T for now to a more efficient calculation, which
-                # will work as long as we deal with uncorrelated values, so that
-                # all information can be found on the diagonal of the covariance
-                # and thus the result matrix.
+                # C diag(u_y^2) C^T to a more efficient calculation, which works as
+                # long as we deal with uncorrelated values, so that all information
+                # can be found on the diagonal of the covariance and thus the result
+                # matrix. For the cubic case this is eq. (19) of White2017.
+                uy_new[..., interp_range] = np.sqrt(
+                    (C_interp.power(2) @ np.square(uy).reshape(-1, len(x)).T).T.reshape(
+                        uy.shape[:-1] + (-1,)
+                    )
+                )
+            else:
+                # The diagonal of C Uy C^T is the row-wise sum of (C Uy) * C.
                 uy_new[interp_range] = np.sqrt(
-                    np.sum(C[interp_range] ** 2 * uy**2, 1)
+                    np.abs(
+                        np.asarray(C_interp.multiply(C_interp @ Uy).sum(axis=1)).ravel()
+                    )
                 )
 
-            elif kind == "cubic":
-                # Calculate the uncertainty by generating a spline of sensitivity
-                # coefficients. This procedure is described by eq. (19) of White2017.
-                F_is = []
-                for i in range(len(x)):
-                    x_temp = np.zeros_like(x)
-                    x_temp[i] = 1.0
-                    F_i = BSpline(*splrep(x, x_temp, k=3))
-                    F_is.append(F_i)
-
-                # Calculate sensitivity coefficients.
-                C[interp_range] = np.array([F_i(x_new[interp_range]) for F_i in F_is]).T
-                C_sqr = np.square(C[interp_range])
-
-                # if at some point time-uncertainties are of interest, White2017
-                # already provides the formulas (eq. (17))
-
-                # ut = np.zeros_like(t)
-                # ut_new = np.zeros_like(t_new)
-                # a1 = np.dot(C_sqr, np.square(uy))
-                # a2 = np.dot(
-                #     C_sqr,
-                #     np.squeeze(np.square(interp_y._spline(t, nu=1))) * np.square(ut),
-                # )
-                # a3 = np.square(np.squeeze(interp_y._spline(t_new, nu=1))) * np.square(
-                #     ut_new
-                # )
-                # uy_new[interp_range] = np.sqrt(a1 - a2 + a3)
-
-                # without consideration of time-uncertainty eq. (17) becomes
-                uy_new[interp_range] = np.sqrt(np.dot(C_sqr, np.square(uy)))
-    else:
-        raise NotImplementedError(
-            f"interp1d_unc: The kind of interpolation '{kind}' is unsupported yet. Let "
-            f"us know, that you need it."
+        # if at some point time-uncertainties are of interest, White2017
+        # already provides the formulas (eq. (17))
+
+        # ut = np.zeros_like(t)
+        # ut_new = np.zeros_like(t_new)
+        # a1 = np.dot(C_sqr, np.square(uy))
+        # a2 = np.dot(
+        #     C_sqr,
+        #     np.squeeze(np.square(interp_y._spline(t, nu=1))) * np.square(ut),
+        # )
+        # a3 = np.square(np.squeeze(interp_y._spline(t_new, nu=1))) * np.square(
+        #     ut_new
+        # )
+        # uy_new[interp_range] = np.sqrt(a1 - a2 + a3)
+
+    result = (x_new, y_new, uy_new)
+    if returnC:
+        result += (C.toarray(),)
+    if returnU:
+        if Uy is None:
+            Uy = sparse.diags(np.square(uy))
+        result += (C @ Uy @ C.T,)
+    return result
+
+
+def _sensitivity_matrix(
+    x_new: np.ndarray,
+    x: np.ndarray,
+    kind: str,
+    interp_range: np.ndarray,
+    extrap_range_below: np.ndarray,
+    extrap_range_above: np.ndarray,
+) -> sparse.csr_matrix:
+    """Assemble the sparse sensitivities of the interpolated w.r.t. the original values
+
+    Rows of values extrapolated below or above the original range get a single one in
+    the first or last column respectively.
+    """
+    rows = [np.flatnonzero(extrap_range_below), np.flatnonzero(extrap_range_above)]
+    cols = [np.zeros(len(rows[0]), int), np.full(len(rows[1]), len(x) - 1)]
+    data = [np.ones(len(rows[0])), np.ones(len(rows[1]))]
+
+    interp_rows = np.flatnonzero(interp_range)
+    x_interp = x_new[interp_range]
+    if kind in ("previous", "next", "nearest"):
+        # Look up the index of the original value each interpolated value equals.
+        interp_indices = interp1d(
+            x, np.arange(len(x)), kind=kind, copy=False, assume_sorted=True
         )
+        rows.append(interp_rows)
+        cols.append(interp_indices(x_interp).astype(int))
+        data.append(np.ones(len(interp_rows)))
+    elif kind == "linear":
+        # This following section is taken mainly from scipy.interpolate.interp1d to
+        # determine the indices of the relevant original x values just for the
+        # interpolation range.
+        # ------------------------------------------------------------------------------
+        # 2. Find where in the original data, the values to interpolate
+        #    would be inserted.
+        #    Note: If x_new[n] == x[m], then m is returned by searchsorted.
+        x_new_indices = np.searchsorted(x, x_interp)
+
+        # 3. Clip x_new_indices so that they are within the range of
+        #    self.x indices and at least 1.  Removes mis-interpolation
+        #    of x_new[n] = x[0]
+        x_new_indices = x_new_indices.clip(1, len(x) - 1).astype(int)
+
+        # 4. Calculate the slope of regions that each x_new value falls in.
+        lo = x_new_indices - 1
+        hi = x_new_indices
+
+        x_lo = x[lo]
+        x_hi = x[hi]
+        # ------------------------------------------------------------------------------
+        # The sensitivity coefficients inside the interpolation range are the
+        # Lagrangian polynomials. In each row of C the column with the corresponding
+        # index in lo is set to L_1 and the column with the corresponding index in hi
+        # is set to L_2.
+        L_1 = (x_interp - x_hi) / (x_lo - x_hi)
+        L_2 = (x_interp - x_lo) / (x_hi - x_lo)
+        rows.extend((interp_rows, interp_rows))
+        cols.extend((lo, hi))
+        data.extend((L_1, L_2))
+    else:  # kind == "cubic"
+        cubic_rows, cubic_cols, cubic_data = _cubic_spline_sensitivities(x_interp, x)
+        rows.append(interp_rows[cubic_rows])
+        cols.append(cubic_cols)
+        data.append(cubic_data)
+
+    return sparse.csr_matrix(
+        (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(len(x_new), len(x)),
+    )
+
+
+def _cubic_bspline_design_matrix(x: np.ndarray, knots: np.ndarray) -> sparse.csr_matrix:
+    """Values of the cubic B-spline basis on knots at x as sparse matrix
+
+    Equals :meth:`scipy.interpolate.BSpline.design_matrix` of SciPy 1.8 and later.
+    Each row holds the four basis functions, which do not vanish at x, computed by
+    the Cox-de Boor recursion, see algorithm A2.2 in Piegl and Tiller, The NURBS
+    Book, 1997.
+    """
+    n_basis = len(knots) - 4
+    # Index of the knot interval containing x, the last one is closed.
+    interval = np.clip(np.searchsorted(knots, x, side="right") - 1, 3, n_basis - 1)
+    values = np.zeros((len(x), 4))
+    values[:, 0] = 1.0
+    left = np.empty((len(x), 4))
+    right = np.empty((len(x), 4))
+    for j in range(1, 4):
+        left[:, j] = x - knots[interval + 1 - j]
+        right[:, j] = knots[interval + j] - x
+        saved = np.zeros(len(x))
+        for r in range(j):
+            temp = values[:, r] / (right[:, r + 1] + left[:, j - r])
+            values[:, r] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        values[:, j] = saved
+    return sparse.csr_matrix(
+        (
+            values.ravel(),
+            (interval[:, np.newaxis] + np.arange(-3, 1)).ravel(),
+            np.arange(0, 4 * len(x) + 1, 4),
+        ),
+        shape=(len(x), n_basis),
+    )
+
+
+def _cubic_spline_sensitivities(
+    x_new: np.ndarray, x: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sensitivities of the interpolating cubic spline at x_new to the values at x
 
-    if returnC:
-        return x_new, y_new, uy_new, C
-    return x_new, y_new, uy_new
+    The spline value at x_new is :math:`B_{new} A^{-1} y` with :math:`A` the
+    collocation matrix of the B-spline basis of the not-a-knot interpolating spline
+    at x and :math:`B_{new}` the basis evaluated at x_new, each of which has four
+    non-zero entries per row. Row i of :math:`C = B_{new} A^{-1}` is the i-th
+    cardinal spline of eq. (19) of White2017 evaluated at x_new.
+
+    The entries of :math:`A^{-1}` decay geometrically away from the diagonal, such
+    that only a band of half width _CUBIC_SENSITIVITY_HALF_WIDTH is computed. Its
+    columns are probed with sums of unit vectors :math:`2w+1` samples apart and the
+    banded systems are solved in overlapping blocks of _CUBIC_SENSITIVITY_BLOCK_SIZE
+    samples, so time and memory grow linearly with the number of samples.
+
+    Returns
+    -------
+    rows, cols, data : np.ndarray
+        coordinates and values of the non-zero sensitivities
+    """
+    if len(x_new) == 0:
+        return np.empty(0, int), np.empty(0, int), np.empty(0)
+    n = len(x)
+    w = min(_CUBIC_SENSITIVITY_HALF_WIDTH, n - 1)
+    n_probes = 2 * w + 1
+    knots = np.concatenate((np.full(4, x[0]), x[2:-2], np.full(4, x[-1])))
+
+    # Collocation matrix in the band storage of scipy.linalg.solve_banded.
+    A = _cubic_bspline_design_matrix(x, knots)
+    A_coo = A.tocoo()
+    lower = int(np.max(A_coo.row - A_coo.col, initial=0))
+    upper = int(np.max(A_coo.col - A_coo.row, initial=0))
+
+    # The four basis functions at each x_new, which do not vanish, start at base.
+    B_new = _cubic_bspline_design_matrix(x_new, knots)
+    base = B_new.indices[::4]
+    B_values = B_new.data.reshape(-1, 4)
+    order = np.argsort(base, kind="stable")
+
+    # Offsets of the columns of each row of C relative to base.
+    offsets = np.arange(-w, w + 4)
+    rows, cols, data = [], [], []
+    margin = w + 4
+    for block_start in range(0, n, _CUBIC_SENSITIVITY_BLOCK_SIZE):
+        block_stop = min(block_start + _CUBIC_SENSITIVITY_BLOCK_SIZE, n)
+        window_start = max(block_start - margin, 0)
+        window_stop = min(block_stop + margin, n)
+        window = np.arange(window_start, window_stop)
+
+        # Solve the banded system restricted to the window for all probes at once.
+        A_window = A[window_start:window_stop, window_start:window_stop].tocoo()
+        ab = np.zeros((lower + upper + 1, len(window)))
+        ab[upper + A_window.row - A_window.col, A_window.col] = A_window.data
+        probes = np.zeros((len(window), n_probes))
+        probes[np.arange(len(window)), window % n_probes] = 1.0
+        Z = solve_banded((lower, upper), ab, probes)
+
+        # All interpolated values with their first basis function in this block.
+        selected = order[
+            np.searchsorted(base[order], block_start) : np.searchsorted(
+                base[order], block_stop
+            )
+        ]
+        if len(selected) == 0:
+            continue
+
+        # A^{-1}[i, i + d] for |d| <= w is found in the probe of column i + d.
+        A_inv_band = np.take_along_axis(
+            Z, (window[:, np.newaxis] + offsets[: 2 * w + 1]) % n_probes, axis=1
+        )
+        C_rows = np.zeros((len(selected), len(offsets)))
+        for q in range(4):
+            C_rows[:, q : q + 2 * w + 1] += (
+                B_values[selected, q, np.newaxis]
+                * A_inv_band[base[selected] + q - window_start]
+            )
+        columns = base[selected, np.newaxis] + offsets
+        valid = (columns >= 0) & (columns < n)
+        rows.append(np.broadcast_to(selected[:, np.newaxis], columns.shape)[valid])
+        cols.append(columns[valid])
+        data.append(C_rows[valid])
+
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(data)
 
 
 def make_equidistant(
     x: np.ndarray,
     y: np.ndarray,
-    uy: np.ndarray,
+    uy: Optional[np.ndarray],
     dx: Optional[float] = 5e-2,
     kind: Optional[str] = "linear",
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    Uy: Optional[Union[np.ndarray, sparse.spmatrix]] = None,
+    returnU: Optional[bool] = False,
+) -> Union[
+    Tuple[np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, Union[np.ndarray, sparse.spmatrix]],
+]:
     r"""Interpolate a 1-D function equidistantly considering associated uncertainties
 
     Interpolate function values equidistantly and propagate uncertainties
@@ -356,14 +548,19 @@ def make_equidistant(
     y: (N,) array_like
         A 1-D array of real values. The length of y must be equal to the length
         of x.
-    uy: (N,) array_like
+    uy: (N,) array_like or None
         A 1-D array of real values representing the standard uncertainties
-        associated with y.
+        associated with y. May be None if Uy is provided.
     dx: float, optional
         desired interval length (defaults to 5e-2)
     kind : str, optional
         Specifies the kind of interpolation for y as a string ('previous',
         'next', 'nearest', 'linear' or 'cubic'). Default is ‘linear’.
+    Uy : (N, N) array_like or sparse matrix, optional
+        covariance matrix associated with y, see :func:`interp1d_unc`
+    returnU : bool, optional
+        If True, return the sparse covariance matrix associated with y_new as well,
+        see :func:`interp1d_unc`. Defaults to False.
 
     Returns
     -------
@@ -373,6 +570,8 @@ def make_equidistant(
         interpolated values
     uy_new : (M,) array_like
         interpolated associated standard uncertainties
+    U_y_new : (M, M) sparse matrix or array_like
+        covariance matrix associated with y_new, if returnU is True
 
     References
     ----------
@@ -390,4 +589,4 @@ def make_equidistant(
     if x_new[-1] > x_max:
         x_new = x_new[x_new <= x_max]
 
-    return interp1d_unc(x_new, x, y, uy, kind)
+    return interp1d_unc(x_new, x, y, uy, kind, Uy=Uy, returnU=returnU)
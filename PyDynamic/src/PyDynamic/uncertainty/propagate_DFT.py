@@ -20,6 +20,8 @@ This module contains the following functions:
 * :func:`GUM_iDFT`: GUM propagation of the squared uncertainty UF associated with
   the DFT values F through the inverse DFT
 * :func:`GUM_DFTfreq`: Return the Discrete Fourier Transform sample frequencies
+* :func:`get_DFT_plan`: Return a cached :class:`DFTPlan` with precomputed
+  sensitivities for repeated DFTs and inverse DFTs of the same length and window
 * :func:`DFT_transferfunction`: Calculation of the transfer function H = Y/X in the
   frequency domain with X being the Fourier transform
   of the system's input signal and Y that of the output signal
@@ -45,14 +47,18 @@ __all__ = [
     "AmpPhase2Time",
     "Time2AmpPhase",
     "Time2AmpPhase_multi",
+    "DFTPlan",
+    "get_DFT_plan",
 ]
 
 import warnings
-from typing import Dict, Optional, Tuple, Union
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from scipy import sparse
 
+from ..misc.structured_covariance import ToeplitzCovariance
 from ..misc.tools import (
     is_2d_matrix,
     is_vector,
@@ -62,13 +68,14 @@ from ..misc.tools import (
 
 def GUM_DFT(
     x: np.ndarray,
-    Ux: Union[np.ndarray, float],
+    Ux: Union[np.ndarray, float, ToeplitzCovariance],
     N: Optional[int] = None,
     window: Optional[np.ndarray] = None,
     CxCos: Optional[np.ndarray] = None,
     CxSin: Optional[np.ndarray] = None,
     returnC: bool = False,
     mask: Optional[np.ndarray] = None,
+    return_blocks: Optional[Sequence[str]] = None,
 ) -> Union[
     Tuple[np.ndarray, Union[Tuple[np.ndarray, np.ndarray, np.ndarray], np.ndarray]],
     Tuple[
@@ -83,13 +90,21 @@ def GUM_DFT(
     the squared uncertainty Ux associated with the time domain sequence x to
     the real and imaginary parts of the DFT of x.
 
+    If Ux is a float, a vector or a :class:`~PyDynamic.misc.ToeplitzCovariance` and
+    no sensitivities are provided or requested, the uncertainties are computed
+    without setting up the sensitivity matrices from FFTs of Ux's diagonal or
+    generator in :math:`\mathcal{O}(N \log N)` plus the size of the requested
+    output.
+
     Parameters
     ----------
-    x : np.ndarray of shape (M,)
-        vector of time domain signal values
-    Ux : np.ndarray of shape (M,) or of shape (M,M) or float
+    x : np.ndarray of shape (M,) or (..., M)
+        vector of time domain signal values or a stack of such vectors, see below
+    Ux : np.ndarray of shape (M,) or of shape (M,M) or float or ToeplitzCovariance
         covariance matrix associated with x, or vector of squared standard
-        uncertainties, or noise variance as float
+        uncertainties, or noise variance as float, or the covariance matrix of a
+        stationary signal in Toeplitz representation (not in combination with a
+        window)
     N : int, optional
         length of time domain signal for DFT; N>=len(x)
     window : np.ndarray of shape (M,), optional
@@ -103,13 +118,36 @@ def GUM_DFT(
     mask: ndarray of dtype bool, optional
         calculate DFT values and uncertainties only at those frequencies
         where mask is True
+    return_blocks : sequence of str, optional
+        if given, only the requested parts of UF are computed and returned in a dict
+        with the requested names as keys. With the blocks A, B, C of
+        ``UF = [[A, B], [B.T, C]]`` the available parts are
+
+        * ``"CC"``, ``"CS"``, ``"SS"``: the blocks A, B and C respectively
+        * ``"diagonal"``: the main diagonal of UF, i.e. the squared standard
+          uncertainties of the real and imaginary parts
+        * ``"CS_diagonal"``: the main diagonal of B, i.e. the covariances between
+          the real and the imaginary part at each frequency
+
+    If x is a stack of signals of shape (..., M), all signals are transformed at
+    once. Ux is then either shared by all signals as described above, or given for
+    every signal as array of shape (..., M) of squared standard uncertainties or of
+    shape (..., M, M) of covariance matrices. An array of shape (M, M) is always
+    taken as covariance shared by all signals, also for a stack of M signals, whose
+    individual variances are then to be given as stack of diagonal covariance
+    matrices. The sensitivities are computed only once and applied to all signals by
+    one stacked matrix product. A shared Ux is propagated only once and UF is a
+    read-only broadcast view. Neither
+    ``return_blocks`` nor ``returnC`` are supported for stacks of signals.
 
     Returns
     -------
-    F : np.ndarray
+    F : np.ndarray of shape (2K,) or (..., 2K)
         vector of complex valued DFT values or of its real and imaginary parts
-    UF : np.ndarray
-        covariance matrix associated with real and imaginary part of F
+    UF : np.ndarray or dict
+        covariance matrix associated with real and imaginary part of F, or its
+        main diagonal if Ux is a float, or the parts of it requested by
+        return_blocks
     CxCos and CxSin : Dict
         Keys are "CxCos", "CxSin" and values the respective sensitivity matrix entries
 
@@ -120,12 +158,51 @@ def GUM_DFT(
     Raises
     ------
     ValueError
-        If N < len(x)
+        If N < len(x) or return_blocks contains unknown names
+    NotImplementedError
+        If Ux is given as ToeplitzCovariance together with a window or sensitivities
     """
+    if np.ndim(x) > 1:
+        if returnC or return_blocks is not None:
+            raise NotImplementedError(
+                "GUM_DFT: return_blocks and returnC are not supported for stacks of "
+                "signals."
+            )
+        return _gum_dft_stacked(x, Ux, N, window, CxCos, CxSin, mask)
+
+    if return_blocks is not None:
+        unknown_blocks = set(return_blocks) - set(_DFT_UNCERTAINTY_BLOCKS)
+        if unknown_blocks:
+            raise ValueError(
+                f"GUM_DFT: return_blocks may only contain {_DFT_UNCERTAINTY_BLOCKS}, "
+                f"but {sorted(unknown_blocks)} were given."
+            )
+    matrix_free = (
+        isinstance(Ux, (float, ToeplitzCovariance))
+        or isinstance(Ux, np.ndarray)
+        and Ux.ndim == 1
+    ) and not (returnC or isinstance(CxCos, np.ndarray))
+    if isinstance(Ux, ToeplitzCovariance):
+        if isinstance(window, np.ndarray) or not matrix_free:
+            raise NotImplementedError(
+                "GUM_DFT: the covariance of a windowed signal is not Toeplitz anymore "
+                "and sensitivities are not set up for Toeplitz covariances, please "
+                "provide Ux as dense matrix via Ux.to_dense() instead."
+            )
+        if Ux.shape[0] != len(x):
+            raise ValueError(
+                "GUM_DFT: Ux is expected to be of the same size as x, but "
+                f"Ux is of shape {Ux.shape} and x of length {len(x)}."
+            )
+
     L = 0
     # Apply the chosen window for the application of the FFT.
     if isinstance(window, np.ndarray):
-        x, Ux = _apply_window(x, Ux, window)
+        if isinstance(Ux, np.ndarray) and Ux.ndim == 1:
+            Ux = Ux * window**2  # diagonal covariance stays diagonal
+            x = x.copy() * window
+        else:
+            x, Ux = _apply_window(x, Ux, window)
     if isinstance(N, int):
         L = N - len(x)
         if L < 0:
@@ -162,6 +239,26 @@ def GUM_DFT(
         mask = np.ones(len(F) // 2, dtype=bool)
     Nm = 2 * np.sum(mask)
 
+    if matrix_free:
+        if return_blocks is not None:
+            blocks = return_blocks
+        elif isinstance(Ux, float):
+            blocks = ("diagonal",)
+        else:
+            blocks = ("CC", "CS", "SS")
+        UF = _dft_uncertainty_matrix_free(
+            Ux, n=N - L, N=N, k=np.arange(M // 2)[mask], return_blocks=blocks
+        )
+        if return_blocks is None:
+            UF = (
+                UF["diagonal"]
+                if isinstance(Ux, float)
+                else np.block([[UF["CC"], UF["CS"]], [UF["CS"].T, UF["SS"]]])
+            )
+        if returnC:
+            return F, UF, {"CxCos": CxCos, "CxSin": CxSin}
+        return F, UF
+
     # For simplified calculation of sensitivities
     beta = 2 * np.pi * np.arange(N - L) / N
 
@@ -213,6 +310,9 @@ def GUM_DFT(
                 UFSS,
             )
 
+    if return_blocks is not None:
+        UF = _extract_dft_uncertainty_blocks(UF, return_blocks)
+
     if returnC:
         # Return sensitivities if requested.
         return F, UF, {"CxCos": CxCos, "CxSin": CxSin}
@@ -220,6 +320,229 @@ def GUM_DFT(
         return F, UF
 
 
+def _gum_dft_stacked(
+    x: np.ndarray,
+    Ux: Union[np.ndarray, float, ToeplitzCovariance],
+    N: Optional[int],
+    window: Optional[np.ndarray],
+    CxCos: Optional[np.ndarray],
+    CxSin: Optional[np.ndarray],
+    mask: Optional[np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """GUM_DFT for a stack of signals x of shape (..., M) with shared sensitivities"""
+    batch_shape, M = x.shape[:-1], x.shape[-1]
+    N = M if N is None else N
+    if N < M:
+        raise ValueError(
+            "N needs to be greater or equal than the length of x, "
+            f"but N = {N} and len(x) = {M} were given."
+        )
+    if not isinstance(mask, np.ndarray):
+        mask = np.ones(N // 2 + 1, dtype=bool)
+
+    Ux, is_variance, is_shared = _as_stacked_covariance(Ux, x)
+    if is_shared:
+        # the uncertainty propagation is the same for all signals
+        UF = GUM_DFT(x.reshape((-1, M))[0], Ux, N, window, CxCos, CxSin, mask=mask)[1]
+        UF = np.broadcast_to(UF, batch_shape + UF.shape)
+    else:
+        if isinstance(window, np.ndarray):
+            Ux = (
+                Ux * window**2
+                if is_variance
+                else window[:, np.newaxis] * Ux * window[np.newaxis, :]
+            )
+        if not isinstance(CxCos, np.ndarray) or not isinstance(CxSin, np.ndarray):
+            CxCos, CxSin = get_DFT_plan(N).forward_sensitivities
+            CxCos, CxSin = CxCos[mask, :M], CxSin[mask, :M]
+        C = np.vstack((CxCos, CxSin))
+        if is_variance:
+            UF = np.matmul(C * Ux[..., np.newaxis, :], C.T)
+        else:
+            UF = np.matmul(np.matmul(C, Ux), C.T)
+
+    if isinstance(window, np.ndarray):
+        x = x * window
+    F = np.fft.rfft(x, n=N, axis=-1)[..., mask]
+    # In real, imag format in accordance with GUM S2
+    F = np.concatenate((np.real(F), np.imag(F)), axis=-1)
+    return F, UF
+
+
+def _as_stacked_covariance(
+    U: Union[np.ndarray, float, ToeplitzCovariance, None], values: np.ndarray
+) -> Tuple[Union[np.ndarray, float, ToeplitzCovariance, None], bool, bool]:
+    """Classify the uncertainty associated with a stack of vectors
+
+    Parameters
+    ----------
+    U : np.ndarray or float or ToeplitzCovariance or None
+        uncertainty associated with values, either shared by all vectors as float,
+        ToeplitzCovariance, array of shape (n,) or of shape (n, n) or given for
+        every vector as array of shape (..., n) of the same shape as values or as
+        array of shape (..., n, n). An array of shape (n, n) is always taken as
+        shared covariance, also for a stack of n vectors.
+    values : np.ndarray of shape (..., n)
+        stack of vectors
+
+    Returns
+    -------
+    U : np.ndarray or float or ToeplitzCovariance or None
+        the unchanged uncertainty
+    is_variance : bool
+        True, if U contains only variances or no uncertainty at all
+    is_shared : bool
+        True, if U is shared by all vectors
+    """
+    n = np.shape(values)[-1]
+    if U is None or isinstance(U, (float, ToeplitzCovariance)):
+        return U, not isinstance(U, ToeplitzCovariance), True
+    if U.shape == (n, n):
+        # a square matrix is one shared covariance, even for a stack of n vectors
+        return U, False, True
+    if U.shape == np.shape(values):
+        return U, True, U.ndim == 1
+    if U.shape == (n,):
+        return U, True, True
+    if U.shape[-2:] == (n, n):
+        return U, False, U.ndim == 2
+    raise ValueError(
+        f"The uncertainties are expected to be of shape (..., {n}) or (..., {n}, "
+        f"{n}) for values of shape {np.shape(values)}, but are of shape {U.shape}."
+    )
+
+
+_DFT_UNCERTAINTY_BLOCKS = ("CC", "CS", "SS", "diagonal", "CS_diagonal")
+
+
+def _extract_dft_uncertainty_blocks(
+    UF: Union[np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    return_blocks: Sequence[str],
+) -> Dict[str, np.ndarray]:
+    """Extract the requested parts from the covariance of the real and imaginary parts
+
+    Parameters
+    ----------
+    UF : np.ndarray of shape (2K,) or (2K, 2K) or tuple of three (K, K) arrays
+        main diagonal or full covariance matrix associated with real and imaginary
+        parts or its blocks (A, B, C) such that ``UF = [[A, B], [B.T, C]]``
+    return_blocks : sequence of str
+        names of the parts of UF to extract, see :func:`GUM_DFT`
+
+    Returns
+    -------
+    dict
+        the requested parts with the requested names as keys
+    """
+    if isinstance(UF, np.ndarray) and UF.ndim == 1:
+        if set(return_blocks) - {"diagonal"}:
+            raise ValueError(
+                "GUM_DFT: for a float Ux only the diagonal of UF is computed, but "
+                f"{return_blocks} were requested."
+            )
+        return {"diagonal": UF}
+    if isinstance(UF, np.ndarray):
+        K = len(UF) // 2
+        UF = (UF[:K, :K], UF[:K, K:], UF[K:, K:])
+    blocks = dict(zip(("CC", "CS", "SS"), UF))
+    blocks["diagonal"] = np.r_[np.diag(blocks["CC"]), np.diag(blocks["SS"])]
+    blocks["CS_diagonal"] = np.diag(blocks["CS"]).copy()
+    return {name: blocks[name] for name in return_blocks}
+
+
+def _dft_uncertainty_matrix_free(
+    Ux: Union[float, np.ndarray, ToeplitzCovariance],
+    n: int,
+    N: int,
+    k: np.ndarray,
+    return_blocks: Sequence[str],
+) -> Dict[str, np.ndarray]:
+    r"""Propagate a diagonal or Toeplitz covariance through the DFT via FFTs
+
+    Denote by :math:`X_k` the DFT of the (zero-padded) signal at frequency index
+    :math:`k`. All requested parts of the covariance associated with the real and
+    imaginary parts of :math:`X_k` follow from
+
+    .. math:: P(k, l) = \sum_{j,m} U_{jm} e^{-i\omega (kj - lm)}
+
+    with :math:`\omega = 2\pi / N`, because :math:`P(k, l)` is the covariance of
+    :math:`X_k` and :math:`X_l^*` and :math:`P(k, -l)` the one of :math:`X_k` and
+    :math:`X_l`. For a diagonal U, :math:`P(k, l)` is the DFT of U's diagonal at
+    :math:`k - l`. For a Toeplitz U, the inner sums are geometric series and
+    :math:`P(k, l)` is a closed-form expression in the DFTs of the generator at
+    :math:`k` and :math:`l`.
+
+    Parameters
+    ----------
+    Ux : float or np.ndarray of shape (n,) or ToeplitzCovariance
+        noise variance, squared standard uncertainties or Toeplitz covariance
+        associated with the signal before zero-padding
+    n : int
+        length of the signal before zero-padding
+    N : int
+        length of the DFT
+    k : np.ndarray of int
+        frequency indices at which the uncertainties are requested
+    return_blocks : sequence of str
+        names of the parts of the covariance to compute, see :func:`GUM_DFT`
+
+    Returns
+    -------
+    dict
+        the requested parts with the requested names as keys
+    """
+    if isinstance(Ux, ToeplitzCovariance):
+        generator = np.zeros(n)
+        generator[: min(n, len(Ux.generator))] = Ux.generator[:n]
+        generator_dft = np.fft.fft(generator, N)
+        weighted_generator_dft = np.fft.fft(generator * (n - np.arange(n)), N)
+
+        def covariance_of_dft(k, l):
+            z = np.exp(-2j * np.pi * (k - l) / N)
+            equal = np.mod(k - l, N) == 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                P = (
+                    generator_dft[k % N]
+                    + np.conj(generator_dft[l % N])
+                    - generator[0]
+                    - z**n
+                    * (
+                        generator_dft[l % N]
+                        + np.conj(generator_dft[k % N])
+                        - generator[0]
+                    )
+                ) / (1 - z)
+            return np.where(
+                equal,
+                2 * np.real(weighted_generator_dft[k % N]) - n * generator[0],
+                P,
+            )
+
+    else:
+        diagonal_dft = np.fft.fft(np.broadcast_to(Ux, (n,)), N)
+
+        def covariance_of_dft(k, l):
+            return diagonal_dft[(k - l) % N]
+
+    def block(k, l, name):
+        P_conj, P = covariance_of_dft(k, l), covariance_of_dft(k, -l)
+        if name == "CC":
+            return np.real(P_conj + P) / 2
+        if name == "SS":
+            return np.real(P_conj - P) / 2
+        return np.imag(P - P_conj) / 2  # covariances of real and imaginary parts
+
+    blocks = {}
+    for name in return_blocks:
+        if name == "diagonal":
+            blocks[name] = np.r_[block(k, k, "CC"), block(k, k, "SS")]
+        elif name == "CS_diagonal":
+            blocks[name] = block(k, k, "CS")
+        else:
+            blocks[name] = block(k[:, np.newaxis], k[np.newaxis, :], name)
+    return blocks
+
+
 def _apply_window(
     x: np.ndarray, Ux: Union[np.ndarray, float], window: np.ndarray
 ) -> Tuple[np.ndarray, np.ndarray]:
@@ -391,25 +714,17 @@ def GUM_iDFT(
     N_out_default = UF.shape[0] - 2
     N_out = N_out_default if Nx is None else Nx
 
-    # calculate discrete angular frequency
-    beta = 2 * np.pi * np.arange(N_out) / N_out
-
     # calculate inverse DFT
     x = np.fft.irfft(F[:N_in] + 1j * F[N_in:], n=N_out)
 
     # propagate uncertainty
     if not isinstance(Cc, np.ndarray) or not isinstance(Cs, np.ndarray):
-        k = np.arange(N_in)
-        k_beta = np.outer(beta, k)
-
-    # calculate sensitivities (scaling factor 1/N_out is accounted for at the end)
-    if not isinstance(Cc, np.ndarray):
-        Cc = np.cos(k_beta)
-        Cc = _adjust_sensitivity_matrix_to_match_irfft(Cc, N_out, N_out_default)
-
-    if not isinstance(Cs, np.ndarray):
-        Cs = -np.sin(k_beta)
-        Cs = _adjust_sensitivity_matrix_to_match_irfft(Cs, N_out, N_out_default)
+        # calculate sensitivities (scaling factor 1/N_out is accounted for at the end)
+        Cc_computed, Cs_computed = _compute_idft_sensitivities(
+            N_in, N_out, N_out_default
+        )
+        Cc = Cc_computed if not isinstance(Cc, np.ndarray) else Cc
+        Cs = Cs_computed if not isinstance(Cs, np.ndarray) else Cs
 
     # calculate blocks of uncertainty matrix
     if len(UF.shape) == 2:
@@ -433,6 +748,20 @@ def GUM_iDFT(
         return x, Ux / N_out**2
 
 
+def _compute_idft_sensitivities(
+    N_in: int, N_out: int, N_out_default: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosine and sine part of the sensitivities of the iDFT without factor 1/N_out"""
+    # calculate discrete angular frequency
+    beta = 2 * np.pi * np.arange(N_out) / N_out
+    k_beta = np.outer(beta, np.arange(N_in))
+    Cc = _adjust_sensitivity_matrix_to_match_irfft(np.cos(k_beta), N_out, N_out_default)
+    Cs = _adjust_sensitivity_matrix_to_match_irfft(
+        -np.sin(k_beta), N_out, N_out_default
+    )
+    return Cc, Cs
+
+
 def _adjust_sensitivity_matrix_to_match_irfft(C, N_out, N_out_default):
     # multiply by two because to compensate missing left side of spectrum
     C[:, 1:] *= 2
@@ -477,6 +806,154 @@ def GUM_DFTfreq(N, dt=1):
     return np.fft.rfftfreq(N, dt)
 
 
+class DFTPlan:
+    """Precomputed sensitivities for repeated DFTs of the same length and window
+
+    The cosine and sine parts of the sensitivities of :func:`GUM_DFT` and
+    :func:`GUM_iDFT` are computed once on first use and reused for all further
+    transforms, such that repeated propagations of full covariance matrices are
+    dominated by matrix products instead of evaluations of trigonometric functions.
+    Instead of instantiating plans directly, use :func:`get_DFT_plan` to reuse them
+    across calls.
+
+    Parameters
+    ----------
+    N : int
+        length of the DFT, signals passed to :meth:`forward` are zero-padded to N
+    window : np.ndarray of shape (M,), optional
+        vector of the time domain window values applied in :meth:`forward`
+    Nx : int, optional
+        length of the result of :meth:`inverse`, defaults to N
+    """
+
+    def __init__(self, N: int, window: Optional[np.ndarray] = None, Nx: int = None):
+        self.N = int(N)
+        self.window = None if window is None else np.array(window, dtype=float)
+        self.Nx = self.N if Nx is None else int(Nx)
+        self._forward_sensitivities = None
+        self._inverse_sensitivities = None
+
+    @property
+    def forward_sensitivities(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine and sine part of the sensitivities of the DFT of length N"""
+        if self._forward_sensitivities is None:
+            k_beta = np.outer(
+                np.arange(self.N // 2 + 1), 2 * np.pi * np.arange(self.N) / self.N
+            )
+            self._forward_sensitivities = np.cos(k_beta), -np.sin(k_beta)
+        return self._forward_sensitivities
+
+    @property
+    def inverse_sensitivities(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine and sine part of the sensitivities of the iDFT of length Nx"""
+        if self._inverse_sensitivities is None:
+            N_in = self.N // 2 + 1
+            self._inverse_sensitivities = _compute_idft_sensitivities(
+                N_in, self.Nx, 2 * N_in - 2
+            )
+        return self._inverse_sensitivities
+
+    def forward(
+        self, x: np.ndarray, Ux: Union[np.ndarray, float, ToeplitzCovariance]
+    ) -> Tuple[np.ndarray, Union[np.ndarray, Dict[str, np.ndarray]]]:
+        """DFT of x with propagation of uncertainty as :func:`GUM_DFT`
+
+        Parameters
+        ----------
+        x : np.ndarray of shape (M,)
+            vector of time domain signal values with M <= N
+        Ux : np.ndarray of shape (M,) or of shape (M,M) or float or ToeplitzCovariance
+            uncertainties associated with x as accepted by :func:`GUM_DFT`
+
+        Returns
+        -------
+        F : np.ndarray
+            vector of real and imaginary parts of the DFT of x
+        UF : np.ndarray
+            covariance matrix associated with F, or its main diagonal if Ux is a
+            float
+        """
+        if isinstance(Ux, np.ndarray) and Ux.ndim == 2:
+            CxCos, CxSin = self.forward_sensitivities
+            return GUM_DFT(
+                x,
+                Ux,
+                N=self.N,
+                window=self.window,
+                CxCos=CxCos[:, : len(x)],
+                CxSin=CxSin[:, : len(x)],
+            )
+        # diagonal and Toeplitz covariances are propagated without sensitivities
+        return GUM_DFT(x, Ux, N=self.N, window=self.window)
+
+    def inverse(self, F: np.ndarray, UF: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Inverse DFT of F with propagation of uncertainty as :func:`GUM_iDFT`
+
+        Parameters
+        ----------
+        F : np.ndarray of shape (2 * (N // 2 + 1),)
+            vector of real and imaginary parts of a DFT result of length N
+        UF : np.ndarray of shape (2 * (N // 2 + 1),) or (2 * (N // 2 + 1),) * 2
+            covariance matrix associated with F or its main diagonal
+
+        Returns
+        -------
+        x : np.ndarray of shape (Nx,)
+            vector of time domain signal values
+        Ux : np.ndarray of shape (Nx, Nx)
+            covariance matrix associated with x
+        """
+        if len(F) != 2 * (self.N // 2 + 1):
+            raise ValueError(
+                f"DFTPlan.inverse: F is expected to be of length "
+                f"{2 * (self.N // 2 + 1)} for a DFT of length {self.N}, but is of "
+                f"length {len(F)}."
+            )
+        Cc, Cs = self.inverse_sensitivities
+        return GUM_iDFT(F, UF, Nx=self.Nx, Cc=Cc, Cs=Cs)
+
+
+_DFT_PLAN_CACHE_SIZE = 8
+_dft_plan_cache: "OrderedDict[tuple, DFTPlan]" = OrderedDict()
+
+
+def get_DFT_plan(
+    N: int, window: Optional[np.ndarray] = None, Nx: Optional[int] = None
+) -> DFTPlan:
+    """Return a DFT plan from a bounded least-recently-used cache
+
+    Plans are identified by N, the window values and Nx. If no matching plan is
+    cached, a new one is created and, if the cache is full, the least recently used
+    plan is discarded.
+
+    Parameters
+    ----------
+    N : int
+        length of the DFT
+    window : np.ndarray of shape (M,), optional
+        vector of the time domain window values
+    Nx : int, optional
+        length of the result of the inverse DFT, defaults to N
+
+    Returns
+    -------
+    DFTPlan
+        the plan for the given DFT and inverse DFT
+    """
+    key = (
+        int(N),
+        None if window is None else np.asarray(window, dtype=float).tobytes(),
+        int(N) if Nx is None else int(Nx),
+    )
+    if key in _dft_plan_cache:
+        _dft_plan_cache.move_to_end(key)
+    else:
+        _dft_plan_cache[key] = DFTPlan(N, window=window, Nx=Nx)
+        while len(_dft_plan_cache) > _DFT_PLAN_CACHE_SIZE:
+            _dft_plan_cache.popitem(last=False)
+    return _dft_plan_cache[key]
+
+
 def DFT2AmpPhase(
     F: np.ndarray,
     UF: np.ndarray,
@@ -930,11 +1407,17 @@ def DFT_deconv(
     This function returns the covariance matrix as a tuple of blocks if too large for
     complete storage in memory.
 
+    H and Y may be stacks of shape (..., 2M) of several frequency responses and
+    spectra which broadcast against each other. UH and UY are then either shared by
+    all of them or given for each of them as array of shape (..., 2M) or
+    (..., 2M, 2M) and the result is of shape (..., 2M) and (..., 2M, 2M). An array of
+    shape (2M, 2M) is always taken as covariance shared by all of them.
+
     Parameters
     ----------
-    H : np.ndarray of shape (2M,)
+    H : np.ndarray of shape (2M,) or (..., 2M)
         real and imaginary parts of frequency response values (M an even integer)
-    Y : np.ndarray of shape (2M,)
+    Y : np.ndarray of shape (2M,) or (..., 2M)
         real and imaginary parts of DFT values
     UH : np.ndarray of shape (2M,2M) or (2M,)
         full covariance or diagonal of the covariance matrix associated with H
@@ -943,7 +1426,7 @@ def DFT_deconv(
 
     Returns
     -------
-    X : np.ndarray of shape (2M,)
+    X : np.ndarray of shape (2M,) or (..., 2M)
         real and imaginary parts of DFT values of deconv result
     UX : np.ndarray of shape (2M,2M) or 3-tuple of np.ndarray of shape (M,M)
         Covariance matrix associated with real and imaginary part of X. If the matrix
@@ -961,6 +1444,9 @@ def DFT_deconv(
     ValueError
         If dimensions of H, Y, UY and UH do not match accordingly.
     """
+    if np.ndim(H) > 1 or np.ndim(Y) > 1:
+        return _dft_deconv_stacked(H, Y, UH, UY)
+
     if len(H) != len(Y):
         raise ValueError(
             f"The dimensions of H and Y are expected to match but H is of length "
@@ -1086,6 +1572,103 @@ def _matprod(
         )
 
 
+def _dft_deconv_stacked(
+    H: np.ndarray, Y: np.ndarray, UH: np.ndarray, UY: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """DFT_deconv for stacks of frequency responses and spectra"""
+    if H.shape[-1] != Y.shape[-1]:
+        raise ValueError(
+            f"The dimensions of H and Y are expected to match but H is of length "
+            f"{H.shape[-1]} and Y is of length {Y.shape[-1]}."
+        )
+    K = H.shape[-1] // 2
+    rH, iH = H[..., :K], H[..., K:]
+    rY, iY = Y[..., :K], Y[..., K:]
+
+    Xc = (rY + 1j * iY) / (rH + 1j * iH)
+    X = np.concatenate((np.real(Xc), np.imag(Xc)), axis=-1)
+
+    # sensitivities of real and imaginary part of X w.r.t. those of Y and H
+    norm = rH**2 + iH**2
+    RY = (rH / norm, iH / norm)
+    IY = (-iH / norm, rH / norm)
+    RH = (
+        (-rY * rH**2 + rY * iH**2 - 2 * iY * iH * rH) / norm**2,
+        (iY * rH**2 - iY * iH**2 - 2 * rY * rH * iH) / norm**2,
+    )
+    IH = (
+        (-iY * rH**2 + iY * iH**2 + 2 * rY * iH * rH) / norm**2,
+        (-rY * rH**2 + rY * iH**2 - 2 * iY * rH * iH) / norm**2,
+    )
+    UX = _propagate_stacked_complex_jacobian(UY, Y, RY, IY) + (
+        _propagate_stacked_complex_jacobian(UH, H, RH, IH)
+    )
+    return X, UX
+
+
+def _propagate_stacked_complex_jacobian(
+    U: Union[np.ndarray, float],
+    values: np.ndarray,
+    R: Tuple[np.ndarray, np.ndarray],
+    I: Tuple[np.ndarray, np.ndarray],
+) -> np.ndarray:
+    """Propagate U through a frequency-wise Jacobian for stacks of spectra
+
+    Parameters
+    ----------
+    U : np.ndarray or float
+        uncertainty associated with the real and imaginary parts values as accepted
+        by :func:`_as_stacked_covariance`
+    values : np.ndarray of shape (..., 2K)
+        real and imaginary parts of the spectra U is associated with
+    R, I : tuple of two np.ndarray of shape (..., K)
+        sensitivities of the real and imaginary part of the result at each
+        frequency w.r.t. the real and the imaginary part of values at the same
+        frequency
+
+    Returns
+    -------
+    np.ndarray of shape (..., 2K, 2K)
+        covariance of the real and imaginary parts of the result
+    """
+    if isinstance(U, float):
+        U = np.full(np.shape(values)[-1], U)
+    U, is_variance, _ = _as_stacked_covariance(U, values)
+    K = np.shape(values)[-1] // 2
+    if is_variance:
+        URR, UII = U[..., :K], U[..., K:]
+
+        def matprod(V, W):
+            return _diag_stacked(V[0] * URR * W[0] + V[1] * UII * W[1])
+
+    else:
+        URR, URI, UII = U[..., :K, :K], U[..., :K, K:], U[..., K:, K:]
+
+        def matprod(V, W):
+            v1, v2 = V[0][..., :, np.newaxis], V[1][..., :, np.newaxis]
+            w1, w2 = W[0][..., np.newaxis, :], W[1][..., np.newaxis, :]
+            return (
+                v1 * URR * w1
+                + v2 * np.swapaxes(URI, -1, -2) * w1
+                + v1 * URI * w2
+                + v2 * UII * w2
+            )
+
+    URI_result = matprod(R, I)
+    return np.concatenate(
+        (
+            np.concatenate((matprod(R, R), URI_result), axis=-1),
+            np.concatenate((np.swapaxes(URI_result, -1, -2), matprod(I, I)), axis=-1),
+        ),
+        axis=-2,
+    )
+
+
+def _diag_stacked(v: np.ndarray) -> np.ndarray:
+    """Stack of diagonal matrices from a stack of vectors of shape (..., n)"""
+    return v[..., :, np.newaxis] * np.eye(v.shape[-1])
+
+
 # for backward compatibility
 GUMdeconv = DFT_deconv
 
@@ -1101,11 +1684,17 @@ def DFT_multiply(
     domain or the application of deconvolution as a multiplication with an inverse of
     known uncertainty.
 
+    Y and F may be stacks of shape (..., 2M) of several spectra which broadcast
+    against each other. UY and UF are then either shared by all of them or given for
+    each of them as array of shape (..., 2M) or (..., 2M, 2M) and the result is of
+    shape (..., 2M) and (..., 2M, 2M). An array of shape (2M, 2M) is always taken
+    as covariance shared by all of them.
+
     Parameters
     ----------
-    Y : np.ndarray of shape (2M,)
+    Y : np.ndarray of shape (2M,) or (..., 2M)
         real and imaginary parts of the first factor
-    F : np.ndarray of shape (2M,)
+    F : np.ndarray of shape (2M,) or (..., 2M)
         real and imaginary parts of the second factor
     UY : np.ndarray either of shape (2M,) or of shape (2M,2M)
         covariance matrix or squared uncertainty associated with Y
@@ -1124,6 +1713,9 @@ def DFT_multiply(
     ValueError
         If dimensions of Y and F do not match.
     """
+    if np.ndim(Y) > 1 or np.ndim(F) > 1:
+        return _dft_multiply_stacked(Y, F, UY, UF)
+
     if len(Y) != len(F):
         raise ValueError(
             f"GUM_multiply: The dimensions of Y and F are expected to match but Y is "
@@ -1188,3 +1780,24 @@ def DFT_multiply(
         # Stack together covariance matrix
         UYF = np.vstack((np.hstack((URR, URI)), np.hstack((URI.T, UII))))
     return YF, UYF
+
+
+def _dft_multiply_stacked(
+    Y: np.ndarray, F: np.ndarray, UY: np.ndarray, UF: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """DFT_multiply for stacks of spectra"""
+    if Y.shape[-1] != F.shape[-1]:
+        raise ValueError(
+            f"GUM_multiply: The dimensions of Y and F are expected to match but Y is "
+            f"of length {Y.shape[-1]} and F is of length {F.shape[-1]}."
+        )
+    K = Y.shape[-1] // 2
+    RY, IY = Y[..., :K], Y[..., K:]
+    RF, IF = F[..., :K], F[..., K:]
+    YF = np.concatenate((RY * RF - IY * IF, RY * IF + IY * RF), axis=-1)
+
+    # sensitivities of real and imaginary part of YF w.r.t. those of Y and F resp.
+    UYF = _propagate_stacked_complex_jacobian(UY, Y, (RF, -IF), (IF, RF))
+    if isinstance(UF, (np.ndarray, float)):  # both factors are uncertain
+        UYF = UYF + _propagate_stacked_complex_jacobian(UF, F, (RY, -IY), (IY, RY))
+    return YF, UYF
@@ -28,14 +28,90 @@ __all__ = [
 import numpy as np
 import pywt
 
-from .propagate_filter import IIR_get_initial_state, IIRuncFilter
+from .propagate_filter import IIR_get_initial_state
+
+
+def _fir_state_history(state):
+    """Return the previous inputs and their variances stored in an FIR filter state
+
+    For ``a = [1]`` the state of :func:`IIRuncFilter` holds the last ``p`` inputs in
+    ``z`` (oldest first) and their variances on the diagonal of ``P``.
+    """
+    return state["z"][:, 0], np.diag(state["P"]).copy()
+
+
+def _advance_fir_state(state, x_ext, Ux2_ext, n):
+    """Set the FIR filter state to where :func:`IIRuncFilter` leaves it
+
+    Parameters
+    ----------
+    state : dict
+        internal state before the ``n`` new inputs, updated in place
+    x_ext : np.ndarray
+        the ``p`` previous inputs followed by the ``n`` new inputs
+    Ux2_ext : np.ndarray
+        variances of ``x_ext``
+    n : int
+        number of new inputs
+    """
+    p = state["z"].shape[0]
+    dz = np.empty_like(state["dz"])
+    # the last row of dz receives the reversed state of every time step
+    for row in range(p):
+        step = n - p + row
+        if step >= 0:
+            dz[row] = -x_ext[step : step + p][::-1]
+        else:
+            dz[row] = state["dz"][row + n]
+    state["z"] = x_ext[len(x_ext) - p :, np.newaxis].copy()
+    state["P"] = np.diag(Ux2_ext[len(Ux2_ext) - p :])
+    state["dz"] = dz
+    return state
+
+
+def _polyphase_fir_decimate(x_ext, b, start, count):
+    """Evaluate the FIR filter ``b`` only at every second output
+
+    Computes ``y[start + 2m] = sum_k b[k] * x_ext[start + 2m + p - k]`` for
+    ``m = 0, ..., count - 1``, where ``x_ext`` starts with the ``p = len(b) - 1``
+    previous inputs. The even and odd coefficients are applied to the matching
+    phase of the input, such that each kept output costs ``len(b)`` multiplications
+    and no discarded output is computed.
+    """
+    p = len(b) - 1
+    y = np.zeros(count)
+    if count == 0:
+        return y
+    for r in range(min(2, len(b))):
+        first = start + p - r
+        phase = x_ext[first % 2 :: 2]
+        offset = first // 2
+        y += np.convolve(phase, b[r::2])[offset : offset + count]
+    return y
+
+
+def _polyphase_fir_interpolate(c_ext, b, n_hist, count):
+    """Filter the zero-upsampled sequence ``c_ext`` with ``b`` without the zeros
+
+    ``c_ext`` starts with ``n_hist`` previous coefficients. Returns the
+    ``2 * count`` outputs of filtering ``[c0, 0, c1, 0, ...]``, which are obtained
+    by filtering ``c_ext`` with the even and the odd coefficients of ``b``.
+    """
+    y = np.zeros(2 * count)
+    if count == 0:
+        return y
+    for r in range(min(2, len(b))):
+        y[r::2] = np.convolve(c_ext, b[r::2])[n_hist : n_hist + count]
+    return y
 
 
 def dwt(x, Ux, lowpass, highpass, states=None, realtime=False, subsample_start=1):
     """Apply low-pass ``lowpass`` and high-pass ``highpass`` to time-series data ``x``
 
-    The uncertainty is propagated through the transformation by using
-    :func:`PyDynamic.uncertainty.propagate_filter.IIRuncFilter`.
+    The uncertainty is propagated through the transformation in the same way as by
+    :func:`PyDynamic.uncertainty.propagate_filter.IIRuncFilter` with ``a = [1]``
+    and ``kind="diag"``. Both FIR filters are evaluated in polyphase form, such
+    that only the outputs kept by the subsampling are computed.
 
     Return the subsampled results.
 
@@ -75,6 +151,8 @@ def dwt(x, Ux, lowpass, highpass, states=None, realtime=False, subsample_start=1
         allows to continue at the last used internal state in next call
     """
 
+    Ux = np.broadcast_to(Ux, x.shape)
+
     # prolongate signals if no realtime is needed
     if not realtime:
         pad_len = lowpass.size - 1
@@ -92,19 +170,23 @@ def dwt(x, Ux, lowpass, highpass, states=None, realtime=False, subsample_start=1
             ),
         }
 
-    # propagate uncertainty through FIR-filter
-    c_approx, U_approx, states["low"] = IIRuncFilter(
-        x, Ux, lowpass, np.ones(1), Uab=None, kind="diag", state=states["low"]
-    )
-    c_detail, U_detail, states["high"] = IIRuncFilter(
-        x, Ux, highpass, np.ones(1), Uab=None, kind="diag", state=states["high"]
-    )
-
-    # subsample to half the length
-    c_approx = c_approx[subsample_start::2]
-    U_approx = U_approx[subsample_start::2]
-    c_detail = c_detail[subsample_start::2]
-    U_detail = U_detail[subsample_start::2]
+    # propagate uncertainty through FIR-filter, but only for the kept outputs
+    count = len(range(subsample_start, x.size, 2))
+    Ux2 = np.square(Ux)
+    results = []
+    for key, b in (("low", lowpass), ("high", highpass)):
+        x_hist, Ux2_hist = _fir_state_history(states[key])
+        x_ext = np.concatenate((x_hist, x))
+        Ux2_ext = np.concatenate((Ux2_hist, Ux2))
+        y = _polyphase_fir_decimate(x_ext, b, subsample_start, count)
+        Uy = np.sqrt(
+            np.abs(
+                _polyphase_fir_decimate(Ux2_ext, np.square(b), subsample_start, count)
+            )
+        )
+        states[key] = _advance_fir_state(states[key], x_ext, Ux2_ext, x.size)
+        results.extend((y, Uy))
+    c_approx, U_approx, c_detail, U_detail = results
 
     return c_approx, U_approx, c_detail, U_detail, states
 
@@ -121,6 +203,11 @@ def inv_dwt(
 ):
     """Single step of inverse discrete wavelet transform
 
+    The coefficients are upsampled by inserting zeros and filtered in polyphase
+    form, such that the inserted zeros are never multiplied. The uncertainty is
+    propagated as by :func:`PyDynamic.uncertainty.propagate_filter.IIRuncFilter`
+    with ``a = [1]`` and ``kind="diag"``.
+
     Parameters
     ----------
     c_approx : np.ndarray
@@ -155,15 +242,14 @@ def inv_dwt(
     """
 
     # upsample to double the length
-    indices = np.arange(1, c_detail.size + 1)
-    c_approx = np.insert(c_approx, indices, 0)
-    U_approx = np.insert(
-        U_approx / np.sqrt(2), indices, 0
-    )  # why is this correction necessary?
-    c_detail = np.insert(c_detail, indices, 0)
-    U_detail = np.insert(
-        U_detail / np.sqrt(2), indices, 0
-    )  # why is this correction necessary?
+    count = c_detail.size
+    if c_approx.size != count:
+        raise ValueError(
+            f"inv_dwt: c_approx and c_detail are expected to be of the same size, "
+            f"but c_approx is of size {c_approx.size} and c_detail of size {count}."
+        )
+    U_approx = U_approx / np.sqrt(2)  # why is this correction necessary?
+    U_detail = U_detail / np.sqrt(2)  # why is this correction necessary?
 
     # init states if not given
     if not states:
@@ -176,24 +262,29 @@ def inv_dwt(
         }
 
     # propagate uncertainty through FIR-filter
-    x_approx, Ux_approx, states["low"] = IIRuncFilter(
-        c_approx,
-        U_approx,
-        lowpass,
-        np.ones(1),
-        Uab=None,
-        kind="diag",
-        state=states["low"],
-    )
-    x_detail, Ux_detail, states["high"] = IIRuncFilter(
-        c_detail,
-        U_detail,
-        highpass,
-        np.ones(1),
-        Uab=None,
-        kind="diag",
-        state=states["high"],
-    )
+    results = []
+    for key, b, c, U in (
+        ("low", lowpass, c_approx, U_approx),
+        ("high", highpass, c_detail, U_detail),
+    ):
+        p = b.size - 1
+        x_hist, Ux2_hist = _fir_state_history(states[key])
+        # previous inputs at the positions of coefficients, the others are zeros
+        n_hist = p // 2
+        c_ext = np.concatenate((x_hist[p % 2 :: 2], c))
+        Uc2_ext = np.concatenate((Ux2_hist[p % 2 :: 2], np.square(U)))
+        y = _polyphase_fir_interpolate(c_ext, b, n_hist, count)
+        Uy = np.sqrt(
+            np.abs(_polyphase_fir_interpolate(Uc2_ext, np.square(b), n_hist, count))
+        )
+        # the zero-upsampled input as seen by the filter state
+        x_ext = np.zeros(p % 2 + 2 * c_ext.size)
+        x_ext[p % 2 :: 2] = c_ext
+        Ux2_ext = np.zeros_like(x_ext)
+        Ux2_ext[p % 2 :: 2] = Uc2_ext
+        states[key] = _advance_fir_state(states[key], x_ext, Ux2_ext, 2 * count)
+        results.extend((y, Uy))
+    x_approx, Ux_approx, x_detail, Ux_detail = results
 
     # add both parts
     if realtime:
@@ -15,10 +15,14 @@ This module contains the following functions:
   requirements
 """
 
+import atexit
 import functools
 import math
 import multiprocessing
+import queue
 import sys
+import traceback
+import warnings
 
 import numpy as np
 import scipy as sp
@@ -28,7 +32,11 @@ from scipy.signal import lfilter
 
 from ..misc.filterstuff import isstable
 from ..misc.noise import ARMA
-from ..misc.tools import progress_bar
+from ..misc.tools import (
+    _merge_means_and_scatter_matrices,
+    _update_mean_and_scatter_matrix,
+    progress_bar,
+)
 
 __all__ = ["MC", "SMC", "UMC", "UMC_generic"]
 
@@ -100,6 +108,8 @@ def MC(
     return_samples=False,
     shift=0,
     verbose=True,
+    blocksize=None,
+    compute_full_covariance=True,
 ):
     r"""Standard Monte Carlo method
 
@@ -107,6 +117,10 @@ def MC(
     with uncertainty matrix :math:`U_{\theta}` for
     :math:`\theta=(a_1,\ldots,a_{N_a},b_0,\ldots,b_{N_b})^T`
 
+    The Monte Carlo draws are filtered block-wise with all draws of a block at once.
+    Unless the samples are requested, mean and covariance are accumulated block by
+    block, such that only one block of results has to be kept in memory.
+
     Parameters
     ----------
     x : np.ndarray
@@ -118,18 +132,24 @@ def MC(
         filter numerator coefficients
     a : np.ndarray
         filter denominator coefficients
-    Uab : np.ndarray
-        uncertainty matrix :math:`U_\theta`
+    Uab : np.ndarray or None
+        uncertainty matrix :math:`U_\theta`, None for a fully certain filter
     runs : int,optional
         number of Monte Carlo runs
     return_samples : bool, optional
         whether samples or mean and std are returned
+    blocksize : int, optional
+        number of Monte Carlo runs to evaluate at a time, defaults to all runs at once
+    compute_full_covariance : bool, optional
+        whether to compute the full covariance matrix or just its diagonal, defaults
+        to True
 
     Returns
     -------
     y, Uy : np.ndarray
         filtered output signal and  associated uncertainties, only returned if
-        return_samples is ``False``
+        return_samples is ``False``, Uy is the covariance matrix or, if
+        compute_full_covariance is ``False``, its diagonal
     Y : np.ndarray
         array of Monte Carlo results, only returned if return_samples is ``True``
 
@@ -140,16 +160,18 @@ def MC(
 
     Na = len(a)
     runs = int(runs)
+    blocksize = runs if blocksize is None else min(int(blocksize), runs)
 
-    Y = np.zeros((runs, len(x)))  # set up matrix of MC results
     theta = np.hstack(
         (a[1:], b)
     )  # create the parameter vector from the filter coefficients
-    Theta = np.random.multivariate_normal(
-        theta, Uab, runs
-    )  # Theta is small and thus we
+    if Uab is None:
+        Theta = np.tile(theta, (runs, 1))
+    else:
+        Theta = np.random.multivariate_normal(
+            theta, Uab, runs
+        )  # Theta is small and thus we can draw the full matrix now.
 
-    # can draw the full matrix now.
     if isinstance(Ux, np.ndarray):
         if len(Ux.shape) == 1:
             dist = Normal_ZeroCorr(loc=x, scale=Ux)  # non-iid noise w/o correlation
@@ -160,42 +182,163 @@ def MC(
     else:
         raise NotImplementedError("The supplied type of uncertainty is not implemented")
 
-    unst_count = 0  # Count how often in the MC runs the IIR filter is unstable.
-    st_inds = list()
-    samples = dist.rvs(size=runs)
+    # Check in advance, which of the drawn filters are unstable.
+    BB = Theta[:, Na - 1 :]
+    AA = np.hstack((np.ones((runs, 1)), Theta[:, : Na - 1]))
+    stable = np.array([isstable(bb, aa) for bb, aa in zip(BB, AA)], dtype=bool)
+    unst_count = runs - np.count_nonzero(stable)
+
+    if return_samples:
+        Y = np.zeros((runs, len(x)))  # set up matrix of MC results
+    else:
+        # accumulators for the block-wise update of mean and covariance
+        n_stable = 0
+        y = np.zeros(len(x))
+        scatter = (
+            np.zeros((len(x), len(x))) if compute_full_covariance else np.zeros(len(x))
+        )
+
     if verbose:
         sys.stdout.write("MC progress: ")
-    for k, sample in enumerate(samples):
-        xn = sample  # draw filter input signal
+    for block_start in range(0, runs, blocksize):
+        block = slice(block_start, min(block_start + blocksize, runs))
+        block_stable = stable[block]
+
+        # draw filter input signals
+        Xn = np.reshape(dist.rvs(size=block.stop - block.start), (-1, len(x)))
         if not blow is None:
             if alow is None:
                 alow = 1.0  # FIR low-pass filter
-            xn = lfilter(blow, alow, xn)  # low-pass filtered input signal
-        bb = Theta[k, Na - 1 :]
-        aa = np.hstack((1.0, Theta[k, : Na - 1]))
-        if isstable(bb, aa):
-            Y[k, :] = lfilter(bb, aa, xn)
-            st_inds.append(k)
-        else:
-            unst_count += 1  # don't apply the IIR filter if it's unstable
-        if np.mod(k, 0.1 * runs) == 0 and verbose:
-            sys.stdout.write(" %d%%" % (np.round(100.0 * k / runs)))
+            Xn = lfilter(blow, alow, Xn, axis=1)  # low-pass filtered input signals
+
+        # don't apply the IIR filter if it's unstable
+        Y_block = np.zeros_like(Xn)
+        Y_block[block_stable] = _lfilter_stacked(
+            BB[block][block_stable], AA[block][block_stable], Xn[block_stable]
+        )
+        Y_block = np.roll(
+            Y_block, int(shift), axis=1
+        )  # correct for the (known) sample delay
+
+        if return_samples:
+            Y[block] = Y_block
+        elif np.any(block_stable):
+            n_stable, y, scatter = _update_mean_and_scatter_matrix(
+                n_stable, y, scatter, Y_block[block_stable]
+            )
+
+        if verbose:
+            sys.stdout.write(" %d%%" % (np.round(100.0 * block.stop / runs)))
     if verbose:
-        sys.stdout.write(" 100%\n")
+        sys.stdout.write("\n")
 
     if unst_count > 0:
         print("In %d Monte Carlo %d filters have been unstable" % (runs, unst_count))
         print("These results will not be considered for calculation of mean and " "std")
         print("However, if return_samples is 'True' then ALL samples are " "returned.")
 
-    Y = np.roll(Y, int(shift), axis=1)  # correct for the (known) sample delay
-
     if return_samples:
         return Y
-    else:
-        y = np.mean(Y[st_inds, :], axis=0)
-        uy = np.cov(Y[st_inds, :], rowvar=False)
-        return y, uy
+    if n_stable < 2:
+        warnings.warn(
+            f"MC: only {n_stable} of the {runs} drawn filters are stable, which is "
+            f"not enough to estimate the covariance of the output. It is returned "
+            f"as NaN{' and so is the mean' if n_stable == 0 else ''}.",
+            RuntimeWarning,
+        )
+        if n_stable == 0:
+            y = np.full_like(y, np.nan)
+        return y, np.full_like(scatter, np.nan)
+    uy = scatter / (n_stable - 1)
+    return y, uy
+
+
+def _lfilter_stacked(B, A, X):
+    """Filter each row of X with the filter given by the same row of B and A
+
+    If all rows share the same coefficients, a single call of
+    :func:`scipy.signal.lfilter` along the rows filters all signals at once. FIR
+    filters are evaluated as weighted sum of delayed signals for all rows at once.
+    IIR filters with different coefficients are evaluated block-wise for all rows at
+    once by :func:`_lfilter_stacked_iir`.
+    """
+    if len(X) == 0:
+        return X
+    B = B / A[:, :1]
+    A = A / A[:, :1]
+
+    if np.all(B == B[0]) and np.all(A == A[0]):
+        return lfilter(B[0], A[0], X, axis=1)
+
+    if np.all(A[:, 1:] == 0):
+        Y = np.zeros_like(X)
+        for k in range(min(B.shape[1], X.shape[1])):
+            Y[:, k:] += B[:, k : k + 1] * X[:, : X.shape[1] - k]
+        return Y
+
+    return _lfilter_stacked_iir(B, A, X)
+
+
+def _lfilter_stacked_iir(B, A, X):
+    """Filter each row of X with the normalized IIR filter in the same row of B and A
+
+    The signals are split into blocks of L samples. Within a block, the output of
+    each filter is the convolution of the block with its first L impulse response
+    values plus the response to the filter state at the start of the block. Both
+    are computed as matrix products for all rows and blocks at once, such that only
+    the states at the block boundaries are propagated block after block.
+    """
+    n_rows, n_samples = X.shape
+    order = max(B.shape[1], A.shape[1])
+    B = np.hstack((B, np.zeros((n_rows, order - B.shape[1]))))
+    A = np.hstack((A, np.zeros((n_rows, order - A.shape[1]))))
+    n_states = order - 1
+    L = max(1, min(16, math.isqrt(n_samples)))
+
+    # The direct form II transposed of all rows is advanced for L samples at once
+    # for a unit impulse from zero states and for zero input from each unit state.
+    B_exp = np.repeat(B, n_states + 1, axis=0)
+    A_exp = np.repeat(A, n_states + 1, axis=0)
+    x = np.tile(np.arange(n_states + 1) == 0, n_rows).astype(float)
+    Z = np.zeros((len(B_exp), order))
+    Z[:, :n_states] = np.tile(np.eye(n_states + 1, n_states, -1), (n_rows, 1))
+    responses = np.empty((len(B_exp), L))
+    impulse_states = np.empty((n_rows, n_states, L))
+    for n in range(L):
+        responses[:, n] = B_exp[:, 0] * x + Z[:, 0]
+        Z[:, :-1] = (
+            B_exp[:, 1:] * x[:, np.newaxis]
+            + Z[:, 1:]
+            - A_exp[:, 1:] * responses[:, n : n + 1]
+        )
+        x = np.zeros_like(x)
+        # the state after the block due to the input sample L - 1 - n
+        impulse_states[:, :, L - 1 - n] = Z[:: n_states + 1, :n_states]
+    responses = responses.reshape(n_rows, n_states + 1, L)
+    Z = Z.reshape(n_rows, n_states + 1, order)
+
+    # Transposed lower triangular Toeplitz matrices of the impulse responses.
+    lags = np.arange(L) - np.arange(L)[:, np.newaxis]
+    impulse_matrices = np.where(lags >= 0, responses[:, 0, np.clip(lags, 0, None)], 0.0)
+    # Outputs and states after the block due to the unit states.
+    state_responses = np.ascontiguousarray(responses[:, 1:])
+    state_transitions = np.ascontiguousarray(Z[:, 1:, :n_states])
+    input_states = np.ascontiguousarray(np.swapaxes(impulse_states, 1, 2))
+
+    n_blocks = -(-n_samples // L)
+    if n_samples % L:
+        X = np.hstack((X, np.zeros((n_rows, n_blocks * L - n_samples))))
+    X_blocks = X.reshape(n_rows, n_blocks, L)
+    Y = X_blocks @ impulse_matrices
+    block_inputs = X_blocks @ input_states
+    states = np.zeros((n_rows, n_blocks, n_states))
+    for k in range(1, n_blocks):
+        states[:, k] = (
+            np.einsum("rj,rji->ri", states[:, k - 1], state_transitions)
+            + block_inputs[:, k - 1]
+        )
+    Y += states @ state_responses
+    return Y.reshape(n_rows, n_blocks * L)[:, :n_samples]
 
 
 def SMC(
@@ -213,6 +356,7 @@ def SMC(
     phi=None,
     theta=None,
     Delta=0.0,
+    blocksize=None,
 ):
     r"""Sequential Monte Carlo method
 
@@ -250,6 +394,11 @@ def SMC(
             \theta_k w(n-k) + w(n)` with :math:`w(n)\sim N(0,noise_std^2)`
         Delta: float,optional
              upper bound on systematic error of the filter
+        blocksize: int, optional
+            if given, the noise for ``blocksize`` time steps is drawn at once and all
+            runs are advanced through the whole block of time steps together. The
+            quantiles of all time steps of a block are then computed from one sort
+            of the block's results. Defaults to None, i.e. one time step at a time.
 
     If ``return_samples`` is ``False``, the method returns:
 
@@ -276,6 +425,24 @@ def SMC(
 
     runs = int(runs)
 
+    if blocksize is not None:
+        return _smc_blockwise(
+            x,
+            noise_std,
+            b,
+            a,
+            Uab=Uab,
+            runs=runs,
+            Perc=Perc,
+            blow=blow,
+            alow=alow,
+            shift=shift,
+            phi=phi,
+            theta=theta,
+            Delta=Delta,
+            blocksize=int(blocksize),
+        )
+
     if isinstance(a, np.ndarray):  # filter order denominator
         Na = len(a) - 1
     else:
@@ -414,6 +581,137 @@ def SMC(
         return y, Uy
 
 
+def _smc_blockwise(
+    x,
+    noise_std,
+    b,
+    a,
+    Uab,
+    runs,
+    Perc,
+    blow,
+    alow,
+    shift,
+    phi,
+    theta,
+    Delta,
+    blocksize,
+):
+    """Fast path of :func:`SMC` advancing all runs through blocks of time steps"""
+    b = np.atleast_1d(np.asarray(b, dtype=float))
+    a = np.atleast_1d(np.asarray(a, dtype=float)) if a is not None else np.ones(1)
+    Na, Nb = len(a) - 1, len(b) - 1
+    order = max(Na, Nb)
+
+    # Initialize the ARMA noise model and the low-pass filter as digital filters
+    # with states carried over from block to block.
+    noise_b = np.hstack((1.0, np.atleast_1d(theta) if theta is not None else []))
+    noise_a = np.hstack((1.0, -np.atleast_1d(phi) if phi is not None else []))
+    noise_is_white = len(noise_b) == 1 and len(noise_a) == 1
+    if not noise_is_white:
+        noise_state = np.zeros((runs, max(len(noise_a), len(noise_b)) - 1))
+    if blow is not None:
+        blow = np.atleast_1d(blow)
+        alow = np.atleast_1d(alow) if alow is not None else np.ones(1)
+        low_pass_state = np.zeros((runs, max(len(alow), len(blow)) - 1))
+
+    coefs = np.hstack((a[1:], b))
+    if isinstance(Uab, np.ndarray):  # Monte Carlo draw for filter coefficients
+        Coefs = np.random.multivariate_normal(coefs, Uab, runs)
+        # state-space model of all drawn filters with states of shape (runs, order)
+        A = np.zeros((runs, order))
+        A[:, :Na] = Coefs[:, :Na]
+        B = np.zeros((runs, order + 1))
+        B[:, : Nb + 1] = Coefs[:, Na:]
+        b0 = B[:, 0]
+        c = B[:, 1:] - b0[:, np.newaxis] * A
+        States = np.zeros((runs, order))
+    else:
+        filter_state = np.zeros((runs, order))
+
+    y = np.zeros(len(x))
+    Uy = np.zeros(len(x))
+    if Perc is not None:
+        P = np.zeros((len(Perc), len(x)))
+
+    print("Sequential Monte Carlo progress", end="")
+    for block_start in range(0, len(x), blocksize):
+        block = slice(block_start, min(block_start + blocksize, len(x)))
+
+        # draw the noise of all runs for the whole block of time steps at once
+        E = np.random.randn(runs, block.stop - block.start) * noise_std
+        if not noise_is_white:
+            E, noise_state = lfilter(noise_b, noise_a, E, axis=1, zi=noise_state)
+        Xl = x[block] + E
+        if blow is not None:  # apply low-pass filter
+            Xl, low_pass_state = lfilter(blow, alow, Xl, axis=1, zi=low_pass_state)
+
+        if isinstance(Uab, np.ndarray):
+            Y = np.empty_like(Xl)
+            for n in range(Xl.shape[1]):
+                # State-space system output.
+                Y[:, n] = np.sum(c * States, axis=1) + b0 * Xl[:, n]
+                # Calculate state updates and remove old ones.
+                Z = -np.sum(A * States, axis=1) + Xl[:, n]
+                States = np.hstack((Z[:, np.newaxis], States[:, :-1]))
+        elif order > 0:
+            Y, filter_state = lfilter(b, a, Xl, axis=1, zi=filter_state)
+        else:
+            Y = Xl * b[0] / a[0]
+        if Delta:
+            Y += np.random.rand(*Y.shape) * 2 * Delta - Delta
+
+        y[block] = np.mean(Y, axis=0)  # point-wise best estimate
+        Uy[block] = np.std(Y, axis=0)  # point-wise standard uncertainties
+        if Perc is not None:
+            P[:, block] = _block_quantiles(Y, Perc)
+
+        print(" %d%%" % (np.round(100.0 * block.stop / len(x))), end="")
+    print("")
+
+    # Correct for (known) delay.
+    y = np.roll(y, int(shift))
+    Uy = np.roll(Uy, int(shift))
+
+    if Perc is not None:
+        P = np.roll(P, int(shift), axis=1)
+        return y, Uy, P
+    else:
+        return y, Uy
+
+
+def _block_quantiles(Y, probabilities):
+    """Quantiles of every column of Y as computed by mquantiles
+
+    All columns are sorted at once and the quantiles are interpolated with the
+    default plotting positions of :func:`scipy.stats.mstats.mquantiles`
+    (``alphap=betap=0.4``), such that the result equals one call of mquantiles per
+    column.
+
+    Parameters
+    ----------
+    Y : np.ndarray of shape (runs, N)
+        observations, every column is one independent sample
+    probabilities : list of float
+        the probabilities in [0, 1] of the requested quantiles
+
+    Returns
+    -------
+    np.ndarray of shape (len(probabilities), N)
+        the quantiles
+    """
+    Y = np.sort(Y, axis=0)
+    runs = len(Y)
+    if runs == 1:
+        return np.repeat(Y, len(probabilities), axis=0)
+    p = np.asarray(probabilities, dtype=float)
+    alphap = betap = 0.4
+    aleph = runs * p + alphap + p * (1.0 - alphap - betap)
+    k = np.floor(aleph.clip(1, runs - 1)).astype(int)
+    gamma = (aleph - k).clip(0, 1)[:, np.newaxis]
+    return (1.0 - gamma) * Y[k - 1] + gamma * Y[k]
+
+
 def UMC(
     x,
     b,
@@ -610,6 +908,8 @@ def UMC_generic(
     n_cpu=multiprocessing.cpu_count(),
     return_histograms=True,
     compute_full_covariance=True,
+    backend="pool",
+    seed=None,
 ):
     """
     Generic Batch Monte Carlo using update formulae for mean, variance and (approximated) histogram.
@@ -640,6 +940,26 @@ def UMC_generic(
             whether to compute a histogram for each entry of the result at all
         compute_full_covariance: bool, optional
             whether to compute the full covariance matrix or just its diagonal
+        backend: str, optional
+            how to distribute the evaluations, either
+
+            * ``"pool"`` (default): samples are drawn in the main process and
+              evaluated by a pool of processes, results are collected in the order
+              of their completion
+            * ``"shared_memory"``: ``n_cpu`` persistent workers each draw and
+              evaluate a fixed share of the runs and accumulate mean, covariance and
+              histograms in their own slab of shared memory, which are merged in a
+              fixed order afterwards. The results are bit-reproducible for a given
+              seed and number of workers. The workers and slabs are kept for
+              subsequent calls with the same number of workers, where the workers
+              are only restarted if ``draw_samples`` or ``evaluate`` are other
+              objects than before. Requires Python 3.8 or later.
+        seed: None, int or np.random.SeedSequence, optional
+            entropy for the random number generation of the ``"shared_memory"``
+            backend, from which every worker gets its own
+            :class:`numpy.random.SeedSequence`. The workers seed the global numpy
+            random number generator, which ``draw_samples`` is expected to use.
+            Ignored by the ``"pool"`` backend.
 
     Example
     -------
@@ -684,6 +1004,26 @@ def UMC_generic(
     if isinstance(nbins, int):
         nbins = [nbins]
 
+    if backend == "shared_memory":
+        return _umc_generic_shared_memory(
+            draw_samples,
+            evaluate,
+            runs=runs,
+            blocksize=blocksize,
+            runs_init=runs_init,
+            nbins=nbins,
+            return_samples=return_samples,
+            n_cpu=n_cpu,
+            return_histograms=return_histograms,
+            compute_full_covariance=compute_full_covariance,
+            seed=seed,
+        )
+    elif backend != "pool":
+        raise ValueError(
+            f"UMC_generic: backend is expected to be either 'pool' or "
+            f"'shared_memory', but '{backend}' was given."
+        )
+
     # check if parallel computation is required
     # this allows to circumvent a multiprocessing-problem on windows-machines
     # see: https://github.com/PTB-M4D/PyDynamic/issues/84
@@ -820,16 +1160,484 @@ def UMC_generic(
     # ----------------- post-calculation steps -----------------------
 
     if return_histograms:
-        # replace edge limits by ymin and ymax, resp.
-        for h in happr.values():
-            h["bin-edges"][0, :] = np.min(
-                np.vstack((ymin, h["bin-edges"][0, :])), axis=0
-            )
-            h["bin-edges"][-1, :] = np.min(
-                np.vstack((ymax, h["bin-edges"][-1, :])), axis=0
-            )
+        _replace_histogram_edge_limits(happr, ymin, ymax)
+
+    if return_samples:
+        return y, Uy, happr, output_shape, sims
+    else:
+        return y, Uy, happr, output_shape
+
+
+def _replace_histogram_edge_limits(happr, ymin, ymax):
+    """Replace the outermost bin-edges of the histograms by ymin and ymax, resp."""
+    for h in happr.values():
+        h["bin-edges"][0, :] = np.min(np.vstack((ymin, h["bin-edges"][0, :])), axis=0)
+        h["bin-edges"][-1, :] = np.min(np.vstack((ymax, h["bin-edges"][-1, :])), axis=0)
+
+
+def _umc_generic_shared_memory(
+    draw_samples,
+    evaluate,
+    runs,
+    blocksize,
+    runs_init,
+    nbins,
+    return_samples,
+    n_cpu,
+    return_histograms,
+    compute_full_covariance,
+    seed,
+):
+    """Shared memory backend of :func:`UMC_generic` with persistent seeded workers
+
+    The runs are split into one fixed share per worker. Each worker seeds the global
+    random number generator from its own :class:`numpy.random.SeedSequence`, draws
+    and evaluates its share block by block and accumulates the results in its own
+    slab of shared memory. The slabs are merged pairwise in a fixed order
+    afterwards, such that the results only depend on the seed and the number of
+    workers.
+    """
+    from multiprocessing import shared_memory
+
+    n_workers = max(1, min(n_cpu, runs))
+    seed_sequence = (
+        seed
+        if isinstance(seed, np.random.SeedSequence)
+        else np.random.SeedSequence(seed)
+    )
+    init_seed_sequence, *worker_seed_sequences = seed_sequence.spawn(n_workers + 1)
+
+    # ------------ preparations for update formulae ------------
+
+    global_random_state = np.random.get_state()
+    np.random.seed(init_seed_sequence.generate_state(4))
+    try:
+        samples = draw_samples(runs_init)
+        Y_init = np.asarray([evaluate(sample) for sample in samples])
+    finally:
+        np.random.set_state(global_random_state)
+
+    # get size of in- and output (was so far not explicitly known)
+    input_shape = np.shape(samples[0])
+    output_shape = Y_init[0].shape
+    output_size = int(np.prod(output_shape))
+    Y_init = Y_init.reshape((runs_init, output_size))
+    ymin = np.min(Y_init, axis=0)
+    ymax = np.max(Y_init, axis=0)
+
+    bin_edges = {}
+    if return_histograms:
+        for nbin in nbins:
+            bin_edges[nbin] = np.linspace(ymin, ymax, num=nbin + 1)
+
+    # ------------ set up the shared memory slabs of the workers ------------
+
+    layout = _umc_statistics_layout(output_size, bin_edges, compute_full_covariance)
+    sims_layout = (
+        {"samples": (runs, *input_shape), "results": (runs, *output_shape)}
+        if return_samples
+        else {}
+    )
+    worker_runs = [
+        runs // n_workers + int(worker < runs % n_workers)
+        for worker in range(n_workers)
+    ]
+    worker_offsets = np.cumsum([0] + worker_runs[:-1])
+
+    pool = _shared_memory_worker_pool(n_workers)
+    slabs, sims_slab = pool.slabs(layout, sims_layout)
+    statistics_views = [_shared_memory_views(slab.buf, layout) for slab in slabs]
+    for statistics in statistics_views:
+        _init_umc_statistics(statistics)
+
+    tasks = [
+        (
+            worker_runs[worker],
+            blocksize,
+            worker_seed_sequences[worker],
+            slabs[worker].name,
+            layout,
+            bin_edges,
+            sims_slab.name,
+            sims_layout,
+            worker_offsets[worker],
+        )
+        for worker in range(n_workers)
+    ]
+
+    # ----------------- run MC in persistent workers -----------------------
+
+    pool.run(
+        draw_samples,
+        evaluate,
+        tasks,
+        counts=[statistics["count"] for statistics in statistics_views],
+        runs=runs,
+    )
+    print("\n")  # to escape the carriage-return of progress_bar
+
+    # ----------------- merge the statistics of all workers ----------------
+
+    statistics = [
+        {key: np.copy(value) for key, value in views.items()}
+        for views in statistics_views
+    ]
+    del statistics_views
+    while len(statistics) > 1:
+        statistics = [
+            _merge_umc_statistics(*statistics[i : i + 2])
+            if i + 1 < len(statistics)
+            else statistics[i]
+            for i in range(0, len(statistics), 2)
+        ]
+    statistics = statistics[0]
+
+    if return_samples:
+        sims = {
+            key: np.copy(value)
+            for key, value in _shared_memory_views(sims_slab.buf, sims_layout).items()
+        }
+
+    # ----------------- post-calculation steps -----------------------
+
+    y = statistics["mean"]
+    Uy = statistics["scatter"] / (statistics["count"][0] - 1)
+    ymin = np.minimum(ymin, statistics["min"])
+    ymax = np.maximum(ymax, statistics["max"])
+
+    happr = {}
+    if return_histograms:
+        for nbin, edges in bin_edges.items():
+            happr[nbin] = {
+                "bin-edges": edges,
+                "bin-counts": statistics[f"bin-counts-{nbin}"],
+            }
+        _replace_histogram_edge_limits(happr, ymin, ymax)
 
     if return_samples:
         return y, Uy, happr, output_shape, sims
     else:
         return y, Uy, happr, output_shape
+
+
+class _SharedMemoryWorkerPool:
+    """Persistent workers and shared memory slabs of the UMC_generic backend
+
+    The worker processes are kept alive between calls with the same
+    ``draw_samples`` and ``evaluate``, which they receive when they are started, and
+    are only restarted for other functions. The slabs are reused as long as they
+    are large enough for the requested layouts. A single worker runs in the calling
+    process.
+    """
+
+    def __init__(self, n_workers):
+        self.n_workers = n_workers
+        self._functions = None
+        self._workers = []
+        self._tasks = None
+        self._done = None
+        self._slabs = []
+        self._sims_slab = None
+
+    def slabs(self, layout, sims_layout):
+        """One slab for the statistics of each worker and one for all samples"""
+        from multiprocessing import shared_memory
+
+        size, sims_size = _shared_memory_size(layout), _shared_memory_size(sims_layout)
+        if not self._slabs or self._slabs[0].size < size:
+            self._release_slabs(self._slabs)
+            self._slabs = [
+                shared_memory.SharedMemory(create=True, size=size)
+                for _ in range(self.n_workers)
+            ]
+        if self._sims_slab is None or self._sims_slab.size < sims_size:
+            self._release_slabs([self._sims_slab] if self._sims_slab else [])
+            self._sims_slab = shared_memory.SharedMemory(create=True, size=sims_size)
+        return self._slabs, self._sims_slab
+
+    def run(self, draw_samples, evaluate, tasks, counts, runs):
+        """Run one task per worker and wait for all of them to finish"""
+        if self.n_workers == 1:
+            # this allows to circumvent a multiprocessing-problem on windows-machines
+            # see: https://github.com/PTB-M4D/PyDynamic/issues/84
+            attached = {slab.name: slab for slab in self._slabs + [self._sims_slab]}
+            global_random_state = np.random.get_state()
+            try:
+                _run_umc_generic_task(draw_samples, evaluate, tasks[0], attached)
+            finally:
+                np.random.set_state(global_random_state)
+            progress_bar(runs - 1, runs, prefix="UMC running:            ")
+            return
+
+        if self._functions is None or any(
+            function is not previous
+            for function, previous in zip((draw_samples, evaluate), self._functions)
+        ):
+            self._start_workers(draw_samples, evaluate)
+        try:
+            for index, task in enumerate(tasks):
+                self._tasks.put((index, task))
+            errors, pending = [], len(tasks)
+            while pending:
+                progress_bar(
+                    int(sum(count[0] for count in counts)) - 1,
+                    runs,
+                    prefix="UMC running:            ",
+                )
+                try:
+                    index, error = self._done.get(timeout=0.1)
+                except queue.Empty:
+                    exitcodes = [
+                        worker.exitcode
+                        for worker in self._workers
+                        if not worker.is_alive()
+                    ]
+                    if exitcodes:
+                        raise RuntimeError(
+                            f"UMC_generic: {len(exitcodes)} of {self.n_workers} "
+                            f"workers of the shared memory backend failed with exit "
+                            f"codes {exitcodes}."
+                        )
+                    continue
+                pending -= 1
+                if error is not None:
+                    errors.append(error)
+        except BaseException:
+            # the workers might still write to the slabs, so neither can be reused
+            self.close()
+            raise
+        if errors:
+            raise RuntimeError(
+                f"UMC_generic: {len(errors)} of {self.n_workers} workers of the shared "
+                f"memory backend failed with:\n" + "\n".join(errors)
+            )
+        progress_bar(runs - 1, runs, prefix="UMC running:            ")
+
+    def close(self):
+        """Stop the workers and release the slabs"""
+        self._stop_workers()
+        self._release_slabs(
+            self._slabs + ([self._sims_slab] if self._sims_slab else [])
+        )
+        self._slabs, self._sims_slab = [], None
+        _SHARED_MEMORY_WORKER_POOLS.pop(self.n_workers, None)
+
+    def _start_workers(self, draw_samples, evaluate):
+        self._stop_workers()
+        self._tasks, self._done = multiprocessing.Queue(), multiprocessing.Queue()
+        self._workers = [
+            multiprocessing.Process(
+                target=_umc_generic_worker,
+                args=(draw_samples, evaluate, self._tasks, self._done),
+            )
+            for _ in range(self.n_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._functions = (draw_samples, evaluate)
+
+    def _stop_workers(self):
+        for worker in self._workers:
+            if worker.is_alive():
+                self._tasks.put(None)
+        for worker in self._workers:
+            worker.join(timeout=1)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self._workers, self._functions = [], None
+
+    @staticmethod
+    def _release_slabs(slabs):
+        for slab in slabs:
+            slab.unlink()
+            try:
+                slab.close()
+            except BufferError:
+                # after a failed run the caller may still hold views of the slab,
+                # which is then unmapped once they are gone
+                pass
+
+
+_SHARED_MEMORY_WORKER_POOLS = {}
+
+
+def _shared_memory_worker_pool(n_workers):
+    """The persistent worker pool for n_workers, which is created on first use"""
+    if not _SHARED_MEMORY_WORKER_POOLS:
+        atexit.register(_close_shared_memory_worker_pools)
+    if n_workers not in _SHARED_MEMORY_WORKER_POOLS:
+        _SHARED_MEMORY_WORKER_POOLS[n_workers] = _SharedMemoryWorkerPool(n_workers)
+    return _SHARED_MEMORY_WORKER_POOLS[n_workers]
+
+
+def _close_shared_memory_worker_pools():
+    for pool in list(_SHARED_MEMORY_WORKER_POOLS.values()):
+        pool.close()
+    atexit.unregister(_close_shared_memory_worker_pools)
+
+
+def _umc_generic_worker(draw_samples, evaluate, tasks, done):
+    """Run UMC_generic tasks from the queue tasks until None is received"""
+    attached = {}
+    for index, task in iter(tasks.get, None):
+        try:
+            _run_umc_generic_task(draw_samples, evaluate, task, attached)
+            done.put((index, None))
+        except Exception:
+            done.put((index, traceback.format_exc()))
+    for slab in attached.values():
+        slab.close()
+
+
+def _run_umc_generic_task(draw_samples, evaluate, task, attached):
+    """Draw, evaluate and accumulate one worker's share of the UMC_generic runs
+
+    attached maps the names of the already attached slabs to their shared memory
+    and is updated to contain exactly the slabs of task.
+    """
+    from multiprocessing import shared_memory
+
+    (
+        runs,
+        blocksize,
+        seed_sequence,
+        slab_name,
+        layout,
+        bin_edges,
+        sims_slab_name,
+        sims_layout,
+        sims_offset,
+    ) = task
+    for name in set(attached) - {slab_name, sims_slab_name}:
+        attached.pop(name).close()
+    for name in (slab_name, sims_slab_name):
+        if name not in attached:
+            attached[name] = shared_memory.SharedMemory(name=name)
+
+    np.random.seed(seed_sequence.generate_state(4))
+    statistics = _shared_memory_views(attached[slab_name].buf, layout)
+    sims = _shared_memory_views(attached[sims_slab_name].buf, sims_layout)
+    Y = np.empty((min(blocksize, max(runs, 1)), statistics["mean"].size))
+    for block_start in range(0, runs, blocksize):
+        block_size = min(blocksize, runs - block_start)
+        samples = draw_samples(block_size)
+        for k, sample in enumerate(samples):
+            Y[k] = np.ravel(evaluate(sample))
+
+        _update_umc_statistics(statistics, Y[:block_size], bin_edges)
+
+        # save results if wanted
+        if sims:
+            block = slice(
+                sims_offset + block_start, sims_offset + block_start + block_size
+            )
+            sims["samples"][block] = samples
+            sims["results"][block] = Y[:block_size].reshape(
+                (block_size, *sims["results"].shape[1:])
+            )
+
+
+def _umc_statistics_layout(output_size, bin_edges, compute_full_covariance):
+    """Shapes of the accumulators of mean, covariance and histograms"""
+    layout = {
+        "count": (1,),
+        "mean": (output_size,),
+        "scatter": (output_size, output_size)
+        if compute_full_covariance
+        else (output_size,),
+        "min": (output_size,),
+        "max": (output_size,),
+    }
+    for nbin in bin_edges:
+        layout[f"bin-counts-{nbin}"] = (nbin, output_size)
+    return layout
+
+
+def _shared_memory_size(layout):
+    """Number of bytes needed to store float arrays of the shapes in layout"""
+    return max(
+        1,
+        sum(int(np.prod(shape)) for shape in layout.values())
+        * np.dtype(float).itemsize,
+    )
+
+
+def _shared_memory_views(buffer, layout):
+    """Float arrays of the shapes in layout stored one after another in buffer"""
+    views = {}
+    offset = 0
+    for key, shape in layout.items():
+        views[key] = np.ndarray(shape, dtype=float, buffer=buffer, offset=offset)
+        offset += views[key].nbytes
+    return views
+
+
+def _init_umc_statistics(statistics):
+    """Set the accumulators to the state without any evaluated runs"""
+    for key, value in statistics.items():
+        value[...] = 0.0
+    statistics["min"][...] = np.inf
+    statistics["max"][...] = -np.inf
+
+
+def _merge_umc_statistics(statistics, other):
+    """Merge the accumulators of two disjoint sets of runs (Chan et al.)"""
+    merged = {key: np.copy(value) for key, value in statistics.items()}
+    _merge_umc_statistics_into(merged, other)
+    return merged
+
+
+def _merge_umc_statistics_into(statistics, other):
+    """Merge the accumulators other into statistics in place"""
+    if other["count"][0] == 0:
+        return
+    (
+        statistics["count"][0],
+        statistics["mean"][...],
+        statistics["scatter"][...],
+    ) = _merge_means_and_scatter_matrices(
+        statistics["count"][0],
+        statistics["mean"],
+        statistics["scatter"],
+        other["count"][0],
+        other["mean"],
+        other["scatter"],
+    )
+    np.minimum(statistics["min"], other["min"], out=statistics["min"])
+    np.maximum(statistics["max"], other["max"], out=statistics["max"])
+    for key in statistics:
+        if key.startswith("bin-counts"):
+            statistics[key] += other[key]
+
+
+def _update_umc_statistics(statistics, Y, bin_edges):
+    """Accumulate a block of results Y of shape (runs, output_size) in place"""
+    (
+        statistics["count"][0],
+        statistics["mean"][...],
+        statistics["scatter"][...],
+    ) = _update_mean_and_scatter_matrix(
+        statistics["count"][0], statistics["mean"], statistics["scatter"], Y
+    )
+    np.minimum(statistics["min"], np.min(Y, axis=0), out=statistics["min"])
+    np.maximum(statistics["max"], np.max(Y, axis=0), out=statistics["max"])
+    for nbin, edges in bin_edges.items():
+        statistics[f"bin-counts-{nbin}"] += _histogram_columns(Y, edges)
+
+
+def _histogram_columns(Y, edges):
+    """Histogram of every column of Y with the bin-edges in the same column of edges
+
+    Equivalent to calling :func:`numpy.histogram` for every column separately.
+    """
+    nbin, columns = len(edges) - 1, np.arange(Y.shape[1])
+    inside = (Y >= edges[0]) & (Y <= edges[-1])
+    indices = np.sum(Y[:, np.newaxis, :] >= edges[np.newaxis, 1:-1, :], axis=1)
+    counts = np.zeros((nbin, Y.shape[1]))
+    np.add.at(
+        counts,
+        (indices[inside], np.broadcast_to(columns, Y.shape)[inside]),
+        1.0,
+    )
+    return counts
@@ -12,23 +12,35 @@ This module contains the following function:
 __all__ = ["convolve_unc"]
 
 import numpy as np
+from scipy import sparse
 
 from .propagate_filter import _fir_filter
 from ..misc.tools import is_vector
 
 
-def convolve_unc(x1, U1, x2, U2, mode="full"):
+def convolve_unc(x1, U1, x2, U2, mode="full", return_full_covariance=True):
     """Discrete convolution of two signals with uncertainty propagation
 
     This function supports the convolution modes of :func:`numpy.convolve` and
     :func:`scipy.ndimage.convolve1d`.
 
     .. note::
-        The option to provide the uncertainties as 1D-arrays of standard uncertainties
-        is given for convenience only. It does not result in any performance benefits,
-        as they are internally just converted into a diagonal covariance matrix.
-        Moreover, the output will always be a full covariance matrix (and will almost
-        always have off-diagonal entries in practical scenarios).
+        If both uncertainties are provided as 1D-arrays of standard uncertainties (or
+        None), the signals are uncorrelated and the output covariance is a sum of
+        shifted outer products of the inputs. It is then computed from sparse
+        convolution matrices without ever forming the input covariance matrices. If
+        additionally only the standard uncertainties of the result are requested via
+        ``return_full_covariance=False``, memory and time scale linearly in the
+        signal length. Otherwise the output will be a full covariance matrix (and
+        will almost always have off-diagonal entries in practical scenarios).
+
+    Both signals may also be stacks of signals of shape (..., N) and (..., M), which
+    broadcast against each other. Their uncertainties are then either shared by all
+    signals of the stack as described below, or given for every signal as array of
+    shape (..., N) of standard uncertainties or of shape (..., N, N) of covariance
+    matrices. An array of shape (N, N) is always taken as covariance shared by all
+    signals, also for a stack of N signals. The convolution matrices are set up once
+    per stack and all covariances are propagated by stacked matrix products.
 
     Parameters
     ----------
@@ -56,13 +68,16 @@ def convolve_unc(x1, U1, x2, U2, mode="full"):
         - nearest: len(y) == N (value+covariance are padded with by stationary assumption)
         - reflect:  len(y) == N
         - mirror:   len(y) == N
+    return_full_covariance : bool, optional
+        whether or not to return a full covariance of the output, defaults to True
 
     Returns
     -------
     conv : np.ndarray
         convoluted output signal
     Uconv : np.ndarray
-        full 2D-covariance matrix of y
+        full 2D-covariance matrix of y if return_full_covariance is True, otherwise
+        the point-wise standard uncertainties of y
 
     References
     ----------
@@ -71,12 +86,22 @@ def convolve_unc(x1, U1, x2, U2, mode="full"):
         :func:`scipy.ndimage.convolve1d`
     """
 
+    if np.ndim(x1) > 1 or np.ndim(x2) > 1:
+        conv, Uconv = _convolve_unc_stacked(x1, U1, x2, U2, mode)
+        if not return_full_covariance:
+            Uconv = np.sqrt(np.abs(np.diagonal(Uconv, axis1=-2, axis2=-1)))
+        return conv, Uconv
+
     # if a numpy-mode is chosen, x1 is expected to be the longer signal
     # remember that pure convolution is commutative
     if len(x1) < len(x2) and mode in ["valid", "full", "same"]:
         x1, x2 = x2, x1
         U1, U2 = U2, U1
 
+    # uncorrelated inputs do not require any covariance matrices of the inputs
+    if (U1 is None or np.ndim(U1) == 1) and (U2 is None or np.ndim(U2) == 1):
+        return _convolve_unc_uncorrelated(x1, U1, x2, U2, mode, return_full_covariance)
+
     # convert 1d array of standard uncertainties to covariance matrix (if necessary)
     U1, U2 = _ensure_cov_matrix(U1), _ensure_cov_matrix(U2)
 
@@ -162,9 +187,238 @@ def convolve_unc(x1, U1, x2, U2, mode="full"):
     else:
         raise ValueError(f'convolve_unc: Mode "{mode}" is not supported.')
 
+    if not return_full_covariance:
+        return conv, np.sqrt(np.abs(np.diag(Uconv)))
     return conv, Uconv
 
 
+def _convolve_unc_uncorrelated(x1, u1, x2, u2, mode, return_full_covariance):
+    """Convolution with uncertainty propagation for uncorrelated input signals
+
+    With the notation of :func:`_convolve_unc_stacked` and :math:`x_1 = P s` for the
+    (padded) signal x1, which is a selection :math:`P` of the original samples
+    :math:`s`, the output covariance is the sum of :math:`A D_1 A^T` with
+    :math:`A = T_2 P`, :math:`T_1 D_2 T_1^T` and the trace term, where :math:`D_1`
+    and :math:`D_2` are the diagonal input covariances. All three terms are of the
+    form :math:`S S^T` with sparse factors :math:`S` of M non-zero entries per row.
+    Point-wise variances are the sums of the squared entries of the factors' rows,
+    i.e. convolutions of the squared input values and uncertainties, which are only
+    corrected in the rows affected by padding.
+    """
+    n1, n2 = len(x1), len(x2)
+    start, stop, source = _convolution_rows_and_source(n1, n2, mode)
+
+    if return_full_covariance:
+        conv, sqrt_terms = _uncorrelated_convolution_factors(
+            x1, u1, x2, u2, source, start, stop
+        )
+        Uconv = np.zeros((len(conv), len(conv)))
+        for sqrt_term in sqrt_terms:
+            Uconv += (sqrt_term @ sqrt_term.T).toarray()
+        return conv, Uconv
+
+    # away from the padding, all three terms are convolutions of squared values
+    padded_x1 = x1[source]
+    conv = np.convolve(padded_x1, x2)[start:stop]
+    variances = np.zeros(stop - start)
+    if u1 is not None:
+        variances += np.convolve(np.square(u1[source]), np.square(x2))[start:stop]
+    if u2 is not None:
+        variances += np.convolve(np.square(padded_x1), np.square(u2))[start:stop]
+    if u1 is not None and u2 is not None:
+        variances += np.convolve(np.square(u1[source]), np.square(u2))[start:stop]
+
+    # the padding might select the same sample multiple times within one row
+    if len(source) > n1:
+        for edge_start, edge_stop in (
+            (start, min(start + n2, stop)),
+            (max(stop - n2, start), stop),
+        ):
+            _, sqrt_terms = _uncorrelated_convolution_factors(
+                x1, u1, x2, u2, source, edge_start, edge_stop
+            )
+            edge = slice(edge_start - start, edge_stop - start)
+            variances[edge] = 0.0
+            for sqrt_term in sqrt_terms:
+                variances[edge] += np.asarray(
+                    sqrt_term.multiply(sqrt_term).sum(axis=1)
+                ).ravel()
+    return conv, np.sqrt(variances)
+
+
+def _uncorrelated_convolution_factors(x1, u1, x2, u2, source, start, stop):
+    """Rows start to stop of the convolution and the sparse covariance factors"""
+    n1, n2, n_rows = len(x1), len(x2), stop - start
+
+    # indices of all non-zero entries of the convolution matrices
+    lags = np.arange(start, stop)[:, np.newaxis] - np.arange(n2)
+    valid = (lags >= 0) & (lags < len(source))
+    rows, taps = np.nonzero(valid)
+    samples = source[lags[valid]]
+
+    T1 = np.zeros((n_rows, n2))
+    T1[rows, taps] = x1[samples]
+    conv = T1 @ x2
+
+    sqrt_terms = []
+    if u1 is not None:
+        # padding might select the same sample multiple times, which is summed up
+        sqrt_terms.append(
+            sparse.csr_matrix(
+                (x2[taps] * u1[samples], (rows, samples)), shape=(n_rows, n1)
+            )
+        )
+    if u2 is not None:
+        sqrt_terms.append(sparse.csr_matrix(T1 * u2))
+    if u1 is not None and u2 is not None:
+        # products of the same pair of samples are fully correlated
+        pairs, pair_indices = np.unique(taps * n1 + samples, return_inverse=True)
+        sqrt_terms.append(
+            sparse.csr_matrix(
+                (u2[taps] * u1[samples], (rows, pair_indices)),
+                shape=(n_rows, len(pairs)),
+            )
+        )
+    return conv, sqrt_terms
+
+
+def _convolution_rows_and_source(n1, n2, mode):
+    """Rows of the full convolution of x2 with padded x1 and the padding's origins
+
+    Returns
+    -------
+    start, stop : int
+        the requested mode's output are the rows start to stop of the full
+        convolution of x2 with the padded version of x1
+    source : np.ndarray of int
+        indices of the samples of x1, which make up the padded version of x1
+    """
+    source = np.arange(n1)
+    if mode == "valid":
+        return n2 - 1, n1, source
+    if mode == "full":
+        return 0, n1 + n2 - 1, source
+    if mode == "same":
+        start = (n2 - 1) // 2
+        return start, start + n1, source
+    if mode in ["nearest", "reflect", "mirror"]:
+        # scipy.ndimage.convolve1d and numpy.pad use different (but overlapping)
+        # terminology
+        pad_mode = {"nearest": "edge", "reflect": "symmetric", "mirror": "reflect"}[
+            mode
+        ]
+        pad_len = (n2 + 1) // 2
+        return n2, n2 + n1, np.pad(source, (pad_len, pad_len), mode=pad_mode)
+    raise ValueError(f'convolve_unc: Mode "{mode}" is not supported.')
+
+
+def _convolve_unc_stacked(x1, U1, x2, U2, mode):
+    """Convolution with uncertainty propagation for stacks of signals
+
+    The result of every mode is a slice of the full convolution of x2 with a
+    (padded) version of x1, which is expressed by convolution matrices as
+    :math:`y = T_2 x_1 = T_1 x_2`. The covariances then follow as
+    :math:`T_2 U_1 T_2^T + T_1 U_2 T_1^T` plus the trace term of the product of both
+    uncertain signals as in :func:`_fir_filter`.
+    """
+    n1, n2 = np.shape(x1)[-1], np.shape(x2)[-1]
+
+    # if a numpy-mode is chosen, x1 is expected to be the longer signal
+    # remember that pure convolution is commutative
+    if n1 < n2 and mode in ["valid", "full", "same"]:
+        x1, x2, U1, U2, n1, n2 = x2, x1, U2, U1, n2, n1
+
+    # convert standard uncertainties to covariance matrices (if necessary)
+    U1, U2 = _ensure_stacked_cov_matrix(U1, x1), _ensure_stacked_cov_matrix(U2, x2)
+
+    if mode == "valid":
+        start, stop = n2 - 1, n1
+    elif mode == "full":
+        start, stop = 0, n1 + n2 - 1
+    elif mode == "same":
+        start = (n2 - 1) // 2
+        stop = start + n1
+    elif mode in ["nearest", "reflect", "mirror"]:
+        # scipy.ndimage.convolve1d and numpy.pad use different (but overlapping)
+        # terminology
+        pad_mode = {"nearest": "edge", "reflect": "symmetric", "mirror": "reflect"}[
+            mode
+        ]
+        pad_len = (n2 + 1) // 2
+        x1 = np.pad(x1, [(0, 0)] * (np.ndim(x1) - 1) + [(pad_len, pad_len)], pad_mode)
+        if U1 is not None:
+            U1 = np.pad(
+                U1, [(0, 0)] * (U1.ndim - 2) + [(pad_len, pad_len)] * 2, pad_mode
+            )
+        start, stop = n2, n2 + n1
+        n1 = n1 + 2 * pad_len
+    else:
+        raise ValueError(f'convolve_unc: Mode "{mode}" is not supported.')
+
+    # convolution matrices of the requested rows of the full convolution
+    rows = np.arange(start, stop)[:, np.newaxis]
+    T1 = _convolution_matrix(x1, rows - np.arange(n2))
+    T2 = _convolution_matrix(x2, rows - np.arange(n1))
+
+    conv = np.matmul(T1, x2[..., np.newaxis])[..., 0]
+    Uconv = np.zeros(conv.shape + conv.shape[-1:])
+    if U1 is not None:
+        Uconv = Uconv + _clip_stacked_main_diagonal_to_zero_from_below(
+            np.matmul(np.matmul(T2, U1), np.swapaxes(T2, -1, -2))
+        )
+    if U2 is not None:
+        Uconv = Uconv + _clip_stacked_main_diagonal_to_zero_from_below(
+            np.matmul(np.matmul(T1, U2), np.swapaxes(T1, -1, -2))
+        )
+    if U1 is not None and U2 is not None:
+        # calc subterm Tr(U1 * U2), i.e. the sum of U2[k, l] * U1[i - k, j - l]
+        U1_padded = np.pad(U1, [(0, 0)] * (U1.ndim - 2) + [(n2 - 1, n2 - 1)] * 2)
+        trace_term = 0.0
+        for k in range(n2):
+            rows_k = slice(start - k + n2 - 1, stop - k + n2 - 1)
+            for l in range(n2):
+                columns_l = slice(start - l + n2 - 1, stop - l + n2 - 1)
+                trace_term = (
+                    trace_term
+                    + U2[..., k, l, np.newaxis, np.newaxis]
+                    * U1_padded[..., rows_k, columns_l]
+                )
+        Uconv = Uconv + _clip_stacked_main_diagonal_to_zero_from_below(trace_term)
+
+    return conv, Uconv
+
+
+def _convolution_matrix(x, lags):
+    """Stack of matrices with entries x[..., lags] and zeros where lags are invalid"""
+    valid = (lags >= 0) & (lags < np.shape(x)[-1])
+    return np.where(valid, np.take(x, np.where(valid, lags, 0), axis=-1), 0.0)
+
+
+def _clip_stacked_main_diagonal_to_zero_from_below(matrices):
+    diagonal = np.arange(matrices.shape[-1])
+    matrices[..., diagonal, diagonal] = matrices[..., diagonal, diagonal].clip(min=0)
+    return matrices
+
+
+def _ensure_stacked_cov_matrix(unc_array, values):
+    """Converts standard uncertainties of the same shape as values or of shape (N,)
+    into the corresponding (diagonal) covariance matrices by *square*+diag.
+
+    Does not modify inputs which are stacks of covariance matrices or None. An input
+    of shape (N, N) is always one shared covariance matrix, also for a stack of N
+    signals.
+    """
+    if unc_array is None:
+        return None
+    unc_array = np.asarray(unc_array)
+    n = np.shape(values)[-1]
+    if unc_array.shape == (n, n):
+        return unc_array
+    if unc_array.shape in (np.shape(values), (n,)):
+        unc_array = np.square(unc_array)[..., np.newaxis] * np.eye(unc_array.shape[-1])
+    return unc_array
+
+
 def _ensure_cov_matrix(unc_array):
     """
     Converts 1D-arrays of standard uncertainties into the corresponding
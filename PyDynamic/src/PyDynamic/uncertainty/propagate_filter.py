@@ -5,7 +5,11 @@ the application of a digital filter using the GUM approach.
 This modules contains the following functions:
 
 * :func:`FIRuncFilter`: Uncertainty propagation for signal y and uncertain FIR
-  filter theta
+  filter theta, optionally with compact Toeplitz or banded output covariance
+* :func:`FIRuncFilter_realtime`: Block-wise uncertainty propagation for signal x and
+  uncertain FIR filter theta carrying an internal state between successive blocks
+* :func:`FIR_get_initial_state`: Get a valid internal state for
+  :func:`FIRuncFilter_realtime` that assumes a stationary signal before the first value.
 * :func:`IIRuncFilter`: Uncertainty propagation for the signal x and the uncertain
   IIR filter (b,a)
 * :func:`IIR_get_initial_state`: Get a valid internal state for :func:`IIRuncFilter`
@@ -18,12 +22,25 @@ This modules contains the following functions:
 import warnings
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy.linalg import solve, solve_discrete_lyapunov, toeplitz
 from scipy.signal import convolve, dimpulse, lfilter, lfilter_zi
 
+from ..misc.structured_covariance import (
+    BandedCovariance,
+    is_structured_covariance,
+    StructuredCovariance,
+    ToeplitzCovariance,
+)
 from ..misc.tools import trimOrPad
 
-__all__ = ["FIRuncFilter", "IIRuncFilter", "IIR_get_initial_state"]
+__all__ = [
+    "FIRuncFilter",
+    "FIRuncFilter_realtime",
+    "FIR_get_initial_state",
+    "IIRuncFilter",
+    "IIR_get_initial_state",
+]
 
 
 def _fir_filter(x, theta, Ux=None, Utheta=None, initial_conditions="constant"):
@@ -237,6 +254,164 @@ def _fir_filter_diag(
     return y, Uy_diag
 
 
+def _fir_filter_structured(
+    x, theta, Ux: StructuredCovariance, initial_conditions="constant"
+):
+    """Uncertainty propagation for signal x with structured covariance Ux
+       and fully certain FIR filter theta.
+
+       The output covariance is computed and returned in the compact representation
+       without ever forming a dense matrix, such that memory requirements scale
+       linearly in the signal length.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        filter input signal
+    theta : np.ndarray
+        FIR filter coefficients
+    Ux : ToeplitzCovariance or BandedCovariance
+        covariance associated with x
+    initial_conditions : str, optional
+        - "constant": assume signal + uncertainty are constant before t=0 (default)
+        - "zero": assume signal + uncertainty are zero before t=0
+
+    Returns
+    -------
+    y : np.ndarray
+        FIR filter output signal
+    Uy : ToeplitzCovariance or BandedCovariance
+        covariance of filter output y, a :class:`ToeplitzCovariance` for a
+        Toeplitz Ux and constant initial conditions, a :class:`BandedCovariance`
+        otherwise
+
+    References
+    ----------
+    * Elster and Link 2008 [Elster2008]_
+    """
+
+    if initial_conditions == "constant":
+        x0 = x[0]
+
+    # Note: currently only used in testing for comparison against Monte Carlo method
+    elif initial_conditions == "zero":
+        x0 = 0.0
+
+    else:
+        raise ValueError(
+            f"_fit_filter: You provided 'initial_conditions' = '{initial_conditions}'."
+            f"However, only 'zero' or 'constant' are currently supported."
+        )
+
+    # propagate filter
+    y, _ = lfilter(theta, 1.0, x, zi=x0 * lfilter_zi(theta, 1.0))
+
+    # propagate uncertainty, a stationary input stays stationary, if it was already
+    # stationary before t=0
+    if isinstance(Ux, ToeplitzCovariance) and initial_conditions == "constant":
+        Uy = _propagate_toeplitz_covariance(theta, Ux)
+    else:
+        Uy = _propagate_banded_covariance(theta, Ux.to_banded(), initial_conditions)
+
+    return y, Uy
+
+
+def _propagate_toeplitz_covariance(
+    theta: np.ndarray, Ux: ToeplitzCovariance
+) -> ToeplitzCovariance:
+    """Compute the generator of theta^T * Ux * theta for stationary Ux
+
+    The output autocovariance is the two-sided input autocovariance convolved with
+    the autocorrelation of the filter coefficients.
+    """
+    theta_autocorrelation = np.correlate(theta, theta, mode="full")
+    two_sided_generator = np.r_[Ux.generator[:0:-1], Ux.generator]
+    generator = convolve(theta_autocorrelation, two_sided_generator)[
+        len(theta) + len(Ux.generator) - 2 :
+    ]
+    generator[0] = max(generator[0], 0.0)
+    return ToeplitzCovariance(generator, size=Ux.shape[0])
+
+
+def _propagate_banded_covariance(
+    theta: np.ndarray, Ux: BandedCovariance, initial_conditions: str
+) -> BandedCovariance:
+    """Compute the band storage of theta^T * Ux * theta for banded Ux
+
+    Each entry Uy[i, i + m] sums theta[k] * theta[l] * Ux[i - k, i + m - l]. For
+    fixed offsets delta = m - l + k inside Ux's band, this is a one-dimensional
+    convolution of the lagged filter coefficient products with the corresponding
+    diagonal of Ux, such that only O(bandwidth * len(theta)) convolutions are needed.
+    """
+    Ntheta = len(theta)
+    N = Ux.shape[0]
+    bandwidth = Ux.bandwidth
+    output_bandwidth = min(bandwidth + Ntheta - 1, N - 1)
+    bands = np.zeros((output_bandwidth + 1, N))
+
+    # number of samples each diagonal needs to be extended into the past
+    n_prepend = Ntheta - 1 + bandwidth
+    for delta in range(-bandwidth, bandwidth + 1):
+        diagonal = Ux.bands[abs(delta)]
+        if initial_conditions == "constant":
+            past_value = diagonal[0]
+        else:  # "zero"
+            past_value = 0.0
+        diagonal_extended = np.r_[np.full(n_prepend, past_value), diagonal]
+
+        # entries with delta < 0 are stored in the band starting delta rows earlier
+        start = n_prepend - (Ntheta - 1) + min(delta, 0)
+        series = diagonal_extended[start : start + N + Ntheta - 1]
+
+        for m in range(output_bandwidth + 1):
+            lag = m - delta
+            if abs(lag) > Ntheta - 1:
+                continue
+            first, last = max(0, -lag), min(Ntheta, Ntheta - lag)
+            kernel = np.zeros(Ntheta)
+            kernel[first:last] = theta[first:last] * theta[first + lag : last + lag]
+            bands[m] += convolve(kernel, series, mode="valid")
+
+    bands[0] = bands[0].clip(min=0)
+    return BandedCovariance(bands)
+
+
+def _structured_input_covariance(
+    sigma_noise, length: int, kind: str
+) -> StructuredCovariance:
+    """Bring the supported inputs for sigma_noise into a structured representation"""
+    if is_structured_covariance(sigma_noise):
+        if sigma_noise.shape != (length, length):
+            raise ValueError(
+                f"FIRuncFilter: sigma_noise is of shape {sigma_noise.shape}, but "
+                f"expected shape is {(length, length)}."
+            )
+        return sigma_noise
+
+    if sigma_noise is None:
+        return ToeplitzCovariance(np.zeros(1), size=length)
+
+    if isinstance(sigma_noise, float):
+        return ToeplitzCovariance(np.array([sigma_noise**2]), size=length)
+
+    if isinstance(sigma_noise, np.ndarray):
+        if len(sigma_noise.shape) == 1:
+            if kind == "diag":
+                return BandedCovariance(np.square(sigma_noise))
+            if kind == "corr":
+                return ToeplitzCovariance(sigma_noise, size=length)
+            raise ValueError(
+                f"Unknown kind `{kind}`. Don't now how to interpret the array "
+                f"sigma_noise."
+            )
+        if len(sigma_noise.shape) == 2:
+            return BandedCovariance.from_dense(sigma_noise)
+
+    raise ValueError(
+        "Unsupported value of sigma_noise. Please check the documentation."
+    )
+
+
 def _stationary_prepend_covariance(U, n):
     """Prepend covariance matrix U by n steps into the past"""
 
@@ -258,6 +433,7 @@ def FIRuncFilter(
     blow=None,
     kind="corr",
     return_full_covariance=False,
+    return_structured_covariance=False,
 ):
     """Uncertainty propagation for signal y and uncertain FIR filter theta
 
@@ -271,10 +447,12 @@ def FIRuncFilter(
     ----------
     y : np.ndarray
         filter input signal
-    sigma_noise : float or np.ndarray
+    sigma_noise : float, np.ndarray, ToeplitzCovariance or BandedCovariance
         - float: standard deviation of white noise in y
         - 1D-array: interpretation depends on kind
         - 2D-array: full covariance of input
+        - :class:`ToeplitzCovariance` or :class:`BandedCovariance`: compact
+          representation of the full covariance of input
 
     theta : np.ndarray
         FIR filter coefficients
@@ -296,16 +474,32 @@ def FIRuncFilter(
 
     return_full_covariance : bool, optional
         whether or not to return a full covariance of the output, defaults to False
+    return_structured_covariance : bool, optional
+        whether or not to return the full covariance of the output in a compact
+        representation, which requires memory only linear in the signal length,
+        defaults to False. This requires a fully certain filter, i.e. `Utheta =
+        None`. Stationary inputs (float or "corr" sigma_noise) result in a
+        :class:`ToeplitzCovariance`, all other inputs in a :class:`BandedCovariance`.
+        Use their `to_dense()` method to get the dense matrix. The circularly
+        shifted covariance is not structured anymore, so this requires `shift = 0`.
 
     Returns
     -------
     x : np.ndarray
         FIR filter output signal
-    Ux : np.ndarray
+    Ux : np.ndarray, ToeplitzCovariance or BandedCovariance
         - return_full_covariance == False : point-wise standard uncertainties
           associated with x (default)
         - return_full_covariance == True : covariance matrix containing uncertainties
           associated with x
+        - return_structured_covariance == True : compact representation of the
+          covariance matrix containing uncertainties associated with x
+
+    Raises
+    ------
+    NotImplementedError
+        if return_structured_covariance is True, but Utheta is given or shift is
+        not 0
 
     References
     ----------
@@ -330,6 +524,34 @@ def FIRuncFilter(
     ## calculation.
     ## Check this example: <examples\digital_filtering\FIRuncFilter_runtime_comparison.py>
 
+    if return_structured_covariance and shift != 0:
+        raise NotImplementedError(
+            "FIRuncFilter: the circularly shifted output covariance is not "
+            "structured anymore and thus cannot be returned in a structured "
+            "representation. Please provide 'shift = 0' or set "
+            "'return_structured_covariance=False'."
+        )
+    if is_structured_covariance(sigma_noise) or return_structured_covariance:
+        if Utheta is None:
+            return _fir_unc_filter_structured(
+                y,
+                sigma_noise,
+                theta,
+                shift,
+                blow,
+                kind,
+                return_full_covariance,
+                return_structured_covariance,
+            )
+        if return_structured_covariance:
+            raise NotImplementedError(
+                "FIRuncFilter: the output covariance of an uncertain filter is dense "
+                "in general and thus cannot be returned in a structured "
+                "representation. Please provide 'Utheta = None' or set "
+                "'return_structured_covariance=False'."
+            )
+        sigma_noise = sigma_noise.to_dense()
+
     # note to user
     if not return_full_covariance:
         print(
@@ -439,17 +661,250 @@ def FIRuncFilter(
             return x, np.sqrt(np.abs(np.diag(Ux)))
 
 
+def _fir_unc_filter_structured(
+    y,
+    sigma_noise,
+    theta,
+    shift,
+    blow,
+    kind,
+    return_full_covariance,
+    return_structured_covariance,
+):
+    """Compute FIRuncFilter for a fully certain filter with structured covariances"""
+    Uy = _structured_input_covariance(sigma_noise, len(y), kind)
+
+    # filter operation(s)
+    if isinstance(blow, np.ndarray):
+        # apply (fully certain) lowpass-filter
+        xlow, Ulow = _fir_filter_structured(y, blow, Uy, initial_conditions="constant")
+
+        # apply filter to lowpass-filtered signal
+        x, Ux = _fir_filter_structured(xlow, theta, Ulow, initial_conditions="constant")
+
+    else:
+        # apply filter to input signal
+        x, Ux = _fir_filter_structured(y, theta, Uy, initial_conditions="constant")
+
+    # shift result, a circularly shifted covariance is not structured anymore
+    x = np.roll(x, -int(shift))
+    if return_structured_covariance:
+        return x, Ux
+    if return_full_covariance:
+        return x, np.roll(Ux.to_dense(), (-int(shift), -int(shift)), axis=(0, 1))
+    return x, np.roll(np.sqrt(np.abs(Ux.diagonal())), -int(shift))
+
+
+def FIRuncFilter_realtime(
+    x,
+    Ux,
+    theta,
+    Utheta=None,
+    state=None,
+    kind="diag",
+    return_full_covariance=False,
+):
+    """Uncertainty propagation for successive blocks of signal x and FIR filter theta
+
+    The internal state carries the last `len(theta) - 1` input values and their
+    uncertainties from one call to the next. Processing a signal block by block thus
+    results in exactly the same values as processing it at once with
+    :func:`FIRuncFilter`, while memory requirements only depend on the block length.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        current block of the filter input signal
+    Ux : float or np.ndarray
+        - float: standard deviation of white noise in x (requires `kind="diag"`)
+        - 1D-array: interpretation depends on kind
+    theta : np.ndarray
+        FIR filter coefficients
+    Utheta : np.ndarray, optional
+        - 1D-array: coefficient-wise standard uncertainties of filter
+        - 2D-array: covariance matrix associated with theta
+
+        if the filter is fully certain, use `Utheta = None` (default) to make use of
+        more efficient calculations.
+    state : dict, optional (default: None)
+        An internal state to start from - e.g. from a previous run of
+        :func:`FIRuncFilter_realtime`.
+
+        * If not given, the state is calculated such that the signal was constant
+          before the given block
+        * If given, the input parameters (theta, Utheta, kind) are ignored and the
+          ones stored in the state's cache are used instead. A valid new state can
+          always be generated by using :func:`FIR_get_initial_state`.
+    kind : string, optional (default: "diag")
+        defines the interpretation of Ux, if Ux is a 1D-array
+
+        - "diag": point-wise standard uncertainties of non-stationary white noise
+        - "corr": single sided autocovariance of stationary (colored/correlated)
+          noise, which is expected to be the same for all blocks
+
+    return_full_covariance : bool, optional
+        whether or not to return the full covariance of the current output block,
+        defaults to False
+
+    Returns
+    -------
+    y : np.ndarray
+        current block of the FIR filter output signal
+    Uy : np.ndarray
+        - return_full_covariance == False : point-wise standard uncertainties
+          associated with y (default)
+        - return_full_covariance == True : covariance matrix of the current output
+          block
+    state : dict
+        dictionary of updated internal state
+
+    References
+    ----------
+    * Elster and Link 2008 [Elster2008]_
+    """
+
+    # check user input
+    if kind not in ("diag", "corr"):
+        raise ValueError(
+            "`kind` is expected to be either 'diag' or 'corr' but '{KIND}' was "
+            "given.".format(KIND=kind)
+        )
+
+    # make Ux an array of standard uncertainties in the "diag" case
+    if not isinstance(Ux, np.ndarray):
+        if kind != "diag":
+            raise ValueError(
+                "FIRuncFilter_realtime: Ux of type float requires `kind='diag'`."
+            )
+        Ux = np.full(x.shape, Ux)
+
+    if state is None:
+        state = FIR_get_initial_state(
+            theta,
+            Utheta=Utheta,
+            x0=x[0],
+            U0=Ux[0] if kind == "diag" else 0.0,
+            Ux=Ux if kind == "corr" else None,
+        )
+
+    theta, Utheta, acf = state["cache"]["processed_input"]
+    Ntheta = len(theta)
+
+    # propagate filter
+    y, zi = lfilter(theta, 1.0, x, zi=state["zi"])
+
+    # extend signal and variances by the carried past values
+    x_extended = np.r_[state["x"], x]
+    if acf is None:
+        Ux_diag_extended = np.r_[state["Ux"], np.square(Ux)]
+
+    if return_full_covariance:
+        if acf is None:
+            Ux_extended = np.diag(Ux_diag_extended)
+        else:
+            Ux_extended = toeplitz(trimOrPad(acf, len(x_extended)))
+        Uy = np.zeros((len(x), len(x)))
+
+        # calc subterm theta^T * Ux * theta
+        Uy += _clip_main_diagonal_to_zero_from_below(
+            convolve(np.outer(theta, theta), Ux_extended, mode="valid")
+        )
+        if Utheta is not None:
+            # calc subterm x^T * Utheta * x
+            Uy += _clip_main_diagonal_to_zero_from_below(
+                convolve(np.outer(x_extended, x_extended), Utheta, mode="valid")
+            )
+            # calc subterm Tr(Ux * Utheta)
+            Uy += _clip_main_diagonal_to_zero_from_below(
+                convolve(Ux_extended, Utheta.T, mode="valid")
+            )
+    else:
+        # calc subterm theta^T * Ux * theta
+        if acf is None:
+            Uy = convolve(np.square(theta), Ux_diag_extended, mode="valid").clip(min=0)
+        else:
+            Ux_window = toeplitz(trimOrPad(acf, Ntheta))
+            Uy = np.full(len(x), max(theta @ Ux_window @ theta, 0.0))
+        if Utheta is not None:
+            # calc subterm x^T * Utheta * x on the reversed sliding windows
+            x_windows = sliding_window_view(x_extended, Ntheta)[:, ::-1]
+            Uy += np.einsum(
+                "ik,kl,il->i", x_windows, Utheta, x_windows, optimize=True
+            ).clip(min=0)
+            # calc subterm Tr(Ux * Utheta)
+            if acf is None:
+                Uy += convolve(Ux_diag_extended, np.diag(Utheta), mode="valid").clip(
+                    min=0
+                )
+            else:
+                Uy += max(np.sum(Ux_window * Utheta.T), 0.0)
+        Uy = np.sqrt(np.abs(Uy))
+
+    # carry the last Ntheta-1 samples over to the next block
+    state.update({"zi": zi, "x": x_extended[len(x_extended) - (Ntheta - 1) :]})
+    if acf is None:
+        state["Ux"] = Ux_diag_extended[len(Ux_diag_extended) - (Ntheta - 1) :]
+
+    return y, Uy, state
+
+
+def FIR_get_initial_state(theta, Utheta=None, x0=1.0, U0=1.0, Ux=None):
+    """
+    Calculate the internal state for the FIRuncFilter_realtime-function corresponding
+    to stationary non-zero input signal.
+
+    Parameters
+    ----------
+        theta : np.ndarray
+            FIR filter coefficients
+        Utheta : np.ndarray, optional (default: None)
+            - 1D-array: coefficient-wise standard uncertainties of filter
+            - 2D-array: covariance matrix associated with theta
+        x0 : float, optional (default: 1.0)
+            stationary input value
+        U0 : float, optional (default: 1.0)
+            stationary input uncertainty
+        Ux : np.ndarray, optional (default: None)
+            single sided autocovariance of stationary (colored/correlated) noise
+            (needed in the `kind="corr"` case of :func:`FIRuncFilter_realtime`)
+
+    Returns
+    -------
+    internal_state : dict
+        dictionary of state
+    """
+    theta = np.asarray(theta, dtype=float)
+    Ntheta = len(theta)
+
+    if isinstance(Utheta, np.ndarray) and len(Utheta.shape) == 1:
+        Utheta = np.diag(np.square(Utheta))
+
+    # bring results into the format that is used within FIRuncFilter_realtime
+    # this is the only place, where the structure of the cache is "documented"
+    cache = {"processed_input": (theta, Utheta, Ux)}
+    state = {
+        "zi": x0 * lfilter_zi(theta, 1.0),
+        "x": np.full(Ntheta - 1, x0, dtype=float),
+        "Ux": None if isinstance(Ux, np.ndarray) else np.full(Ntheta - 1, U0**2),
+        "cache": cache,
+    }
+
+    return state
+
+
 def IIRuncFilter(x, Ux, b, a, Uab=None, state=None, kind="corr"):
     """
     Uncertainty propagation for the signal x and the uncertain IIR filter (b,a)
 
     Parameters
     ----------
-        x : np.ndarray
-            filter input signal
+        x : np.ndarray of shape (N,) or (channels, N)
+            filter input signal, a 2D-array is treated as stack of independent
+            channels, which are processed simultaneously
         Ux : float or np.ndarray
             float:    standard deviation of white noise in x (requires `kind="diag"`)
-            1D-array: interpretation depends on kind
+            1D-array: interpretation depends on kind, shared by all channels
+            2D-array: channel-wise interpretation depending on kind
         b : np.ndarray
             filter numerator coefficients
         a : np.ndarray
@@ -470,9 +925,9 @@ def IIRuncFilter(x, Ux, b, a, Uab=None, state=None, kind="corr"):
 
     Returns
     -------
-        y : np.ndarray
+        y : np.ndarray of the same shape as x
             filter output signal
-        Uy : np.ndarray
+        Uy : np.ndarray of the same shape as x
             uncertainty associated with y
         state : dict
             dictionary of updated internal state
@@ -514,6 +969,9 @@ def IIRuncFilter(x, Ux, b, a, Uab=None, state=None, kind="corr"):
                 category=UserWarning,
             )
 
+    if len(x.shape) == 2:
+        return _iir_unc_filter_multichannel(x, Ux, b, a, Uab, state, kind)
+
     # system, corr_unc and processed_input are cached as well to reduce computational load
     if state is None:
         # calculate initial state
@@ -593,6 +1051,105 @@ def IIRuncFilter(x, Ux, b, a, Uab=None, state=None, kind="corr"):
     return y, Uy, state
 
 
+def _iir_unc_filter_multichannel(x, Ux, b, a, Uab, state, kind):
+    """Stacked variant of the state-space loop of IIRuncFilter for x of shape (C, N)
+
+    All channels share the filter, such that each time step updates the internal
+    states of all channels at once by broadcasting matrix products instead of looping
+    over the channels.
+    """
+    n_channels, n_samples = x.shape
+
+    # bring Ux into shape (C, N) for "diag" and (C, L) for "corr"
+    Ux = np.broadcast_to(Ux, x.shape if np.ndim(Ux) == 0 else Ux.shape)
+    if len(Ux.shape) == 1:
+        Ux = np.broadcast_to(Ux, (n_channels, len(Ux)))
+
+    if state is None:
+        # calculate initial state channel by channel
+        states = [
+            IIR_get_initial_state(b, a, Uab=Uab, x0=x[c, 0], U0=Ux[c, 0])
+            if kind == "diag"
+            else IIR_get_initial_state(
+                b, a, Uab=Uab, x0=x[c, 0], U0=np.sqrt(Ux[c, 0]), Ux=Ux[c]
+            )
+            for c in range(n_channels)
+        ]
+        state = {
+            "z": np.stack([channel_state["z"] for channel_state in states]),
+            "dz": np.stack([channel_state["dz"] for channel_state in states]),
+            "P": np.stack([channel_state["P"] for channel_state in states]),
+            "cache": {
+                **states[0]["cache"],
+                "corr_unc": np.array(
+                    [channel_state["cache"]["corr_unc"] for channel_state in states]
+                ),
+            },
+        }
+
+    z = state["z"]  # shape (C, p, 1)
+    dz = state["dz"]  # shape (C, p, p)
+    P = state["P"]  # shape (C, p, p)
+    A, bs, cT, b0 = state["cache"]["system"]
+    corr_unc = state["cache"]["corr_unc"]
+    b, a, Uab = state["cache"]["processed_input"]
+    p = len(a) - 1
+
+    # quantities which are constant over time
+    c = cT[0]
+    A_T = A.T
+    bs_bs = np.outer(bs, bs)
+    a_reversed = a[1:][::-1]
+    b0 = b0.item()
+
+    # phi: dy/dtheta for all channels
+    phi = np.empty((n_channels, 2 * p + 1))
+    dA_z = np.zeros((n_channels, p, p))
+
+    # output y, output uncertainty Uy
+    y = np.zeros_like(x, dtype=float)
+    Uy = np.zeros_like(x, dtype=float)
+
+    # implementation of the state-space formulas from the paper
+    for n in range(n_samples):
+        z_reversed = z[:, ::-1, 0]
+
+        # calculate output according to formulas (7)
+        y[:, n] = z[:, :, 0] @ c + b0 * x[:, n]  # (7)
+
+        # output uncertainty according to formulas (12) and (19)
+        if kind == "diag":
+            Uy[:, n] = np.einsum("i,cij,j->c", c, P, c) + np.square(b0 * Ux[:, n])
+        else:  # "corr"
+            Uy[:, n] = corr_unc
+
+        # if Uab is not given, use faster implementation
+        if isinstance(Uab, np.ndarray):
+            # calculate phi according to formulas (13) and (15) from paper
+            phi[:, :p] = dz.transpose(0, 2, 1) @ c - b0 * z_reversed
+            phi[:, p] = x[:, n] - z[:, :, 0] @ a_reversed
+            phi[:, p + 1 :] = z_reversed
+            Uy[:, n] += np.einsum("ci,ij,cj->c", phi, Uab, phi)
+
+        # timestep update preparations
+        if kind == "diag":
+            u_square = np.square(Ux[:, n])  # as in formula (18)
+        else:  # "corr"
+            u_square = Ux[:, 0]  # adopted for kind == "corr"
+        dA_z[:, -1, :] = -z_reversed
+
+        # timestep update
+        P = A @ P @ A_T + u_square[:, np.newaxis, np.newaxis] * bs_bs  # (18)
+        dz = A @ dz + dA_z  # state derivative, formula (17)
+        z = A @ z + bs * x[:, n, np.newaxis, np.newaxis]  # state, formula (6)
+
+    Uy = np.sqrt(np.abs(Uy))  # calculate point-wise standard uncertainties
+
+    # return result and internal state
+    state.update({"z": z, "dz": dz, "P": P})
+    return y, Uy, state
+
+
 def _tf2ss(b, a):
     """
     Variant of :func:`scipy.signal.tf2ss` that fits the definitions of [Link2009]_
@@ -8,6 +8,7 @@ from hypothesis.strategies import composite
 from numpy.testing import assert_allclose, assert_almost_equal
 from typing import Callable, Dict, Optional, Tuple, Union
 
+from PyDynamic.misc.structured_covariance import ToeplitzCovariance
 from PyDynamic.misc.testsignals import multi_sine
 from PyDynamic.misc.tools import (
     complex_2_real_imag as c2ri,
@@ -19,6 +20,7 @@ from PyDynamic.uncertainty.propagate_DFT import (
     _apply_window,
     _prod,
     AmpPhase2Time,
+    get_DFT_plan,
     GUM_DFT,
     GUM_iDFT,
     Time2AmpPhase,
@@ -490,3 +492,108 @@ def test__prod_against_known_result_for_vector_b():
         ),
         np.array([[0, 1, 4, 9], [0, 5, 12, 21], [0, 9, 20, 33]]),
     )
+
+
+@pytest.mark.parametrize("signal_length, dft_length", [(64, 64), (33, 33), (40, 64)])
+@pytest.mark.parametrize("uncertainty_kind", ["float", "vector", "toeplitz"])
+def test_GUM_DFT_matrix_free_equals_dense(signal_length, dft_length, uncertainty_kind):
+    x = np.random.randn(signal_length)
+    if uncertainty_kind == "float":
+        Ux, Ux_dense = 0.1, 0.1 * np.eye(signal_length)
+    elif uncertainty_kind == "vector":
+        Ux = np.random.rand(signal_length)
+        Ux_dense = np.diag(Ux)
+    else:
+        Ux = ToeplitzCovariance(0.1 * np.exp(-np.arange(10) / 3), size=signal_length)
+        Ux_dense = Ux.to_dense()
+    X, UX = GUM_DFT(x, Ux, N=dft_length)
+    X_dense, UX_dense = GUM_DFT(x, Ux_dense, N=dft_length)
+    assert_allclose(X, X_dense)
+    if uncertainty_kind == "float":
+        UX_dense = np.diag(UX_dense)
+    assert_allclose(UX, UX_dense, atol=1e-12)
+
+
+def test_GUM_DFT_return_blocks():
+    x = np.random.randn(50)
+    Ux = ToeplitzCovariance(0.1 * np.exp(-np.arange(5)), size=len(x))
+    blocks = ("CC", "CS", "SS", "diagonal", "CS_diagonal")
+    _, UX_blocks = GUM_DFT(x, Ux, return_blocks=blocks)
+    _, UX_dense_blocks = GUM_DFT(x, Ux.to_dense(), return_blocks=blocks)
+    assert set(UX_blocks) == set(blocks)
+    for name in blocks:
+        assert_allclose(UX_blocks[name], UX_dense_blocks[name], atol=1e-12)
+    assert_allclose(UX_blocks["CS_diagonal"], np.diag(UX_blocks["CS"]))
+
+
+def test_GUM_DFT_unknown_block():
+    with pytest.raises(ValueError, match="return_blocks"):
+        GUM_DFT(np.ones(8), 0.1, return_blocks=("XY",))
+
+
+def test_GUM_DFT_toeplitz_with_window():
+    with pytest.raises(NotImplementedError):
+        GUM_DFT(
+            np.ones(8),
+            ToeplitzCovariance(np.ones(2), size=8),
+            window=np.hanning(8),
+        )
+
+
+@pytest.mark.parametrize("N, signal_length, Nx", [(32, 32, None), (32, 20, 16)])
+def test_DFT_plan_equals_GUM_DFT_and_GUM_iDFT(N, signal_length, Nx):
+    x = np.random.randn(signal_length)
+    Ux = scl.toeplitz(0.01 * np.exp(-np.arange(signal_length) / 4))
+    window = np.hanning(signal_length)
+    plan = get_DFT_plan(N, window=window, Nx=Nx)
+
+    X, UX = plan.forward(x, Ux)
+    X_expected, UX_expected = GUM_DFT(x, Ux, N=N, window=window)
+    assert_allclose(X, X_expected)
+    assert_allclose(UX, UX_expected)
+
+    x_inv, Ux_inv = plan.inverse(X, UX)
+    x_inv_expected, Ux_inv_expected = GUM_iDFT(X, UX, Nx=Nx)
+    assert_allclose(x_inv, x_inv_expected)
+    assert_allclose(Ux_inv, Ux_inv_expected)
+
+
+def test_GUM_DFT_square_Ux_is_shared_for_stack_of_as_many_signals():
+    x = np.random.randn(32, 32)
+    Ux = scl.toeplitz(np.exp(-np.arange(32) / 3))
+    X, UX = GUM_DFT(x, Ux)
+    for index in range(len(x)):
+        X_expected, UX_expected = GUM_DFT(x[index], Ux)
+        assert_allclose(UX[index], UX_expected, atol=1e-12)
+
+
+def test_get_DFT_plan_is_cached():
+    window = np.hanning(16)
+    plan = get_DFT_plan(16, window=window)
+    assert get_DFT_plan(16, window=window.copy()) is plan
+    assert get_DFT_plan(16) is not plan
+    assert get_DFT_plan(16, window=window, Nx=8) is not plan
+
+
+@pytest.mark.parametrize(
+    "Ux_shape", [None, (32,), (32, 32), (3, 32), (3, 32, 32)], ids=str
+)
+@pytest.mark.parametrize("window_and_length", [{}, {"window": np.hanning(32), "N": 40}])
+def test_GUM_DFT_stacked_equals_single(Ux_shape, window_and_length):
+    x = np.random.randn(3, 32)
+    if Ux_shape is None:
+        Ux = 0.1
+    elif len(Ux_shape) == 3:
+        Ux = np.array(
+            [scl.toeplitz(np.exp(-np.arange(32) / (3 + i))) for i in range(3)]
+        )
+    elif Ux_shape == (32, 32):
+        Ux = scl.toeplitz(np.exp(-np.arange(32) / 3))
+    else:
+        Ux = np.random.rand(*Ux_shape)
+    X, UX = GUM_DFT(x, Ux, **window_and_length)
+    for index in range(len(x)):
+        Ux_single = Ux if np.ndim(Ux) < 2 or Ux_shape == (32, 32) else Ux[index]
+        X_expected, UX_expected = GUM_DFT(x[index], Ux_single, **window_and_length)
+        assert_allclose(X[index], X_expected)
+        assert_allclose(UX[index], UX_expected, atol=1e-12)
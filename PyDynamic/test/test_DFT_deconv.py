@@ -8,7 +8,7 @@ from hypothesis import given, HealthCheck, settings
 from hypothesis.strategies import composite, DrawFn, SearchStrategy
 from numpy.testing import assert_allclose
 
-from PyDynamic.uncertainty.propagate_DFT import DFT_deconv
+from PyDynamic.uncertainty.propagate_DFT import DFT_deconv, DFT_multiply
 from .conftest import (
     hypothesis_covariance_matrix_for_complex_vectors,
     hypothesis_float_vector,
@@ -210,3 +210,19 @@ def test_reveal_bug_in_dft_deconv_up_to_1_9(
         operator=complex_deconvolution_on_sets,
     )
     assert_allclose(u_deconv + 1, y_divided_by_h_mc_cov + 1)
+
+
+def test_dft_deconv_and_multiply_stacked_equal_single():
+    H = np.random.randn(10) + 2
+    UH = np.diag(np.random.rand(10)) * 1e-3
+    Y = np.random.randn(3, 10)
+    UY = np.random.rand(3, 10) * 1e-3
+    X, UX = DFT_deconv(H, Y, UH, UY)
+    YH, UYH = DFT_multiply(Y, H, UY, UH)
+    for index in range(len(Y)):
+        X_expected, UX_expected = DFT_deconv(H, Y[index], UH, UY[index])
+        assert_allclose(X[index], X_expected)
+        assert_allclose(UX[index], UX_expected, atol=1e-15)
+        YH_expected, UYH_expected = DFT_multiply(Y[index], H, np.diag(UY[index]), UH)
+        assert_allclose(YH[index], YH_expected)
+        assert_allclose(UYH[index], UYH_expected, atol=1e-15)
@@ -5,8 +5,9 @@ from typing import Dict
 
 import numpy as np
 import pytest
+import scipy.signal as dsp
 from hypothesis import assume, given, settings, strategies as hst
-from numpy.testing import assert_almost_equal, assert_equal
+from numpy.testing import assert_allclose, assert_almost_equal, assert_equal
 
 from PyDynamic import grpdelay, isstable, mapinside, sos_FreqResp
 from PyDynamic.model_estimation import fit_filter
@@ -360,3 +361,126 @@ def test_LSIIR_rms_output_format(parameters):
 @given(hst.booleans(), hst.booleans())
 def test_rms_is_required(return_rms, verbose):
     assert_equal(_rms_is_required(return_rms, verbose), return_rms or verbose)
+
+
+@pytest.mark.parametrize("Na, Nb", [(1, 1), (4, 4), (6, 3)])
+@pytest.mark.parametrize("tau", [0, 3])
+@pytest.mark.parametrize("inv", [False, True])
+def test_stacked_fits_equal_single_fits(Na, Nb, tau, inv, compute_fitting_parameters):
+    # The normal equations are numerically singular in general, so we compare the
+    # fitted frequency responses for the original example of a second order system.
+    f = np.linspace(0, 80e3, 30)
+    lsiir_base_params = {"Na": Na, "Nb": Nb, "f": f, "Fs": 500e3}
+    H = sos_FreqResp(0.124, 0.0055, 36e3, f)
+    Hs = H * np.linspace(0.5, 1.5, 3)[:, np.newaxis]
+    fit_params = {
+        "tau": tau,
+        **compute_fitting_parameters(LSIIR_params=lsiir_base_params),
+        "Na": Na,
+        "Nb": Nb,
+        "inv": inv,
+    }
+    bs, as_ = fit_filter._compute_actual_iir_least_squares_fits(Hs=Hs, **fit_params)
+    stable = fit_filter._are_digital_filters_stable(as_)
+    for H, b_stacked, a_stacked, stable_stacked in zip(Hs, bs, as_, stable):
+        b, a = fit_filter._compute_actual_iir_least_squares_fit(H=H, **fit_params)
+        freq_resp = dsp.freqz(b, a, fit_params["omega"])[1]
+        assert_allclose(
+            dsp.freqz(b_stacked, a_stacked, fit_params["omega"])[1],
+            freq_resp,
+            atol=1e-6 * np.max(np.abs(freq_resp)),
+        )
+        assert stable_stacked == isstable(b_stacked, a_stacked, "digital")
+
+
+def test_fit_iir_with_uncertainty_returns_stabilization_statistics():
+    N = 10
+    f = np.arange(N)
+    H = np.random.randn(N) + 1j * np.random.randn(N)
+    UH = np.diag(1 + np.random.rand(2 * N))
+
+    *_, stab_stats = fit_filter.LSIIR(
+        H=H, UH=UH, Nb=3, Na=6, f=f, Fs=1.0, tau=2, mc_runs=5, return_stab_stats=True
+    )
+    assert stab_stats.shape == (5,)
+    assert np.all(stab_stats["tau"] >= 2)
+    assert np.all((stab_stats["stab_iters"] >= 1) & (stab_stats["stab_iters"] <= 50))
+    assert stab_stats["stable"].dtype == bool
+
+
+@pytest.mark.slow
+def test_fit_iir_with_uncertainty_in_parallel_is_reproducible():
+    N = 10
+    f = np.arange(N)
+    H = np.random.randn(N) + 1j * np.random.randn(N)
+    UH = np.diag(1 + np.random.rand(2 * N))
+    parameters = {"H": H, "UH": UH, "Nb": 3, "Na": 6, "f": f, "Fs": 1.0, "tau": 2}
+
+    results = [
+        fit_filter.LSIIR(**parameters, mc_runs=20, n_cpu=2, seed=1, verbose=False)
+        for _ in range(2)
+    ]
+    for result, other_result in zip(*results):
+        assert_equal(result, other_result)
+
+
+def test_fit_iir_with_uncertainty_and_seed_keeps_global_random_state():
+    N = 10
+    f = np.arange(N)
+    H = np.random.randn(N) + 1j * np.random.randn(N)
+    UH = np.diag(1 + np.random.rand(2 * N))
+    parameters = {"H": H, "UH": UH, "Nb": 3, "Na": 6, "f": f, "Fs": 1.0, "tau": 2}
+
+    global_random_state = np.random.get_state()
+    results = fit_filter.LSIIR(**parameters, mc_runs=5, seed=1, verbose=False)
+    assert_equal(np.random.get_state()[1], global_random_state[1])
+    assert_equal(np.random.get_state()[2], global_random_state[2])
+    for result, other_result in zip(
+        results, fit_filter.LSIIR(**parameters, mc_runs=5, seed=1, verbose=False)
+    ):
+        assert_equal(result, other_result)
+
+
+@pytest.fixture(scope="module")
+def uncertain_second_order_system():
+    f = np.linspace(0, 80e3, 30)
+    H = sos_FreqResp(0.124, 0.0055, 36e3, f)
+    UH = np.diag(np.full(2 * len(f), 1e-6))
+    return {"H": H, "UH": UH, "Nb": 2, "Na": 2, "f": f, "Fs": 500e3, "tau": 0}
+
+
+@pytest.mark.slow
+def test_fit_iir_with_uncertainty_in_parallel_without_seed_equals_serial(
+    uncertain_second_order_system,
+):
+    results = []
+    for n_cpu in (1, 2):
+        np.random.seed(0)
+        results.append(
+            fit_filter.LSIIR(
+                **uncertain_second_order_system, mc_runs=50, n_cpu=n_cpu, verbose=False
+            )
+        )
+    for result, other_result in zip(*results):
+        assert_allclose(result, other_result, rtol=1e-10, atol=1e-15)
+
+
+@pytest.mark.slow
+def test_fit_iir_with_uncertainty_in_parallel_with_seed_equals_serial_statistics(
+    uncertain_second_order_system,
+):
+    mc_runs = 2000
+    b, a, tau, Uab = fit_filter.LSIIR(
+        **uncertain_second_order_system, mc_runs=mc_runs, seed=1, verbose=False
+    )
+    b_par, a_par, tau_par, Uab_par = fit_filter.LSIIR(
+        **uncertain_second_order_system, mc_runs=mc_runs, n_cpu=2, seed=1, verbose=False
+    )
+    # The shares draw other samples, so only the statistics agree.
+    assert not np.array_equal(Uab_par, Uab)
+    assert tau_par == tau
+    standard_errors = np.sqrt(2 * np.diag(Uab) / mc_runs)
+    assert np.all(
+        np.abs(np.r_[a_par[1:], b_par] - np.r_[a[1:], b]) < 5 * standard_errors
+    )
+    assert_allclose(np.diag(Uab_par), np.diag(Uab), rtol=0.2)
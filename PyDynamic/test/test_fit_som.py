@@ -5,6 +5,7 @@ import pytest
 from hypothesis import assume, given, settings, Verbosity
 from hypothesis.strategies import composite
 from numpy.random import default_rng
+from numpy.testing import assert_allclose
 
 from PyDynamic import fit_som, make_semiposdef, sos_FreqResp
 from PyDynamic.examples.demonstrate_fit_som import (
@@ -134,3 +135,21 @@ def test_fit_som_with_zero_frequency_response_but_without_MCruns_or_UH(params):
     assume(params["MCruns"] is None or params["UH"] is None)
     with pytest.raises(ValueError):
         fit_som(**params)
+
+
+@given(random_input_to_fit_som(guarantee_UH_as_matrix=True))
+def test_fit_som_with_nonpositive_chunk_size(params):
+    params["chunk_size"] = 0
+    with pytest.raises(ValueError):
+        fit_som(**params)
+
+
+@given(random_input_to_fit_som(guarantee_UH_as_matrix=True))
+@settings(deadline=None)
+def test_fit_som_in_chunks_equals_at_once(params):
+    np.random.seed(0)
+    pars, Upars = fit_som(**params)
+    np.random.seed(0)
+    pars_chunked, Upars_chunked = fit_som(chunk_size=3, **params)
+    assert_allclose(pars_chunked, pars, rtol=1e-9)
+    assert_allclose(Upars_chunked, Upars, rtol=1e-6, atol=1e-15)
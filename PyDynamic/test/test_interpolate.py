@@ -9,7 +9,11 @@ from hypothesis.strategies import composite
 from numpy.testing import assert_allclose
 from pytest import raises
 
-from PyDynamic.uncertainty.interpolate import interp1d_unc, make_equidistant
+from PyDynamic.uncertainty.interpolate import (
+    _cubic_bspline_design_matrix,
+    interp1d_unc,
+    make_equidistant,
+)
 
 _MIN_NODES_FOR_CUBIC_SPLINE = 4
 
@@ -609,10 +613,13 @@ def test_returnc_with_extrapolation_check_c_interp1d_unc(
     )
 )
 @pytest.mark.slow
-def test_value_error_for_returnc_interp1d_unc(interp_inputs):
-    # Check erroneous calls with returnC and wrong kind.
-    with raises(NotImplementedError):
-        interp1d_unc(**interp_inputs)
+def test_returnc_for_trivial_kinds_interp1d_unc(interp_inputs):
+    # Check that the sensitivities of the trivial kinds pick exactly one original
+    # value for each interpolated value.
+    _, y_new, uy_new, C = interp1d_unc(**interp_inputs)
+    assert np.all(np.count_nonzero(C, 1) == 1)
+    assert_allclose(C @ interp_inputs["y"], y_new)
+    assert_allclose(C @ np.abs(interp_inputs["uy"]), np.abs(uy_new))
 
 
 @given(hst.integers(min_value=3, max_value=1000))
@@ -742,3 +749,128 @@ def test_raise_not_implemented_yet_make_equidistant(interp_inputs):
     # Check that not implemented versions raise exceptions.
     with raises(NotImplementedError):
         make_equidistant(**interp_inputs)
+
+
+@pytest.mark.parametrize("kind", ["linear", "cubic", "previous", "next", "nearest"])
+@pytest.mark.parametrize(
+    "extrapolation",
+    [
+        {},
+        {"bounds_error": False, "fill_value": "extrapolate", "fill_unc": "extrapolate"},
+        {"bounds_error": False, "fill_value": (1.0, 2.0), "fill_unc": (0.1, 0.2)},
+    ],
+)
+def test_interp1d_unc_stacked_equals_single(kind, extrapolation):
+    x = np.linspace(0, 10, 21)
+    y, uy = np.random.randn(3, len(x)), np.random.rand(3, len(x))
+    x_new = np.linspace(-1, 11, 50) if extrapolation else np.linspace(0, 10, 50)
+    _, y_new, uy_new = interp1d_unc(x_new, x, y, uy, kind=kind, **extrapolation)
+    for y_single, uy_single, y_new_single, uy_new_single in zip(y, uy, y_new, uy_new):
+        _, y_expected, uy_expected = interp1d_unc(
+            x_new, x, y_single, uy_single, kind=kind, **extrapolation
+        )
+        assert_allclose(y_new_single, y_expected)
+        assert_allclose(uy_new_single, uy_expected)
+
+
+def test_cubic_sensitivities_equal_cardinal_splines_interp1d_unc():
+    # Check the banded sensitivities against the cardinal splines of White2017,
+    # i.e. the interpolating splines through the unit vectors.
+    from scipy.interpolate import BSpline, splrep
+
+    x = np.cumsum(np.random.uniform(0.5, 1.5, 200))
+    x_new = np.linspace(x[0], x[-1], 450)
+    y, uy = np.random.randn(len(x)), np.random.rand(len(x))
+    C_expected = np.empty((len(x_new), len(x)))
+    for i, y_unit in enumerate(np.eye(len(x))):
+        C_expected[:, i] = BSpline(*splrep(x, y_unit, s=0))(x_new)
+    _, y_new, uy_new, C = interp1d_unc(x_new, x, y, uy, kind="cubic", returnC=True)
+    assert_allclose(C, C_expected, atol=1e-10)
+    assert_allclose(C @ y, y_new, atol=1e-10)
+
+
+@pytest.mark.parametrize("n", [4, 5, 7, 30])
+def test_cubic_bspline_design_matrix_equals_unit_coefficient_bsplines(n):
+    # Evaluating the B-splines with unit vectors as coefficients works for all
+    # supported SciPy versions, unlike BSpline.design_matrix.
+    from scipy.interpolate import BSpline
+
+    x = np.cumsum(np.random.uniform(0.5, 1.5, n))
+    knots = np.concatenate((np.full(4, x[0]), x[2:-2], np.full(4, x[-1])))
+    x_new = np.concatenate((x, np.random.uniform(x[0], x[-1], 50)))
+    design_matrix = _cubic_bspline_design_matrix(x_new, knots)
+    assert design_matrix.nnz == 4 * len(x_new)
+    assert_allclose(
+        design_matrix.toarray(), BSpline(knots, np.eye(n), 3)(x_new), atol=1e-14
+    )
+
+
+@pytest.mark.parametrize("kind", ["linear", "cubic", "previous", "next", "nearest"])
+def test_interp1d_unc_with_covariance(kind):
+    # Check that a diagonal covariance leads to the same uncertainties as uy and
+    # that the returned covariance carries those on its diagonal.
+    from scipy import sparse
+
+    x = np.linspace(0, 10, 21)
+    y, uy = np.random.randn(len(x)), np.random.rand(len(x))
+    x_new = np.linspace(-1, 11, 50)
+    extrapolation = {
+        "bounds_error": False,
+        "fill_value": "extrapolate",
+        "fill_unc": "extrapolate",
+    }
+    _, y_new, uy_new = interp1d_unc(x_new, x, y, uy, kind=kind, **extrapolation)
+    for Uy in (np.diag(np.square(uy)), sparse.diags(np.square(uy))):
+        _, y_cov, uy_cov, U_y_new = interp1d_unc(
+            x_new, x, y, None, kind=kind, Uy=Uy, returnU=True, **extrapolation
+        )
+        assert_allclose(y_cov, y_new)
+        assert_allclose(uy_cov, uy_new)
+        assert sparse.issparse(U_y_new) == sparse.issparse(Uy)
+        assert_allclose(U_y_new.diagonal(), np.square(uy_new))
+
+
+def test_full_covariance_of_correlated_values_interp1d_unc():
+    # Check the propagation of a full covariance against C Uy C^T.
+    x = np.linspace(0, 10, 21)
+    y = np.random.randn(len(x))
+    L = np.random.randn(len(x), len(x))
+    Uy = L @ L.T
+    x_new = np.linspace(0, 10, 50)
+    for kind in ("linear", "cubic"):
+        _, _, uy_new, C, U_y_new = interp1d_unc(
+            x_new, x, y, None, kind=kind, Uy=Uy, returnC=True, returnU=True
+        )
+        assert_allclose(U_y_new, C @ Uy @ C.T)
+        assert_allclose(uy_new, np.sqrt(np.diag(C @ Uy @ C.T)))
+
+
+def test_raise_value_error_for_stacked_y_and_covariance_interp1d_unc():
+    x = np.linspace(0, 10, 21)
+    y = np.random.randn(3, len(x))
+    with raises(ValueError):
+        interp1d_unc(x, x, y, None, Uy=np.eye(len(x)))
+    with raises(ValueError):
+        interp1d_unc(x, x, y, np.ones_like(y), returnU=True)
+
+
+@pytest.mark.slow
+def test_cubic_make_equidistant_on_long_non_equidistant_timestamps():
+    # Check that long non-equidistant time series can be resampled with cubic
+    # splines, which used to require quadratic time and memory.
+    from scipy import sparse
+
+    x = np.cumsum(np.random.uniform(0.9e-3, 1.1e-3, 10**6))
+    y, uy = np.sin(x), np.full_like(x, 0.1)
+    x_new, y_new, uy_new = make_equidistant(x, y, uy, dx=1e-3, kind="cubic")
+    assert np.all((uy_new > 0.05) & (uy_new < 0.2))
+    x_new, y_new, uy_new, U_y_new = make_equidistant(
+        x[: 10**5],
+        y[: 10**5],
+        None,
+        dx=1e-3,
+        Uy=sparse.diags(uy[: 10**5] ** 2),
+        returnU=True,
+    )
+    assert sparse.issparse(U_y_new)
+    assert_allclose(U_y_new.diagonal(), np.square(uy_new))
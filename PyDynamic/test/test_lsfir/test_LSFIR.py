@@ -660,3 +660,23 @@ def test_compare_invLSFIR_to_LSFIR(monte_carlo, freqs, sampling_freq, filter_ord
         inv=True,
     )[0]
     assert_allclose(b_fir, b_fir_inv_lsfir)
+
+
+def test_too_small_mc_block_size_LSFIR(monte_carlo, freqs, sampling_freq):
+    with pytest.raises(
+        ValueError,
+        match=r"LSFIR: Number of Monte Carlo runs per block is expected to be a "
+        r"positive integer.*",
+    ):
+        LSFIR(
+            H=monte_carlo["H"],
+            N=4,
+            f=freqs,
+            Fs=sampling_freq,
+            tau=2,
+            verbose=False,
+            inv=True,
+            UH=monte_carlo["UH"],
+            mc_runs=2,
+            mc_block_size=0,
+        )
@@ -0,0 +1,43 @@
+import hypothesis.strategies as hst
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from numpy.testing import assert_allclose
+
+# noinspection PyProtectedMember
+from PyDynamic.model_estimation.fit_filter import (
+    LSFIR,
+)
+from ..conftest import (
+    hypothesis_dimension,
+)
+
+
+@given(
+    hypothesis_dimension(min_value=4, max_value=8),
+    hst.integers(min_value=1, max_value=50),
+    hst.booleans(),
+)
+@settings(deadline=None)
+@pytest.mark.slow
+def test(monte_carlo, freqs, sampling_freq, filter_order, mc_block_size, inv):
+    results = []
+    for block_size in (mc_block_size, None):
+        np.random.seed(0)
+        results.append(
+            LSFIR(
+                H=monte_carlo["H"],
+                N=filter_order,
+                f=freqs,
+                Fs=sampling_freq,
+                tau=filter_order // 2,
+                verbose=False,
+                inv=inv,
+                UH=monte_carlo["UH"],
+                mc_runs=100,
+                mc_block_size=block_size,
+            )
+        )
+    (b_fir_blocks, Ub_fir_blocks), (b_fir_at_once, Ub_fir_at_once) = results
+    assert_allclose(b_fir_blocks, b_fir_at_once, rtol=1e-10, atol=1e-12)
+    assert_allclose(Ub_fir_blocks, Ub_fir_at_once, rtol=1e-8, atol=1e-14)
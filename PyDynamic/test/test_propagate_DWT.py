@@ -3,6 +3,7 @@ Perform test for uncertainty.propagate_DWT
 """
 
 import numpy as np
+import pytest
 import pywt
 from numpy.testing import assert_allclose
 
@@ -15,6 +16,7 @@ from PyDynamic.uncertainty.propagate_DWT import (
     wave_dec_realtime,
     wave_rec,
 )
+from PyDynamic.uncertainty.propagate_filter import IIR_get_initial_state, IIRuncFilter
 
 
 def test_filter_design():
@@ -254,3 +256,84 @@ def test_identity_multi():
             assert x.size == xr.size
             assert_allclose(x, xr)
             assert Ux.size == Uxr.size
+
+
+def test_dwt_equals_subsampled_full_rate_filtering():
+    """Check the polyphase :func:`dwt` against full rate filtering and subsampling"""
+    for filter_name in ["haar", "db3", "rbio3.3"]:
+        ld, hd, _, _ = filter_design(filter_name)
+
+        for subsample_start in [0, 1]:
+            x = np.random.randn(41)
+            Ux = 0.1 * (1 + np.random.random(41))
+
+            states = None
+            full_states = {"low": None, "high": None}
+            for x_batch, Ux_batch in zip(np.array_split(x, 3), np.array_split(Ux, 3)):
+                c_approx, U_approx, c_detail, U_detail, states = dwt(
+                    x_batch,
+                    Ux_batch,
+                    ld,
+                    hd,
+                    states=states,
+                    realtime=True,
+                    subsample_start=subsample_start,
+                )
+                for key, b, c, U in (
+                    ("low", ld, c_approx, U_approx),
+                    ("high", hd, c_detail, U_detail),
+                ):
+                    y, Uy, full_states[key] = IIRuncFilter(
+                        x_batch,
+                        Ux_batch,
+                        b,
+                        np.ones(1),
+                        kind="diag",
+                        state=full_states[key],
+                    )
+                    assert_allclose(c, y[subsample_start::2], atol=1e-14)
+                    assert_allclose(U, Uy[subsample_start::2], atol=1e-14)
+                    for name in ["z", "dz", "P"]:
+                        assert_allclose(states[key][name], full_states[key][name])
+
+
+def test_inv_dwt_equals_full_rate_filtering_of_upsampled_coefficients():
+    """Check the polyphase :func:`inv_dwt` against filtering with inserted zeros"""
+    for filter_name in ["haar", "db3", "rbio3.3"]:
+        _, _, lr, hr = filter_design(filter_name)
+
+        c_approx = np.random.randn(21)
+        U_approx = np.random.random(21)
+        c_detail = np.random.randn(21)
+        U_detail = np.random.random(21)
+
+        x, Ux, _ = inv_dwt(
+            c_approx, U_approx, c_detail, U_detail, lr, hr, realtime=True
+        )
+
+        expected_x = np.zeros(42)
+        expected_Ux = np.zeros(42)
+        for b, c, U in ((lr, c_approx, U_approx), (hr, c_detail, U_detail)):
+            upsampled = np.zeros(42)
+            upsampled[::2] = c
+            U_upsampled = np.zeros(42)
+            U_upsampled[::2] = U / np.sqrt(2)
+            y, Uy, _ = IIRuncFilter(
+                upsampled,
+                U_upsampled,
+                b,
+                np.ones(1),
+                kind="diag",
+                state=IIR_get_initial_state(b, np.ones(1), x0=0, U0=0),
+            )
+            expected_x += y
+            expected_Ux += Uy
+
+        assert_allclose(x, expected_x, atol=1e-14)
+        assert_allclose(Ux, expected_Ux, atol=1e-14)
+
+
+def test_inv_dwt_raises_for_coefficients_of_different_size():
+    _, _, lr, hr = filter_design("db2")
+    with pytest.raises(ValueError, match="same size"):
+        inv_dwt(np.ones(5), np.ones(5), np.ones(4), np.ones(4), lr, hr)
@@ -6,12 +6,22 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pytest
 from numpy.testing import assert_allclose
+from scipy.signal import lfilter
+from scipy.stats.mstats import mquantiles
 
 from PyDynamic.misc.filterstuff import kaiser_lowpass
 from PyDynamic.misc.noise import ARMA
 from PyDynamic.misc.testsignals import rect
 from PyDynamic.misc.tools import make_semiposdef
-from PyDynamic.uncertainty.propagate_MonteCarlo import MC, SMC, UMC, UMC_generic
+from PyDynamic.uncertainty.propagate_MonteCarlo import (
+    _block_quantiles,
+    _lfilter_stacked,
+    _SHARED_MEMORY_WORKER_POOLS,
+    MC,
+    SMC,
+    UMC,
+    UMC_generic,
+)
 
 # parameters of simulated measurement
 Fs = 100e3  # sampling frequency (in Hz)
@@ -111,6 +121,84 @@ def test_MC_non_negative_main_diagonal_covariance():
     assert np.all(np.diag(Uy) >= 0)
 
 
+def test_MC_blockwise_equals_samples_statistics():
+    np.random.seed(12345)
+    Y = MC(x, sigma_noise, b1, np.ones(1), Ub, runs=runs, blow=b2, return_samples=True)
+    np.random.seed(12345)
+    y, Uy = MC(x, sigma_noise, b1, np.ones(1), Ub, runs=runs, blow=b2, blocksize=7)
+    assert_allclose(y, np.mean(Y, axis=0), atol=1e-14)
+    assert_allclose(Uy, np.cov(Y, rowvar=False), atol=1e-14)
+
+
+def test_MC_diagonal_covariance_only():
+    np.random.seed(12345)
+    _, Uy = MC(x, sigma_noise, b1, np.ones(1), Ub, runs=runs, blocksize=6)
+    np.random.seed(12345)
+    _, uy = MC(
+        x,
+        sigma_noise,
+        b1,
+        np.ones(1),
+        Ub,
+        runs=runs,
+        blocksize=6,
+        compute_full_covariance=False,
+    )
+    assert uy.shape == x.shape
+    assert_allclose(uy, np.diag(Uy))
+
+
+def test_MC_iir_without_coefficient_uncertainty():
+    b, a = np.array([0.2, 0.3]), np.array([1.0, -0.5])
+    Y = MC(x, sigma_noise, b, a, None, runs=runs, blocksize=3, return_samples=True)
+    assert Y.shape == (runs, len(x))
+    assert_allclose(np.mean(Y, axis=0), lfilter(b, a, x), atol=1e-4)
+
+
+def test_MC_all_filters_unstable_returns_nan():
+    b, a = np.ones(1), np.array([1.0, -1.5])
+    with pytest.warns(RuntimeWarning, match="only 0 of the"):
+        y, Uy = MC(x, sigma_noise, b, a, None, runs=10, blocksize=4)
+    assert np.all(np.isnan(y))
+    assert Uy.shape == (len(x), len(x))
+    assert np.all(np.isnan(Uy))
+
+
+def test_MC_single_stable_filter_returns_nan_covariance():
+    b, a = np.array([0.2, 0.3]), np.array([1.0, -0.5])
+    with pytest.warns(RuntimeWarning, match="only 1 of the"):
+        y, uy = MC(x, sigma_noise, b, a, None, runs=1, compute_full_covariance=False)
+    assert np.all(np.isfinite(y))
+    assert np.all(np.isnan(uy))
+
+
+@pytest.mark.parametrize("n_samples", [1, 7, 256, 1001])
+def test_lfilter_stacked_iir_equals_lfilter(n_samples):
+    rng = np.random.default_rng(7)
+    n_rows = 20
+    B = rng.standard_normal((n_rows, 3))
+    # stable second order denominators from random poles inside the unit circle
+    poles = (
+        0.95
+        * np.sqrt(rng.uniform(size=(n_rows, 1)))
+        * np.exp(1j * rng.uniform(0, np.pi, size=(n_rows, 1)))
+    )
+    A = np.hstack(
+        (
+            np.ones((n_rows, 1)),
+            -2 * poles.real,
+            np.abs(poles) ** 2,
+            np.zeros((n_rows, 1)),
+        )
+    )
+    X = rng.standard_normal((n_rows, n_samples))
+    assert_allclose(
+        _lfilter_stacked(B, A, X),
+        [lfilter(b, a, signal) for b, a, signal in zip(B, A, X)],
+        atol=1e-12,
+    )
+
+
 def test_SMC():
     # run method
     y, Uy = SMC(x, sigma_noise, b1, np.ones(1), Ub, runs=runs)
@@ -119,6 +207,38 @@ def test_SMC():
     assert Uy.shape == y.shape
 
 
+def test_SMC_blockwise():
+    y, Uy, quantiles = SMC(
+        x, sigma_noise, b1, np.ones(1), Ub, runs=runs, Perc=[0.05, 0.95], blocksize=64
+    )
+
+    assert len(y) == len(x)
+    assert Uy.shape == y.shape
+    assert quantiles.shape == (2, len(x))
+    assert np.all(quantiles[0] <= quantiles[1])
+
+
+def test_SMC_blockwise_without_coefficient_uncertainty():
+    b, a = np.array([0.2, 0.3]), np.array([1.0, -0.5])
+    y, Uy = SMC(x, sigma_noise, b, a, runs=200, blocksize=37)
+    assert_allclose(y, lfilter(b, a, x), atol=5 * sigma_noise)
+    assert_allclose(
+        Uy[10:],
+        sigma_noise * np.sqrt(np.sum(np.square(lfilter(b, a, np.eye(1, 50)[0])))),
+        rtol=0.3,
+    )
+
+
+def test_block_quantiles_equal_mquantiles():
+    samples = np.random.default_rng(1).standard_normal((5000, 10))
+    probabilities = [0.0, 0.025, 0.5, 0.975, 1.0]
+    assert_allclose(
+        _block_quantiles(samples, probabilities),
+        mquantiles(samples, prob=probabilities, axis=0).data,
+        rtol=1e-14,
+    )
+
+
 @pytest.mark.slow
 def test_UMC(visualizeOutput=False):
     # run method
@@ -236,6 +356,71 @@ def test_UMC_generic_cov_full(umc_generic_cov_kwargs):
     assert_allclose(Uy, Uy_sims)
 
 
+def test_UMC_generic_shared_memory_reproducible(umc_generic_multiprocess_kwargs):
+    results = [
+        UMC_generic(
+            **umc_generic_multiprocess_kwargs,
+            backend="shared_memory",
+            seed=42,
+            n_cpu=2,
+        )
+        for _ in range(2)
+    ]
+    assert np.array_equal(results[0][0], results[1][0])
+    assert np.array_equal(results[0][1], results[1][1])
+    for nbin, histogram in results[0][2].items():
+        assert np.array_equal(
+            histogram["bin-counts"], results[1][2][nbin]["bin-counts"]
+        )
+
+
+@pytest.mark.parametrize("n_cpu", [1, 3])
+@pytest.mark.parametrize("compute_full_covariance", [True, False])
+def test_UMC_generic_shared_memory_statistics(
+    umc_generic_multiprocess_kwargs, sample_shape, n_cpu, compute_full_covariance
+):
+    y, Uy, happr, output_shape, sims = UMC_generic(
+        **umc_generic_multiprocess_kwargs,
+        backend="shared_memory",
+        n_cpu=n_cpu,
+        return_samples=True,
+        compute_full_covariance=compute_full_covariance,
+    )
+    assert output_shape == (sample_shape[0], sample_shape[2])
+    assert sims["samples"].shape == (
+        umc_generic_multiprocess_kwargs["runs"],
+        *sample_shape,
+    )
+    assert_allclose(sims["results"], np.mean(sims["samples"], axis=2))
+
+    results = sims["results"].reshape((sims["results"].shape[0], -1))
+    Uy_sims = np.cov(results, rowvar=False)
+    assert_allclose(y, np.mean(results, axis=0))
+    assert_allclose(Uy, Uy_sims if compute_full_covariance else np.diag(Uy_sims))
+    assert isinstance(happr, dict)
+
+
+def test_UMC_generic_shared_memory_reuses_workers_and_slabs(
+    umc_generic_multiprocess_kwargs,
+):
+    def worker_pids_and_slab_names():
+        pool = _SHARED_MEMORY_WORKER_POOLS[2]
+        return [worker.pid for worker in pool._workers], [
+            slab.name for slab in pool._slabs
+        ]
+
+    UMC_generic(**umc_generic_multiprocess_kwargs, backend="shared_memory", n_cpu=2)
+    first_call = worker_pids_and_slab_names()
+    UMC_generic(**umc_generic_multiprocess_kwargs, backend="shared_memory", n_cpu=2)
+    assert worker_pids_and_slab_names() == first_call
+    assert all(worker.is_alive() for worker in _SHARED_MEMORY_WORKER_POOLS[2]._workers)
+
+
+def test_UMC_generic_unknown_backend(umc_generic_multiprocess_kwargs):
+    with pytest.raises(ValueError, match="backend"):
+        UMC_generic(**umc_generic_multiprocess_kwargs, backend="threads")
+
+
 @pytest.mark.slow
 def test_compare_MC_UMC():
     np.random.seed(12345)
@@ -3,6 +3,7 @@ from typing import Callable, Optional, Set, Tuple
 
 import numpy as np
 import pytest
+import scipy.linalg as scl
 import scipy.ndimage as sn
 from hypothesis import assume, given, settings, strategies as hst
 from hypothesis.strategies import composite
@@ -122,3 +123,70 @@ def test_convolution_invalid_mode(input_1, input_2, mode):
     assume(mode not in numpy_modes and mode not in scipy_modes)
     with pytest.raises(ValueError):
         convolve_unc(*input_1, *input_2, mode)
+
+
+@pytest.mark.parametrize(
+    "mode", ["full", "valid", "same", "nearest", "reflect", "mirror"]
+)
+@pytest.mark.parametrize(
+    "uncertain_signals", [(True, True), (True, False), (False, True)]
+)
+def test_convolution_stacked_equals_single(mode, uncertain_signals):
+    x1, x2 = np.random.randn(3, 12), np.random.randn(4)
+    U1 = np.random.rand(3, 12) if uncertain_signals[0] else None
+    U2 = np.diag(np.random.rand(4)) if uncertain_signals[1] else None
+    conv, Uconv = convolve_unc(x1, U1, x2, U2, mode=mode)
+    for index in range(len(x1)):
+        conv_expected, Uconv_expected = convolve_unc(
+            x1[index], None if U1 is None else U1[index], x2, U2, mode=mode
+        )
+        assert_allclose(conv[index], conv_expected, atol=1e-14)
+        assert_allclose(Uconv[index], Uconv_expected, atol=1e-14)
+
+
+@pytest.mark.parametrize("mode", ["full", "valid", "same", "nearest"])
+def test_convolution_square_covariance_is_shared_for_stack_of_as_many_signals(mode):
+    x1, x2 = np.random.randn(12, 12), np.random.randn(4)
+    U1 = scl.toeplitz(np.exp(-np.arange(12) / 3)) * 1e-2
+    conv, Uconv = convolve_unc(x1, U1, x2, None, mode=mode)
+    for index in range(len(x1)):
+        conv_expected, Uconv_expected = convolve_unc(x1[index], U1, x2, None, mode=mode)
+        assert_allclose(Uconv[index], Uconv_expected, atol=1e-14)
+
+
+@pytest.mark.parametrize(
+    "mode", ["full", "valid", "same", "nearest", "reflect", "mirror"]
+)
+@pytest.mark.parametrize(
+    "uncertain_signals", [(True, True), (True, False), (False, True)]
+)
+@pytest.mark.parametrize("lengths", [(15, 4), (4, 15), (15, 7)])
+def test_convolution_uncorrelated_equals_covariance(mode, uncertain_signals, lengths):
+    if lengths[0] < lengths[1] and mode in scipy_modes:
+        pytest.skip("scipy modes expect the first signal to be the longer one")
+    x1, x2 = np.random.randn(lengths[0]), np.random.randn(lengths[1])
+    u1 = np.random.rand(lengths[0]) if uncertain_signals[0] else None
+    u2 = np.random.rand(lengths[1]) if uncertain_signals[1] else None
+    conv, Uconv = convolve_unc(x1, u1, x2, u2, mode=mode)
+    conv_expected, Uconv_expected = convolve_unc(
+        x1,
+        None if u1 is None else np.diag(np.square(u1)),
+        x2,
+        None if u2 is None else np.diag(np.square(u2)),
+        mode=mode,
+    )
+    assert_allclose(conv, conv_expected, atol=1e-14)
+    assert_allclose(Uconv, Uconv_expected, atol=1e-14)
+
+    conv, uconv = convolve_unc(x1, u1, x2, u2, mode=mode, return_full_covariance=False)
+    assert_allclose(conv, conv_expected, atol=1e-14)
+    assert_allclose(uconv, np.sqrt(np.diag(Uconv_expected)), atol=1e-14)
+
+
+@pytest.mark.parametrize("mode", ["full", "same", "nearest"])
+def test_convolution_standard_uncertainties_of_correlated_signals(mode):
+    x1, x2 = np.random.randn(12), np.random.randn(4)
+    U1 = np.cov(np.random.randn(12, 20))
+    _, Uconv = convolve_unc(x1, U1, x2, None, mode=mode)
+    _, uconv = convolve_unc(x1, U1, x2, None, mode=mode, return_full_covariance=False)
+    assert_allclose(uconv, np.sqrt(np.diag(Uconv)))
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from PyDynamic.uncertainty.propagate_filter import (
+    FIR_get_initial_state,
+    FIRuncFilter,
+    FIRuncFilter_realtime,
+)
+from ..conftest import random_covariance_matrix
+
+
+@pytest.fixture(scope="module")
+def signal_and_filter():
+    rng = np.random.default_rng(42)
+    x = rng.standard_normal(300)
+    ux = np.abs(rng.standard_normal(300)) * 1e-1
+    acf = np.array([1e-2, 5e-3, 1e-3, 2e-4])
+    theta = rng.standard_normal(11)
+    return {"x": x, "ux": ux, "acf": acf, "theta": theta}
+
+
+def _filter_in_blocks(x, Ux, theta, Utheta, kind, n_blocks, **kwargs):
+    y_blocks, Uy_blocks = [], []
+    state = None
+    for indices in np.array_split(np.arange(len(x)), n_blocks):
+        y_block, Uy_block, state = FIRuncFilter_realtime(
+            x[indices],
+            Ux[indices] if kind == "diag" else Ux,
+            theta,
+            Utheta=Utheta,
+            state=state,
+            kind=kind,
+            **kwargs,
+        )
+        y_blocks.append(y_block)
+        Uy_blocks.append(Uy_block)
+    return y_blocks, Uy_blocks
+
+
+@pytest.mark.parametrize("kind", ["diag", "corr"])
+@pytest.mark.parametrize("uncertain_filter", [None, "1D", "2D"])
+@pytest.mark.parametrize("n_blocks", [1, 7, 300])
+def test_realtime_standard_uncertainties_equal_one_shot(
+    signal_and_filter, kind, uncertain_filter, n_blocks
+):
+    x, theta = signal_and_filter["x"], signal_and_filter["theta"]
+    Ux = signal_and_filter["ux"] if kind == "diag" else signal_and_filter["acf"]
+    Utheta_covariance = random_covariance_matrix(len(theta)) * 1e-3
+    Utheta = {
+        None: None,
+        "1D": np.sqrt(np.diag(Utheta_covariance)),
+        "2D": Utheta_covariance,
+    }[uncertain_filter]
+    Utheta_full = np.diag(np.square(Utheta)) if uncertain_filter == "1D" else Utheta
+    y, Uy = FIRuncFilter(
+        x, Ux, theta, Utheta=Utheta_full, kind=kind, return_full_covariance=True
+    )
+
+    y_blocks, uy_blocks = _filter_in_blocks(x, Ux, theta, Utheta, kind, n_blocks)
+
+    assert_allclose(np.concatenate(y_blocks), y, atol=1e-12)
+    assert_allclose(np.concatenate(uy_blocks), np.sqrt(np.diag(Uy)), atol=1e-12)
+
+
+@pytest.mark.parametrize("kind", ["diag", "corr"])
+def test_realtime_full_covariance_equals_diagonal_blocks(signal_and_filter, kind):
+    x, theta = signal_and_filter["x"], signal_and_filter["theta"]
+    Ux = signal_and_filter["ux"] if kind == "diag" else signal_and_filter["acf"]
+    Utheta = random_covariance_matrix(len(theta)) * 1e-3
+    _, Uy = FIRuncFilter(
+        x, Ux, theta, Utheta=Utheta, kind=kind, return_full_covariance=True
+    )
+
+    _, Uy_blocks = _filter_in_blocks(
+        x, Ux, theta, Utheta, kind, 5, return_full_covariance=True
+    )
+
+    start = 0
+    for Uy_block in Uy_blocks:
+        stop = start + len(Uy_block)
+        assert_allclose(Uy_block, Uy[start:stop, start:stop], atol=1e-12)
+        start = stop
+
+
+def test_realtime_initial_state_shapes(signal_and_filter):
+    theta = signal_and_filter["theta"]
+    state = FIR_get_initial_state(theta, x0=2.0, U0=0.5)
+    assert len(state["x"]) == len(theta) - 1
+    assert np.all(state["x"] == 2.0)
+    assert np.all(state["Ux"] == 0.25)
+
+
+def test_realtime_raises_for_unknown_kind(signal_and_filter):
+    with pytest.raises(ValueError):
+        FIRuncFilter_realtime(
+            signal_and_filter["x"],
+            signal_and_filter["ux"],
+            signal_and_filter["theta"],
+            kind="something",
+        )
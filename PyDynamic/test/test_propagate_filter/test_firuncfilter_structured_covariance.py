@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from numpy.testing import assert_allclose
+
+from PyDynamic import BandedCovariance, FIRuncFilter, ToeplitzCovariance
+from PyDynamic.misc.testsignals import rect
+from ..conftest import FIRuncFilter_input
+
+
+@given(FIRuncFilter_input())
+@settings(deadline=None)
+@pytest.mark.slow
+def test_structured_covariance_equals_full_covariance(fir_unc_filter_input):
+    fir_unc_filter_input["Utheta"] = None
+    fir_unc_filter_input["shift"] = 0
+    y_full, Uy_full = FIRuncFilter(**fir_unc_filter_input, return_full_covariance=True)
+    y_structured, Uy_structured = FIRuncFilter(
+        **fir_unc_filter_input, return_structured_covariance=True
+    )
+    assert_allclose(y_structured, y_full)
+    assert_allclose(
+        Uy_structured.to_dense(), Uy_full, atol=1e-8 * np.max(np.abs(Uy_full))
+    )
+
+
+@pytest.fixture(scope="module")
+def signal_and_filters():
+    time = np.arange(300) * 1e-3
+    x = rect(time, 50e-3, 150e-3, 1.0, noise=1e-2)
+    theta = np.array([0.1, 0.3, 0.4, 0.3, 0.1, -0.05])
+    blow = np.array([0.25, 0.5, 0.25])
+    return x, theta, blow
+
+
+@pytest.mark.parametrize(
+    "sigma_noise, kind, expected_type",
+    [
+        (1e-2, "corr", ToeplitzCovariance),
+        (np.array([1e-4, 5e-5, 1e-5]), "corr", ToeplitzCovariance),
+        (np.linspace(1e-2, 2e-2, 300), "diag", BandedCovariance),
+    ],
+)
+@pytest.mark.parametrize("use_blow", [True, False])
+def test_structured_covariance_matches_dense_computation(
+    signal_and_filters, sigma_noise, kind, expected_type, use_blow
+):
+    x, theta, blow = signal_and_filters
+    blow = blow if use_blow else None
+    y_full, Uy_full = FIRuncFilter(
+        x, sigma_noise, theta, blow=blow, kind=kind, return_full_covariance=True
+    )
+    y_structured, Uy_structured = FIRuncFilter(
+        x, sigma_noise, theta, blow=blow, kind=kind, return_structured_covariance=True
+    )
+    assert isinstance(Uy_structured, expected_type)
+    assert_allclose(y_structured, y_full)
+    assert_allclose(Uy_structured.to_dense(), Uy_full, atol=1e-15)
+
+
+def test_structured_covariance_as_input(signal_and_filters):
+    x, theta, _ = signal_and_filters
+    Ux = ToeplitzCovariance(np.array([1e-4, 5e-5, 1e-5]), size=len(x))
+    _, Uy_from_dense = FIRuncFilter(
+        x, Ux.to_dense(), theta, return_full_covariance=True
+    )
+    _, Uy_from_structured = FIRuncFilter(x, Ux, theta, return_full_covariance=True)
+    assert_allclose(Uy_from_structured, Uy_from_dense, atol=1e-15)
+
+
+@pytest.mark.parametrize(
+    "sigma_noise, kind",
+    [
+        (np.array([1e-4, 5e-5, 1e-5]), "corr"),
+        (np.linspace(1e-2, 2e-2, 300), "diag"),
+    ],
+)
+@pytest.mark.parametrize("return_full_covariance", [True, False])
+def test_structured_covariance_input_shifted_equals_dense_input_shifted(
+    signal_and_filters, sigma_noise, kind, return_full_covariance
+):
+    x, theta, blow = signal_and_filters
+    Ux = (
+        ToeplitzCovariance(sigma_noise, size=len(x))
+        if kind == "corr"
+        else BandedCovariance(sigma_noise[np.newaxis] ** 2)
+    )
+    y_dense, Uy_dense = FIRuncFilter(
+        x,
+        Ux.to_dense(),
+        theta,
+        shift=3,
+        blow=blow,
+        return_full_covariance=return_full_covariance,
+    )
+    y_structured, Uy_structured = FIRuncFilter(
+        x,
+        Ux,
+        theta,
+        shift=3,
+        blow=blow,
+        return_full_covariance=return_full_covariance,
+    )
+    assert_allclose(y_structured, y_dense)
+    assert_allclose(Uy_structured, Uy_dense, atol=1e-15)
+
+
+def test_structured_covariance_raises_for_shift(signal_and_filters):
+    x, theta, _ = signal_and_filters
+    with pytest.raises(NotImplementedError):
+        FIRuncFilter(x, 1e-2, theta, shift=3, return_structured_covariance=True)
+
+
+def test_structured_covariance_raises_for_uncertain_filter(signal_and_filters):
+    x, theta, _ = signal_and_filters
+    with pytest.raises(NotImplementedError):
+        FIRuncFilter(
+            x,
+            1e-2,
+            theta,
+            Utheta=np.eye(len(theta)) * 1e-4,
+            return_structured_covariance=True,
+        )
@@ -235,6 +235,75 @@ def test_FIR_IIR_identity(kind, fir_filter, input_signal):
     assert_allclose(Uy_fir, Uy_iir)
 
 
+@pytest.fixture(scope="module")
+def multichannel_input_signal(input_signal):
+    x = np.vstack(
+        [input_signal["x"], -2 * input_signal["x"], input_signal["x"][::-1] + 0.5]
+    )
+    Ux = np.vstack(
+        [
+            input_signal["Ux"],
+            2 * input_signal["Ux"],
+            np.linspace(1e-3, 1e-1, x.shape[1]),
+        ]
+    )
+    return {"x": x, "Ux": Ux}
+
+
+@pytest.mark.parametrize("kind", ["diag", "corr"])
+@pytest.mark.parametrize("with_Uab", [True, False])
+def test_IIRuncFilter_multichannel_equals_channelwise_loop(
+    kind, with_Uab, iir_filter, multichannel_input_signal
+):
+    x = multichannel_input_signal["x"]
+    if kind == "diag":
+        Ux = multichannel_input_signal["Ux"]
+    else:
+        Ux = np.array([[1e-4, 5e-5, 1e-5], [2e-4, 1e-5, 0.0], [1e-4, 0.0, 0.0]])
+    Uab = iir_filter["Uab"] if with_Uab else None
+
+    y, Uy, state = IIRuncFilter(
+        x, Ux, iir_filter["b"], iir_filter["a"], Uab=Uab, kind=kind
+    )
+
+    assert y.shape == x.shape
+    assert Uy.shape == x.shape
+    for channel in range(len(x)):
+        y_channel, Uy_channel, state_channel = IIRuncFilter(
+            x[channel],
+            Ux[channel],
+            iir_filter["b"],
+            iir_filter["a"],
+            Uab=Uab,
+            kind=kind,
+        )
+        assert_allclose(y[channel], y_channel)
+        assert_allclose(Uy[channel], Uy_channel)
+        assert_allclose(state["z"][channel], state_channel["z"])
+        assert_allclose(state["P"][channel], state_channel["P"])
+
+
+def test_IIRuncFilter_multichannel_identity_nonchunk_chunk(
+    iir_filter, multichannel_input_signal
+):
+    x, Ux = multichannel_input_signal["x"], multichannel_input_signal["Ux"]
+    y, Uy, _ = IIRuncFilter(x, Ux, **iir_filter, kind="diag")
+
+    y_chunks, Uy_chunks = [], []
+    state = None
+    for x_chunk, Ux_chunk in zip(
+        np.array_split(x, 20, axis=1), np.array_split(Ux, 20, axis=1)
+    ):
+        y_chunk, Uy_chunk, state = IIRuncFilter(
+            x_chunk, Ux_chunk, **iir_filter, kind="diag", state=state
+        )
+        y_chunks.append(y_chunk)
+        Uy_chunks.append(Uy_chunk)
+
+    assert_allclose(np.hstack(y_chunks), y)
+    assert_allclose(np.hstack(Uy_chunks), Uy)
+
+
 def test_tf2ss(iir_filter):
     """compare output of _tf2ss to (the very similar) scipy.signal.tf2ss"""
     b = iir_filter["b"]
@@ -60,3 +60,16 @@ def test_sos_absphase():
     assert Hcov.shape == (2 * len(fe3), 2 * len(fe3))
     H = sos_FreqResp(S0, delta, f0, fe3)
     assert np.linalg.norm(H) == approx(np.linalg.norm(Hmean))
+
+
+@pytest.mark.parametrize("sos_propagation", (sos_realimag, sos_absphase))
+def test_sos_propagation_in_chunks_equals_at_once(sos_propagation):
+    uncertainties = (1e-2 * S0, 1e-1 * delta, 1e-2 * f0)
+    np.random.seed(0)
+    Hmean, Hcov = sos_propagation(S0, delta, f0, *uncertainties, fe3, runs=100)
+    np.random.seed(0)
+    Hmean_chunked, Hcov_chunked = sos_propagation(
+        S0, delta, f0, *uncertainties, fe3, runs=100, chunk_size=33
+    )
+    assert np.allclose(Hmean_chunked, Hmean, rtol=1e-12, atol=0)
+    assert np.allclose(Hcov_chunked, Hcov, rtol=1e-9, atol=1e-12 * np.abs(Hcov).max())
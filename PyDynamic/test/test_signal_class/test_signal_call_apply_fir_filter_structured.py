@@ -0,0 +1,24 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+from PyDynamic import BandedCovariance
+from PyDynamic.signals import Signal
+
+
+def test_apply_fir_filter_keeps_structured_covariance():
+    time = np.arange(500) * 1e-3
+    values = np.sin(2 * np.pi * 5 * time)
+    uncertainty = np.full_like(values, 1e-2)
+    theta = np.array([0.2, 0.6, 0.2])
+    structured_signal = Signal(time, values.copy(), uncertainty=uncertainty.copy())
+    structured_signal.apply_filter(theta, structured_covariance=True)
+    default_signal = Signal(time, values.copy(), uncertainty=uncertainty.copy())
+    default_signal.apply_filter(theta)
+
+    assert isinstance(structured_signal.uncertainty, BandedCovariance)
+    assert structured_signal.uncertainty.bandwidth == len(theta) - 1
+    assert_allclose(structured_signal.values, default_signal.values)
+    assert_allclose(
+        structured_signal.standard_uncertainties,
+        default_signal.standard_uncertainties,
+    )
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+from scipy.linalg import toeplitz
+
+from PyDynamic.misc.structured_covariance import BandedCovariance, ToeplitzCovariance
+from .conftest import random_covariance_matrix
+
+
+def test_toeplitz_covariance_to_dense():
+    generator = np.array([3.0, 2.0, 1.0])
+    covariance = ToeplitzCovariance(generator, size=6)
+    assert_equal(covariance.shape, (6, 6))
+    assert_equal(covariance.bandwidth, 2)
+    assert_allclose(covariance.to_dense(), toeplitz(np.r_[generator, np.zeros(3)]))
+    assert_allclose(covariance.diagonal(), np.full(6, 3.0))
+    assert_allclose(covariance.to_banded().to_dense(), covariance.to_dense())
+
+
+def test_toeplitz_covariance_trims_trailing_zeros():
+    covariance = ToeplitzCovariance(np.array([1.0, 0.5, 0.0, 0.0]))
+    assert_equal(covariance.bandwidth, 1)
+    assert_equal(covariance.shape, (4, 4))
+
+
+@pytest.mark.parametrize("bandwidth", [0, 1, 4, 9])
+def test_banded_covariance_from_dense_round_trip(bandwidth):
+    dense = random_covariance_matrix(10)
+    rows, columns = np.indices(dense.shape)
+    dense[np.abs(rows - columns) > bandwidth] = 0.0
+    covariance = BandedCovariance.from_dense(dense)
+    assert_equal(covariance.bandwidth, bandwidth)
+    assert_allclose(covariance.to_dense(), dense)
+    assert_allclose(covariance.diagonal(), np.diag(dense))
+
+
+def test_banded_covariance_roll_keeps_inner_band():
+    dense = random_covariance_matrix(10)
+    covariance = BandedCovariance.from_dense(dense, bandwidth=2)
+    rolled = covariance.roll(-3).to_dense()
+    expected = np.roll(covariance.to_dense(), (-3, -3), axis=(0, 1))
+    assert_allclose(rolled[:7, :7], expected[:7, :7])
+    assert_allclose(np.diag(rolled), np.diag(expected))
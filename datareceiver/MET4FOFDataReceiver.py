@@ -12,13 +12,15 @@ import traceback
 import os
 import socket
 import threading
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
 
 import warnings
 from datetime import datetime
 from multiprocessing import Queue
 import time
 import datetime
-import copy
 import json
 import h5py
 
@@ -38,6 +40,13 @@ CURR_DIR = os.path.dirname(os.path.abspath(__file__))
 print(CURR_DIR)
 sys.path.append(CURR_DIR)
 import messages_pb2
+from storageprofiles import getStorageProfile, datasetStorageArgs
+from messagedecoder import (
+    DATA_MESSAGE_DTYPE,
+    DATA_MESSAGE_FIELDS,
+    decodeDataMessages,
+    decodeDataPackets,
+)
 
 import pandas as pd
 from bokeh.server.server import Server
@@ -52,7 +61,6 @@ import logging
 
 # matplotlib.use('Qt5Agg')
 
-
 class DataReceiver:
     """Class for handlig the incomming UDP Packets and spwaning sensor Tasks and sending the Protobuff Messages over an queue to the Sensor Task
 
@@ -60,7 +68,15 @@ class DataReceiver:
 
     """
 
-    def __init__(self, IP, Port=7654):
+    def __init__(
+        self,
+        IP,
+        Port=7654,
+        BulkIngest=False,
+        RingBufferSize=2**18,
+        SocketBufferSize=2**25,
+        ProcessPerSensor=False,
+    ):
         """
 
 
@@ -70,6 +86,23 @@ class DataReceiver:
             Either an spefic IP Adress like "192.168.0.200" or "" for all interfaces.
         Port : intger
             UDP Port for the incoming data 7654 is default.
+        BulkIngest : bool, optional
+            If True all datagrams waiting in the socket are read at once and the
+            data messages are decoded into a preallocated DataRingBuffer of every
+            sensor instead of being send one by one over the sensors queue.
+            Needed to receive the data of many boards at full rate.
+            The default is False.
+        RingBufferSize : integer, optional
+            Number of data messages each sensors ring buffer can hold if BulkIngest
+            is True. The default is 2**18.
+        SocketBufferSize : integer, optional
+            Requested size of the OS receive buffer of the UDP socket in bytes if
+            BulkIngest is True. The OS might limit this (net.core.rmem_max on
+            linux). The default is 2**25.
+        ProcessPerSensor : bool, optional
+            Places the ring buffers in shared memory if BulkIngest is True, so the
+            data messages of every sensor can be processed in an own process, see
+            StartAllSensorProcesses. The default is False.
 
         Raises
         ------
@@ -82,13 +115,28 @@ class DataReceiver:
         None.
 
         """
-        self.flags = {"Networtinited": False}
-        self.params = {"IP": IP, "Port": Port, "PacketrateUpdateCount": 10000}
+        self.flags = {
+            "Networtinited": False,
+            "BulkIngest": BulkIngest,
+            "ProcessPerSensor": BulkIngest and ProcessPerSensor,
+        }
+        self.params = {
+            "IP": IP,
+            "Port": Port,
+            "PacketrateUpdateCount": 10000,
+            "RingBufferSize": int(RingBufferSize),
+            "MaxDatagramsPerBatch": 1024,
+        }
         self.socket = socket.socket(
             socket.AF_INET, socket.SOCK_DGRAM  # Internet
         )  # UDP
 
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)# socket can be resued instantly for debugging
+        if BulkIngest:
+            # a large OS buffer bridges the time the batch of datagrams is decoded
+            self.socket.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, int(SocketBufferSize)
+            )
         # Try to open the UDP connection
         try:
             self.socket.bind((IP, Port))
@@ -118,7 +166,10 @@ class DataReceiver:
         self.packestlosforsensor = {}
         self.AllSensors = {}
         self.msgcount = 0
+        self.datagramcount = 0
+        self.invalidmsgcount = 0
         self.lastTimestamp = 0
+        self.lastRateMsgcount = 0
         self.Datarate = 0
         self._stop_event = threading.Event()
         # start thread for data processing
@@ -174,130 +225,318 @@ class DataReceiver:
         None.
 
         """
+        if self.flags["BulkIngest"]:
+            self._runBulk()
+            return
         # implement stop routine
         while not self._stop_event.is_set():
             data, addr = self.socket.recvfrom(1500)  # buffer size is 1024 bytes
-            wasValidData = False
-            wasValidDescription = False
-            ProtoData = messages_pb2.DataMessage()
-            ProtoDescription = messages_pb2.DescriptionMessage()
-            SensorID = 0
-            BytesProcessed = 4  # we need an offset of 4 sice
+            self.datagramcount += 1
             if data[:4] == b"DATA":
-                while BytesProcessed < len(data):
-                    msg_len, new_pos = _DecodeVarint32(data, BytesProcessed)
-                    BytesProcessed = new_pos
-
+                # all messages of the packet are decoded at once by messagedecoder
+                # and send as one block over the sensors queue
+                records, invalid = decodeDataMessages(data, offset=4)
+                if invalid > 0:
+                    self.invalidmsgcount = self.invalidmsgcount + invalid
+                    print("INVALID PROTODATA")
+                if len(records) == 0:
+                    continue
+                for SensorID, block in self._splitRecordsBySensor(records):
+                    message = {"Records": block, "Type": "DataBlock"}
                     try:
-                        msg_buf = data[new_pos : new_pos + msg_len]
-                        ProtoData.ParseFromString(msg_buf)
-                        wasValidData = True
-                        SensorID = ProtoData.id
-                        message = {"ProtMsg": copy.deepcopy(ProtoData), "Type": "Data"}
-                        BytesProcessed += msg_len
-                    except:
-                        pass  # ? no exception for wrong data type !!
-                    if not (wasValidData or wasValidDescription):
-                        print("INVALID PROTODATA")
-                        pass  # invalid data leave parsing routine
-
-                    if SensorID in self.AllSensors:
-                        try:
-                            self.AllSensors[SensorID].buffer.put_nowait(message)
-                        except:
-                            tmp = self.packestlosforsensor[SensorID] = (
-                                self.packestlosforsensor[SensorID] + 1
-                            )
-                            if tmp == 1:
-                                print("!!!! FATAL PERFORMANCE PROBLEMS !!!!")
-                                print(
-                                    "FIRSTTIME packet lost for sensor ID:"
-                                    + str(SensorID)
-                                )
-                                print(
-                                    "DROP MESSAGES ARE ONLY PRINTETD EVERY 1000 DROPS FROM NOW ON !!!!!!!! "
-                                )
-                            if tmp % 1000 == 0:
-                                print("oh no lost an other  thousand packets :(")
-                    else:
-                        self.AllSensors[SensorID] = Sensor(SensorID)
-                        print(
-                            "FOUND NEW SENSOR WITH ID=hex"
-                            + hex(SensorID)
-                            + "==>dec:"
-                            + str(SensorID)
-                        )
-                        self.packestlosforsensor[
-                            SensorID
-                        ] = 0  # initing lost packet counter
-                    self.msgcount = self.msgcount + 1
-
-                    if self.msgcount % self.params["PacketrateUpdateCount"] == 0:
-                        print(
-                            "received "
-                            + str(self.params["PacketrateUpdateCount"])
-                            + " packets"
-                        )
-                        if self.lastTimestamp != 0:
-                            timeDIFF = time.monotonic() - self.lastTimestamp
-                            self.Datarate = (
-                                self.params["PacketrateUpdateCount"] / timeDIFF
-                            )
-                            print("Update rate is " + str(self.Datarate) + " Hz")
-                            self.lastTimestamp = time.monotonic()
-                        else:
-                            self.lastTimestamp = time.monotonic()
+                        self.AllSensors[SensorID].buffer.put_nowait(message)
+                    except Exception:
+                        self._countLostMessages(SensorID, len(block))
+                self._countMessages(len(records))
             elif data[:4] == b"DSCP":
-                while BytesProcessed < len(data):
-                    msg_len, new_pos = _DecodeVarint32(data, BytesProcessed)
-                    BytesProcessed = new_pos
-                    try:
-                        msg_buf = data[new_pos : new_pos + msg_len]
-                        ProtoDescription.ParseFromString(msg_buf)
-                        # print(msg_buf)
-                        wasValidData = True
-                        SensorID = ProtoDescription.id
-                        message = {"ProtMsg": ProtoDescription, "Type": "Description"}
-                        BytesProcessed += msg_len
-                    except:
-                        pass  # ? no exception for wrong data type !!
-                    if not (wasValidData or wasValidDescription):
-                        print("INVALID PROTODATA")
-                        pass  # invalid data leave parsing routine
-
-                    if SensorID in self.AllSensors:
-                        try:
-                            self.AllSensors[SensorID].buffer.put_nowait(message)
-                        except:
-                            print("packet lost for sensor ID:" + hex(SensorID))
-                    else:
-                        self.AllSensors[SensorID] = Sensor(SensorID)
-                        print(
-                            "FOUND NEW SENSOR WITH ID=hex"
-                            + hex(SensorID)
-                            + " dec==>:"
-                            + str(SensorID)
-                        )
-                    self.msgcount = self.msgcount + 1
-
-                    if self.msgcount % self.params["PacketrateUpdateCount"] == 0:
-                        print(
-                            "received "
-                            + str(self.params["PacketrateUpdateCount"])
-                            + " packets"
-                        )
-                        if self.lastTimestamp != 0:
-                            timeDIFF = time.monotonic() - self.lastTimestamp
-                            self.Datarate = (
-                                self.params["PacketrateUpdateCount"] / timeDIFF
-                            )
-                            print("Update rate is " + str(self.Datarate) + " Hz")
-                            self.lastTimestamp = time.monotonic()
-                        else:
-                            self.lastTimestamp = time.monotonic()
+                self._processDescriptionPacket(data)
             else:
                 print("unrecognized packed preamble" + str(data[:5]))
 
+    def _processDescriptionPacket(self, data):
+        """
+        Sends all description messages of an DSCP packet to the sensors queue.
+
+        Parameters
+        ----------
+        data : bytes
+            UDP packet starting with the preamble DSCP.
+
+        Returns
+        -------
+        None.
+
+        """
+        wasValidData = False
+        wasValidDescription = False
+        ProtoDescription = messages_pb2.DescriptionMessage()
+        SensorID = 0
+        BytesProcessed = 4  # we need an offset of 4 sice
+        while BytesProcessed < len(data):
+            msg_len, new_pos = _DecodeVarint32(data, BytesProcessed)
+            BytesProcessed = new_pos
+            try:
+                msg_buf = data[new_pos : new_pos + msg_len]
+                ProtoDescription.ParseFromString(msg_buf)
+                # print(msg_buf)
+                wasValidData = True
+                SensorID = ProtoDescription.id
+                message = {"ProtMsg": ProtoDescription, "Type": "Description"}
+                BytesProcessed += msg_len
+            except:
+                pass  # ? no exception for wrong data type !!
+            if not (wasValidData or wasValidDescription):
+                print("INVALID PROTODATA")
+                pass  # invalid data leave parsing routine
+
+            if SensorID in self.AllSensors:
+                try:
+                    self.AllSensors[SensorID].buffer.put_nowait(message)
+                except:
+                    print("packet lost for sensor ID:" + hex(SensorID))
+            else:
+                self._createSensor(SensorID)
+                print(
+                    "FOUND NEW SENSOR WITH ID=hex"
+                    + hex(SensorID)
+                    + " dec==>:"
+                    + str(SensorID)
+                )
+            self.msgcount = self.msgcount + 1
+
+            if self.msgcount % self.params["PacketrateUpdateCount"] == 0:
+                print(
+                    "received "
+                    + str(self.params["PacketrateUpdateCount"])
+                    + " packets"
+                )
+                if self.lastTimestamp != 0:
+                    timeDIFF = time.monotonic() - self.lastTimestamp
+                    self.Datarate = (
+                        self.params["PacketrateUpdateCount"] / timeDIFF
+                    )
+                    print("Update rate is " + str(self.Datarate) + " Hz")
+                    self.lastTimestamp = time.monotonic()
+                else:
+                    self.lastTimestamp = time.monotonic()
+
+    def _createSensor(self, SensorID):
+        """
+        Creates and registers a new sensor, with ring buffer if BulkIngest is set.
+
+        Parameters
+        ----------
+        SensorID : uint32
+            ID of the new Sensor.
+
+        Returns
+        -------
+        Sensor
+            the new Sensor instance.
+
+        """
+        if self.flags["BulkIngest"]:
+            sensor = Sensor(
+                SensorID,
+                RingBufferSize=self.params["RingBufferSize"],
+                SharedRingBuffer=self.flags["ProcessPerSensor"],
+            )
+        else:
+            sensor = Sensor(SensorID)
+        self.AllSensors[SensorID] = sensor
+        self.packestlosforsensor[SensorID] = 0  # initing lost packet counter
+        return sensor
+
+    def _runBulk(self):
+        """
+        Receive loop of the BulkIngest mode.
+
+        After each wake up all datagrams already waiting in the socket are read
+        without blocking, the data messages of the whole batch are decoded at once
+        by messagedecoder.decodeDataPackets into one structured array and are
+        pushed block wise into the ring buffers of the sensors. No per message
+        objects are created or copied.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.socket.settimeout(0.1)
+        while not self._stop_event.is_set():
+            try:
+                datagrams = [self.socket.recv(1500)]
+            except socket.timeout:
+                continue
+            except OSError:
+                break  # socket has been closed by stop()
+            # drain the socket without waiting for further datagrams
+            self.socket.setblocking(False)
+            try:
+                while len(datagrams) < self.params["MaxDatagramsPerBatch"]:
+                    datagrams.append(self.socket.recv(1500))
+            except (BlockingIOError, OSError):
+                pass
+            finally:
+                if not self._stop_event.is_set():
+                    self.socket.settimeout(0.1)
+            self.datagramcount += len(datagrams)
+
+            datapackets = []
+            for data in datagrams:
+                if data[:4] == b"DATA":
+                    datapackets.append(data)
+                elif data[:4] == b"DSCP":
+                    self._processDescriptionPacket(data)
+                else:
+                    print("unrecognized packed preamble" + str(data[:5]))
+            if len(datapackets) > 0:
+                records, invalid = decodeDataPackets(datapackets)
+                if invalid > 0:
+                    self.invalidmsgcount = self.invalidmsgcount + invalid
+                    print("INVALID PROTODATA")
+                if len(records) > 0:
+                    self._pushDataRecords(records)
+
+    def _pushDataRecords(self, records):
+        """
+        Pushes decoded data messages into the ring buffers of their sensors.
+
+        Parameters
+        ----------
+        records : numpy.ndarray of DATA_MESSAGE_DTYPE
+            decoded data messages of possibly multiple sensors in received order.
+
+        Returns
+        -------
+        None.
+
+        """
+        for SensorID, block in self._splitRecordsBySensor(records):
+            dropped = self.AllSensors[SensorID].ringbuffer.push(block)
+            if dropped > 0:
+                self._countLostMessages(SensorID, dropped)
+        self._countMessages(len(records))
+
+    def _splitRecordsBySensor(self, records):
+        """
+        Splits decoded data messages by sensor and creates unknown sensors.
+
+        Parameters
+        ----------
+        records : numpy.ndarray of DATA_MESSAGE_DTYPE
+            decoded data messages of possibly multiple sensors in received order.
+
+        Returns
+        -------
+        list of (integer, numpy.ndarray of DATA_MESSAGE_DTYPE)
+            SensorID and data messages of every sensor in the records.
+
+        """
+        SensorIDs = records["id"]
+        if np.all(SensorIDs == SensorIDs[0]):
+            blocks = [(SensorIDs[0], records)]
+        else:
+            blocks = [
+                (SensorID, records[SensorIDs == SensorID])
+                for SensorID in np.unique(SensorIDs)
+            ]
+        blocks = [(int(SensorID), block) for SensorID, block in blocks]
+        for SensorID, block in blocks:
+            if SensorID not in self.AllSensors:
+                self._createSensor(SensorID)
+                print(
+                    "FOUND NEW SENSOR WITH ID=hex"
+                    + hex(SensorID)
+                    + "==>dec:"
+                    + str(SensorID)
+                )
+        return blocks
+
+    def _countLostMessages(self, SensorID, lost):
+        """
+        Counts data messages which could not be passed to a sensor.
+
+        Parameters
+        ----------
+        SensorID : integer
+            ID of the sensor.
+        lost : integer
+            number of lost data messages.
+
+        Returns
+        -------
+        None.
+
+        """
+        tmp = self.packestlosforsensor[SensorID]
+        self.packestlosforsensor[SensorID] = tmp + lost
+        if tmp == 0:
+            print("!!!! FATAL PERFORMANCE PROBLEMS !!!!")
+            print("FIRSTTIME packet lost for sensor ID:" + str(SensorID))
+            print(
+                "DROP MESSAGES ARE ONLY PRINTETD EVERY 1000 DROPS FROM NOW ON !!!!!!!! "
+            )
+        elif (tmp + lost) // 1000 > tmp // 1000:
+            print("oh no lost an other  thousand packets :(")
+
+    def _countMessages(self, count):
+        """
+        Counts received data messages and updates the data rate.
+
+        Parameters
+        ----------
+        count : integer
+            number of newly received data messages.
+
+        Returns
+        -------
+        None.
+
+        """
+        UpdateCount = self.params["PacketrateUpdateCount"]
+        lastmsgcount = self.msgcount
+        self.msgcount = self.msgcount + count
+        if self.msgcount // UpdateCount > lastmsgcount // UpdateCount:
+            print("received " + str(UpdateCount) + " packets")
+            now = time.monotonic()
+            if self.lastTimestamp != 0:
+                self.Datarate = (
+                    (self.msgcount - self.lastRateMsgcount)
+                    / (now - self.lastTimestamp)
+                )
+                print("Update rate is " + str(self.Datarate) + " Hz")
+            self.lastTimestamp = now
+            self.lastRateMsgcount = self.msgcount
+
+    def getIngestStats(self):
+        """
+        Returns counters to monitor the ingest of the data.
+
+        Returns
+        -------
+        dict
+            total numbers of received datagrams, data messages and invalid
+            messages and per sensor ID the number of received, dropped and
+            buffered (backlog) data messages and the largest backlog so far.
+
+        """
+        stats = {
+            "datagrams": self.datagramcount,
+            "messages": self.msgcount,
+            "invalid": self.invalidmsgcount,
+            "sensors": {},
+        }
+        for SensorID, sensor in self.AllSensors.items():
+            if sensor.ringbuffer is not None:
+                stats["sensors"][SensorID] = sensor.ringbuffer.getStats()
+            else:
+                stats["sensors"][SensorID] = {
+                    "dropped": self.packestlosforsensor.get(SensorID, 0),
+                    "backlog": sensor.buffer.qsize(),
+                }
+        return stats
+
     def __del__(self):
         """
         just for securtiy closes the socket if __del__ is called.
@@ -342,6 +581,51 @@ class DataReceiver:
         for SensorID in self.AllSensors:
             self.AllSensors[SensorID].StopDumpingToFileASCII()
 
+    def StartAllSensorProcesses(self, callbackfactory, args=(), force=False):
+        """
+        Starts one worker process per sensor, see Sensor.StartProcess.
+
+        Parameters
+        ----------
+        callbackfactory : callable
+            picklable factory of the block callbacks, called in every process as
+            callbackfactory(Description, *args).
+        args : tuple, optional
+            additional picklable arguments of the factory. The default is ().
+        force : bool, optional
+            start even if not all descriptions are complete. The default is False.
+
+        Raises
+        ------
+        RuntimeError
+            if not all descriptions are complete and force is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        for SensorID in self.AllSensors:
+            if self.AllSensors[SensorID].Description._complete == False and not force:
+                raise RuntimeError(
+                    "not all descriptions are complete processes not started."
+                    " Wait until descriptions are complete or use function argument force=true to start anyway"
+                )
+        for SensorID in self.AllSensors:
+            self.AllSensors[SensorID].StartProcess(callbackfactory, args)
+
+    def StopAllSensorProcesses(self):
+        """
+        Stops the worker processes of all sensors.
+
+        Returns
+        -------
+        None.
+
+        """
+        for SensorID in self.AllSensors:
+            self.AllSensors[SensorID].StopProcess()
+
 
 ### classes to proces sensor descriptions
 class AliasDict(dict):
@@ -358,6 +642,11 @@ class AliasDict(dict):
     def add_alias(self, key, alias):
         self.aliases[alias] = key
 
+    def __reduce__(self):
+        # the items are passed to __init__, the default reduction of dict
+        # subclasses would set them with __setitem__ before aliases exists
+        return (self.__class__, (dict(self),), self.__dict__)
+
 
 class ChannelDescription:
     def __init__(self, CHID):
@@ -676,6 +965,212 @@ class SensorDescription:
         return self.hiracydict
 
 
+class DataRingBuffer:
+    """Preallocated ring buffer of decoded data messages for one sensor
+
+    Holds the messages as numpy structured array of DATA_MESSAGE_DTYPE. It is meant
+    for exactly one producer (the DataReceiver thread) and one consumer (the Sensor
+    thread or the sensors worker process). The producer only advances the write
+    counter and the consumer only the read counter after the data has been copied,
+    so no lock is needed. Messages which do not fit into the buffer are dropped and
+    counted.
+
+    With Shared=True messages and counters are placed in shared memory. The buffer
+    can then be passed to a multiprocessing.Process, which attaches to the same
+    memory, so blocks are handed over without pickling.
+    """
+
+    # indices of the counters
+    _WRITTEN = 0  # total number of messages pushed
+    _READ = 1  # total number of messages popped
+    _DROPPED = 2
+    _MAXBACKLOG = 3
+
+    def __init__(self, Size=2**18, dtype=DATA_MESSAGE_DTYPE, Shared=False):
+        """
+        Constructor for the DataRingBuffer class
+
+        Parameters
+        ----------
+        Size : integer, optional
+            Number of messages the buffer can hold. The default is 2**18.
+        dtype : numpy.dtype, optional
+            Structured dtype of one message. The default is DATA_MESSAGE_DTYPE.
+        Shared : bool, optional
+            Place the buffer in shared memory for a consumer in an other process.
+            The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.size = int(Size)
+        self.dtype = np.dtype(dtype)
+        self.shared = Shared
+        self._isowner = True
+        if Shared:
+            self._datashm = shared_memory.SharedMemory(
+                create=True, size=self.size * self.dtype.itemsize
+            )
+            self._countershm = shared_memory.SharedMemory(create=True, size=4 * 8)
+            self._attachSharedMemory()
+            self.data[:] = 0
+            self._counters[:] = 0
+            self._dataAvailable = multiprocessing.Event()
+        else:
+            self.data = np.zeros(self.size, dtype=self.dtype)
+            self._counters = np.zeros(4, dtype=np.int64)
+            self._dataAvailable = threading.Event()
+
+    def _attachSharedMemory(self):
+        self.data = np.ndarray(self.size, dtype=self.dtype, buffer=self._datashm.buf)
+        self._counters = np.ndarray(4, dtype=np.int64, buffer=self._countershm.buf)
+
+    def __getstate__(self):
+        if not self.shared:
+            raise TypeError("only DataRingBuffers with Shared=True can be pickled")
+        return {
+            "size": self.size,
+            "dtype": self.dtype,
+            "datashmname": self._datashm.name,
+            "countershmname": self._countershm.name,
+            "dataAvailable": self._dataAvailable,
+        }
+
+    def __setstate__(self, state):
+        # attach to the shared memory of the buffer in the creating process
+        self.size = state["size"]
+        self.dtype = state["dtype"]
+        self.shared = True
+        self._isowner = False
+        self._datashm = shared_memory.SharedMemory(name=state["datashmname"])
+        self._countershm = shared_memory.SharedMemory(name=state["countershmname"])
+        self._attachSharedMemory()
+        self._dataAvailable = state["dataAvailable"]
+
+    def close(self):
+        """
+        Releases the shared memory, the creating process also frees it.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.shared and self.data is not None:
+            self.data = None
+            self._counters = None
+            self._datashm.close()
+            self._countershm.close()
+            if self._isowner:
+                self._datashm.unlink()
+                self._countershm.unlink()
+
+    @property
+    def written(self):
+        """Total number of messages pushed"""
+        return int(self._counters[self._WRITTEN])
+
+    @property
+    def read(self):
+        """Total number of messages popped"""
+        return int(self._counters[self._READ])
+
+    @property
+    def dropped(self):
+        """Total number of messages dropped because the buffer was full"""
+        return int(self._counters[self._DROPPED])
+
+    @property
+    def maxbacklog(self):
+        """Largest number of messages waiting in the buffer so far"""
+        return int(self._counters[self._MAXBACKLOG])
+
+    @property
+    def backlog(self):
+        """Number of messages waiting in the buffer"""
+        return self.written - self.read
+
+    def push(self, records):
+        """
+        Copies messages into the buffer, drops what does not fit.
+
+        Parameters
+        ----------
+        records : numpy.ndarray of the buffers dtype
+            messages to append.
+
+        Returns
+        -------
+        integer
+            Number of dropped messages.
+
+        """
+        count = min(len(records), self.size - self.backlog)
+        if count > 0:
+            start = self.written % self.size
+            first = min(count, self.size - start)
+            self.data[start : start + first] = records[:first]
+            self.data[: count - first] = records[first:count]
+            self._counters[self._WRITTEN] += count
+            self._counters[self._MAXBACKLOG] = max(self.maxbacklog, self.backlog)
+            self._dataAvailable.set()
+        dropped = len(records) - count
+        self._counters[self._DROPPED] += dropped
+        return dropped
+
+    def pop(self, maxCount=None, timeout=None):
+        """
+        Removes the oldest messages from the buffer.
+
+        Parameters
+        ----------
+        maxCount : integer, optional
+            Maximal number of messages to return. The default is None for all.
+        timeout : float, optional
+            Seconds to wait for messages if the buffer is empty.
+            The default is None for not waiting.
+
+        Returns
+        -------
+        numpy.ndarray of the buffers dtype
+            Copy of the popped messages in received order, might be empty.
+
+        """
+        self._dataAvailable.clear()
+        if self.backlog == 0 and timeout is not None:
+            self._dataAvailable.wait(timeout)
+        count = self.backlog
+        if maxCount is not None:
+            count = min(count, maxCount)
+        start = self.read % self.size
+        first = min(count, self.size - start)
+        records = np.concatenate(
+            (self.data[start : start + first], self.data[: count - first])
+        )
+        self._counters[self._READ] += count
+        return records
+
+    def getStats(self):
+        """
+        Returns the counters of the buffer.
+
+        Returns
+        -------
+        dict
+            numbers of received, dropped and buffered (backlog) messages and the
+            largest backlog so far.
+
+        """
+        return {
+            "received": self.written + self.dropped,
+            "dropped": self.dropped,
+            "backlog": self.backlog,
+            "max_backlog": self.maxbacklog,
+        }
+
+
 class Sensor:
     """Class for Processing the Data from Datareceiver class. All instances of this class will be swaned in Datareceiver.AllSensors
 
@@ -729,7 +1224,7 @@ class Sensor:
         6: "HIERARCHY",
     }
 
-    def __init__(self, ID, BufferSize=25e5):
+    def __init__(self, ID, BufferSize=25e5, RingBufferSize=0, SharedRingBuffer=False):
         """
         Constructor for the Sensor class
 
@@ -739,6 +1234,14 @@ class Sensor:
             ID of the Sensor.
         BufferSize : integer, optional
             Size of the Data Queue. The default is 25e5.
+        RingBufferSize : integer, optional
+            If larger than 0 the data messages are received block wise over a
+            DataRingBuffer of this size (see DataReceiver BulkIngest) and only
+            descriptions over the Data Queue. The default is 0.
+        SharedRingBuffer : bool, optional
+            Places the ring buffer in shared memory, which is needed to process
+            the data messages in an own process with StartProcess.
+            The default is False.
 
         Returns
         -------
@@ -748,12 +1251,21 @@ class Sensor:
         self.Description = SensorDescription(ID, "Name not Set")
         self.buffer = Queue(int(BufferSize))
         self.buffersize = BufferSize
+        if RingBufferSize > 0:
+            self.ringbuffer = DataRingBuffer(RingBufferSize, Shared=SharedRingBuffer)
+        else:
+            self.ringbuffer = None
+        self.process = None
+        self._processStopEvent = None
+        self._consumerLock = threading.Lock()
         self.flags = {
             "DumpToFile": False,
             "DumpToFileProto": False,
             "DumpToFileASCII": False,
             "PrintProcessedCounts": True,
             "callbackSet": False,
+            "blockCallbackSet": False,
+            "ProcessMode": False,
         }
         self.params = {"ID": ID, "BufferSize": BufferSize, "DumpFileName": ""}
         self.DescriptionsProcessed = AliasDict(
@@ -916,11 +1428,18 @@ class Sensor:
         None.
 
         """
+        if self.ringbuffer is not None:
+            self.__runRingBuffer()
+            return
         while not self._stop_event.is_set():
             # problem when we are closing the queue this function is waiting for data and raises EOF error if we delet the q
             # work around adding time out so self.buffer.get is returning after a time an thestop_event falg can be checked
             try:
                 message = self.buffer.get(timeout=0.1)
+                if message["Type"] == "DataBlock":
+                    # counted per data message in __processBlock
+                    self.__processBlock(message["Records"])
+                    continue
                 self.timeoutOccured = False
                 self.ProcessedPacekts = self.ProcessedPacekts + 1
                 if self.flags["PrintProcessedCounts"]:
@@ -935,137 +1454,9 @@ class Sensor:
                             + "%"
                         )
                 if message["Type"] == "Description":
-                    Description = message["ProtMsg"]
-                    try:
-                        if (
-                            not any(self.DescriptionsProcessed.values())
-                            and Description.IsInitialized()
-                        ):
-                            # run only if no description packed has been procesed ever
-                            # self.Description.SensorName=message.Sensor_name
-                            print(
-                                "Found new description "
-                                + Description.Sensor_name
-                                + " sensor with ID:"
-                                + str(self.params["ID"])
-                            )
-                            # print(str(Description.Description_Type))
-                            if(Description.has_time_ticks==True):
-                                print("Raw tick detected for " +Description.Sensor_name
-                                + " sensor with ID:"
-                                + str(self.params["ID"]))
-                                self.Description.has_time_ticks =True
-                        if (
-                            self.DescriptionsProcessed[Description.Description_Type]
-                            == False
-                        ):
-
-                            if self.Description.SensorName == "Name not Set":
-                                self.Description.SensorName = Description.Sensor_name
-                            # we havent processed thiss message before now do that
-                            if Description.Description_Type in [
-                                0,
-                                1,
-                                2,
-                                6,
-                            ]:  # ["PHYSICAL_QUANTITY","UNIT","UNCERTAINTY_TYPE"]
-                                # print(Description)
-                                # string Processing
-
-                                FieldNumber = 1
-                                for StrField in self.StrFieldNames:
-                                    if Description.HasField(StrField):
-                                        self.Description.setChannelParam(
-                                            FieldNumber,
-                                            self.DescriptionTypNames[
-                                                Description.Description_Type
-                                            ],
-                                            Description.__getattribute__(StrField),
-                                        )
-                                        # print(str(FieldNumber)+' '+Description.__getattribute__(StrField))
-                                    FieldNumber = FieldNumber + 1
-
-                                self.DescriptionsProcessed[
-                                    Description.Description_Type
-                                ] = True
-                                # print(self.DescriptionsProcessed)
-                            if Description.Description_Type in [
-                                3,
-                                4,
-                                5,
-                            ]:  # ["RESOLUTION","MIN_SCALE","MAX_SCALE"]
-                                self.DescriptionsProcessed[
-                                    Description.Description_Type
-                                ] = True
-                                FieldNumber = 1
-                                for FloatField in self.FFieldNames:
-                                    if Description.HasField(FloatField):
-                                        self.Description.setChannelParam(
-                                            FieldNumber,
-                                            self.DescriptionTypNames[
-                                                Description.Description_Type
-                                            ],
-                                            Description.__getattribute__(FloatField),
-                                        )
-                                        # print(str(FieldNumber)+' '+str(Description.__getattribute__(FloatField)))
-                                    FieldNumber = FieldNumber + 1
-                                # print(self.DescriptionsProcessed)
-                                # string Processing
-                    except Exception:
-                        print(
-                            " Sensor id:"
-                            + hex(self.params["ID"])
-                            + "Exception in user Description parsing:"
-                        )
-                        print("-" * 60)
-                        traceback.print_exc(file=sys.stdout)
-                        print("-" * 60)
-                if self.flags["callbackSet"]:
-                    if message["Type"] == "Data":
-                        try:
-                            self.callback(message["ProtMsg"], self.Description)
-                        except Exception:
-                            print(
-                                " Sensor id:"
-                                + hex(self.params["ID"])
-                                + "Exception in user callback:"
-                            )
-                            print("-" * 60)
-                            traceback.print_exc(file=sys.stdout)
-                            print("-" * 60)
-                            pass
-
-                if self.flags["DumpToFileProto"]:
-                    if message["Type"] == "Data":
-                        try:
-                            self.__dumpMsgToFileProto(message["ProtMsg"])
-                        except Exception:
-                            print(
-                                " Sensor id:"
-                                + hex(self.params["ID"])
-                                + "Exception in user datadump:"
-                            )
-                            print("-" * 60)
-                            traceback.print_exc(file=sys.stdout)
-                            print("-" * 60)
-                            pass
-                if self.flags["DumpToFileASCII"]:
-                    if message["Type"] == "Data":
-                        if time.monotonic() > self.ASCIIDumpNextSplittime:
-                            # TODO remove bug in this line
-                            self.initNewASCIIFile()
-                        try:
-                            self.__dumpMsgToFileASCII(message["ProtMsg"])
-                        except Exception:
-                            print(
-                                " Sensor id:"
-                                + hex(self.params["ID"])
-                                + "Exception in user datadump:"
-                            )
-                            print("-" * 60)
-                            traceback.print_exc(file=sys.stdout)
-                            print("-" * 60)
-                            pass
+                    self.__processDescription(message["ProtMsg"])
+                elif message["Type"] == "Data":
+                    self.__processData(message["ProtMsg"])
             except Exception as inst:
                 if self.timeoutOccured == False:
                     self.timeoutOccured = True
@@ -1073,6 +1464,286 @@ class Sensor:
                 else:
                     self.timeSinceLastPacket += 0.1
 
+    def __runRingBuffer(self):
+        """
+        Sensor loop for data messages received over the ring buffer.
+
+        Descriptions are still taken from the Data Queue. The data messages are
+        processed block wise, the block callback gets the whole block as numpy
+        structured array, the callback and the dumps get one numpy.record per
+        message, which provides the same attributes as the protobuff message.
+
+        Returns
+        -------
+        None.
+
+        """
+        while not self._stop_event.is_set():
+            while not self.buffer.empty():
+                try:
+                    message = self.buffer.get_nowait()
+                except Exception:
+                    break
+                if message["Type"] == "Description":
+                    self.__processDescription(message["ProtMsg"])
+            if self.flags["ProcessMode"]:
+                # the data messages are consumed by the worker process
+                self._stop_event.wait(0.1)
+                self.__checkProcess()
+                continue
+            with self._consumerLock:
+                if not self.flags["ProcessMode"]:
+                    self.__processBlock(self.ringbuffer.pop(timeout=0.1))
+
+    def __checkProcess(self):
+        """
+        Falls back to the sensor thread if the worker process died.
+
+        Without a consumer the ring buffer would fill up and all further data
+        messages would be dropped.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._consumerLock:
+            process = self.process
+            if (
+                process is None
+                or process.is_alive()
+                or self._processStopEvent.is_set()
+            ):
+                return
+            warnings.warn(
+                "Process of sensor "
+                + hex(self.params["ID"])
+                + " died with exit code "
+                + str(process.exitcode)
+                + ", processing the data messages in the sensor thread again",
+                RuntimeWarning,
+            )
+            self.process = None
+            self.flags["ProcessMode"] = False
+
+    def __processBlock(self, block):
+        """
+        private function to process a block of data messages from the ring buffer.
+
+        Parameters
+        ----------
+        block : numpy.ndarray of DATA_MESSAGE_DTYPE
+            data messages of this sensor, might be empty.
+
+        Returns
+        -------
+        None.
+
+        """
+        if len(block) == 0:
+            if self.timeoutOccured == False:
+                self.timeoutOccured = True
+                self.timeSinceLastPacket = 0
+            else:
+                self.timeSinceLastPacket += 0.1
+            return
+        self.timeoutOccured = False
+        lastProcessedPacekts = self.ProcessedPacekts
+        self.ProcessedPacekts = self.ProcessedPacekts + len(block)
+        if self.flags["PrintProcessedCounts"]:
+            if self.ProcessedPacekts // 10000 > lastProcessedPacekts // 10000:
+                if self.ringbuffer is not None:
+                    backlog = " Packets in ring buffer " + str(self.ringbuffer.backlog)
+                    fill = self.ringbuffer.backlog / self.ringbuffer.size
+                else:
+                    backlog = " Blocks in Que " + str(self.buffer.qsize())
+                    fill = self.buffer.qsize() / self.buffersize
+                print(
+                    "processed 10000 packets in receiver for Sensor ID:"
+                    + hex(self.params["ID"])
+                    + backlog
+                    + " -->"
+                    + str(fill * 100)
+                    + "%"
+                )
+        if self.flags["blockCallbackSet"]:
+            try:
+                self.blockcallback(block, self.Description)
+            except Exception:
+                print(
+                    " Sensor id:"
+                    + hex(self.params["ID"])
+                    + "Exception in user block callback:"
+                )
+                print("-" * 60)
+                traceback.print_exc(file=sys.stdout)
+                print("-" * 60)
+        if (
+            self.flags["callbackSet"]
+            or self.flags["DumpToFileProto"]
+            or self.flags["DumpToFileASCII"]
+        ):
+            for message in block.view(np.recarray):
+                self.__processData(message)
+
+    def __processDescription(self, Description):
+        """
+        private function to process a description message.
+
+        Parameters
+        ----------
+        Description : protobuff message
+            DescriptionMessage of this sensor.
+
+        Returns
+        -------
+        None.
+
+        """
+        try:
+            if (
+                not any(self.DescriptionsProcessed.values())
+                and Description.IsInitialized()
+            ):
+                # run only if no description packed has been procesed ever
+                # self.Description.SensorName=message.Sensor_name
+                print(
+                    "Found new description "
+                    + Description.Sensor_name
+                    + " sensor with ID:"
+                    + str(self.params["ID"])
+                )
+                # print(str(Description.Description_Type))
+                if(Description.has_time_ticks==True):
+                    print("Raw tick detected for " +Description.Sensor_name
+                    + " sensor with ID:"
+                    + str(self.params["ID"]))
+                    self.Description.has_time_ticks =True
+            if (
+                self.DescriptionsProcessed[Description.Description_Type]
+                == False
+            ):
+
+                if self.Description.SensorName == "Name not Set":
+                    self.Description.SensorName = Description.Sensor_name
+                # we havent processed thiss message before now do that
+                if Description.Description_Type in [
+                    0,
+                    1,
+                    2,
+                    6,
+                ]:  # ["PHYSICAL_QUANTITY","UNIT","UNCERTAINTY_TYPE"]
+                    # print(Description)
+                    # string Processing
+
+                    FieldNumber = 1
+                    for StrField in self.StrFieldNames:
+                        if Description.HasField(StrField):
+                            self.Description.setChannelParam(
+                                FieldNumber,
+                                self.DescriptionTypNames[
+                                    Description.Description_Type
+                                ],
+                                Description.__getattribute__(StrField),
+                            )
+                            # print(str(FieldNumber)+' '+Description.__getattribute__(StrField))
+                        FieldNumber = FieldNumber + 1
+
+                    self.DescriptionsProcessed[
+                        Description.Description_Type
+                    ] = True
+                    # print(self.DescriptionsProcessed)
+                if Description.Description_Type in [
+                    3,
+                    4,
+                    5,
+                ]:  # ["RESOLUTION","MIN_SCALE","MAX_SCALE"]
+                    self.DescriptionsProcessed[
+                        Description.Description_Type
+                    ] = True
+                    FieldNumber = 1
+                    for FloatField in self.FFieldNames:
+                        if Description.HasField(FloatField):
+                            self.Description.setChannelParam(
+                                FieldNumber,
+                                self.DescriptionTypNames[
+                                    Description.Description_Type
+                                ],
+                                Description.__getattribute__(FloatField),
+                            )
+                            # print(str(FieldNumber)+' '+str(Description.__getattribute__(FloatField)))
+                        FieldNumber = FieldNumber + 1
+                    # print(self.DescriptionsProcessed)
+                    # string Processing
+        except Exception:
+            print(
+                " Sensor id:"
+                + hex(self.params["ID"])
+                + "Exception in user Description parsing:"
+            )
+            print("-" * 60)
+            traceback.print_exc(file=sys.stdout)
+            print("-" * 60)
+
+    def __processData(self, message):
+        """
+        private function to pass a data message to the callback and the dumps.
+
+        Parameters
+        ----------
+        message : protobuff message or numpy.record
+            DataMessage of this sensor or a record of DATA_MESSAGE_DTYPE, which
+            provides the same attributes.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.flags["callbackSet"]:
+            try:
+                self.callback(message, self.Description)
+            except Exception:
+                print(
+                    " Sensor id:"
+                    + hex(self.params["ID"])
+                    + "Exception in user callback:"
+                )
+                print("-" * 60)
+                traceback.print_exc(file=sys.stdout)
+                print("-" * 60)
+                pass
+
+        if self.flags["DumpToFileProto"]:
+            try:
+                self.__dumpMsgToFileProto(message)
+            except Exception:
+                print(
+                    " Sensor id:"
+                    + hex(self.params["ID"])
+                    + "Exception in user datadump:"
+                )
+                print("-" * 60)
+                traceback.print_exc(file=sys.stdout)
+                print("-" * 60)
+                pass
+        if self.flags["DumpToFileASCII"]:
+            if time.monotonic() > self.ASCIIDumpNextSplittime:
+                # TODO remove bug in this line
+                self.initNewASCIIFile()
+            try:
+                self.__dumpMsgToFileASCII(message)
+            except Exception:
+                print(
+                    " Sensor id:"
+                    + hex(self.params["ID"])
+                    + "Exception in user datadump:"
+                )
+                print("-" * 60)
+                traceback.print_exc(file=sys.stdout)
+                print("-" * 60)
+                pass
+
     def donothingcb(self, message, Description):
         pass
 
@@ -1107,6 +1778,118 @@ class Sensor:
         self.flags["callbackSet"] = False
         self.callback = self.donothingcb
 
+    def SetBlockCallback(self, callback):
+        """
+        Sets an callback for blocks of data messages, called with all data
+        messages of a DATA packet or of a ring buffer read.
+        Signature musste be: callback(block, self.Description)
+
+        Parameters
+        ----------
+        callback : function
+            callback function signature musste be: callback(block, self.Description)
+            with block a numpy structured array of DATA_MESSAGE_DTYPE.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.flags["blockCallbackSet"] = True
+        self.blockcallback = callback
+
+    def UnSetBlockCallback(
+        self,
+    ):
+        """
+        deactivates the block callback.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.flags["blockCallbackSet"] = False
+        self.blockcallback = self.donothingcb
+
+    def StartProcess(self, callbackfactory, args=()):
+        """
+        Processes the data messages in an own process instead of the sensor thread.
+
+        The process attaches to the shared ring buffer and calls
+        callback=callbackfactory(self.Description, *args) once at start. Then
+        callback(block, Description) is called for every block of data messages,
+        without the GIL of the receiving process. If the callback has a close
+        method it is called after the remaining messages have been processed when
+        the process is stopped. Callbacks, dumps and descriptions updated in this
+        process are not seen by the worker process. If the worker process dies,
+        the sensor thread warns and processes the data messages again.
+
+        Parameters
+        ----------
+        callbackfactory : callable
+            picklable (e.g. module level function or class) factory of the block
+            callback, for example HDF5DumperBlockCallback.
+        args : tuple, optional
+            additional picklable arguments of the factory. The default is ().
+
+        Raises
+        ------
+        RuntimeError
+            if the sensor has no shared ring buffer or a process is running.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.ringbuffer is None or not self.ringbuffer.shared:
+            raise RuntimeError(
+                "Sensor "
+                + hex(self.params["ID"])
+                + " has no shared ring buffer use"
+                " DataReceiver(BulkIngest=True, ProcessPerSensor=True)"
+            )
+        if self.process is not None:
+            raise RuntimeError(
+                "Sensor " + hex(self.params["ID"]) + " has already a running process"
+            )
+        # wait until the sensor thread has finished its current block
+        with self._consumerLock:
+            self.flags["ProcessMode"] = True
+        self._processStopEvent = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=runSensorProcess,
+            args=(
+                self.ringbuffer,
+                self.Description,
+                callbackfactory,
+                args,
+                self._processStopEvent,
+            ),
+            name="Sensor_" + str(self.params["ID"]) + "_process",
+            daemon=True,
+        )
+        self.process.start()
+
+    def StopProcess(self):
+        """
+        Stops the worker process after it has processed all buffered messages.
+
+        The data messages are then again processed in the sensor thread.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.process is None:
+            return
+        self._processStopEvent.set()
+        self.process.join()
+        self.process = None
+        self.flags["ProcessMode"] = False
+
     def stop(self):
         """
         Stops the sensor task.
@@ -1117,6 +1900,7 @@ class Sensor:
 
         """
         print("Stopping Sensor " + hex(self.params["ID"]))
+        self.StopProcess()
         self._stop_event.set()
         # sleeping until run function is exiting due to timeout
         time.sleep(0.2)
@@ -1127,6 +1911,8 @@ class Sensor:
             except:
                 pass
         self.buffer.close()
+        if self.ringbuffer is not None:
+            self.ringbuffer.close()
 
     def join(self, *args, **kwargs):
         """
@@ -1221,22 +2007,75 @@ class Sensor:
         None.
 
         """
+        if not isinstance(message, messages_pb2.DataMessage):
+            # record from the ring buffer
+            message = messages_pb2.DataMessage(
+                **{name: message[name].item() for name in DATA_MESSAGE_FIELDS}
+            )
         size = message.ByteSize()
         self.DumpfileProto.write(_VarintBytes(size))
         self.DumpfileProto.write(message.SerializeToString())
 
 
+def runSensorProcess(ringbuffer, Description, callbackfactory, args, stopevent):
+    """
+    Loop of a sensor worker process started by Sensor.StartProcess.
+
+    Parameters
+    ----------
+    ringbuffer : DataRingBuffer
+        shared ring buffer of the sensor, attached to in this process.
+    Description : SensorDescription
+        description of the sensor at the time the process was started.
+    callbackfactory : callable
+        factory of the block callback, called as callbackfactory(Description, *args).
+    args : tuple
+        additional arguments of the factory.
+    stopevent : multiprocessing.Event
+        ends the loop once set and all buffered messages are processed.
+
+    Returns
+    -------
+    None.
+
+    """
+    callback = callbackfactory(Description, *args)
+    while not stopevent.is_set() or ringbuffer.backlog > 0:
+        block = ringbuffer.pop(timeout=0.1)
+        if len(block) > 0:
+            try:
+                callback(block, Description)
+            except Exception:
+                print(
+                    " Sensor id:"
+                    + hex(Description.ID)
+                    + "Exception in process block callback:"
+                )
+                print("-" * 60)
+                traceback.print_exc(file=sys.stdout)
+                print("-" * 60)
+    if hasattr(callback, "close"):
+        callback.close()
+
+
 class HDF5Dumper:
-    def __init__(self, dscp, file, hdfffilelock, chunksize=2048,correcttimeglitches=True,ignoreMissmatchErrors=True):
+    def __init__(self, dscp, file, hdfffilelock, chunksize=None,correcttimeglitches=True,ignoreMissmatchErrors=True,writerbuffers=3,storageprofile=None):
         self.dscp=dscp
         self.hdflock = hdfffilelock
         self.pushlock = threading.Lock()
         self.dataframindexoffset = 4
+        # chunk length, filters and dtype of the data channels of new datasets
+        self.storageprofile = getStorageProfile(storageprofile)
+        self.storageargs = datasetStorageArgs(self.storageprofile)
+        if chunksize is None:
+            chunksize = self.storageprofile["chunksize"]
         self.chunksize = chunksize
         self.buffer = np.zeros([16, self.chunksize])
         self.time_buffer = np.zeros([4,self.chunksize], dtype=np.uint64)
         self.ticks_buffer = np.zeros( self.chunksize,dtype=np.uint64)
         self.chunkswritten = 0
+        # number of samples the datasets are extended to, ahead of the written data
+        self.allocated = self.chunksize
         self.msgbufferd = 0
         self.lastdatatime=0
         self.timeoffset = 0
@@ -1244,6 +2083,31 @@ class HDF5Dumper:
         self.hieracy = dscp.gethieracyasdict()
         self.startimewritten = False
         self.correcttimeglitches=correcttimeglitches
+        # full chunks are handed to a background writer thread, so pushing never
+        # waits for compression and disk io. writerbuffers is the number of chunks
+        # which can wait for the writer, 0 writes synchronously while pushing.
+        self.writerbuffers = writerbuffers
+        self.writequeue = queue.Queue(maxsize=max(writerbuffers, 1))
+        self.freebuffers = queue.Queue()
+        for i in range(writerbuffers):
+            self.freebuffers.put(
+                (
+                    np.zeros([4, self.chunksize], dtype=np.uint64),
+                    np.zeros([16, self.chunksize]),
+                    np.zeros(self.chunksize, dtype=np.uint64),
+                )
+            )
+        self.writerthread = None
+        self.writererror = None
+        self.writerstats = {
+            "chunks_written": 0,
+            "max_queue_depth": 0,
+            "last_write_latency": 0.0,
+            "max_write_latency": 0.0,
+            "total_write_latency": 0.0,
+            "stalls": 0,
+            "stall_time": 0.0,
+        }
         if isinstance(file, str):
             self.f = h5py.File(file, "a")
         elif isinstance(file, h5py._hl.files.File):
@@ -1285,6 +2149,12 @@ class HDF5Dumper:
                 self.chunkswritten = int(
                     self.Datasets["Absolutetime"].shape[1] / self.chunksize
                 )
+                self.allocated = self.Datasets["Absolutetime"].shape[1]
+                if "Data_point_number" in self.group.attrs:
+                    # datasets may be pre-extended beyond the written data
+                    self.chunkswritten = int(
+                        np.ceil(self.group.attrs["Data_point_number"] / self.chunksize)
+                    )
                 for groupname in self.hieracy:
                     #TODO add loop over dict with error mesaages for unmatched parirs this will save at least 50 lines code and will be way better readable
                     self.Datasets[groupname] = self.group[groupname]
@@ -1397,8 +2267,8 @@ class HDF5Dumper:
                         ([1, chunksize]),
                         maxshape=(1, None),
                         dtype="uint64",
-                        compression="gzip",
-                        shuffle=True,
+                        chunks=(1, chunksize),
+                        **self.storageargs,
                     )
                     self.Datasets["Time_Ticks"]
                     self.Datasets["Time_Ticks"].attrs["Unit"] = "\\one"
@@ -1414,8 +2284,8 @@ class HDF5Dumper:
                     ([1, chunksize]),
                     maxshape=(1, None),
                     dtype="uint64",
-                    compression="gzip",
-                    shuffle=True,
+                    chunks=(1, chunksize),
+                    **self.storageargs,
                 )
                 self.Datasets["Absolutetime"].make_scale("Absoluitetime")
                 self.Datasets["Absolutetime"].attrs["Unit"] = "\\nano\\seconds"
@@ -1430,8 +2300,8 @@ class HDF5Dumper:
                     ([1, chunksize]),
                     maxshape=(1, None),
                     dtype="uint32",
-                    compression="gzip",
-                    shuffle=True,
+                    chunks=(1, chunksize),
+                    **self.storageargs,
                 )
                 self.Datasets["Absolutetime_uncertainty"].attrs[
                     "Unit"
@@ -1452,8 +2322,8 @@ class HDF5Dumper:
                     ([1, chunksize]),
                     maxshape=(1, None),
                     dtype="uint32",
-                    compression="gzip",
-                    shuffle=True,
+                    chunks=(1, chunksize),
+                    **self.storageargs,
                 )
                 self.Datasets["Sample_number"].attrs["Unit"] = "\\one"
                 self.Datasets["Sample_number"].attrs[
@@ -1468,10 +2338,10 @@ class HDF5Dumper:
                         groupname,
                         ([vectorlength, chunksize]),
                         maxshape=(3, None),
-                        dtype="float32",
-                        compression="gzip",
-                        shuffle=True,
-                    )  # compression="gzip",shuffle=True,
+                        chunks=(vectorlength, chunksize),
+                        dtype=self.storageprofile["datadtype"],
+                        **self.storageargs,
+                    )
                     self.Datasets[groupname].dims[0].label = "Absoluitetime"
                     self.Datasets[groupname].dims[0].attach_scale(
                         self.Datasets["Absolutetime"]
@@ -1542,112 +2412,371 @@ class HDF5Dumper:
             self.ticks_buffer[self.msgbufferd] = message.time_ticks
             self.msgbufferd = self.msgbufferd + 1
             if self.msgbufferd == self.chunksize:
-                #print(hex(self.dscp.ID)+"waiting for lock "+str(self.hdflock))
-                with self.hdflock:
-                    #print(hex(self.dscp.ID)+"Aquired lock " + str(self.hdflock))
-                    startIDX = self.chunksize * self.chunkswritten
-                    #print("Start index is " + str(startIDX))
-                    self.Datasets["Absolutetime"].resize([1, startIDX + self.chunksize])
-                    time = (
-                        self.time_buffer[1, :] * 1000000000
-                        + self.time_buffer[2, : startIDX + self.chunksize]
-                    )
-                    self.Datasets["Absolutetime"][:, startIDX:] = time
-                    if (self.dscp.has_time_ticks):
-                        self.Datasets["Time_Ticks"].resize([1, startIDX + self.chunksize])
-                        self.Datasets["Time_Ticks"][:, startIDX:] = self.ticks_buffer
+                self.__handOffBuffer()
 
-                    self.Datasets["Absolutetime_uncertainty"].resize(
-                        [1, startIDX + self.chunksize]
-                    )
-                    Absolutetime_uncertainty = self.time_buffer[3, :].astype(np.uint32)
-                    self.Datasets["Absolutetime_uncertainty"][
-                        :, startIDX:
-                    ] = Absolutetime_uncertainty
-                    if not self.startimewritten:
-                        self.group.attrs["Start_time"] = time[0]
-                        self.group.attrs[
-                            "Start_time_uncertainty"
-                        ] = Absolutetime_uncertainty[0]
-                        self.startimewritten = True
-                    self.Datasets["Sample_number"].resize(
-                        [1, startIDX + self.chunksize]
-                    )
-                    samplenumbers = self.time_buffer[0, :].astype(np.uint32)
-                    self.Datasets["Sample_number"][:, startIDX:] = samplenumbers
+    def pushblock(self, block, Description):
+        """
+        Pushes a block of many data messages at once.
 
-                    for groupname in self.hieracy:
-                        vectorlength = len(self.hieracy[groupname]["copymask"])
-                        self.Datasets[groupname].resize(
-                            [vectorlength, startIDX + self.chunksize]
-                        )
-                        data = self.buffer[
-                            (
-                                self.hieracy[groupname]["copymask"]
-                                #+ self.dataframindexoffset
-                            ),
-                            :,
-                        ].astype("float32")
-                        self.Datasets[groupname][:, startIDX:] = data
-                    # self.f.flush()
-                    self.msgbufferd = 0
-                    self.chunkswritten = self.chunkswritten + 1
-                    self.group.attrs["Data_point_number"] = self.chunkswritten*self.chunksize
-                    self.buffer.fill(np.NaN)
-                    self.ticks_buffer.fill(np.NaN)
-                    self.buffer[0:4,:]=np.zeros([4,self.chunksize])
+        The time glitch correction of pushmsg is applied to the whole block and
+        all complete chunks of the block are written with one write per dataset,
+        so this is much faster than pushing every message of the block with
+        pushmsg. Both can be mixed.
 
-    def wirteRemainingToHDF(self):
-        warnings.warn('WARNING will generate zeros in the end of the data file if callback is active there will be an gap in the file ')
-        with self.hdflock:
-            startIDX = self.chunksize * self.chunkswritten
-            # print("Start index is " + str(startIDX))
-            self.Datasets["Absolutetime"].resize([1, startIDX + self.chunksize])
-            time = (
-                    self.time_buffer[1, :] * 1000000000
-                    + self.time_buffer[2, : startIDX + self.chunksize]
-            ).astype(np.uint64)
-            self.Datasets["Absolutetime"][:, startIDX:] = time
-            if (self.dscp.has_time_ticks):
-                self.Datasets["Time_Ticks"].resize([1, startIDX + self.chunksize])
-                self.Datasets["Time_Ticks"][:, startIDX:] = self.ticks_buffer
-
-            self.Datasets["Absolutetime_uncertainty"].resize(
-                [1, startIDX + self.chunksize]
+        Parameters
+        ----------
+        block : numpy.ndarray of DATA_MESSAGE_DTYPE
+            the data messages, e.g. as popped from the sensors DataRingBuffer.
+        Description : SensorDescription
+            description of the sensor.
+
+        Returns
+        -------
+        None.
+
+        """
+        length = len(block)
+        if length == 0:
+            return
+        with self.pushlock:
+            timeoffsets = self.__timeOffsets(block)
+            timedata = np.zeros([4, length], dtype=np.uint64)
+            timedata[0] = block["sample_number"]
+            timedata[1] = block["unix_time"] + timeoffsets
+            timedata[2] = block["unix_time_nsecs"]
+            timedata[3] = (
+                block["time_uncertainty"]
+                + self.uncerpenaltyfortimeerrorns * timeoffsets
             )
-            Absolutetime_uncertainty = self.time_buffer[3, :].astype(np.uint32)
-            self.Datasets["Absolutetime_uncertainty"][
-            :, startIDX:
-            ] = Absolutetime_uncertainty
-            if not self.startimewritten:
-                self.group.attrs["Start_time"] = time[0]
-                self.group.attrs[
-                    "Start_time_uncertainty"
-                ] = Absolutetime_uncertainty[0]
-                self.startimewritten = True
-            self.Datasets["Sample_number"].resize(
-                [1, startIDX + self.chunksize]
+            data = np.zeros([16, length])
+            for i, name in enumerate(DATA_MESSAGE_FIELDS[5:21]):
+                data[i] = block[name]
+            ticks = block["time_ticks"]
+
+            pos = 0
+            if self.msgbufferd > 0:
+                # complete the partially filled chunk of previous pushes first
+                pos = min(length, self.chunksize - self.msgbufferd)
+                self.__bufferSamples(timedata[:, :pos], data[:, :pos], ticks[:pos])
+                if self.msgbufferd == self.chunksize:
+                    self.__handOffBuffer()
+            wholechunks = (length - pos) // self.chunksize * self.chunksize
+            if wholechunks > 0:
+                self.__queueChunks(
+                    timedata[:, pos : pos + wholechunks],
+                    data[:, pos : pos + wholechunks],
+                    ticks[pos : pos + wholechunks],
+                )
+                pos += wholechunks
+            self.__bufferSamples(timedata[:, pos:], data[:, pos:], ticks[pos:])
+
+    def __timeOffsets(self, block):
+        """Time offsets in s of all messages of a block, like pushmsg calculates them"""
+        time = block["unix_time"] * 1e9 + block["unix_time_nsecs"]
+        timeoffsets = np.full(len(block), float(self.timeoffset))
+        if self.correcttimeglitches:
+            if self.msgbufferd == 0 and self.chunkswritten == 0:
+                self.lastdatatime = time[0]
+            deltat = np.diff(time, prepend=self.lastdatatime)
+            # the offset is constant between glitches, so only these are looped over
+            glitches = np.flatnonzero(np.abs(deltat) > 2.5e8)
+            IDX = self.msgbufferd + self.chunksize * self.chunkswritten
+            for glitch in glitches:
+                deltains = np.rint((deltat[glitch]) / 1e9)
+                if deltat[glitch] < 0:
+                    self.timeoffset = self.timeoffset - deltains
+                    warnings.warn("Time difference is negative in Sensor "+self.dscp.SensorName+' ID '+hex(self.dscp.ID)+" at IDX "+str(IDX+glitch)+"with timme difference "+str(deltat[glitch])+" ns "+str(deltains)+" in seconds "+str(self.timeoffset)+' accumulated deltat in s',UserWarning)
+                elif self.timeoffset < 0:
+                    self.timeoffset = self.timeoffset - deltains
+                    if self.timeoffset != 0:
+                        warnings.warn("Time difference is large positive in Sensor "+self.dscp.SensorName+' ID '+hex(self.dscp.ID)+"at IDX "+str(IDX+glitch)+"with timme difference "+str(deltat[glitch])+" ns "+str(deltains)+" in seconds "+str(self.timeoffset)+' accumulated deltat in seconds. Accumulated deltat will be set to 0',UserWarning)
+                    self.timeoffset = 0
+                timeoffsets[glitch:] = self.timeoffset
+        self.lastdatatime = time[-1]
+        return timeoffsets
+
+    def __bufferSamples(self, timedata, data, ticks):
+        """Appends samples to the not yet written chunk"""
+        count = len(ticks)
+        self.time_buffer[:, self.msgbufferd : self.msgbufferd + count] = timedata
+        self.buffer[:, self.msgbufferd : self.msgbufferd + count] = data
+        self.ticks_buffer[self.msgbufferd : self.msgbufferd + count] = ticks
+        self.msgbufferd = self.msgbufferd + count
+
+    def __resetBuffers(self):
+        self.msgbufferd = 0
+        self.buffer.fill(np.NaN)
+        self.ticks_buffer.fill(0)
+        self.buffer[0:4,:]=np.zeros([4,self.chunksize])
+
+    def __extendDatasets(self, length):
+        """
+        Extends all datasets to at least length samples.
+
+        The datasets grow geometrically by doubling their size, so the number of
+        resizes is logarithmic in the number of samples instead of one resize per
+        chunk. Allocated but unwritten chunks take no space in the file, the number
+        of valid samples is stored in the groups Data_point_number attribute.
+        """
+        if length <= self.allocated:
+            return
+        # sizes independent of the number of samples written at once
+        while self.allocated < length:
+            self.allocated = 2 * self.allocated
+        for dataset in self.Datasets.values():
+            dataset.resize(self.allocated, axis=1)
+
+    def __handOffBuffer(self):
+        """Queues the full chunk buffer for writing and continues with a free one"""
+        self.__queueChunks(
+            self.time_buffer, self.buffer, self.ticks_buffer, recycle=True
+        )
+        if self.writerbuffers > 0:
+            try:
+                freebuffer = self.freebuffers.get_nowait()
+            except queue.Empty:
+                freebuffer = self.__stall(self.freebuffers.get)
+            self.time_buffer, self.buffer, self.ticks_buffer = freebuffer
+        self.__resetBuffers()
+
+    def __queueChunks(self, timedata, data, ticks, recycle=False):
+        """
+        Queues whole chunks for the writer thread.
+
+        The chunks position in the datasets is fixed when queueing, so the writer
+        only has to write them in order. With recycle the arrays are chunk buffers,
+        which are returned to freebuffers after writing.
+        """
+        startIDX = self.chunksize * self.chunkswritten
+        self.chunkswritten = self.chunkswritten + int(timedata.shape[1] / self.chunksize)
+        if self.writerbuffers == 0:
+            self.__timedWriteChunks(startIDX, timedata, data, ticks)
+            return
+        self.__raiseWriterError()
+        if self.writerthread is None:
+            self.writerthread = threading.Thread(
+                target=self.__runWriter,
+                name="HDF5Writer_" + hex(self.dscp.ID),
+                daemon=True,
             )
-            samplenumbers = self.buffer[0, :].astype(np.uint32)
-            self.Datasets["Sample_number"][:, startIDX:] = samplenumbers
+            self.writerthread.start()
+        chunk = (startIDX, timedata, data, ticks, recycle)
+        try:
+            self.writequeue.put_nowait(chunk)
+        except queue.Full:
+            self.__stall(lambda: self.writequeue.put(chunk))
+        self.writerstats["max_queue_depth"] = max(
+            self.writerstats["max_queue_depth"], self.writequeue.qsize()
+        )
+
+    def __stall(self, wait):
+        """Waits for the writer thread to catch up and counts the waiting"""
+        stallstart = time.monotonic()
+        result = wait()
+        self.writerstats["stalls"] += 1
+        self.writerstats["stall_time"] += time.monotonic() - stallstart
+        return result
+
+    def __runWriter(self):
+        """Loop of the writer thread, writes queued chunks until None is queued"""
+        while True:
+            chunk = self.writequeue.get()
+            try:
+                if chunk is None:
+                    return
+                startIDX, timedata, data, ticks, recycle = chunk
+                self.__timedWriteChunks(startIDX, timedata, data, ticks)
+                if recycle:
+                    self.freebuffers.put((timedata, data, ticks))
+            except Exception as error:
+                # reported to the pushing thread, following chunks are still tried
+                if self.writererror is None:
+                    self.writererror = error
+                if recycle:
+                    self.freebuffers.put((timedata, data, ticks))
+            finally:
+                self.writequeue.task_done()
+
+    def __timedWriteChunks(self, startIDX, timedata, data, ticks):
+        writestart = time.monotonic()
+        with self.hdflock:
+            self.__writeChunks(startIDX, timedata, data, ticks)
+        latency = time.monotonic() - writestart
+        self.writerstats["chunks_written"] += int(timedata.shape[1] / self.chunksize)
+        self.writerstats["last_write_latency"] = latency
+        self.writerstats["max_write_latency"] = max(
+            self.writerstats["max_write_latency"], latency
+        )
+        self.writerstats["total_write_latency"] += latency
+
+    def __stopWriter(self):
+        """Waits until all queued chunks are written and stops the writer thread"""
+        if self.writerthread is None:
+            return
+        self.writequeue.put(None)
+        self.writerthread.join()
+        self.writerthread = None
+
+    def waitForWriter(self):
+        """
+        Blocks until all queued chunks are written.
+
+        The not yet complete chunk stays in the buffer and the datasets keep their
+        pre-extension, use close to finish dumping.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.writequeue.join()
+        self.__raiseWriterError()
+
+    def __raiseWriterError(self):
+        if self.writererror is not None:
+            error = self.writererror
+            self.writererror = None
+            raise RuntimeError(
+                "Writing to HDF5 failed for sensor " + hex(self.dscp.ID)
+            ) from error
+
+    def getWriterStats(self):
+        """
+        Returns counters to monitor the background writer.
+
+        Without background writer (writerbuffers=0) the latencies are the times
+        pushing was blocked by writing.
+
+        Returns
+        -------
+        dict
+            number of chunks waiting for the writer (queue_depth) and the largest
+            number so far, number of written chunks, last, maximal and mean write
+            latency in s of one queued block of chunks including waiting for
+            hdflock, and how often and how long in s pushing had to wait for the
+            writer (stalls, stall_time).
+
+        """
+        stats = dict(self.writerstats)
+        stats["queue_depth"] = self.writequeue.qsize()
+        writes = stats["chunks_written"]
+        stats["mean_write_latency"] = stats.pop("total_write_latency") / max(writes, 1)
+        return stats
+
+    def __writeChunks(self, startIDX, timedata, data, ticks):
+        """Writes whole chunks starting at startIDX, hdflock has to be held"""
+        stopIDX = startIDX + timedata.shape[1]
+        self.__extendDatasets(stopIDX)
+        time = timedata[1, :] * 1000000000 + timedata[2, :]
+        self.Datasets["Absolutetime"][:, startIDX:stopIDX] = time
+        if (self.dscp.has_time_ticks):
+            self.Datasets["Time_Ticks"][:, startIDX:stopIDX] = ticks
+        Absolutetime_uncertainty = timedata[3, :].astype(np.uint32)
+        self.Datasets["Absolutetime_uncertainty"][
+            :, startIDX:stopIDX
+        ] = Absolutetime_uncertainty
+        if not self.startimewritten:
+            self.group.attrs["Start_time"] = time[0]
+            self.group.attrs[
+                "Start_time_uncertainty"
+            ] = Absolutetime_uncertainty[0]
+            self.startimewritten = True
+        samplenumbers = timedata[0, :].astype(np.uint32)
+        self.Datasets["Sample_number"][:, startIDX:stopIDX] = samplenumbers
+        for groupname in self.hieracy:
+            groupdata = data[
+                (
+                    self.hieracy[groupname]["copymask"]
+                    #+ self.dataframindexoffset
+                ),
+                :,
+            ].astype(self.Datasets[groupname].dtype)
+            self.Datasets[groupname][:, startIDX:stopIDX] = groupdata
+        # self.f.flush()
+        self.group.attrs["Data_point_number"] = stopIDX
+
+    def wirteRemainingToHDF(self):
+        warnings.warn('WARNING will generate zeros in the end of the data file if callback is active there will be an gap in the file ')
+        self.close(writeremaining=True)
+
+    def close(self, writeremaining=True):
+        """
+        Finishes dumping, every dumper has to be closed before its file.
+
+        Waits until the writer thread has written all queued chunks, stops it and
+        trims the datasets to the written chunks, which removes their geometric
+        pre-extension. Datasets of dumpers which are not closed keep zero padding
+        behind the data.
+
+        Parameters
+        ----------
+        writeremaining : bool, optional
+            if True the not yet complete chunk in the buffer is written padded with
+            zeros and Data_point_number is set to the number of pushed samples.
+            If False it is dropped, like the data converters always did. The
+            default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self.pushlock:
+            if writeremaining:
+                Data_point_number = self.chunksize * self.chunkswritten + self.msgbufferd
+                self.__queueChunks(self.time_buffer, self.buffer, self.ticks_buffer)
+            # the single flush of the file after the writer finished all chunks
+            self.__stopWriter()
+            with self.hdflock:
+                # drop the datasets pre-extension behind the last chunk, the
+                # datasets are never shorter than the one chunk they start with
+                datalength = self.chunksize * max(self.chunkswritten, 1)
+                for dataset in self.Datasets.values():
+                    dataset.resize(datalength, axis=1)
+                self.allocated = datalength
+                if writeremaining:
+                    self.group.attrs["Data_point_number"] = Data_point_number
+                self.f.flush()
+            self.__resetBuffers()
+            self.__raiseWriterError()
+
+class HDF5DumperBlockCallback:
+    """Block callback dumping into an own HDF5 file per sensor
+
+    Meant as callbackfactory of Sensor.StartProcess, so every sensor process writes
+    its own file without sharing an HDF5 file and lock between processes. The files
+    can be merged afterwards with met4fofhdftools.combineHDFRawdata.
+    """
+
+    def __init__(self, Description, filenamePrefix, **dumperkwargs):
+        """
+        Parameters
+        ----------
+        Description : SensorDescription
+            description of the sensor.
+        filenamePrefix : path
+            the data are written to filenamePrefix_<ID in hex>.hdf5 .
+        **dumperkwargs : kwargs
+            further keyword arguments of HDF5Dumper.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.filename = filenamePrefix + "_" + hex(Description.ID) + ".hdf5"
+        self.file = h5py.File(self.filename, "a")
+        self.dumper = HDF5Dumper(
+            Description, self.file, threading.Lock(), **dumperkwargs
+        )
+
+    def __call__(self, block, Description):
+        self.dumper.pushblock(block, Description)
+
+    def close(self):
+        self.dumper.close()
+        self.file.close()
 
-            for groupname in self.hieracy:
-                vectorlength = len(self.hieracy[groupname]["copymask"])
-                self.Datasets[groupname].resize(
-                    [vectorlength, startIDX + self.chunksize]
-                )
-                data = self.buffer[
-                       (
-                               self.hieracy[groupname]["copymask"]
-                               #+ self.dataframindexoffset
-                       ),
-                       :,
-                       ].astype("float32")
-                self.Datasets[groupname][:, startIDX:] = data
-            self.f.flush()
-            self.group.attrs["Data_point_number"] = self.group.attrs["Data_point_number"] + self.msgbufferd
-            self.msgbufferd = 0
-            self.chunkswritten = self.chunkswritten + 1
 
 def startdumpingallsensorshdf(filename):
     hdfdumplock = threading.Lock()
@@ -1666,8 +2795,7 @@ def stopdumpingallsensorshdf(dumperlist, dumpfile):
         DR.AllSensors[SensorID].UnSetCallback()
     for dumper in dumperlist:
         print("closing"+str(dumper))
-        dumper.wirteRemainingToHDF()
-        dumper.f.flush()
+        dumper.close()
         del dumper
     dumpfile.close()
 
@@ -0,0 +1,240 @@
+"""
+Benchmark of the storage profiles for RAWDATA datasets
+
+Writes simulated MPU9250 and BMA280 recordings with HDF5Dumper for every storage
+profile and prints the write throughput, the file size and the latency of
+reading the data back. Run from the datareceiver folder, e.g.
+
+    python benchmark_storageprofiles.py --duration 600 fast default archive
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import warnings
+
+import h5py
+import numpy as np
+
+from MET4FOFDataReceiver import HDF5Dumper, SensorDescription
+from messagedecoder import DATA_MESSAGE_DTYPE
+from storageprofiles import STORAGE_PROFILES
+
+# (hierarchy, unit, min scale, max scale, resolution) of the simulated channels
+SENSORS = {
+    "MPU 9250": {
+        "ID": 0x1FE40000,
+        "samplerate": 1000,
+        "channels": [
+            ("Acceleration/0", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 65536),
+            ("Acceleration/1", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 65536),
+            ("Acceleration/2", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 65536),
+            ("Angular_velocity/0", "\\radian\\second\\tothe{-1}", -34.9, 34.9, 65536),
+            ("Angular_velocity/1", "\\radian\\second\\tothe{-1}", -34.9, 34.9, 65536),
+            ("Angular_velocity/2", "\\radian\\second\\tothe{-1}", -34.9, 34.9, 65536),
+            ("Magnetic_flux_density/0", "\\micro\\tesla", -4912, 4912, 65520),
+            ("Magnetic_flux_density/1", "\\micro\\tesla", -4912, 4912, 65520),
+            ("Magnetic_flux_density/2", "\\micro\\tesla", -4912, 4912, 65520),
+            ("Temperature/0", "\\degreeCelsius", -77.0, 93.0, 65536),
+        ],
+    },
+    "BMA 280": {
+        "ID": 0x1FE40A00,
+        "samplerate": 2000,
+        "channels": [
+            ("Acceleration/0", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 16384),
+            ("Acceleration/1", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 16384),
+            ("Acceleration/2", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 16384),
+            ("Temperature/0", "\\degreeCelsius", -40.0, 87.5, 256),
+        ],
+    },
+}
+
+
+def simulatedRecording(sensorname, duration, seed=0):
+    """
+    Simulates the data messages of a sensor excited by a 80 Hz sine.
+
+    Parameters
+    ----------
+    sensorname : str
+        key of SENSORS.
+    duration : float
+        length of the recording in s.
+    seed : integer, optional
+        seed of the noise. The default is 0.
+
+    Returns
+    -------
+    description : SensorDescription
+        the description of the sensor.
+    records : numpy.ndarray of DATA_MESSAGE_DTYPE
+        the data messages with values quantized to the sensors resolution.
+
+    """
+    sensor = SENSORS[sensorname]
+    descriptiondict = {"ID": sensor["ID"], "Name": sensorname}
+    for i, (hierarchy, unit, minscale, maxscale, resolution) in enumerate(
+        sensor["channels"]
+    ):
+        descriptiondict[str(i + 1)] = {
+            "CHID": i + 1,
+            "PHYSICAL_QUANTITY": hierarchy.replace("/", " "),
+            "UNIT": unit,
+            "RESOLUTION": float(resolution),
+            "MIN_SCALE": minscale,
+            "MAX_SCALE": maxscale,
+            "HIERARCHY": hierarchy,
+        }
+    description = SensorDescription(fromDict=descriptiondict)
+
+    length = int(duration * sensor["samplerate"])
+    rng = np.random.default_rng(seed)
+    reltime = np.arange(length) / sensor["samplerate"]
+    nstime = 1600000000 * 10**9 + (reltime * 1e9).astype(np.uint64)
+    records = np.zeros(length, dtype=DATA_MESSAGE_DTYPE)
+    records["id"] = sensor["ID"]
+    records["sample_number"] = np.arange(length)
+    records["unix_time"] = nstime // 10**9
+    records["unix_time_nsecs"] = nstime % 10**9
+    records["time_uncertainty"] = rng.integers(100, 200, size=length)
+    for i, (hierarchy, unit, minscale, maxscale, resolution) in enumerate(
+        sensor["channels"]
+    ):
+        step = (maxscale - minscale) / resolution
+        signal = 0.05 * maxscale * np.sin(
+            2 * np.pi * 80 * reltime + i
+        ) + rng.normal(scale=4 * step, size=length)
+        records["Data_{:02d}".format(i + 1)] = np.round(signal / step) * step
+    return description, records
+
+
+def benchmarkProfile(profile, recordings, folder, blocksize=10000, reads=20):
+    """
+    Writes and reads back all recordings with one storage profile.
+
+    Returns
+    -------
+    dict
+        write throughput in MB/s of the uncompressed data, file size in MB,
+        compression ratio, time for reading all data in s, mean latency of
+        reading one second of one dataset in ms and the largest deviation of
+        the read back data from the recorded values.
+
+    """
+    filename = os.path.join(folder, "benchmark_" + str(profile) + ".hdf5")
+    if os.path.exists(filename):
+        os.remove(filename)
+    rawbytes = 0
+    hdffile = h5py.File(filename, "w")
+    lock = threading.Lock()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        # the dumpers print the parsed hierarchy of every sensor
+        with contextlib.redirect_stdout(io.StringIO()):
+            dumpers = [
+                HDF5Dumper(description, hdffile, lock, storageprofile=profile)
+                for description, records in recordings
+            ]
+        start = time.perf_counter()
+        for dumper, (description, records) in zip(dumpers, recordings):
+            for blockstart in range(0, len(records), blocksize):
+                dumper.pushblock(
+                    records[blockstart : blockstart + blocksize], description
+                )
+        for dumper in dumpers:
+            dumper.close()
+        hdffile.close()
+        writetime = time.perf_counter() - start
+    for description, records in recordings:
+        # time stamp, uncertainty, sample number and float32 channels
+        rawbytes += len(records) * (8 + 4 + 4 + 4 * len(description.Channels))
+    filesize = os.path.getsize(filename)
+
+    rng = np.random.default_rng(0)
+    maxerror = 0.0
+    latencies = []
+    start = time.perf_counter()
+    with h5py.File(filename, "r") as hdffile:
+        for description, records in recordings:
+            group = hdffile["RAWDATA"][
+                hex(description.ID) + "_" + description.SensorName.replace(" ", "_")
+            ]
+            length = group.attrs["Data_point_number"]
+            acceleration = group["Acceleration"][:, :length]
+            maxerror = max(
+                maxerror,
+                np.max(np.abs(acceleration[0] - records["Data_01"])),
+            )
+            group["Absolutetime"][:, :length]
+    readtime = time.perf_counter() - start
+    with h5py.File(filename, "r") as hdffile:
+        for description, records in recordings:
+            group = hdffile["RAWDATA"][
+                hex(description.ID) + "_" + description.SensorName.replace(" ", "_")
+            ]
+            samplerate = SENSORS[description.SensorName]["samplerate"]
+            for windowstart in rng.integers(0, len(records) - samplerate, size=reads):
+                start = time.perf_counter()
+                group["Acceleration"][:, windowstart : windowstart + samplerate]
+                latencies.append(time.perf_counter() - start)
+    os.remove(filename)
+    return {
+        "write_MBps": rawbytes / writetime / 1e6,
+        "file_MB": filesize / 1e6,
+        "ratio": rawbytes / filesize,
+        "read_all_s": readtime,
+        "read_1s_ms": np.mean(latencies) * 1e3,
+        "max_error": maxerror,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "profiles",
+        nargs="*",
+        default=list(STORAGE_PROFILES.keys()),
+        help="names of the storage profiles, default all",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=300, help="recording length in s"
+    )
+    parser.add_argument(
+        "--folder", default=tempfile.gettempdir(), help="folder for the test files"
+    )
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        recordings = [
+            simulatedRecording(sensorname, args.duration, seed=i)
+            for i, sensorname in enumerate(SENSORS)
+        ]
+    print(
+        "{:>14} {:>11} {:>9} {:>7} {:>11} {:>11} {:>10}".format(
+            "profile",
+            "write MB/s",
+            "file MB",
+            "ratio",
+            "read all s",
+            "read 1s ms",
+            "max error",
+        )
+    )
+    for profile in args.profiles:
+        result = benchmarkProfile(profile, recordings, args.folder)
+        print(
+            "{:>14} {:>11.1f} {:>9.2f} {:>7.2f} {:>11.3f} {:>11.3f} {:>10.2e}".format(
+                profile,
+                result["write_MBps"],
+                result["file_MB"],
+                result["ratio"],
+                result["read_all_s"],
+                result["read_1s_ms"],
+                result["max_error"],
+            )
+        )
@@ -5,9 +5,8 @@ from google.protobuf.internal.encoder import _VarintBytes
 import threading
 import time
 import numpy as np
-import csv
-import json
 import MET4FOFDataReceiver as DR
+from messagedecoder import readDumpFile
 
 
 class SensorDataPlayer:
@@ -66,7 +65,7 @@ class SensorDataPlayer:
         "Data_16",
     ]
     """
-    Class for replay of saved Met4FoF ASCII Data.
+    Class for replay of saved Met4FoF ASCII or protobuff dump files.
     """
 
     def __init__(
@@ -83,7 +82,7 @@ class SensorDataPlayer:
         Parameters
         ----------
         filename : path.
-            Path to the file to be played back.
+            Path to the ASCII or protobuff dump file to be played back.
         tagetip : sting, optional
             IP Adress of the DataReceiver. The default is "127.0.0.1".
         port : intger, optional
@@ -108,10 +107,10 @@ class SensorDataPlayer:
             "idOverride": idOverride,
             "fileName": filename,
         }
-        self.reader = csv.reader(open(filename), delimiter=";")
-        fristrow = next(self.reader)
-        paramsdictjson = json.loads(fristrow[0])
-        self.line = next(self.reader)  # discard second line with headers
+        # all messages of ASCII and protobuff dumps are read at once, lines are
+        # the rows of the records
+        paramsdictjson, records = readDumpFile(filename)
+        self.reader = iter(records.tolist())
         self.line = next(self.reader)
         if idOverride != 0:
             self.params["ID"] = idOverride
@@ -4,6 +4,8 @@ import h5py
 import json
 import os
 
+from messagedecoder import readDumpFile
+
 ### classes to proces sensor descriptions
 class AliasDict(dict):
     def __init__(self, *args, **kwargs):
@@ -327,11 +329,10 @@ class SensorDescription:
 
 
 def convertdumpfile(dumpfile):
-    with open(dumpfile) as f:
-        jsonstring = f.readline()
-        dscp = json.loads(jsonstring)
+    # ASCII and protobuff dumps are decoded into the same columns
+    dscp, records = readDumpFile(dumpfile)
     print(dscp)
-    df = pandas.read_csv(dumpfile, sep=";", header=1)
+    df = pandas.DataFrame(records)
     hdf5filename = dumpfile.replace("csv", "hdf5")
     # hdffile = h5py.File(hdf5filename, 'a')
     # group=hdffile.create_group(hex(dscp[ID]))
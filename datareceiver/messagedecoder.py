@@ -0,0 +1,316 @@
+"""
+Vectorized decoder for the Met4FoF DataMessage wire format
+
+DATA packets and protobuff dump files are concatenations of varint length prefixed
+messages_pb2.DataMessage with a fixed set of fields, which the SmartUpUnit always
+encodes in the order of their field numbers. Instead of parsing every message with
+protobuff, all messages of a buffer are decoded field by field in one numpy pass
+into a structured array with one column per field. Messages which do not follow
+this layout, e.g. due to unknown fields, are parsed with protobuff instead.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+from google.protobuf.internal.decoder import _DecodeVarint32
+
+import messages_pb2
+
+# fields of messages_pb2.DataMessage in the order of the ASCII dump files
+DATA_MESSAGE_FIELDS = [
+    "id",
+    "sample_number",
+    "unix_time",
+    "unix_time_nsecs",
+    "time_uncertainty",
+    "Data_01",
+    "Data_02",
+    "Data_03",
+    "Data_04",
+    "Data_05",
+    "Data_06",
+    "Data_07",
+    "Data_08",
+    "Data_09",
+    "Data_10",
+    "Data_11",
+    "Data_12",
+    "Data_13",
+    "Data_14",
+    "Data_15",
+    "Data_16",
+    "time_ticks",
+]
+# one decoded messages_pb2.DataMessage as numpy structured array element
+DATA_MESSAGE_DTYPE = np.dtype(
+    [(name, np.uint32) for name in DATA_MESSAGE_FIELDS[:5]]
+    + [(name, np.float32) for name in DATA_MESSAGE_FIELDS[5:21]]
+    + [("time_ticks", np.uint64)]
+)
+
+_WIRETYPE_VARINT = 0
+_WIRETYPE_FIXED32 = 5
+_MAX_VARINT_BYTES = 10
+# id, sample_number, unix_time, unix_time_nsecs, time_uncertainty and Data_01
+_REQUIRED_FIELD_NUMBERS = range(1, 7)
+
+
+def _encodedTag(fieldNumber, wireType):
+    """Bytes of the varint encoded tag of an field"""
+    tag = (fieldNumber << 3) | wireType
+    encoded = []
+    while tag >= 0x80:
+        encoded.append((tag & 0x7F) | 0x80)
+        tag >>= 7
+    encoded.append(tag)
+    return tuple(encoded)
+
+
+# (name, encoded tag, is varint, is required) of all fields in field number order
+_DATA_MESSAGE_LAYOUT = [
+    (
+        field.name,
+        _encodedTag(
+            field.number,
+            _WIRETYPE_FIXED32 if field.type == field.TYPE_FLOAT else _WIRETYPE_VARINT,
+        ),
+        field.type != field.TYPE_FLOAT,
+        field.number in _REQUIRED_FIELD_NUMBERS,
+    )
+    for field in sorted(
+        messages_pb2.DataMessage.DESCRIPTOR.fields, key=lambda field: field.number
+    )
+]
+
+
+def _messageBoundaries(data, offset, end, starts, ends):
+    """
+    Appends start and end of all length prefixed messages to starts and ends.
+
+    Parameters
+    ----------
+    data : bytes-like
+        buffer with the messages.
+    offset : integer
+        position of the first length prefix.
+    end : integer
+        position behind the last message.
+    starts, ends : list of integer
+        positions of the first and behind the last byte of every message.
+
+    Returns
+    -------
+    bool
+        True if the last message is incomplete.
+
+    """
+    pos = offset
+    while pos < end:
+        length = data[pos]
+        if length < 0x80:
+            pos += 1
+        else:
+            length, pos = _DecodeVarint32(data, pos)
+        if pos + length > end:
+            return True
+        starts.append(pos)
+        pos += length
+        ends.append(pos)
+    return False
+
+
+def _decodeVarints(buffer, positions):
+    """Decodes the varints starting at positions, returns values and their sizes"""
+    values = np.zeros(len(positions), dtype=np.uint64)
+    sizes = np.zeros(len(positions), dtype=np.int64)
+    # only varints which are not complete yet are continued with their next byte
+    active = np.arange(len(positions))
+    for i in range(_MAX_VARINT_BYTES):
+        byte = buffer[positions[active] + i]
+        values[active] |= (byte & 0x7F).astype(np.uint64) << np.uint64(7 * i)
+        last = byte < 0x80
+        sizes[active[last]] = i + 1
+        active = active[~last]
+        if len(active) == 0:
+            break
+    return values, sizes
+
+
+def decodeDataMessages(data, offset=0):
+    """
+    Decodes all varint length prefixed DataMessages of a buffer.
+
+    Parameters
+    ----------
+    data : bytes-like
+        DATA packet or content of a protobuff dump file.
+    offset : integer, optional
+        Position of the first length prefix, 4 for DATA packets to skip the
+        preamble. The default is 0.
+
+    Returns
+    -------
+    records : numpy.ndarray of DATA_MESSAGE_DTYPE
+        one element per valid message in the order of the buffer. Optional fields
+        not present in a message are 0.
+    invalid : integer
+        number of messages which could not be decoded and were skipped,
+        including an incomplete last message.
+
+    """
+    starts, ends = [], []
+    truncated = _messageBoundaries(data, offset, len(data), starts, ends)
+    records, invalid = _decodeMessages(data, starts, ends)
+    return records, invalid + int(truncated)
+
+
+def decodeDataPackets(packets):
+    """
+    Decodes all DataMessages of many DATA packets at once.
+
+    The numpy overhead is paid once for all packets instead of for every packet,
+    which makes this the preferred way for decoding the packets of a receive
+    batch.
+
+    Parameters
+    ----------
+    packets : list of bytes-like
+        DATA packets including the preamble.
+
+    Returns
+    -------
+    records : numpy.ndarray of DATA_MESSAGE_DTYPE
+        one element per valid message in the order of the packets.
+    invalid : integer
+        number of messages which could not be decoded and were skipped.
+
+    """
+    data = b"".join(packets)
+    starts, ends = [], []
+    invalid = 0
+    packetstart = 0
+    for packet in packets:
+        packetend = packetstart + len(packet)
+        # messages never span multiple packets
+        invalid += _messageBoundaries(data, packetstart + 4, packetend, starts, ends)
+        packetstart = packetend
+    records, invalidmessages = _decodeMessages(data, starts, ends)
+    return records, invalid + invalidmessages
+
+
+def _decodeMessages(data, starts, ends):
+    """Decodes the DataMessages data[starts[i]:ends[i]] field by field"""
+    starts = np.array(starts, dtype=np.int64)
+    ends = np.array(ends, dtype=np.int64)
+    records = np.zeros(len(starts), dtype=DATA_MESSAGE_DTYPE)
+    if len(starts) == 0:
+        return records, 0
+
+    # padding allows to read the maximal field size behind every position
+    buffer = np.concatenate(
+        (np.frombuffer(data, dtype=np.uint8), np.zeros(_MAX_VARINT_BYTES, np.uint8))
+    )
+    pos = starts.copy()
+    complete = np.ones(len(starts), dtype=bool)
+    for name, tag, isvarint, isrequired in _DATA_MESSAGE_LAYOUT:
+        present = pos < ends
+        for i, tagbyte in enumerate(tag):
+            present &= buffer[pos + i] == tagbyte
+        if isrequired:
+            complete &= present
+        fieldpos = pos[present] + len(tag)
+        if isvarint:
+            values, sizes = _decodeVarints(buffer, fieldpos)
+        else:
+            values = (
+                buffer[fieldpos[:, np.newaxis] + np.arange(4)].view("<f4").ravel()
+            )
+            sizes = 4
+        records[name][present] = values
+        pos[present] = fieldpos + sizes
+
+    # messages not matching the fixed layout are left to protobuff
+    fallback = np.flatnonzero((pos != ends) | ~complete)
+    if len(fallback) == 0:
+        return records, 0
+    valid = np.ones(len(starts), dtype=bool)
+    ProtoData = messages_pb2.DataMessage()
+    for i in fallback:
+        try:
+            ProtoData.ParseFromString(bytes(data[starts[i] : ends[i]]))
+        except Exception:
+            valid[i] = False
+            continue
+        records[i] = tuple(getattr(ProtoData, name) for name in DATA_MESSAGE_FIELDS)
+    return records[valid], int(np.count_nonzero(~valid))
+
+
+def isProtoDumpFile(filename):
+    """
+    Checks if an dump file contains protobuff encoded messages.
+
+    Parameters
+    ----------
+    filename : path
+        dump file written by Sensor.StartDumpingToFileASCII or
+        Sensor.StartDumpingToFileProto.
+
+    Returns
+    -------
+    bool
+        True for protobuff dumps, False for ASCII dumps.
+
+    """
+    with open(filename, "rb") as dumpfile:
+        # ASCII dumps may have lines in front of the json description
+        line = dumpfile.readline()
+        while line:
+            try:
+                if isinstance(json.loads(line), dict):
+                    break
+            except ValueError:
+                pass
+            line = dumpfile.readline()
+        return not dumpfile.read(3) == b"id;"
+
+
+def readDumpFile(filename):
+    """
+    Reads all data messages of an ASCII or protobuff dump file.
+
+    Parameters
+    ----------
+    filename : path
+        dump file written by Sensor.StartDumpingToFileASCII or
+        Sensor.StartDumpingToFileProto.
+
+    Returns
+    -------
+    description : dict
+        the json sensor description of the file's first line.
+    records : numpy.ndarray of DATA_MESSAGE_DTYPE
+        one element per data message.
+
+    """
+    isproto = isProtoDumpFile(filename)
+    with open(filename, "rb") as dumpfile:
+        description = json.loads(dumpfile.readline())
+        if isproto:
+            records, invalid = decodeDataMessages(dumpfile.read())
+            if invalid > 0:
+                print(str(invalid) + " invalid messages skipped in " + str(filename))
+            return description, records
+        df = pd.read_csv(
+            dumpfile,
+            sep=";",
+            header=None,
+            skiprows=1,
+            names=DATA_MESSAGE_FIELDS,
+        )
+    # older dumps have no time_ticks column
+    df = df.fillna(0)
+    records = np.zeros(len(df), dtype=DATA_MESSAGE_DTYPE)
+    for name in DATA_MESSAGE_FIELDS:
+        records[name] = df[name].to_numpy()
+    return description, records
@@ -4,8 +4,14 @@ import numpy as np
 import csv
 from MET4FOFDataReceiver import HDF5Dumper
 from MET4FOFDataReceiver import SensorDescription
+from messagedecoder import DATA_MESSAGE_DTYPE, DATA_MESSAGE_FIELDS, isProtoDumpFile, readDumpFile
+from storageprofiles import getStorageProfile, datasetStorageArgs, isDataDtype
 import messages_pb2
 import threading
+import queue
+import multiprocessing
+import concurrent.futures
+import traceback
 import pandas as pd
 import os
 import warnings
@@ -117,6 +123,98 @@ def spektraCSVtohdfref(filenamelist):
     return resultdf
 
 
+def _dumpSensorDescription(paramsdictjson):
+    """SensorDescription of a dump file description, adds missing hierarchies"""
+    if paramsdictjson["Name"] == "MPU 9250":
+        print("MPU9250 description found adding hieracey")
+        if (not"HIERARCHY" in paramsdictjson["1"])or (paramsdictjson["1"]["HIERARCHY"]==None):
+            print("HIERARCHY not found adding hieracey")
+            paramsdictjson["1"]["HIERARCHY"] = "Acceleration/0"
+            paramsdictjson["2"]["HIERARCHY"] = "Acceleration/1"
+            paramsdictjson["3"]["HIERARCHY"] = "Acceleration/2"
+
+            paramsdictjson["4"]["HIERARCHY"] = "Angular_velocity/0"
+            paramsdictjson["5"]["HIERARCHY"] = "Angular_velocity/1"
+            paramsdictjson["6"]["HIERARCHY"] = "Angular_velocity/2"
+
+            paramsdictjson["7"]["HIERARCHY"] = "Magnetic_flux_density/0"
+            paramsdictjson["8"]["HIERARCHY"] = "Magnetic_flux_density/1"
+            paramsdictjson["9"]["HIERARCHY"] = "Magnetic_flux_density/2"
+
+            paramsdictjson["10"]["HIERARCHY"] = "Temperature/0"
+        sensordscp = SensorDescription(fromDict=paramsdictjson)
+    elif paramsdictjson["Name"] == "BMA 280":
+        print("BMA description found adding hieracey")
+        if (not ("HIERARCHY" in paramsdictjson["1"])) or (paramsdictjson["1"]["HIERARCHY"]==None):
+            print("HIERARCHY not found or NONE adding hieracey")
+            paramsdictjson["1"]["HIERARCHY"] = "Acceleration/0"
+            paramsdictjson["2"]["HIERARCHY"] = "Acceleration/1"
+            paramsdictjson["3"]["HIERARCHY"] = "Acceleration/2"
+
+            paramsdictjson["10"]["HIERARCHY"] = "Temperature/0"
+        sensordscp = SensorDescription(fromDict=paramsdictjson)
+    elif paramsdictjson["Name"] == "STM32 Internal ADC":
+        print("STM32 Internal ADC description found")
+        if (not "HIERARCHY" in paramsdictjson["1"]) or (paramsdictjson["1"]["HIERARCHY"]==None):
+            print("HIERARCHY not found adding hieracey")
+            paramsdictjson["1"]["HIERARCHY"] = "Voltage/0"
+            paramsdictjson["2"]["HIERARCHY"] = "Voltage/1"
+            paramsdictjson["3"]["HIERARCHY"] = "Voltage/2"
+        sensordscp = SensorDescription(fromDict=paramsdictjson)
+    elif paramsdictjson["Name"] == "MS5837_02BA":
+        print("MS5837_02BA description found adding hieracey")
+        if (not "HIERARCHY" in paramsdictjson["1"]) or (paramsdictjson["1"]["HIERARCHY"]==None):
+            paramsdictjson["1"]["HIERARCHY"] = "Temeprature/0"
+            paramsdictjson["2"]["HIERARCHY"] = "Releative humidity/0"
+        sensordscp = SensorDescription(fromDict=paramsdictjson)
+    else:
+        if (not "HIERARCHY" in paramsdictjson["1"]) or (paramsdictjson["1"]["HIERARCHY"]==None):
+            print("sensor " + str(paramsdictjson["Name"]) + " with out HIERARCHY not supported exiting")
+            exit()
+        sensordscp = SensorDescription(fromDict=paramsdictjson)
+    return sensordscp
+
+
+def _dumpADCDescription(paramsdictjson, adcbaseid):
+    """Description of the STM32 ADC data in channel 11, 12 and 13 of legacy dumps"""
+    baseid = int(np.floor(paramsdictjson["ID"] / 65536))
+    adcid = int(baseid * 65536 + 256 * adcbaseid)
+    print("ADC ID " + hex(adcid))
+    adcparamsdict = {
+        "ID": int(adcid),
+        "Name": "STM32 Internal ADC",
+        "1": {
+            "CHID": 1,
+            "PHYSICAL_QUANTITY": "Voltage Ch 1",
+            "UNIT": "\\volt",
+            "RESOLUTION": 4096.0,
+            "MIN_SCALE": -10,
+            "MAX_SCALE": 10,
+            "HIERARCHY": "Voltage/0",
+        },
+        "2": {
+            "CHID": 2,
+            "PHYSICAL_QUANTITY": "Voltage Ch 2",
+            "UNIT": "\\volt",
+            "RESOLUTION": 4096.0,
+            "MIN_SCALE": -10,
+            "MAX_SCALE": 10,
+            "HIERARCHY": "Voltage/1",
+        },
+        "3": {
+            "CHID": 3,
+            "PHYSICAL_QUANTITY": "Voltage Ch 3",
+            "UNIT": "\\volt",
+            "RESOLUTION": 4096.0,
+            "MIN_SCALE": -10,
+            "MAX_SCALE": 10,
+            "HIERARCHY": "Voltage/2",
+        },
+    }
+    adcdscp = SensorDescription(fromDict=adcparamsdict, ID=adcid)
+    return adcid, adcdscp
+
+
 def adddumptohdf(
     dumpfilename,
     hdffilename,
@@ -124,16 +222,24 @@ def adddumptohdf(
     adcbaseid=10,
     extractadcdata=False,
     correcttimeglitches=False,
-    chunksize=2048
+    chunksize=None,
+    storageprofile=None
 ):
     # lock use for multi threading lock in met4FOF hdf dumper implementation
     # adcbaseid=10
     # extractadcdata = False #legacy mode for data where channel 11,12 and 13 contain STM32 internal adc data
     hdfdumpfile = h5py.File(hdffilename, "a")  # open the hdf file
+    isproto = isProtoDumpFile(dumpfilename)
 
     with open(dumpfilename) as dumpfile:
-        reader = csv.reader(dumpfile, delimiter=";")
-        descpparsed = False
+        if isproto:
+            # all messages are decoded at once, rows are the rows of the records
+            paramsdictjson, records = readDumpFile(dumpfilename)
+            reader = iter(records.tolist())
+            descpparsed = True
+        else:
+            reader = csv.reader(dumpfile, delimiter=";")
+            descpparsed = False
         skiprowcount = 0
         while not descpparsed:
             row = next(reader)
@@ -147,93 +253,14 @@ def adddumptohdf(
                 print("skipped " + str(skiprowcount) + " rows")
                 pass
 
-        if paramsdictjson["Name"] == "MPU 9250":
-            print("MPU9250 description found adding hieracey")
-            if (not"HIERARCHY" in paramsdictjson["1"])or (paramsdictjson["1"]["HIERARCHY"]==None):
-                print("HIERARCHY not found adding hieracey")
-                paramsdictjson["1"]["HIERARCHY"] = "Acceleration/0"
-                paramsdictjson["2"]["HIERARCHY"] = "Acceleration/1"
-                paramsdictjson["3"]["HIERARCHY"] = "Acceleration/2"
-
-                paramsdictjson["4"]["HIERARCHY"] = "Angular_velocity/0"
-                paramsdictjson["5"]["HIERARCHY"] = "Angular_velocity/1"
-                paramsdictjson["6"]["HIERARCHY"] = "Angular_velocity/2"
-
-                paramsdictjson["7"]["HIERARCHY"] = "Magnetic_flux_density/0"
-                paramsdictjson["8"]["HIERARCHY"] = "Magnetic_flux_density/1"
-                paramsdictjson["9"]["HIERARCHY"] = "Magnetic_flux_density/2"
-
-                paramsdictjson["10"]["HIERARCHY"] = "Temperature/0"
-            sensordscp = SensorDescription(fromDict=paramsdictjson)
-        elif paramsdictjson["Name"] == "BMA 280":
-            print("BMA description found adding hieracey")
-            if (not ("HIERARCHY" in paramsdictjson["1"])) or (paramsdictjson["1"]["HIERARCHY"]==None):
-                print("HIERARCHY not found or NONE adding hieracey")
-                paramsdictjson["1"]["HIERARCHY"] = "Acceleration/0"
-                paramsdictjson["2"]["HIERARCHY"] = "Acceleration/1"
-                paramsdictjson["3"]["HIERARCHY"] = "Acceleration/2"
-
-                paramsdictjson["10"]["HIERARCHY"] = "Temperature/0"
-            sensordscp = SensorDescription(fromDict=paramsdictjson)
-        elif paramsdictjson["Name"] == "STM32 Internal ADC":
-            print("STM32 Internal ADC description found")
-            if (not "HIERARCHY" in paramsdictjson["1"]) or (paramsdictjson["1"]["HIERARCHY"]==None):
-                print("HIERARCHY not found adding hieracey")
-                paramsdictjson["1"]["HIERARCHY"] = "Voltage/0"
-                paramsdictjson["2"]["HIERARCHY"] = "Voltage/1"
-                paramsdictjson["3"]["HIERARCHY"] = "Voltage/2"
-            sensordscp = SensorDescription(fromDict=paramsdictjson)
-        elif paramsdictjson["Name"] == "MS5837_02BA":
-            print("MS5837_02BA description found adding hieracey")
-            if (not "HIERARCHY" in paramsdictjson["1"]) or (paramsdictjson["1"]["HIERARCHY"]==None):
-                paramsdictjson["1"]["HIERARCHY"] = "Temeprature/0"
-                paramsdictjson["2"]["HIERARCHY"] = "Releative humidity/0"
-            sensordscp = SensorDescription(fromDict=paramsdictjson)
-        else:
-            if (not "HIERARCHY" in paramsdictjson["1"]) or (paramsdictjson["1"]["HIERARCHY"]==None):
-                print("sensor " + str(paramsdictjson["Name"]) + " with out HIERARCHY not supported exiting")
-                exit()
-            sensordscp = SensorDescription(fromDict=paramsdictjson)
-        baseid = int(np.floor(paramsdictjson["ID"] / 65536))
+        sensordscp = _dumpSensorDescription(paramsdictjson)
         # descriptions are now ready start the hdf dumpers
-        sensordumper = HDF5Dumper(sensordscp, hdfdumpfile, hdfdumplock,correcttimeglitches=correcttimeglitches,chunksize=chunksize)
+        sensordumper = HDF5Dumper(sensordscp, hdfdumpfile, hdfdumplock,correcttimeglitches=correcttimeglitches,chunksize=chunksize,storageprofile=storageprofile)
         if extractadcdata:
-            adcid = int(baseid * 65536 + 256 * adcbaseid)
-            print("ADC ID " + hex(adcid))
-            adcparamsdict = {
-                "ID": int(adcid),
-                "Name": "STM32 Internal ADC",
-                "1": {
-                    "CHID": 1,
-                    "PHYSICAL_QUANTITY": "Voltage Ch 1",
-                    "UNIT": "\\volt",
-                    "RESOLUTION": 4096.0,
-                    "MIN_SCALE": -10,
-                    "MAX_SCALE": 10,
-                    "HIERARCHY": "Voltage/0",
-                },
-                "2": {
-                    "CHID": 2,
-                    "PHYSICAL_QUANTITY": "Voltage Ch 2",
-                    "UNIT": "\\volt",
-                    "RESOLUTION": 4096.0,
-                    "MIN_SCALE": -10,
-                    "MAX_SCALE": 10,
-                    "HIERARCHY": "Voltage/1",
-                },
-                "3": {
-                    "CHID": 3,
-                    "PHYSICAL_QUANTITY": "Voltage Ch 3",
-                    "UNIT": "\\volt",
-                    "RESOLUTION": 4096.0,
-                    "MIN_SCALE": -10,
-                    "MAX_SCALE": 10,
-                    "HIERARCHY": "Voltage/2",
-                },
-            }
-            adcdscp = SensorDescription(fromDict=adcparamsdict, ID=adcid)
-            adcdumper = HDF5Dumper(adcdscp, hdfdumpfile, hdfdumplock)
-        cloumnames = next(reader)
+            adcid, adcdscp = _dumpADCDescription(paramsdictjson, adcbaseid)
+            adcdumper = HDF5Dumper(adcdscp, hdfdumpfile, hdfdumplock,storageprofile=storageprofile)
+        if not isproto:
+            cloumnames = next(reader)
         # loop over the remaining file content
         for row in reader:
             sensormsg = messages_pb2.DataMessage()
@@ -279,6 +306,295 @@ def adddumptohdf(
                     "line could not converted to values!Lione ignored",
                     category=RuntimeWarning,
                 )
+        # the incomplete last chunk is dropped
+        sensordumper.close(writeremaining=False)
+        if extractadcdata:
+            adcdumper.close(writeremaining=False)
+        hdfdumpfile.flush()
+        hdfdumpfile.close()
+
+
+# columns of the ASCII dumps used by adddumptohdf
+_DUMP_SENSOR_COLUMNS = DATA_MESSAGE_FIELDS[:15]  # id to Data_10
+_DUMP_ADC_COLUMNS = DATA_MESSAGE_FIELDS[15:18]  # Data_11 to Data_13
+
+
+def _readDumpDescription(dumpfile):
+    """Reads lines until the json description, returns it and the skipped lines"""
+    skiprowcount = 0
+    while True:
+        line = dumpfile.readline()
+        if line == "":
+            raise ValueError("no description found in dump file " + str(dumpfile.name))
+        try:
+            paramsdictjson = json.loads(line.split(";")[0])
+            if isinstance(paramsdictjson, dict):
+                return paramsdictjson, skiprowcount
+        except json.decoder.JSONDecodeError:
+            pass
+        skiprowcount = skiprowcount + 1
+
+
+def _dumpRecordBlocks(dumpfilename, blocklength=2**16, extractadcdata=False):
+    """
+    Reads a dump file in blocks of the messages adddumptohdf pushes.
+
+    Yields
+    ------
+    paramsdictjson : dict
+        the json description, yielded first.
+    sensorrecords, adcrecords, invalid, mismatched : tuple
+        DATA_MESSAGE_DTYPE arrays of the sensor with Data_01 to Data_10 and of
+        the ADC with Data_01 to Data_03 from Data_11 to Data_13 (None without
+        extractadcdata) and the numbers of rows which could not be converted or
+        have an other sensor ID, for every block.
+
+    """
+    columns = _DUMP_SENSOR_COLUMNS
+    if extractadcdata:
+        columns = columns + _DUMP_ADC_COLUMNS
+    if isProtoDumpFile(dumpfilename):
+        paramsdictjson, records = readDumpFile(dumpfilename)
+        yield paramsdictjson
+        blocks = (
+            pd.DataFrame({name: records[name][start : start + blocklength] for name in columns})
+            for start in range(0, len(records), blocklength)
+        )
+        dumpfile = None
+    else:
+        dumpfile = open(dumpfilename)
+        paramsdictjson, skiprowcount = _readDumpDescription(dumpfile)
+        if skiprowcount > 0:
+            print("skipped " + str(skiprowcount) + " rows")
+        yield paramsdictjson
+        dumpfile.readline()  # column names
+        # older dumps have no time_ticks column, so the columns of the first row
+        # are counted instead of relying on the column names
+        datastart = dumpfile.tell()
+        columncount = max(len(dumpfile.readline().split(";")), len(columns))
+        dumpfile.seek(datastart)
+        # round_trip parses floats exactly like float() of the row by row path
+        blocks = pd.read_csv(
+            dumpfile,
+            sep=";",
+            header=None,
+            names=DATA_MESSAGE_FIELDS[:columncount],
+            usecols=columns,
+            chunksize=blocklength,
+            float_precision="round_trip",
+        )
+    try:
+        for block in blocks:
+            values = {}
+            valid = np.ones(len(block), dtype=bool)
+            for name in columns:
+                column = block[name]
+                if column.dtype == object:
+                    column = pd.to_numeric(column, errors="coerce")
+                values[name] = column.to_numpy(dtype=np.float64)
+                # missing and not convertible values are NaN
+                valid &= ~np.isnan(values[name])
+            for name in columns[:5]:
+                # uint32 fields
+                valid &= (values[name] == np.round(values[name])) & (values[name] >= 0) & (values[name] < 2**32)
+            matching = values["id"] == paramsdictjson["ID"]
+            mismatched = int(np.count_nonzero(valid & ~matching))
+            invalid = int(np.count_nonzero(~valid))
+            valid &= matching
+            sensorrecords = np.zeros(np.count_nonzero(valid), dtype=DATA_MESSAGE_DTYPE)
+            for name in _DUMP_SENSOR_COLUMNS:
+                sensorrecords[name] = values[name][valid]
+            adcrecords = None
+            if extractadcdata:
+                adcrecords = np.zeros(len(sensorrecords), dtype=DATA_MESSAGE_DTYPE)
+                for name in DATA_MESSAGE_FIELDS[1:5]:
+                    adcrecords[name] = sensorrecords[name]
+                for adcname, name in zip(DATA_MESSAGE_FIELDS[5:8], _DUMP_ADC_COLUMNS):
+                    adcrecords[adcname] = values[name][valid]
+            yield sensorrecords, adcrecords, invalid, mismatched
+    finally:
+        if dumpfile is not None:
+            dumpfile.close()
+
+
+def _parseDumpFiles(taskindex, dumpfilenames, blocklength, extractadcdata, put):
+    """Passes the description and the blocks of dump files of one sensor to put"""
+    for fileindex, dumpfilename in enumerate(dumpfilenames):
+        blocks = _dumpRecordBlocks(dumpfilename, blocklength, extractadcdata)
+        put(("description", taskindex, fileindex, next(blocks)))
+        for block in blocks:
+            put(("block", taskindex, fileindex) + block)
+        put(("done", taskindex, fileindex))
+
+
+_dumpQueue = None
+
+
+def _initDumpWorker(dumpqueue):
+    global _dumpQueue
+    _dumpQueue = dumpqueue
+
+
+def _parseDumpFilesWorker(task):
+    try:
+        _parseDumpFiles(*task, put=_dumpQueue.put)
+    except Exception:
+        _dumpQueue.put(("error", task[0], traceback.format_exc()))
+
+
+class _DumpConverter:
+    """Pushes the parsed blocks of the dump files into HDF5Dumpers"""
+
+    def __init__(self, tasks, hdfdumpfile, hdfdumplock, adcbaseid, extractadcdata, dumperkwargs):
+        self.tasks = tasks
+        self.hdfdumpfile = hdfdumpfile
+        self.hdfdumplock = hdfdumplock
+        self.adcbaseid = adcbaseid
+        self.extractadcdata = extractadcdata
+        self.dumperkwargs = dumperkwargs
+        self.dumpers = {}
+        self.finishedtasks = 0
+
+    def put(self, message):
+        kind, taskindex = message[0], message[1]
+        if kind == "error":
+            raise RuntimeError("Converting " + str(self.tasks[taskindex]) + " failed\n" + message[2])
+        fileindex = message[2]
+        dumpfilename = self.tasks[taskindex][fileindex]
+        if kind == "description":
+            paramsdictjson = message[3]
+            print(paramsdictjson)
+            sensordscp = _dumpSensorDescription(paramsdictjson)
+            dumpers = [(HDF5Dumper(sensordscp, self.hdfdumpfile, self.hdfdumplock, **self.dumperkwargs), sensordscp)]
+            if self.extractadcdata:
+                adcid, adcdscp = _dumpADCDescription(paramsdictjson, self.adcbaseid)
+                adckwargs = {"storageprofile": self.dumperkwargs["storageprofile"]}
+                dumpers.append((HDF5Dumper(adcdscp, self.hdfdumpfile, self.hdfdumplock, **adckwargs), adcdscp))
+            self.dumpers[taskindex] = dumpers
+        elif kind == "block":
+            sensorrecords, adcrecords, invalid, mismatched = message[3:]
+            for (dumper, dscp), records in zip(self.dumpers[taskindex], (sensorrecords, adcrecords)):
+                dumper.pushblock(records, dscp)
+            if invalid > 0:
+                warnings.warn(
+                    str(invalid) + " lines in " + str(dumpfilename) + " could not converted to values! Lines ignored",
+                    category=RuntimeWarning,
+                )
+            if mismatched > 0:
+                warnings.warn(
+                    str(mismatched) + " lines in " + str(dumpfilename) + " with Sensor ID mismatch! Lines ignored",
+                    category=RuntimeWarning,
+                )
+        elif kind == "done":
+            # like adddumptohdf the incomplete last chunk of every file is dropped
+            for dumper, dscp in self.dumpers.pop(taskindex):
+                dumper.close(writeremaining=False)
+            print(str(dumpfilename) + " converted")
+            if fileindex == len(self.tasks[taskindex]) - 1:
+                self.finishedtasks += 1
+
+    def close(self):
+        """Closes the dumpers of files which are not converted completely"""
+        dumpers = [dumper for dumpers in self.dumpers.values() for dumper, dscp in dumpers]
+        self.dumpers = {}
+        for dumper in dumpers:
+            # the writer threads must not write into the closed file
+            try:
+                dumper.close(writeremaining=False)
+            except Exception as error:
+                warnings.warn("Closing " + str(dumper) + " failed " + repr(error), category=RuntimeWarning)
+
+
+def adddumpstohdf(
+    dumpfilenames,
+    hdffilename,
+    workers=None,
+    blocklength=2**16,
+    adcbaseid=10,
+    extractadcdata=False,
+    correcttimeglitches=False,
+    chunksize=None,
+    storageprofile=None
+):
+    """
+    Converts several dump files into one HDF5 file like adddumptohdf, but fast.
+
+    The dump files are parsed in blocks of blocklength rows with pandas instead
+    of row by row, and the blocks are written with HDF5Dumper.pushblock. Files
+    are parsed in parallel by one process per file, while this process is the
+    single writer of the HDF5 file. Files of the same sensor, or with
+    extractadcdata of the same board, are parsed one after the other in the given
+    order by the same process, so the RAWDATA groups are the same as converting
+    the files one by one with adddumptohdf.
+
+    Parameters
+    ----------
+    dumpfilenames : list of path
+        ASCII or protobuff dump files.
+    hdffilename : path
+        the HDF5 file, created if it doesn't exist.
+    workers : integer or None, optional
+        number of parsing processes, 1 parses in this process. The default is
+        None, which is one process per sensor up to the number of CPUs.
+    blocklength : integer, optional
+        number of rows parsed at once. The default is 2**16.
+    adcbaseid, extractadcdata, correcttimeglitches, chunksize, storageprofile :
+        see adddumptohdf.
+
+    Returns
+    -------
+    None.
+
+    """
+    # files writing into the same group have to be appended in order by one task,
+    # the ADC data of all sensors of a board go into one group
+    tasksbyid = {}
+    for dumpfilename in dumpfilenames:
+        if isProtoDumpFile(dumpfilename):
+            with open(dumpfilename, "rb") as dumpfile:
+                sensorid = json.loads(dumpfile.readline())["ID"]
+        else:
+            with open(dumpfilename) as dumpfile:
+                sensorid = _readDumpDescription(dumpfile)[0]["ID"]
+        if extractadcdata:
+            sensorid = int(np.floor(sensorid / 65536))
+        tasksbyid.setdefault(sensorid, []).append(dumpfilename)
+    tasks = list(tasksbyid.values())
+    if workers is None:
+        workers = min(len(tasks), os.cpu_count())
+
+    hdfdumpfile = h5py.File(hdffilename, "a")
+    dumperkwargs = {
+        "correcttimeglitches": correcttimeglitches,
+        "chunksize": chunksize,
+        "storageprofile": storageprofile,
+    }
+    converter = _DumpConverter(tasks, hdfdumpfile, threading.Lock(), adcbaseid, extractadcdata, dumperkwargs)
+    try:
+        if workers <= 1:
+            for taskindex, taskfilenames in enumerate(tasks):
+                _parseDumpFiles(taskindex, taskfilenames, blocklength, extractadcdata, converter.put)
+        else:
+            # bounded, so parsing can't run away from writing
+            dumpqueue = multiprocessing.Queue(maxsize=4 * workers)
+            with multiprocessing.Pool(workers, _initDumpWorker, (dumpqueue,)) as pool:
+                result = pool.map_async(
+                    _parseDumpFilesWorker,
+                    [
+                        (taskindex, taskfilenames, blocklength, extractadcdata)
+                        for taskindex, taskfilenames in enumerate(tasks)
+                    ],
+                )
+                while converter.finishedtasks < len(tasks):
+                    try:
+                        message = dumpqueue.get(timeout=1)
+                    except queue.Empty:
+                        if result.ready():
+                            result.get()  # raises errors outside of the parsing
+                        continue
+                    converter.put(message)
+    finally:
+        converter.close()
         hdfdumpfile.flush()
         hdfdumpfile.close()
 
@@ -664,7 +980,12 @@ def add3compTDMSData(
     hdffile.flush()
     hdffile.close()
 
-def initSensorGroup(group,sensorParams,chunksize,size,dsdict= {}):
+def initSensorGroup(group,sensorParams,chunksize,size,dsdict= {},storageprofile=None):
+    # chunksize None takes the chunk length of the storage profile
+    storageprofile = getStorageProfile(storageprofile)
+    storageargs = datasetStorageArgs(storageprofile)
+    if chunksize is None:
+        chunksize = storageprofile["chunksize"]
     maxshape=((size//chunksize)+1)*chunksize#maxsize musst fit all data but also be multiple of chunk size
 
     dsdict["Absolutetime"] = group.create_dataset(
@@ -672,8 +993,7 @@ def initSensorGroup(group,sensorParams,chunksize,size,dsdict= {}):
         (1, maxshape),
         chunks=(1, chunksize),
         dtype="uint64",
-        compression="gzip",
-        shuffle=True,
+        **storageargs,
     )
     for key in sensorParams:
         group.attrs[key]=sensorParams[key]
@@ -690,8 +1010,7 @@ def initSensorGroup(group,sensorParams,chunksize,size,dsdict= {}):
         (1, maxshape),
         chunks=(1, chunksize),
         dtype="uint32",
-        compression="gzip",
-        shuffle=True,
+        **storageargs,
     )
     dsdict["Absolutetime_uncertainty"].attrs[
         "Unit"
@@ -711,8 +1030,7 @@ def initSensorGroup(group,sensorParams,chunksize,size,dsdict= {}):
         (1, maxshape),
         chunks=(1, chunksize),
         dtype="uint32",
-        compression="gzip",
-        shuffle=True,
+        **storageargs,
     )
     dsdict["Sample_number"].attrs["Unit"] = "\\one"
     dsdict["Sample_number"].attrs[
@@ -723,15 +1041,18 @@ def initSensorGroup(group,sensorParams,chunksize,size,dsdict= {}):
     dsdict["Sample_number"].attrs["Min_scale"] = 0
     return dsdict
 
-def addDataGroup(group,dsdict,name,params,chunksize,shape):
+def addDataGroup(group,dsdict,name,params,chunksize,shape,storageprofile=None):
+    storageprofile = getStorageProfile(storageprofile)
+    storageargs = datasetStorageArgs(storageprofile)
+    if chunksize is None:
+        chunksize = storageprofile["chunksize"]
     maxshape=((shape[1]//chunksize)+1)*chunksize#maxsize musst fit all data but also be multiple of chunk size
     ds=dsdict[name] = group.create_dataset(
         name,
         (shape[0], maxshape),
         chunks=(shape[0], chunksize),
-        dtype="float32",
-        compression="gzip",
-        shuffle=True,
+        dtype=storageprofile["datadtype"],
+        **storageargs,
     )
     for key in params:
         ds.attrs[key]=params[key]
@@ -1029,62 +1350,228 @@ def getRAWTFFromExperiemnts(
     print(Data)
     return Data
 
-def combineHDFRawdata(outputfilename,listfiles):
-    outfile=h5py.File(outputfilename, 'w')
-    inputfiles=[None]*len(listfiles)
+def _filterPipeline(dataset):
+    """Filters of a dataset as tuples of filter id, flags and parameters"""
+    plist = dataset.id.get_create_plist()
+    return tuple(plist.get_filter(i)[:3] for i in range(plist.get_nfilters()))
+
+
+def _canPassThrough(source, target):
+    """True if the raw chunks of source can be written into target unchanged"""
+    return (
+        source.chunks is not None
+        and source.chunks == target.chunks
+        and source.shape[:-1] == target.shape[:-1]
+        and source.chunks[:-1] == source.shape[:-1]
+        and source.dtype == target.dtype
+        and _filterPipeline(source) == _filterPipeline(target)
+    )
+
+
+def copyDatasetStreaming(sources, target, maxblockbytes=2**26):
+    """
+    Appends datasets along their last axis into one dataset with bounded memory.
+
+    The data are copied in blocks aligned to the chunks of target and of at most
+    maxblockbytes. Chunks of a source which have the same shape, dtype and filters
+    as the target and are placed at a chunk border of the target are copied
+    without decompressing and compressing them again.
+
+    Parameters
+    ----------
+    sources : list of (h5py.Dataset, integer)
+        the datasets and the number of samples of each to copy.
+    target : h5py.Dataset
+        dataset large enough for all samples.
+    maxblockbytes : integer, optional
+        size limit of the copied blocks in byte. The default is 2**26.
+
+    Returns
+    -------
+    int
+        number of chunks copied without recompression.
+
+    """
+    chunk = target.chunks[-1]
+    samplebytes = target.dtype.itemsize * int(np.prod(target.shape[:-1]))
+    blocksamples = max(1, maxblockbytes // (samplebytes * chunk)) * chunk
+    passedchunks = 0
+    startidx = 0
+    for source, sublength in sources:
+        pos = 0
+        if startidx % chunk == 0 and _canPassThrough(source, target):
+            chunkoffset = (0,) * (len(target.shape) - 1)
+            while pos + chunk <= sublength:
+                filtermask, rawchunk = source.id.read_direct_chunk(chunkoffset + (pos,))
+                target.id.write_direct_chunk(
+                    chunkoffset + (startidx + pos,), rawchunk, filtermask
+                )
+                pos += chunk
+                passedchunks += 1
+        while pos < sublength:
+            # end blocks at chunk borders of the target to write every chunk once
+            stop = min(
+                sublength,
+                ((startidx + pos) // chunk * chunk + blocksamples) - startidx,
+            )
+            target[..., startidx + pos : startidx + stop] = source[..., pos:stop]
+            pos = stop
+        startidx += sublength
+    return passedchunks
+
+
+def _combineDatasetInTempFile(tempfilename, sources, createargs, maxblockbytes):
+    """Worker of combineHDFRawdata, copies one dataset into an own file"""
+    inputfiles = {}
+    try:
+        with h5py.File(tempfilename, "w") as tempfile:
+            target = tempfile.create_dataset("data", **createargs)
+            datasets = []
+            for filename, path, sublength in sources:
+                if not filename in inputfiles:
+                    inputfiles[filename] = h5py.File(filename, "r")
+                datasets.append((inputfiles[filename][path], sublength))
+            passedchunks = copyDatasetStreaming(datasets, target, maxblockbytes)
+    finally:
+        for inputfile in inputfiles.values():
+            inputfile.close()
+    return tempfilename, passedchunks
+
+
+def combineHDFRawdata(outputfilename,listfiles,storageprofile=None,workers=None,maxblockbytes=2**26):
+    """
+    Appends the RAWDATA of several HDF5 files into one file.
+
+    The datasets are copied in chunk aligned blocks, so the memory use is bounded
+    by maxblockbytes per dataset copied in parallel. Chunks which already match
+    the target layout and filters are copied without recompressing them.
+
+    Parameters
+    ----------
+    outputfilename : path
+        the combined file, overwritten if it exists.
+    listfiles : list of path
+        the input files in the order of their data.
+    storageprofile : str, dict or None, optional
+        storage profile of the combined datasets, see storageprofiles.py. The
+        default is None, which keeps the chunks and dtypes of the inputs and
+        compresses with gzip and shuffle.
+    workers : integer or None, optional
+        number of processes copying datasets in parallel into temporary files,
+        which are then merged into the output without recompression. 1 copies
+        directly into the output. The default is None, which is the number of
+        CPUs.
+    maxblockbytes : integer, optional
+        largest block of one dataset read into memory at once in byte. The
+        default is 2**26.
+
+    Returns
+    -------
+    None.
+
+    """
+    # without storage profile the chunks and dtypes of the inputs are kept and the
+    # datasets are compressed with gzip and shuffle
+    if storageprofile is None:
+        storageargs = {"compression": "gzip", "shuffle": True}
+    else:
+        storageprofile = getStorageProfile(storageprofile)
+        storageargs = datasetStorageArgs(storageprofile)
+    if workers is None:
+        workers = os.cpu_count()
     outputGroups={}
-    for i in range(len(listfiles)):
-        inputfiles[i]=h5py.File(listfiles[i], 'r')
-        Rawdatagroupnames=list(inputfiles[i]['RAWDATA'].keys())
-        for rawdataName in Rawdatagroupnames:
-            try:
-                group=outputGroups[rawdataName]
-                group['overalllength']+=inputfiles[i]['RAWDATA/'+rawdataName].attrs['Data_point_number']
-                group['sublength'].append(inputfiles[i]['RAWDATA/'+rawdataName].attrs['Data_point_number'])
-            except KeyError:
-                group = outputGroups[rawdataName]={'overalllength':inputfiles[i]['RAWDATA/'+rawdataName].attrs['Data_point_number'],
-                                                   'sublength':[inputfiles[i]['RAWDATA/'+rawdataName].attrs['Data_point_number']],
-                                                   'attrs':dict(inputfiles[i]['RAWDATA/'+rawdataName].attrs),
-                                                   'dsets':{}}
-                dsetnames=list(inputfiles[i]['RAWDATA/'+rawdataName].keys())
-                for dset in dsetnames:
-                    group['dsets'][dset]={'dimension':inputfiles[i]['RAWDATA/'+rawdataName+'/'+dset].shape[:-1],
-                                          'attrs':dict(inputfiles[i]['RAWDATA/'+rawdataName+'/'+dset].attrs),
-                                          'chunks':inputfiles[i]['RAWDATA/'+rawdataName+'/'+dset].chunks,
-                                          'dtype':inputfiles[i]['RAWDATA/'+rawdataName+'/'+dset].dtype}
-
-    print(outputGroups)
-    RD=outfile.create_group("RAWDATA")
-    for rawdataName in Rawdatagroupnames:
-        SensorGpr=RD.create_group(rawdataName)
-        for key in outputGroups[rawdataName]['attrs'].keys():
-            SensorGpr.attrs[key]=outputGroups[rawdataName]['attrs'][key]
-        SensorGpr.attrs['Data_point_number']=length=outputGroups[rawdataName]['overalllength']
+    for filename in listfiles:
+        with h5py.File(filename, 'r') as inputfile:
+            for rawdataName in inputfile['RAWDATA'].keys():
+                rawdataGroup = inputfile['RAWDATA/'+rawdataName]
+                sublength = rawdataGroup.attrs['Data_point_number']
+                try:
+                    group=outputGroups[rawdataName]
+                    group['overalllength']+=sublength
+                except KeyError:
+                    group = outputGroups[rawdataName]={'overalllength':sublength,
+                                                       'sources':[],
+                                                       'attrs':dict(rawdataGroup.attrs),
+                                                       'dsets':{}}
+                    for dset in rawdataGroup.keys():
+                        group['dsets'][dset]={'dimension':rawdataGroup[dset].shape[:-1],
+                                              'attrs':dict(rawdataGroup[dset].attrs),
+                                              'chunks':rawdataGroup[dset].chunks,
+                                              'dtype':rawdataGroup[dset].dtype}
+                group['sources'].append((filename, sublength))
+
+    # one copy task per dataset
+    tasks=[]
+    for rawdataName in outputGroups:
+        length=outputGroups[rawdataName]['overalllength']
         for dsetname in outputGroups[rawdataName]['dsets'].keys():
             dimension=list(outputGroups[rawdataName]['dsets'][dsetname]['dimension'])
             dimension.append(length)
             chunks = outputGroups[rawdataName]['dsets'][dsetname]['chunks']
+            if storageprofile is not None:
+                chunks = tuple(dimension[:-1]) + (storageprofile["chunksize"],)
             for i in range(len(dimension)):
                 if dimension[i]<chunks[i]:
                     print("dimension to smal seting to chunksize")
                     dimension[i]=chunks[i]
-                    i=i+1
             dtype= outputGroups[rawdataName]['dsets'][dsetname]['dtype']
-            dset=SensorGpr.create_dataset(dsetname,dimension,chunks=chunks,compression="gzip",shuffle=True,dtype=dtype)
-            for key in outputGroups[rawdataName]['dsets'][dsetname]['attrs'].keys():
-                dset.attrs[key] = outputGroups[rawdataName]['dsets'][dsetname]['attrs'][key]
-            i=0
-            startidx=0
-            stopidx=0
-            for infile in inputfiles:
-                sublength=outputGroups[rawdataName]['sublength'][i]
-                stopidx+=sublength
-                print("start copy block "+str(infile)+rawdataName+'/'+dsetname)
-                dset[:,startidx:stopidx]=infile['RAWDATA/'+rawdataName+'/'+dsetname][:,:sublength]
-                startidx=stopidx
-                i=i+1
-                print("Block done ")
-
+            if storageprofile is not None and isDataDtype(dtype):
+                dtype = storageprofile["datadtype"]
+            createargs=dict(shape=tuple(dimension),chunks=chunks,dtype=dtype,**storageargs)
+            sources=[(filename,'RAWDATA/'+rawdataName+'/'+dsetname,sublength) for filename,sublength in outputGroups[rawdataName]['sources']]
+            tasks.append((rawdataName,dsetname,sources,createargs))
+
+    executor = None
+    futures = {}
+    if workers > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        for i, (rawdataName, dsetname, sources, createargs) in enumerate(tasks):
+            tempfilename = outputfilename + "." + str(i) + ".tmp"
+            future = executor.submit(
+                _combineDatasetInTempFile, tempfilename, sources, createargs, maxblockbytes
+            )
+            futures[future] = (rawdataName, dsetname)
+    try:
+        with h5py.File(outputfilename, 'w') as outfile:
+            RD=outfile.create_group("RAWDATA")
+            for rawdataName in outputGroups:
+                SensorGpr=RD.create_group(rawdataName)
+                for key in outputGroups[rawdataName]['attrs'].keys():
+                    SensorGpr.attrs[key]=outputGroups[rawdataName]['attrs'][key]
+                SensorGpr.attrs['Data_point_number']=outputGroups[rawdataName]['overalllength']
+            if executor is None:
+                inputfiles = {filename: h5py.File(filename, 'r') for filename in listfiles}
+                try:
+                    for rawdataName, dsetname, sources, createargs in tasks:
+                        print("start copy "+rawdataName+'/'+dsetname)
+                        dset = RD[rawdataName].create_dataset(dsetname, **createargs)
+                        datasets = [(inputfiles[filename][path], sublength) for filename, path, sublength in sources]
+                        passedchunks = copyDatasetStreaming(datasets, dset, maxblockbytes)
+                        print("done "+str(passedchunks)+" chunks passed through")
+                finally:
+                    for inputfile in inputfiles.values():
+                        inputfile.close()
+            else:
+                for future in concurrent.futures.as_completed(futures):
+                    rawdataName, dsetname = futures[future]
+                    tempfilename, passedchunks = future.result()
+                    # object copies keep the compressed chunks
+                    with h5py.File(tempfilename, 'r') as tempfile:
+                        outfile.copy(tempfile["data"], RD[rawdataName], name=dsetname)
+                    os.remove(tempfilename)
+                    print("done "+rawdataName+'/'+dsetname+" "+str(passedchunks)+" chunks passed through")
+            for rawdataName in outputGroups:
+                for dsetname in outputGroups[rawdataName]['dsets'].keys():
+                    dset = RD[rawdataName][dsetname]
+                    for key in outputGroups[rawdataName]['dsets'][dsetname]['attrs'].keys():
+                        dset.attrs[key] = outputGroups[rawdataName]['dsets'][dsetname]['attrs'][key]
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            for i in range(len(tasks)):
+                tempfilename = outputfilename + "." + str(i) + ".tmp"
+                if os.path.exists(tempfilename):
+                    os.remove(tempfilename)
     print("Done")
 if __name__ == "__main__":
     """
@@ -0,0 +1,169 @@
+"""
+Storage profiles for the RAWDATA datasets of Met4FoF HDF5 files
+
+A storage profile sets the chunk length, the compression filter and the dtype of
+the data channels of the datasets written by HDF5Dumper, initSensorGroup,
+addDataGroup and combineHDFRawdata. Profiles are given by the name of one of the
+STORAGE_PROFILES or as dict with the keys of STORAGE_PROFILES["default"]; missing
+keys are taken from the default profile, which is the layout used so far.
+
+Keys of a profile:
+
+chunksize : integer
+    number of samples per chunk.
+compression : str or None
+    None (no compression), "lzf", "gzip" or "bitshuffle". bitshuffle needs the
+    hdf5plugin package and falls back to gzip with shuffle if it is missing.
+compression_level : integer or None
+    gzip level from 0 to 9, None for the h5py default of 4.
+shuffle : bool
+    apply the byte shuffle filter before gzip and lzf compression.
+datadtype : str
+    dtype of the data channels, e.g. "float32" or "float16". Narrowing to
+    float16 keeps 11 significant bits, enough for the 14 bit BMA280 only with
+    loss. Time stamps and sample numbers are never narrowed.
+"""
+
+import copy
+import warnings
+
+import numpy as np
+
+STORAGE_PROFILES = {
+    # the layout of all files written so far
+    "default": {
+        "chunksize": 2048,
+        "compression": "gzip",
+        "compression_level": None,
+        "shuffle": True,
+        "datadtype": "float32",
+    },
+    # fast compression for recording with many sensors
+    "fast": {
+        "chunksize": 2048,
+        "compression": "lzf",
+        "compression_level": None,
+        "shuffle": True,
+        "datadtype": "float32",
+    },
+    "uncompressed": {
+        "chunksize": 8192,
+        "compression": None,
+        "compression_level": None,
+        "shuffle": False,
+        "datadtype": "float32",
+    },
+    # smallest lossless files for long campaigns
+    "archive": {
+        "chunksize": 16384,
+        "compression": "gzip",
+        "compression_level": 9,
+        "shuffle": True,
+        "datadtype": "float32",
+    },
+    "bitshuffle": {
+        "chunksize": 8192,
+        "compression": "bitshuffle",
+        "compression_level": None,
+        "shuffle": False,
+        "datadtype": "float32",
+    },
+    # lossy, halves the data channels before compression
+    "compact": {
+        "chunksize": 16384,
+        "compression": "gzip",
+        "compression_level": 6,
+        "shuffle": True,
+        "datadtype": "float16",
+    },
+}
+
+
+def getStorageProfile(profile=None):
+    """
+    Completes a storage profile.
+
+    Parameters
+    ----------
+    profile : str, dict or None, optional
+        name of one of the STORAGE_PROFILES or dict with some of their keys.
+        The default is None, which is the "default" profile.
+
+    Raises
+    ------
+    ValueError
+        for unknown profile names, keys or compressions.
+
+    Returns
+    -------
+    dict
+        the profile with all keys.
+
+    """
+    completeprofile = copy.deepcopy(STORAGE_PROFILES["default"])
+    if profile is None:
+        return completeprofile
+    if isinstance(profile, str):
+        try:
+            profile = STORAGE_PROFILES[profile]
+        except KeyError:
+            raise ValueError(
+                "Unknown storage profile "
+                + profile
+                + " use one of "
+                + str(list(STORAGE_PROFILES.keys()))
+            )
+    for key in profile:
+        if not key in completeprofile:
+            raise ValueError("Unknown storage profile key " + str(key))
+    completeprofile.update(profile)
+    if not completeprofile["compression"] in [None, "lzf", "gzip", "bitshuffle"]:
+        raise ValueError(
+            "Unknown compression " + str(completeprofile["compression"])
+        )
+    completeprofile["chunksize"] = int(completeprofile["chunksize"])
+    return completeprofile
+
+
+def datasetStorageArgs(profile=None):
+    """
+    Filter keyword arguments of h5py.Group.create_dataset for a storage profile.
+
+    Parameters
+    ----------
+    profile : str, dict or None, optional
+        storage profile, see getStorageProfile. The default is None.
+
+    Returns
+    -------
+    dict
+        compression, compression_opts and shuffle arguments.
+
+    """
+    profile = getStorageProfile(profile)
+    compression = profile["compression"]
+    if compression == "bitshuffle":
+        try:
+            import hdf5plugin
+
+            return dict(hdf5plugin.Bitshuffle())
+        except ImportError:
+            warnings.warn(
+                "hdf5plugin is not installed, using gzip with shuffle instead of bitshuffle",
+                RuntimeWarning,
+            )
+            return {"compression": "gzip", "compression_opts": None, "shuffle": True}
+    if compression is None:
+        return {"compression": None, "compression_opts": None, "shuffle": False}
+    return {
+        "compression": compression,
+        "compression_opts": profile["compression_level"]
+        if compression == "gzip"
+        else None,
+        "shuffle": profile["shuffle"],
+    }
+
+
+def isDataDtype(dtype):
+    """True for the float dtypes of data channels which profiles may narrow"""
+    return np.issubdtype(np.dtype(dtype), np.floating)
@@ -0,0 +1,41 @@
+"""Fixtures shared by the tests of the datareceiver"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# (hierarchy, unit, min scale, max scale, resolution) of the MPU 9250 channels
+MPU9250_CHANNELS = [
+    ("Acceleration/0", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 65536),
+    ("Acceleration/1", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 65536),
+    ("Acceleration/2", "\\metre\\second\\tothe{-2}", -156.96, 156.96, 65536),
+    ("Angular_velocity/0", "\\radian\\second\\tothe{-1}", -34.9, 34.9, 65536),
+    ("Angular_velocity/1", "\\radian\\second\\tothe{-1}", -34.9, 34.9, 65536),
+    ("Angular_velocity/2", "\\radian\\second\\tothe{-1}", -34.9, 34.9, 65536),
+    ("Magnetic_flux_density/0", "\\micro\\tesla", -4912, 4912, 65520),
+    ("Magnetic_flux_density/1", "\\micro\\tesla", -4912, 4912, 65520),
+    ("Magnetic_flux_density/2", "\\micro\\tesla", -4912, 4912, 65520),
+    ("Temperature/0", "\\degreeCelsius", -77.0, 93.0, 65536),
+]
+
+
+@pytest.fixture(scope="session")
+def mpu9250description():
+    """Description dict of a MPU 9250 as written in the first line of dump files"""
+    description = {"ID": 0x1FE40000, "Name": "MPU 9250"}
+    for i, (hierarchy, unit, minscale, maxscale, resolution) in enumerate(
+        MPU9250_CHANNELS
+    ):
+        description[str(i + 1)] = {
+            "CHID": i + 1,
+            "PHYSICAL_QUANTITY": hierarchy.replace("/", " "),
+            "UNIT": unit,
+            "RESOLUTION": float(resolution),
+            "MIN_SCALE": minscale,
+            "MAX_SCALE": maxscale,
+            "HIERARCHY": hierarchy,
+        }
+    return description
@@ -0,0 +1,149 @@
+"""Tests of the sensor worker processes of the DataReceiver"""
+
+import multiprocessing
+import pickle
+import socket
+import time
+
+import h5py
+import numpy as np
+import pytest
+
+import MET4FOFDataReceiver
+import messages_pb2
+from google.protobuf.internal.encoder import _VarintBytes
+from MET4FOFDataReceiver import (
+    AliasDict,
+    DataReceiver,
+    HDF5DumperBlockCallback,
+    Sensor,
+    SensorDescription,
+)
+from messagedecoder import DATA_MESSAGE_DTYPE, DATA_MESSAGE_FIELDS
+
+SAMPLES = 10000
+
+
+def _records(description, length):
+    """Data messages of a sensor with the sample number as value of all channels"""
+    records = np.zeros(length, dtype=DATA_MESSAGE_DTYPE)
+    records["id"] = description["ID"]
+    records["sample_number"] = np.arange(length)
+    records["unix_time"] = 1600000000 + np.arange(length) // 1000
+    records["unix_time_nsecs"] = (np.arange(length) % 1000) * 10**6
+    records["time_uncertainty"] = 150
+    for i in range(16):
+        records["Data_{:02d}".format(i + 1)] = np.arange(length)
+    return records
+
+
+def _dataPacket(records):
+    """DATA packet with the records encoded as protobuff messages"""
+    packet = b"DATA"
+    for record in records:
+        binproto = messages_pb2.DataMessage(
+            **{name: record[name].item() for name in DATA_MESSAGE_FIELDS}
+        ).SerializeToString()
+        packet = packet + _VarintBytes(len(binproto)) + binproto
+    return packet
+
+
+def _waitFor(condition):
+    for _ in range(100):
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def _failingCallbackFactory(Description):
+    raise RuntimeError("callback factory failed")
+
+
+@pytest.fixture
+def spawnsensor(monkeypatch, mpu9250description):
+    """Sensor with shared ring buffer whose processes are started with spawn"""
+    monkeypatch.setattr(
+        MET4FOFDataReceiver, "multiprocessing", multiprocessing.get_context("spawn")
+    )
+    sensor = Sensor(
+        mpu9250description["ID"], RingBufferSize=2**15, SharedRingBuffer=True
+    )
+    sensor.flags["PrintProcessedCounts"] = False
+    sensor.Description = SensorDescription(fromDict=mpu9250description)
+    yield sensor
+    sensor.stop()
+    sensor.ringbuffer.close()
+
+
+@pytest.fixture
+def receiver():
+    """DataReceiver without bulk ingest listening on a free local port"""
+    receiver = DataReceiver("127.0.0.1", 0)
+    yield receiver
+    # the receive loop blocks until the next datagram arrives
+    receiver._stop_event.set()
+    receiver.socket.sendto(b"STOP", receiver.socket.getsockname())
+    receiver.thread.join(10)
+    receiver.stop()
+
+
+def test_aliasdict_keeps_items_and_aliases_when_pickled():
+    aliasdict = AliasDict({"Data_01": 1})
+    aliasdict.add_alias("Data_01", "Acceleration")
+    unpickled = pickle.loads(pickle.dumps(aliasdict))
+    assert unpickled == aliasdict
+    assert unpickled["Acceleration"] == 1
+
+
+def test_sensor_process_started_with_spawn_dumps_all_samples(
+    spawnsensor, mpu9250description, tmp_path
+):
+    prefix = str(tmp_path / "process")
+    spawnsensor.StartProcess(HDF5DumperBlockCallback, (prefix,))
+    assert spawnsensor.ringbuffer.push(_records(mpu9250description, SAMPLES)) == 0
+    spawnsensor.StopProcess()
+    filename = prefix + "_" + hex(mpu9250description["ID"]) + ".hdf5"
+    with h5py.File(filename, "r") as file:
+        (group,) = file["RAWDATA"].values()
+        assert group.attrs["Data_point_number"] == SAMPLES
+        assert np.array_equal(group["Sample_number"][0, :SAMPLES], np.arange(SAMPLES))
+
+
+def test_sensor_falls_back_to_thread_if_process_dies(spawnsensor, mpu9250description):
+    blocks = []
+    spawnsensor.SetBlockCallback(lambda block, Description: blocks.append(block))
+    with pytest.warns(RuntimeWarning, match="died"):
+        spawnsensor.StartProcess(_failingCallbackFactory)
+        spawnsensor.process.join(60)
+        for _ in range(100):
+            if not spawnsensor.flags["ProcessMode"]:
+                break
+            time.sleep(0.1)
+    assert spawnsensor.process is None
+    assert spawnsensor.ringbuffer.push(_records(mpu9250description, SAMPLES)) == 0
+    for _ in range(100):
+        if sum(len(block) for block in blocks) == SAMPLES:
+            break
+        time.sleep(0.1)
+    assert sum(len(block) for block in blocks) == SAMPLES
+
+
+def test_receiver_passes_data_packets_block_wise_to_sensor(
+    receiver, mpu9250description
+):
+    # a DATA packet fits into one ethernet frame
+    records = _records(mpu9250description, 20)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.sendto(_dataPacket(records[:10]), receiver.socket.getsockname())
+    assert _waitFor(lambda: mpu9250description["ID"] in receiver.AllSensors)
+    sensor = receiver.AllSensors[mpu9250description["ID"]]
+    sensor.flags["PrintProcessedCounts"] = False
+    blocks = []
+    sensor.SetBlockCallback(lambda block, Description: blocks.append(block))
+    assert _waitFor(lambda: sensor.ProcessedPacekts == 10)
+    sender.sendto(_dataPacket(records[10:]), receiver.socket.getsockname())
+    assert _waitFor(lambda: len(blocks) == 1)
+    sender.close()
+    assert np.array_equal(blocks[0], records[10:])
+    assert receiver.msgcount == 20
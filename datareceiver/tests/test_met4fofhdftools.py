@@ -0,0 +1,108 @@
+"""Tests of the conversion of dump files into HDF5 files"""
+
+import json
+import threading
+
+import h5py
+import numpy as np
+import pytest
+
+from messagedecoder import DATA_MESSAGE_FIELDS
+import met4fofhdftools
+from met4fofhdftools import adddumpstohdf, adddumptohdf
+
+# six complete chunks of the default chunk length and an incomplete one
+CHUNKSIZE = 2048
+DUMP_LENGTH = 6 * CHUNKSIZE + 1000
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["legacy", "time_ticks"])
+def dump(request, tmp_path_factory, mpu9250description):
+    """ASCII dump of a MPU 9250 with or without time_ticks and its data values"""
+    values = np.round(
+        np.random.default_rng(0).uniform(-100, 100, size=(DUMP_LENGTH, 16)), 3
+    )
+    filename = tmp_path_factory.mktemp("dumps") / "MPU9250.dump"
+    with open(filename, "w") as dumpfile:
+        dumpfile.write(json.dumps(mpu9250description) + "\n")
+        dumpfile.write(";".join(DATA_MESSAGE_FIELDS[:21]) + "\n")
+        for i, row in enumerate(values):
+            header = [mpu9250description["ID"], i, 1600000000 + i // 1000, (i % 1000) * 10**6, 150]
+            ticks = [i * 1000] if request.param else []
+            dumpfile.write(
+                ";".join(str(value) for value in header + list(row) + ticks) + "\n"
+            )
+    return str(filename), values
+
+
+def _rawdata(hdffilename):
+    """Datasets and attributes of the only RAWDATA group of an HDF5 file"""
+    with h5py.File(hdffilename, "r") as hdffile:
+        (group,) = hdffile["RAWDATA"].values()
+        return {name: dataset[()] for name, dataset in group.items()}, dict(
+            group.attrs
+        )
+
+
+def test_adddumptohdf_writes_complete_chunks_without_padding(dump, tmp_path):
+    dumpfilename, values = dump
+    hdffilename = str(tmp_path / "rowbyrow.hdf5")
+    adddumptohdf(dumpfilename, hdffilename, chunksize=CHUNKSIZE)
+    datasets, attrs = _rawdata(hdffilename)
+    written = 6 * CHUNKSIZE
+    for name, data in datasets.items():
+        assert data.shape[1] == written, name
+    assert attrs["Data_point_number"] == written
+    assert np.array_equal(datasets["Sample_number"][0], np.arange(written))
+    assert np.array_equal(
+        datasets["Acceleration"], values[:written, :3].T.astype(np.float32)
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_adddumpstohdf_equals_adddumptohdf(dump, tmp_path, workers):
+    dumpfilename, values = dump
+    adddumptohdf(dumpfilename, str(tmp_path / "rowbyrow.hdf5"), chunksize=CHUNKSIZE)
+    adddumpstohdf(
+        [dumpfilename],
+        str(tmp_path / "blocks.hdf5"),
+        workers=workers,
+        chunksize=CHUNKSIZE,
+    )
+    expected, expectedattrs = _rawdata(str(tmp_path / "rowbyrow.hdf5"))
+    datasets, attrs = _rawdata(str(tmp_path / "blocks.hdf5"))
+    assert datasets.keys() == expected.keys()
+    for name, data in datasets.items():
+        assert data.shape == expected[name].shape, name
+        assert np.array_equal(data, expected[name]), name
+    assert attrs["Data_point_number"] == expectedattrs["Data_point_number"]
+
+
+def test_adddumpstohdf_closes_dumpers_on_errors(dump, tmp_path, monkeypatch):
+    dumpfilename, values = dump
+    put = met4fofhdftools._DumpConverter.put
+
+    def failingput(converter, message):
+        put(converter, message)
+        if message[0] == "block":
+            raise RuntimeError("parsing failed")
+
+    monkeypatch.setattr(met4fofhdftools._DumpConverter, "put", failingput)
+    hdffilename = str(tmp_path / "blocks.hdf5")
+    with pytest.raises(RuntimeError, match="parsing failed"):
+        adddumpstohdf(
+            [dumpfilename],
+            hdffilename,
+            workers=1,
+            blocklength=3 * CHUNKSIZE,
+            chunksize=CHUNKSIZE,
+        )
+    assert not any(
+        thread.name.startswith("HDF5Writer_") for thread in threading.enumerate()
+    )
+    datasets, attrs = _rawdata(hdffilename)
+    for name, data in datasets.items():
+        assert data.shape[1] == 3 * CHUNKSIZE, name
+    assert np.array_equal(
+        datasets["Acceleration"], values[: 3 * CHUNKSIZE, :3].T.astype(np.float32)
+    )
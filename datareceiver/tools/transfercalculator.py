@@ -8,6 +8,7 @@ from matplotlib.pyplot import cm
 import pandas as pd
 import time
 import multiprocessing
+from tqdm import tqdm
 from tqdm.contrib.concurrent import process_map
 import sys
 import time
@@ -15,6 +16,9 @@ import sinetools.SineTools as st
 
 # import yappi
 import warnings
+import contextlib
+import io
+import traceback
 
 import os
 import shutil
@@ -123,6 +127,52 @@ def binarySearch(data, val):
 
     return best_ind
 
+def threeparsinefits(data, reltime, f0, periods=1):
+    """
+    Period-wise three parameter sine fits of all rows of data.
+
+    Uses batch_threeparsinefit of sinetools, which older installed sinetools
+    packages don't have. Those fit row by row with seq_threeparsinefit and the
+    covariances are calculated here in the same way.
+
+    Returns
+    -------
+    sineparams : np.ndarray
+        (rows, sections, 3)-array of the fitted [a,b,c] of every section.
+    sectionStartTimes : np.ndarray
+        start times of the sections.
+    sineparamscov : np.ndarray
+        (rows, sections, 3, 3)-array of the covariances of the fitted [a,b,c]
+        estimated from the residuals of every section.
+
+    """
+    data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    if hasattr(st, "batch_threeparsinefit"):
+        return st.batch_threeparsinefit(
+            data, reltime, f0, periods=periods, returnCovariance=True
+        )
+    rows = []
+    for row in data:
+        sineparams, sectionStartTimes = st.seq_threeparsinefit(
+            row, reltime, f0, periods=periods, returnSectionStartTimes=True
+        )
+        rows.append(sineparams)
+    sineparams = np.stack(rows)
+    N = int(1.0 / f0 / (reltime[1] - reltime[0])) * periods  # samples per section
+    M = sineparams.shape[1]  # number of sections
+    ti = np.asarray(reltime[: M * N]).reshape(M, N)
+    w0 = 2 * np.pi * f0
+    a = np.stack((np.cos(w0 * ti), np.sin(w0 * ti), np.ones(ti.shape)), axis=-1)
+    residuals = data[:, : M * N].reshape(data.shape[0], M, N) - np.einsum(
+        "mnk,rmk->rmn", a, sineparams
+    )
+    variance = np.sum(residuals ** 2, axis=-1) / (N - 3)
+    sineparamscov = variance[:, :, np.newaxis, np.newaxis] * np.linalg.inv(
+        np.einsum("mnk,mnl->mkl", a, a)
+    )
+    return sineparams, sectionStartTimes, sineparamscov
+
+
 class hdfmet4fofdatafile:
     def __init__(self, hdffile,sensornames=None,dataGroupName='RAWDATA',):
         self.dataGroupName=dataGroupName+'/'
@@ -611,35 +661,29 @@ class sineexcitation(experiment):
                 self.data[sensor][dataset]["Sin_Fit_freq"] = f0 * np.ones(
                     [datasetrows, 1]
                 )  # we doing an singe frequency fit
-                # calc first row and create output array[:,idxs[0]:idxs[1]]
-                sineparams, sectionStartTimes = st.seq_threeparsinefit(
+                # all rows and sections are fitted at once
+                sineparams, sectionStartTimes, sineparamscov = threeparsinefits(
                     self.datafile[self.dataGroupName + sensor + "/" + dataset][
-                        0, idxs[0] : idxs[1]
+                        :, idxs[0] : idxs[1]
                     ],
                     reltime,
                     f0,
                     periods=periods,
-                    returnSectionStartTimes=True
                 )
-                sineparamsWstartTime=np.transpose(np.vstack([np.transpose(sineparams),sectionStartTimes]))
                 self.data[sensor][dataset]["SinPOpt"] = np.zeros([datasetrows, 4])
                 self.data[sensor][dataset]["SinPCov"] = np.zeros([datasetrows, 5, 5])
-                self.data[sensor][dataset]["SinParams"] = np.zeros(
-                    [datasetrows, sineparams.shape[0], 4]
+                self.data[sensor][dataset]["SinParams"] = np.concatenate(
+                    [
+                        sineparams,
+                        np.broadcast_to(
+                            sectionStartTimes[:, np.newaxis],
+                            (datasetrows, sectionStartTimes.size, 1),
+                        ),
+                    ],
+                    axis=2,
                 )
-                self.data[sensor][dataset]["SinParams"][0] = sineparamsWstartTime
-                for i in np.arange(1, datasetrows):
-                    sineparams,sectionStartTimes = st.seq_threeparsinefit(
-                        self.datafile[self.dataGroupName + sensor + "/" + dataset][
-                            i, idxs[0] : idxs[1]
-                        ],
-                        reltime,
-                        f0,
-                        periods=periods,
-                        returnSectionStartTimes=True
-                    )
-                    sineparamsWstartTime = np.transpose(np.vstack([np.transpose(sineparams), sectionStartTimes]))
-                    self.data[sensor][dataset]["SinParams"][i] = sineparamsWstartTime
+                # covariance of the [a,b,c] fit parameters of every section
+                self.data[sensor][dataset]["SinParamsCov"] = sineparamscov
                 for i in np.arange(datasetrows):
                     sineparams = self.data[sensor][dataset]["SinParams"][i]
                     DC = sineparams[:, 2]
@@ -1396,23 +1440,80 @@ class sineexcitation(experiment):
     def saveToHdf(self):
         if not self.flags["saved_to_disk"]:
             experimentGroup = self.createHDFGroup()
-            experimentGroup.attrs["Start_time"] = self.timepoints[0]
-            experimentGroup.attrs["End_time"] = self.timepoints[1]
-            experimentGroup.attrs["ID"] = self.experiemntID
-            self.datafile.flush()
-            Path("tmp").mkdir(parents=True, exist_ok=True)
-            dd.io.save("tmp/" + self.experiemntID + ".hdf5", self.data)
-            h5df = h5py_plain.File("tmp/" + self.experiemntID + ".hdf5", "r")
-            for key in h5df.keys():
-                self.datafile.copy(h5df[key], experimentGroup)
-                experimentGroup[key].attrs["Start_index"] = self.idxs[key][0]
-                experimentGroup[key].attrs["Stop_index"] = self.idxs[key][1]
-                self.datafile.flush()
+            tmpfilename = saveExperimentData(
+                "tmp", self.experiemntID, self.timepoints, self.idxs, self.data
+            )
+            copyExperimentDataToHdf(tmpfilename, experimentGroup)
             self.flags["saved_to_disk"] = True
         else:
             raise RuntimeWarning("Data already written to hdf file. Skipping")
 
 
+def saveExperimentData(tmpfolder, experiementID, timepoints, idxs, data):
+    """
+    Saves the data of an experiment to tmpfolder/experiementID.hdf5.
+
+    The file is written under a temporary name and renamed when complete, so an
+    existing file always holds the full results of the experiment.
+
+    Parameters
+    ----------
+    tmpfolder : path
+        folder of the experiment files.
+    experiementID : str
+        ID of the experiment.
+    timepoints : array of int
+        start and end time of the experiment in ns.
+    idxs : dict
+        start and stop index of the experiment in every sensor group.
+    data : dict
+        experiment.data.
+
+    Returns
+    -------
+    tmpfilename : str
+        name of the written file.
+
+    """
+    Path(tmpfolder).mkdir(parents=True, exist_ok=True)
+    tmpfilename = os.path.join(tmpfolder, experiementID + ".hdf5")
+    partfilename = tmpfilename + ".part"
+    dd.io.save(partfilename, data)
+    with h5py_plain.File(partfilename, "r+") as h5df:
+        h5df.attrs["Start_time"] = timepoints[0]
+        h5df.attrs["End_time"] = timepoints[1]
+        h5df.attrs["ID"] = experiementID
+        for key in h5df.keys():
+            h5df[key].attrs["Start_index"] = idxs[key][0]
+            h5df[key].attrs["Stop_index"] = idxs[key][1]
+    os.replace(partfilename, tmpfilename)
+    return tmpfilename
+
+
+def copyExperimentDataToHdf(tmpfilename, experimentGroup):
+    """
+    Copies an experiment file written by saveExperimentData into experimentGroup.
+
+    Parameters
+    ----------
+    tmpfilename : path
+        experiment file.
+    experimentGroup : h5py.Group
+        group of the experiment, e.g. EXPERIMENTS/Sine excitation/00000Sine_Excitation.
+
+    Returns
+    -------
+    None.
+
+    """
+    with h5py_plain.File(tmpfilename, "r") as h5df:
+        for attr in ["Start_time", "End_time", "ID"]:
+            experimentGroup.attrs[attr] = h5df.attrs[attr]
+        for key in h5df.keys():
+            experimentGroup.file.copy(h5df[key], experimentGroup)
+    experimentGroup.file.flush()
+
+
 #TODO move this functions to different place
 def generateCEMrefIDXfromfreqs(freqs, removefreqs=np.array([2000.0])):
     refidx = np.empty(0)
@@ -1642,7 +1743,7 @@ def plotRAWTFUncerComps(datafile,type='Phase',sensorName='0xbccb0000_MPU_9250',s
 
 def processdata(i):
     sys.stdout.flush()
-    times = mpdata["movementtimes"][i]
+    times = np.array(mpdata["movementtimes"][i])
     refidx = int(mpdata["refidx"][i])
     #print("DONE i=" + str(i) + "refidx=" + str(refidx))
     times[0] += mpdata['startCutOutns']
@@ -1686,6 +1787,167 @@ def processdata(i):
     return experiment
 
 
+def _initExperimentWorker(hdffilename, sensornames, dataGroupName, params):
+    """Opens the hdf file read only and sets mpdata for processdata in every worker"""
+    global mpdata
+    mpdata = dict(params)
+    mpdata["hdfinstance"] = hdfmet4fofdatafile(
+        h5py_plain.File(hdffilename, "r"),
+        sensornames=sensornames,
+        dataGroupName=dataGroupName,
+    )
+
+
+def _processExperimentWorker(i):
+    """Runs processdata(i), returns the data of the experiment or the traceback"""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            experiment = processdata(i)
+    except Exception:
+        return i, None, traceback.format_exc()
+    return (
+        i,
+        (experiment.experiemntID, experiment.timepoints, experiment.idxs, experiment.data),
+        None,
+    )
+
+
+def processexperiments(
+    hdffilename,
+    movementtimes,
+    refidx,
+    uniquexfreqs,
+    ADCName,
+    AnalogrefChannel,
+    startCutOutns=0,
+    endCutOutns=0,
+    workers=None,
+    tmpfolder="tmp",
+    resume=True,
+    sensornames=None,
+    dataGroupName="RAWDATA",
+    experimentTypeName="Sine excitation",
+):
+    """
+    Runs processdata for all sine excitations of a campaign in a process pool.
+
+    Every worker opens the hdf file read only. The results are collected in the
+    order of movementtimes and saved with saveExperimentData by this process
+    only, then copied into EXPERIMENTS/Sine excitation as saveToHdf does. With
+    resume experiments which are already in the hdf file or in tmpfolder are not
+    processed again, so an interrupted campaign can be continued; remove
+    tmpfolder to process a campaign from scratch. The hdf file must not be open
+    for writing while the experiments are processed.
+
+    Parameters
+    ----------
+    hdffilename : path
+        met4fof hdf file with RAWDATA and REFERENCEDATA.
+    movementtimes : array of int
+        (n, 2) start and end time in ns of every experiment.
+    refidx : array of int
+        index of the reference data of every experiment.
+    uniquexfreqs : array of float
+        excitation frequencies.
+    ADCName : str
+        name of the sensor group with the analog reference, e.g.
+        '0xbccb0a00_STM32_Internal_ADC'.
+    AnalogrefChannel : int
+        row of the analog reference in ADCName/Voltage.
+    startCutOutns, endCutOutns : float, optional
+        time in ns cut from the start and end of every experiment. The default
+        is 0.
+    workers : int, optional
+        number of processes, None for os.cpu_count(). The default is None.
+    tmpfolder : path, optional
+        folder for the experiment files. The default is "tmp".
+    resume : bool, optional
+        skip finished experiments. The default is True.
+    sensornames : list of str, optional
+        sensor groups to process, None for all. The default is None.
+    dataGroupName : str, optional
+        group of the sensor data. The default is "RAWDATA".
+    experimentTypeName : str, optional
+        group in EXPERIMENTS. The default is "Sine excitation".
+
+    Returns
+    -------
+    results : list of dict
+        experiment.data of every experiment in the order of movementtimes,
+        experiments of an earlier run are loaded from the hdf file. None for
+        failed experiments.
+
+    """
+    experimentIDs = [
+        "{:05d}".format(i) + "Sine_Excitation" for i in range(len(movementtimes))
+    ]
+    tmpfilenames = [os.path.join(tmpfolder, ID + ".hdf5") for ID in experimentIDs]
+    saved = np.zeros(len(experimentIDs), dtype=bool)
+    if resume:
+        with h5py_plain.File(hdffilename, "r") as datafile:
+            for i, ID in enumerate(experimentIDs):
+                saved[i] = "EXPERIMENTS/" + experimentTypeName + "/" + ID in datafile
+    pending = [
+        i
+        for i in range(len(experimentIDs))
+        if not (resume and (saved[i] or os.path.exists(tmpfilenames[i])))
+    ]
+    print(
+        str(len(experimentIDs) - len(pending))
+        + " of "
+        + str(len(experimentIDs))
+        + " experiments done, processing "
+        + str(len(pending))
+    )
+    params = {
+        "movementtimes": movementtimes,
+        "refidx": refidx,
+        "uniquexfreqs": uniquexfreqs,
+        "ADCName": ADCName,
+        "AnalogrefChannel": AnalogrefChannel,
+        "startCutOutns": startCutOutns,
+        "endCutOutns": endCutOutns,
+    }
+    results = [None] * len(experimentIDs)
+    failed = []
+    if len(pending) > 0:
+        with multiprocessing.Pool(
+            workers,
+            initializer=_initExperimentWorker,
+            initargs=(hdffilename, sensornames, dataGroupName, params),
+        ) as pool:
+            # imap returns the results in order while later experiments are processed
+            for i, result, error in tqdm(
+                pool.imap(_processExperimentWorker, pending),
+                total=len(pending),
+                desc="Experiments",
+            ):
+                if error is not None:
+                    warnings.warn("Experiment " + str(i) + " failed\n" + error, RuntimeWarning)
+                    failed.append(i)
+                    continue
+                saveExperimentData(tmpfolder, *result)
+                results[i] = result[3]
+
+    with h5py_plain.File(hdffilename, "r+") as datafile:
+        typegroup = datafile.require_group("EXPERIMENTS").require_group(
+            experimentTypeName
+        )
+        for i, ID in enumerate(experimentIDs):
+            if ID not in typegroup and os.path.exists(tmpfilenames[i]):
+                copyExperimentDataToHdf(tmpfilenames[i], typegroup.create_group(ID))
+            saved[i] = ID in typegroup
+    # experiments done in an earlier run are loaded from the hdf file
+    for i, ID in enumerate(experimentIDs):
+        if results[i] is None and saved[i]:
+            results[i] = dd.io.load(
+                hdffilename, "/EXPERIMENTS/" + experimentTypeName + "/" + ID
+            )
+    if len(failed) > 0:
+        print("Failed experiments " + str(failed))
+    return results
+
+
 
 if __name__ == "__main__":
     hdffilename = r"/home/benedikt/data/IMUPTBCEM/PTB/MPU9250PTB.hdf5"
@@ -1771,11 +2033,7 @@ if __name__ == "__main__":
     numofexperiemnts = movementtimes.shape[0]
 
     if is1DPrcoessing:
-        manager = multiprocessing.Manager()
-        mpdata = manager.dict()
-        mpdata['hdfinstance'] = test
-        mpdata['movementtimes'] = movementtimes
-        mpdata['lock'] = manager.Lock()
+        mpdata = {}
         freqs = test.hdffile['REFERENCEDATA/Acceleration_refference/Frequency']['value'][2, :]
         # PTB Data CALCULATE REFERENCE data index skipping one data set at the end of evry loop
 
@@ -1805,9 +2063,21 @@ if __name__ == "__main__":
         else:
             raise ValueError(" Unkowen Key use 'PTB1D' or 'CEM1D'") #TODO use dict and dickt keys
         unicefreqs = np.unique(freqs, axis=0)
-        mpdata['uniquexfreqs'] = unicefreqs
-        i=np.arange(numofexperiemnts)
-        results=process_map(processdata, i, max_workers=15)
+        # the workers open the file read only, the results are written after closing it
+        datafile.close()
+        results = processexperiments(
+            hdffilename,
+            movementtimes,
+            mpdata['refidx'],
+            unicefreqs,
+            mpdata['ADCName'],
+            mpdata['AnalogrefChannel'],
+            startCutOutns=mpdata['startCutOutns'],
+            endCutOutns=mpdata['endCutOutns'],
+            workers=15,
+        )
+        datafile = h5py.File(hdffilename, "r+")
+        test = hdfmet4fofdatafile(datafile,)
         #i = np.array(18)
         #results = np.array(processdata(i))
         freqs = np.zeros(numofexperiemnts)
@@ -1823,15 +2093,19 @@ if __name__ == "__main__":
         df = pd.DataFrame(output)
         for i in range(len(results)):
             ex=results[i]
-            ex.saveToHdf()
-            mag[i] = ex.data[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Magnitude']['value'][2,2]
-            maguncer[i] = ex.data[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Magnitude']['uncertainty'][2,2]
-            examp[i] = ex.data[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Excitation_amplitude']['value'][2,2]
-            ex_freqs[i] = ex.data[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Excitation_frequency']['value'][2]
-            freqs[i] = ex.data[leadSensorname]['Acceleration']['SinPOpt'][2][2]
-            rawamp[i] = ex.data[leadSensorname]['Acceleration']['SinPOpt'][2][0]
-            phase[i] = ex.data[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Phase']['value'][2,2]
-            phaseuncer[i] = ex.data[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Phase']['uncertainty'][2,2]
+            if ex is None:
+                # failed experiment
+                for values in (freqs, ex_freqs, mag, maguncer, examp, rawamp, phase, phaseuncer):
+                    values[i] = np.NaN
+                continue
+            mag[i] = ex[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Magnitude']['value'][2,2]
+            maguncer[i] = ex[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Magnitude']['uncertainty'][2,2]
+            examp[i] = ex[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Excitation_amplitude']['value'][2,2]
+            ex_freqs[i] = ex[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Excitation_frequency']['value'][2]
+            freqs[i] = ex[leadSensorname]['Acceleration']['SinPOpt'][2][2]
+            rawamp[i] = ex[leadSensorname]['Acceleration']['SinPOpt'][2][0]
+            phase[i] = ex[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Phase']['value'][2,2]
+            phaseuncer[i] = ex[leadSensorname]['Acceleration']['Transfer_coefficients']['Acceleration']['Phase']['uncertainty'][2,2]
 
         TF=getRAWTFFromExperiemnts(datafile['/EXPERIMENTS/Sine excitation'],leadSensorname)
         test.addrawtftohdffromexpreiments(datafile["EXPERIMENTS/Sine excitation"], leadSensorname)